@@ -2,6 +2,14 @@
 from femmt.enumerations import *
 from femmt.logparser import *
 from femmt.data import *
+from femmt.getdp_session import *
+from femmt.mesh_cache import *
+from femmt.profiling import *
+from femmt.meshing_engine import *
+from femmt.adaptive_meshing import *
+from femmt.mesh_tuning import *
+from femmt.litz_coefficients import *
+from femmt.material_lookup import *
 from femmt.functions import *
 from femmt.model import *
 from femmt.thermal import *
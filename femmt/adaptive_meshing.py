@@ -0,0 +1,146 @@
+"""A posteriori error indicators and size fields for the adaptive mesh refinement.
+
+The electromagnetic solution of FEMMT uses first order elements, so the magnetic flux density is constant per element.
+The error indicator of an element is the largest jump of the flux density magnitude to its neighbouring elements,
+weighted with the square root of the element area. The elements with the largest indicators are marked for the
+refinement (Dörfler marking), their mesh size is reduced in the size field of the next mesh.
+"""
+# Python standard libraries
+from typing import List, Optional
+
+# 3rd party libraries
+import numpy as np
+
+
+def element_areas(node_coordinates: np.ndarray) -> np.ndarray:
+    """
+    Calculate the areas of polygonal elements (shoelace formula).
+
+    :param node_coordinates: x-y coordinates of the element nodes, shape (number of elements, number of nodes, 2)
+    :type node_coordinates: np.ndarray
+    :return: element areas
+    :rtype: np.ndarray
+    """
+    x = node_coordinates[:, :, 0]
+    y = node_coordinates[:, :, 1]
+    return 0.5 * np.abs(np.sum(x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y, axis=1))
+
+
+def element_sizes(node_coordinates: np.ndarray) -> np.ndarray:
+    """
+    Calculate the mesh sizes of elements as their mean edge lengths.
+
+    :param node_coordinates: x-y coordinates of the element nodes, shape (number of elements, number of nodes, 2)
+    :type node_coordinates: np.ndarray
+    :return: element sizes
+    :rtype: np.ndarray
+    """
+    return np.mean(np.linalg.norm(np.roll(node_coordinates, -1, axis=1) - node_coordinates, axis=2), axis=1)
+
+
+def element_error_indicators(node_coordinates: np.ndarray, node_values: np.ndarray, relative_node_tolerance: float = 1e-9) -> np.ndarray:
+    """
+    Calculate the flux density jump error indicators of elements.
+
+    The nodes of neighbouring elements are identified by their coordinates. The jump at a node is the range of the
+    values of all elements at this node. The indicator of an element is the largest jump at its nodes (or the range of
+    its own values, in case of a continuous field), weighted with the square root of the element area.
+
+    :param node_coordinates: x-y coordinates of the element nodes, shape (number of elements, number of nodes, 2)
+    :type node_coordinates: np.ndarray
+    :param node_values: field values (e.g. magnitude of the flux density) at the element nodes, shape (number of
+        elements, number of nodes)
+    :type node_values: np.ndarray
+    :param relative_node_tolerance: nodes closer than this tolerance (relative to the model size) are identical
+    :type relative_node_tolerance: float
+    :return: error indicators of the elements
+    :rtype: np.ndarray
+    """
+    node_coordinates = np.asarray(node_coordinates, dtype=float)
+    node_values = np.asarray(node_values, dtype=float)
+    number_of_elements, number_of_nodes, _ = node_coordinates.shape
+
+    # Identify the shared nodes
+    model_size = max(float(np.max(np.abs(node_coordinates))), np.finfo(float).tiny) if number_of_elements else 1.0
+    node_keys = np.round(node_coordinates.reshape(-1, 2) / (model_size * relative_node_tolerance))
+    _, node_indices = np.unique(node_keys, axis=0, return_inverse=True)
+    node_indices = node_indices.ravel()
+
+    # Range of the element values at every node
+    node_maximum = np.full(node_indices.max() + 1 if number_of_elements else 0, -np.inf)
+    node_minimum = np.full_like(node_maximum, np.inf)
+    np.maximum.at(node_maximum, node_indices, node_values.ravel())
+    np.minimum.at(node_minimum, node_indices, node_values.ravel())
+    node_jumps = (node_maximum - node_minimum)[node_indices].reshape(number_of_elements, number_of_nodes)
+
+    jumps = np.maximum(np.max(node_jumps, axis=1), np.ptp(node_values, axis=1))
+    return jumps * np.sqrt(element_areas(node_coordinates))
+
+
+def mark_elements(error_indicators: np.ndarray, refinement_fraction: float = 0.5) -> np.ndarray:
+    """
+    Mark the elements for the refinement (Dörfler marking).
+
+    The smallest set of elements with the largest indicators is marked, which contains the given fraction of the
+    total squared error.
+
+    :param error_indicators: error indicators of the elements
+    :type error_indicators: np.ndarray
+    :param refinement_fraction: fraction of the total squared error, which is refined (0...1)
+    :type refinement_fraction: float
+    :return: True for the marked elements
+    :rtype: np.ndarray
+    """
+    squared_errors = np.asarray(error_indicators, dtype=float) ** 2
+    marked = np.zeros(len(squared_errors), dtype=bool)
+    total_squared_error = np.sum(squared_errors)
+    if total_squared_error == 0:
+        return marked
+
+    order = np.argsort(-squared_errors, kind="stable")
+    cumulative_squared_errors = np.cumsum(squared_errors[order])
+    number_of_marked_elements = min(int(np.searchsorted(cumulative_squared_errors, refinement_fraction * total_squared_error)) + 1,
+                                    len(squared_errors))
+    marked[order[:number_of_marked_elements]] = True
+    return marked
+
+
+def refinement_sizes(node_coordinates: np.ndarray, node_values: np.ndarray, refinement_fraction: float = 0.5,
+                     refinement_factor: float = 0.5) -> np.ndarray:
+    """
+    Calculate the mesh sizes of the elements for the next mesh.
+
+    :param node_coordinates: x-y coordinates of the element nodes, shape (number of elements, number of nodes, 2)
+    :type node_coordinates: np.ndarray
+    :param node_values: field values at the element nodes, shape (number of elements, number of nodes)
+    :type node_values: np.ndarray
+    :param refinement_fraction: fraction of the total squared error, which is refined (0...1)
+    :type refinement_fraction: float
+    :param refinement_factor: factor of the mesh size of the marked elements
+    :type refinement_factor: float
+    :return: mesh sizes of the elements
+    :rtype: np.ndarray
+    """
+    marked = mark_elements(element_error_indicators(node_coordinates, node_values), refinement_fraction)
+    return element_sizes(np.asarray(node_coordinates, dtype=float)) * np.where(marked, refinement_factor, 1.0)
+
+
+def relative_change(values: List[float], previous_values: Optional[List[float]]) -> float:
+    """
+    Calculate the largest relative change of the values (e.g. losses, inductances) between two refinement steps.
+
+    Values, which are zero in the previous step, are compared absolutely.
+
+    :param values: values of the current step
+    :type values: List[float]
+    :param previous_values: values of the previous step, None for the first step
+    :type previous_values: List[float]
+    :return: largest relative change, infinity for the first step
+    :rtype: float
+    """
+    if previous_values is None:
+        return np.inf
+    values = np.asarray(values, dtype=float)
+    previous_values = np.asarray(previous_values, dtype=float)
+    references = np.where(previous_values != 0, np.abs(previous_values), 1.0)
+    return float(np.max(np.abs(values - previous_values) / references, initial=0.0))
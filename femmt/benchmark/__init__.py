@@ -0,0 +1,3 @@
+"""Init file for the benchmark section."""
+from femmt.benchmark.benchmark_runner import *
+from femmt.benchmark.benchmark_cases import *
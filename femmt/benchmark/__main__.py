@@ -0,0 +1,55 @@
+"""Command line interface of the benchmarks.
+
+Run the benchmarks and store the results, then compare them against a stored baseline:
+
+    python -m femmt.benchmark run baseline.json --repetitions 5
+    python -m femmt.benchmark run current.json --repetitions 5
+    python -m femmt.benchmark compare baseline.json current.json --threshold 0.1
+
+The compare command exits with code 1 in case of a regression.
+"""
+# Python standard libraries
+import sys
+import argparse
+
+# Local libraries
+from femmt.benchmark.benchmark_runner import (run_benchmarks, write_benchmark_results, read_benchmark_results,
+                                              compare_benchmark_results, fingerprint_differences, print_benchmark_comparison)
+from femmt.benchmark.benchmark_cases import BENCHMARK_CASES
+
+parser = argparse.ArgumentParser(prog="python -m femmt.benchmark", description="Benchmark FEMMT and detect performance regressions.")
+subparsers = parser.add_subparsers(dest="command", required=True)
+
+run_parser = subparsers.add_parser("run", help="run the benchmark cases and store the results")
+run_parser.add_argument("results_file_path", help="file path of the result file")
+run_parser.add_argument("--cases", nargs="*", default=None, help=f"benchmark cases, defaults to all: {list(BENCHMARK_CASES)}")
+run_parser.add_argument("--repetitions", type=int, default=5, help="number of measured repetitions per case")
+run_parser.add_argument("--warmup-repetitions", type=int, default=1, help="number of repetitions before the measurement")
+run_parser.add_argument("--working-directory", default=None, help="working directory of the cases")
+run_parser.add_argument("--onelab-folder-path", default=None, help="folder of the getdp executable for the fingerprint")
+
+compare_parser = subparsers.add_parser("compare", help="compare results against a baseline, exit code 1 in case of a regression")
+compare_parser.add_argument("baseline_file_path", help="file path of the baseline result file")
+compare_parser.add_argument("current_file_path", help="file path of the current result file")
+compare_parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown of a phase median, which is a regression")
+compare_parser.add_argument("--minimum-duration", type=float, default=1e-3,
+                            help="absolute slowdown of a phase median in seconds, below which no regression is flagged")
+
+subparsers.add_parser("list", help="list the benchmark cases")
+
+arguments = parser.parse_args()
+if arguments.command == "run":
+    if arguments.cases is not None and any(case_name not in BENCHMARK_CASES for case_name in arguments.cases):
+        parser.error(f"unknown benchmark cases {[case_name for case_name in arguments.cases if case_name not in BENCHMARK_CASES]}")
+    write_benchmark_results(arguments.results_file_path, run_benchmarks(arguments.cases, arguments.repetitions,
+                                                                        arguments.warmup_repetitions, arguments.working_directory,
+                                                                        arguments.onelab_folder_path))
+elif arguments.command == "compare":
+    baseline_results = read_benchmark_results(arguments.baseline_file_path)
+    current_results = read_benchmark_results(arguments.current_file_path)
+    comparison = compare_benchmark_results(baseline_results, current_results, arguments.threshold, arguments.minimum_duration)
+    print_benchmark_comparison(comparison, fingerprint_differences(baseline_results["fingerprint"], current_results["fingerprint"]))
+    sys.exit(1 if any(row["regression"] for row in comparison) else 0)
+else:
+    for case_name in BENCHMARK_CASES:
+        print(case_name)
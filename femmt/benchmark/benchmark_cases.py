@@ -0,0 +1,124 @@
+"""Benchmark cases with fixed reference models, which only need gmsh and GetDP (no material database measurements).
+
+Every case gets a PhaseTimer and a working directory, runs once and measures its phases:
+
+* FEM cases (reference designs of the mesh accuracy tuning, see femmt.mesh_tuning.reference_design()):
+  create_model, mesh_generation, parameter_writing, getdp_solve, log_writing, log_parsing and thermal_solve
+* reluctance_sweep: reluctance model sweep over a fixed parameter grid
+* pareto_extraction: Pareto front and tolerance band of seeded random designs
+"""
+# Python standard libraries
+from typing import Callable, Dict
+
+# 3rd party libraries
+import numpy as np
+
+# Local libraries
+from femmt.enumerations import ComponentType, CoreType
+from femmt.logparser import FEMMTLogParser, SweepTypes
+from femmt.reluctance import MagneticCircuit
+from femmt.optimization.functions_optimization import pareto_front_mask, pareto_tolerance_mask
+from femmt.mesh_tuning import MESH_ACCURACY_NAMES, REFERENCE_TOPOLOGIES, mesh_accuracy_profile_key, reference_design
+from femmt.benchmark.benchmark_runner import PhaseTimer
+
+# Mesh accuracy of the FEM cases (default of the MagneticComponent)
+BENCHMARK_MESH_ACCURACY = 0.5
+
+# Thermal parameters of the FEM cases, see the basic transformer example
+THERMAL_CONDUCTIVITIES = {"air": 0.0263, "case": {"top": 1.54, "top_right": 1.54, "right": 1.54, "bot_right": 1.54, "bot": 1.54},
+                          "core": 5, "winding": 400, "air_gaps": 180, "insulation": 0.42}
+THERMAL_CASE_GAPS = {"case_gap_top": 0.002, "case_gap_right": 0.0025, "case_gap_bot": 0.002}
+THERMAL_BOUNDARY_TEMPERATURES = {"value_boundary_top": 20, "value_boundary_top_right": 20, "value_boundary_right_top": 20,
+                                 "value_boundary_right": 20, "value_boundary_right_bottom": 20,
+                                 "value_boundary_bottom_right": 20, "value_boundary_bottom": 20}
+THERMAL_BOUNDARY_FLAGS = {"flag_boundary_top": 0, "flag_boundary_top_right": 0, "flag_boundary_right_top": 1,
+                          "flag_boundary_right": 1, "flag_boundary_right_bottom": 1, "flag_boundary_bottom_right": 1,
+                          "flag_boundary_bottom": 1}
+
+# Topologies of the FEM cases with a thermal simulation
+THERMAL_TOPOLOGIES = [(ComponentType.Inductor, CoreType.Single), (ComponentType.Transformer, CoreType.Single)]
+
+
+def fem_benchmark_case(component_type: ComponentType, core_type: CoreType) -> Callable[[PhaseTimer, str], None]:
+    """
+    Create the FEM benchmark case of a reference design.
+
+    :param component_type: component type
+    :type component_type: ComponentType
+    :param core_type: core type
+    :type core_type: CoreType
+    :return: benchmark case
+    :rtype: Callable[[PhaseTimer, str], None]
+    """
+    def fem_case(timer: PhaseTimer, working_directory: str):
+        geo, frequency, current, phi_deg = reference_design(component_type, core_type, working_directory,
+                                                            {name: BENCHMARK_MESH_ACCURACY for name in MESH_ACCURACY_NAMES})
+
+        with timer.phase("create_model"):
+            geo.create_model(freq=frequency, pre_visualize_geometry=False, save_png=False)
+        with timer.phase("mesh_generation"):
+            geo.mesh.generate_electro_magnetic_mesh()
+        with timer.phase("parameter_writing"):
+            geo.excitation(frequency=frequency, amplitude_list=current, phase_deg_list=phi_deg)
+            geo.check_create_empty_material_log()
+            geo.check_model_mqs_condition()
+            geo.write_simulation_parameters_to_pro_files()
+            geo.generate_load_litz_approximation_parameters()
+        with timer.phase("getdp_solve"):
+            geo.simulate()
+        with timer.phase("log_writing"):
+            geo.calculate_and_write_freq_domain_log()
+        with timer.phase("log_parsing"):
+            FEMMTLogParser.parse_file(geo.file_data.e_m_results_log_path, SweepTypes.SingleSweep)
+
+        if (component_type, core_type) in THERMAL_TOPOLOGIES:
+            with timer.phase("thermal_solve"):
+                geo.thermal_simulation(THERMAL_CONDUCTIVITIES, THERMAL_BOUNDARY_TEMPERATURES, THERMAL_BOUNDARY_FLAGS,
+                                       show_thermal_simulation_results=False, **THERMAL_CASE_GAPS)
+
+    return fem_case
+
+
+def reluctance_sweep_case(timer: PhaseTimer, working_directory: str):
+    """
+    Benchmark the reluctance model sweep over a fixed parameter grid.
+
+    :param timer: phase timer
+    :type timer: PhaseTimer
+    :param working_directory: working directory (not used)
+    :type working_directory: str
+    """
+    with timer.phase("reluctance_sweep"):
+        MagneticCircuit(core_inner_diameter=list(np.linspace(0.01, 0.03, 20)), window_h=list(np.linspace(0.01, 0.04, 20)),
+                        window_w=list(np.linspace(0.005, 0.02, 20)), no_of_turns=list(range(5, 45, 2)), n_air_gaps=[1, 3],
+                        air_gap_h=list(np.linspace(1e-4, 1e-3, 5)), air_gap_position=[0, 50, 100], mu_r_abs=[3000],
+                        mult_air_gap_type=[1, 2], air_gap_method='Percent', component_type='inductor', sim_type='sweep')
+
+
+def pareto_extraction_case(timer: PhaseTimer, working_directory: str):
+    """
+    Benchmark the Pareto front extraction of seeded random designs.
+
+    :param timer: phase timer
+    :type timer: PhaseTimer
+    :param working_directory: working directory (not used)
+    :type working_directory: str
+    """
+    random_generator = np.random.default_rng(0)
+    costs_2d = random_generator.random((200000, 2))
+    costs_3d = random_generator.random((20000, 3))
+
+    with timer.phase("pareto_front_2d"):
+        pareto_front_mask(costs_2d)
+    with timer.phase("pareto_front_3d"):
+        pareto_front_mask(costs_3d)
+    with timer.phase("pareto_tolerance"):
+        pareto_tolerance_mask(costs_2d[:, 0], costs_2d[:, 1], factor_min_losses=10)
+
+
+# Benchmark cases, key is the name of the case
+BENCHMARK_CASES: Dict[str, Callable[[PhaseTimer, str], None]] = {
+    **{f"fem_{mesh_accuracy_profile_key(*topology)}": fem_benchmark_case(*topology) for topology in REFERENCE_TOPOLOGIES},
+    "reluctance_sweep": reluctance_sweep_case,
+    "pareto_extraction": pareto_extraction_case,
+}
@@ -0,0 +1,259 @@
+"""Run the benchmark cases repeatedly, store the phase statistics and compare them against a baseline.
+
+A benchmark result file is a JSON file with the fingerprint of the machine, the number of repetitions and the
+statistics (median, mean, standard deviation, minimum, maximum) of the duration of every phase of every case.
+Two result files are compared by the medians of the phases: a phase is a regression, if its median is slower than the
+median of the baseline by more than the relative threshold (and by more than a minimum duration, to ignore the noise
+of very short phases).
+"""
+# Python standard libraries
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import datetime
+import tempfile
+import subprocess
+import contextlib
+from typing import Callable, Dict, List, Optional
+
+# 3rd party libraries
+import numpy as np
+
+# Version of the benchmark result files. Increase in case of changes in the benchmark cases, to not compare
+# incompatible results.
+BENCHMARK_RESULTS_VERSION = 1
+
+# Fingerprint entries, which need to be identical for a meaningful comparison of two result files
+COMPARABLE_FINGERPRINT_KEYS = ["machine", "processor", "cpu_count", "python_version", "gmsh_version", "getdp_version"]
+
+
+class PhaseTimer:
+    """Collect the durations of the phases of a benchmark case, measured by a monotonic clock."""
+
+    def __init__(self):
+        """Initialize the phase timer without any durations."""
+        self.durations: Dict[str, List[float]] = {}
+
+    @contextlib.contextmanager
+    def phase(self, phase_name: str):
+        """
+        Context manager to measure the duration of a phase.
+
+        :param phase_name: name of the phase
+        :type phase_name: str
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations.setdefault(phase_name, []).append(time.perf_counter() - start_time)
+
+
+def phase_statistics(durations: List[float]) -> Dict[str, float]:
+    """
+    Calculate the statistics of the durations of a phase.
+
+    :param durations: durations of the repetitions in seconds
+    :type durations: List[float]
+    :return: number of repetitions, median, mean, standard deviation, minimum and maximum in seconds
+    :rtype: Dict[str, float]
+    """
+    if len(durations) == 0:
+        raise ValueError("No durations given.")
+    durations = np.asarray(durations, dtype=float)
+    return {"repetitions": len(durations), "median": float(np.median(durations)), "mean": float(np.mean(durations)),
+            "std": float(np.std(durations)), "min": float(np.min(durations)), "max": float(np.max(durations))}
+
+
+def _command_version(command: List[str]) -> Optional[str]:
+    """Inner function. Get the first output line of a version command, None if the command is not available."""
+    if shutil.which(command[0]) is None and not os.path.isfile(command[0]):
+        return None
+    try:
+        process = subprocess.run(command, capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    output = (process.stdout or process.stderr).strip()
+    return output.splitlines()[0] if output else None
+
+
+def machine_fingerprint(onelab_folder_path: Optional[str] = None) -> Dict:
+    """
+    Describe the machine and the software versions of a benchmark run.
+
+    :param onelab_folder_path: folder of the getdp executable, defaults to None (getdp of the system path)
+    :type onelab_folder_path: str
+    :return: platform, processor, number of CPU cores, python, numpy, gmsh and getdp versions
+    :rtype: Dict
+    """
+    try:
+        import gmsh
+        gmsh_version = getattr(gmsh, "__version__", None)
+    except ImportError:
+        gmsh_version = None
+    getdp_executable = os.path.join(onelab_folder_path, "getdp") if onelab_folder_path is not None else "getdp"
+
+    return {"platform": platform.platform(), "machine": platform.machine(), "processor": platform.processor(),
+            "cpu_count": os.cpu_count(), "python_version": platform.python_version(), "numpy_version": np.__version__,
+            "gmsh_version": gmsh_version, "getdp_version": _command_version([getdp_executable, "--version"])}
+
+
+def fingerprint_differences(baseline_fingerprint: Dict, current_fingerprint: Dict) -> Dict[str, tuple]:
+    """
+    Find the fingerprint entries, which differ between a baseline and a current benchmark run.
+
+    :param baseline_fingerprint: fingerprint of the baseline run
+    :type baseline_fingerprint: Dict
+    :param current_fingerprint: fingerprint of the current run
+    :type current_fingerprint: Dict
+    :return: differing entries, value is the tuple of the baseline and the current value
+    :rtype: Dict[str, tuple]
+    """
+    return {key: (baseline_fingerprint.get(key), current_fingerprint.get(key)) for key in COMPARABLE_FINGERPRINT_KEYS
+            if baseline_fingerprint.get(key) != current_fingerprint.get(key)}
+
+
+def run_benchmark_case(case: Callable[[PhaseTimer, str], None], working_directory: str, repetitions: int = 5,
+                       warmup_repetitions: int = 1) -> Dict[str, Dict[str, float]]:
+    """
+    Run a benchmark case repeatedly and calculate the statistics of its phases.
+
+    :param case: benchmark case, gets a phase timer and a working directory
+    :type case: Callable[[PhaseTimer, str], None]
+    :param working_directory: working directory of the case
+    :type working_directory: str
+    :param repetitions: number of measured repetitions
+    :type repetitions: int
+    :param warmup_repetitions: number of repetitions before the measurement (e.g. to fill the caches)
+    :type warmup_repetitions: int
+    :return: statistics per phase, see phase_statistics()
+    :rtype: Dict[str, Dict[str, float]]
+    """
+    if repetitions < 1:
+        raise ValueError(f"At least one repetition is needed, but {repetitions} are given.")
+    for _ in range(warmup_repetitions):
+        case(PhaseTimer(), working_directory)
+
+    timer = PhaseTimer()
+    for _ in range(repetitions):
+        case(timer, working_directory)
+    return {phase_name: phase_statistics(durations) for phase_name, durations in timer.durations.items()}
+
+
+def run_benchmarks(case_names: Optional[List[str]] = None, repetitions: int = 5, warmup_repetitions: int = 1,
+                   working_directory: Optional[str] = None, onelab_folder_path: Optional[str] = None) -> Dict:
+    """
+    Run the benchmark cases and collect the results together with the machine fingerprint.
+
+    :param case_names: names of the cases, defaults to None (all cases, see BENCHMARK_CASES)
+    :type case_names: List[str]
+    :param repetitions: number of measured repetitions per case
+    :type repetitions: int
+    :param warmup_repetitions: number of repetitions before the measurement per case
+    :type warmup_repetitions: int
+    :param working_directory: working directory of the cases. Defaults to None (temporary folder)
+    :type working_directory: str
+    :param onelab_folder_path: folder of the getdp executable for the fingerprint, defaults to None
+    :type onelab_folder_path: str
+    :return: benchmark results
+    :rtype: Dict
+    """
+    # local import, as the benchmark cases use the PhaseTimer of this module
+    from femmt.benchmark.benchmark_cases import BENCHMARK_CASES
+
+    case_names = list(BENCHMARK_CASES) if case_names is None else case_names
+    unknown_case_names = [case_name for case_name in case_names if case_name not in BENCHMARK_CASES]
+    if unknown_case_names:
+        raise ValueError(f"Unknown benchmark cases {unknown_case_names}. Benchmark cases: {list(BENCHMARK_CASES)}")
+
+    results = {"version": BENCHMARK_RESULTS_VERSION, "created": datetime.datetime.now().isoformat(timespec="seconds"),
+               "fingerprint": machine_fingerprint(onelab_folder_path), "repetitions": repetitions, "cases": {}}
+    with tempfile.TemporaryDirectory() if working_directory is None else contextlib.nullcontext(working_directory) as directory:
+        for case_name in case_names:
+            results["cases"][case_name] = run_benchmark_case(BENCHMARK_CASES[case_name], os.path.join(directory, case_name),
+                                                             repetitions, warmup_repetitions)
+    return results
+
+
+def write_benchmark_results(results_file_path: str, results: Dict):
+    """
+    Write benchmark results to a JSON file.
+
+    :param results_file_path: file path of the result file
+    :type results_file_path: str
+    :param results: benchmark results, see run_benchmarks()
+    :type results: Dict
+    """
+    with open(results_file_path, "w") as results_file:
+        json.dump(results, results_file, indent=2)
+
+
+def read_benchmark_results(results_file_path: str) -> Dict:
+    """
+    Read benchmark results from a JSON file.
+
+    :param results_file_path: file path of the result file
+    :type results_file_path: str
+    :return: benchmark results
+    :rtype: Dict
+    """
+    with open(results_file_path, "r") as results_file:
+        results = json.load(results_file)
+    if results.get("version") != BENCHMARK_RESULTS_VERSION:
+        raise ValueError(f"Benchmark results {results_file_path} have version {results.get('version')}, "
+                         f"but version {BENCHMARK_RESULTS_VERSION} is needed.")
+    return results
+
+
+def compare_benchmark_results(baseline_results: Dict, current_results: Dict, threshold: float = 0.1,
+                              minimum_duration: float = 1e-3) -> List[Dict]:
+    """
+    Compare the phase medians of current benchmark results against baseline results.
+
+    Phases, which are only part of one of the results, are not compared.
+
+    :param baseline_results: benchmark results of the baseline
+    :type baseline_results: Dict
+    :param current_results: current benchmark results
+    :type current_results: Dict
+    :param threshold: relative slowdown of the median, which is a regression
+    :type threshold: float
+    :param minimum_duration: absolute slowdown of the median in seconds, below which no regression is flagged
+    :type minimum_duration: float
+    :return: one row per phase with the case, the phase, the baseline and the current median, the relative change
+        and the regression flag
+    :rtype: List[Dict]
+    """
+    comparison = []
+    for case_name, baseline_phases in baseline_results["cases"].items():
+        current_phases = current_results["cases"].get(case_name, {})
+        for phase_name, baseline_statistics in baseline_phases.items():
+            if phase_name not in current_phases:
+                continue
+            baseline_median = baseline_statistics["median"]
+            current_median = current_phases[phase_name]["median"]
+            relative_change = (current_median - baseline_median) / baseline_median if baseline_median > 0 else 0.0
+            comparison.append({"case": case_name, "phase": phase_name, "baseline_median": baseline_median,
+                               "current_median": current_median, "relative_change": relative_change,
+                               "regression": relative_change > threshold and current_median - baseline_median > minimum_duration})
+    return comparison
+
+
+def print_benchmark_comparison(comparison: List[Dict], fingerprint_difference: Optional[Dict] = None):
+    """
+    Print the comparison of benchmark results as a table.
+
+    :param comparison: comparison, see compare_benchmark_results()
+    :type comparison: List[Dict]
+    :param fingerprint_difference: differing fingerprint entries, see fingerprint_differences()
+    :type fingerprint_difference: Dict
+    """
+    for key, (baseline_value, current_value) in (fingerprint_difference or {}).items():
+        print(f"Warning: {key} differs (baseline {baseline_value}, current {current_value}).", file=sys.stderr)
+    print(f"{'case':<32} {'phase':<24} {'baseline [s]':>12} {'current [s]':>12} {'change':>8}")
+    for row in comparison:
+        print(f"{row['case']:<32} {row['phase']:<24} {row['baseline_median']:>12.4f} {row['current_median']:>12.4f} "
+              f"{row['relative_change']:>+8.1%}" + ("  REGRESSION" if row["regression"] else ""))
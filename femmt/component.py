@@ -1,13 +1,17 @@
 """Define the magnetic component."""
 # Python standard libraries
 import csv
-import fileinput
 import os
 import gmsh
 import json
 import warnings
 import inspect
 import re
+import copy
+import shutil
+import tempfile
+import subprocess
+import concurrent.futures
 import pandas as pd
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
@@ -30,6 +34,17 @@ from femmt.mesh import Mesh
 from femmt.model import VirtualWindingWindow, WindingWindow, Core, Insulation, StrayPath, AirGaps, Conductor
 from femmt.enumerations import *
 from femmt.data import FileData, MeshData
+from femmt.getdp_session import get_getdp_session
+from femmt.meshing_engine import MeshingEngine
+from femmt.profiling import PhaseProfiler, profiled_phase
+from femmt.adaptive_meshing import relative_change
+from femmt.mesh_tuning import load_mesh_accuracy_profile, mesh_accuracy_profile_key
+from femmt.mesh_cache import MeshCache
+from femmt.litz_coefficients import LitzCoefficientStore, litz_coefficient_store_from_environment, \
+    litz_coefficient_file_names, write_litz_coefficient_files, read_litz_cell_coefficient, read_litz_coefficient_settings, \
+    adaptive_litz_reduced_frequencies, litz_coefficients_reduced_frequency_range, LITZ_COEFFICIENTS_NUMBER_OF_LAYERS, \
+    LITZ_COEFFICIENTS_REDUCED_FREQUENCIES, LITZ_COEFFICIENTS_MODES
+from femmt.logparser import write_binary_log
 from femmt.drawing import TwoDaxiSymmetric
 from femmt.thermal import thermal_simulation, calculate_heat_flux_round_wire, read_results_log
 from femmt.dtos import *
@@ -54,7 +69,12 @@ class MagneticComponent:
                  component_type: ComponentType = ComponentType.Inductor, working_directory: str = None,
 
                  clean_previous_results: bool = True, verbosity: Verbosity = 2, is_gui: bool = False,
-                 simulation_name: Optional[str] = None, wwr_enabled=True):
+                 simulation_name: Optional[str] = None, wwr_enabled=True, use_getdp_session: bool = False,
+                 mesh_cache_folder_path: Optional[str] = None, mesh_cache_max_size: float = 1e9, binary_log: bool = False,
+                 litz_coefficient_store_folder_path: Optional[str] = None, litz_coefficient_tolerance: Optional[float] = None,
+                 in_memory_gmsh_model: bool = False, write_geo_file: bool = False,
+                 meshing_engine: Optional[MeshingEngine] = None, mesh_accuracy_profile_file_path: Optional[str] = None,
+                 profiler: Optional[PhaseProfiler] = None):
         # TODO Add a enum? for the verbosity to combine silent and print_output_to_file variables
         """
         Initialize the magnetic component.
@@ -71,6 +91,45 @@ class MagneticComponent:
         :type is_gui: bool
         :param simulation_name: name without any effect. Will just be displayed in the result-log file
         :type simulation_name: str
+        :param use_getdp_session: True to re-use the GetDP pre-processing between frequency domain simulations with the
+            same mesh and excitation structure (see femmt.getdp_session). Falls back to a full GetDP run in case the
+            session can not be used.
+        :type use_getdp_session: bool
+        :param mesh_cache_folder_path: folder of the mesh cache. Identical geometries with identical mesh settings are
+            not meshed again, but loaded from the cache (see femmt.mesh_cache). Defaults to None (no mesh cache).
+        :type mesh_cache_folder_path: str
+        :param mesh_cache_max_size: maximum size of the mesh cache in bytes. Least recently used meshes are removed.
+        :type mesh_cache_max_size: float
+        :param binary_log: True to write a binary companion (log_electro_magnetic.npz) of the result log, which can be
+            read without JSON parsing (see femmt.logparser.write_binary_log)
+        :type binary_log: bool
+        :param litz_coefficient_store_folder_path: folder of the global litz coefficient store, which is consulted
+            before the litz approximation coefficients are calculated (see femmt.litz_coefficients). Defaults to None
+            (folder of the environment variable FEMMT_LITZ_COEFFICIENT_STORE, no store in case it is not set).
+        :type litz_coefficient_store_folder_path: str
+        :param litz_coefficient_tolerance: relative interpolation tolerance of the litz approximation coefficients. The
+            reduced frequency grid of the coefficients is refined adaptively and extended to the reduced frequencies of
+            the simulation, which allows reduced frequencies above 1.25. Defaults to None (fixed grid up to 1.25)
+        :type litz_coefficient_tolerance: float
+        :param in_memory_gmsh_model: True to keep the gmsh geometry in memory between the hybrid, the electro magnetic
+            and the thermal mesh generation, instead of writing and re-reading the model.geo_unrolled
+        :type in_memory_gmsh_model: bool
+        :param write_geo_file: True to write the model.geo_unrolled with an in-memory gmsh model, e.g. for debugging
+        :type write_geo_file: bool
+        :param meshing_engine: meshing engine, which sets the number of meshing threads and the meshing algorithm of
+            gmsh and serializes the gmsh calls of components in the same process. Use an isolated engine per component
+            to only remove the own gmsh models (see femmt.meshing_engine). Defaults to None (gmsh default options,
+            gmsh data is cleared completely)
+        :type meshing_engine: MeshingEngine
+        :param mesh_accuracy_profile_file_path: file path of tuned mesh accuracy profiles. The mesh accuracies of the
+            profile of the topology are applied in set_core() (see femmt.mesh_tuning). Mesh accuracies set by
+            update_mesh_accuracies() are kept, no matter if set before or after set_core(). Defaults to None (default
+            mesh accuracies)
+        :type mesh_accuracy_profile_file_path: str
+        :param profiler: phase profiler, which records a span for every phase (model creation, meshing, simulations,
+            sweeps, thermal simulation, litz coefficients, log writing) and optionally profiles them (see
+            femmt.profiling). Defaults to None (the profiler activated by PhaseProfiler.activate(), if any)
+        :type profiler: PhaseProfiler
         """
         # Get caller filepath when no working_directory was set
         if working_directory is None:
@@ -104,6 +163,21 @@ class MagneticComponent:
             self.silent = True
 
         self.wwr_enabled = wwr_enabled
+        self.use_getdp_session = use_getdp_session
+        # parsed result files (file path -> table), only set while the result log is written
+        self.result_tables: Optional[Dict[str, np.ndarray]] = None
+        self.mesh_cache = MeshCache(mesh_cache_folder_path, mesh_cache_max_size) if mesh_cache_folder_path is not None else None
+        self.binary_log = binary_log
+        self.litz_coefficient_store = LitzCoefficientStore(litz_coefficient_store_folder_path) \
+            if litz_coefficient_store_folder_path is not None else litz_coefficient_store_from_environment()
+        self.litz_coefficient_tolerance = litz_coefficient_tolerance
+        self.in_memory_gmsh_model = in_memory_gmsh_model
+        self.write_geo_file = write_geo_file
+        self.meshing_engine = meshing_engine if meshing_engine is not None else MeshingEngine()
+        self.mesh_accuracy_profile_file_path = mesh_accuracy_profile_file_path
+        # mesh accuracies set by update_mesh_accuracies(), which are not replaced by the mesh accuracy profile
+        self.explicit_mesh_accuracies: Dict[str, float] = {}
+        self.profiler = profiler
 
         self.femmt_print(f"\n"
                          f"Initialized a new Magnetic Component of type {component_type.name}\n"
@@ -222,14 +296,20 @@ class MagneticComponent:
 
     def update_mesh_accuracies(self, mesh_accuracy_core: float, mesh_accuracy_window: float,
                                mesh_accuracy_conductor, mesh_accuracy_air_gaps: float):
-        """Update mesh accuracies for core, windows, conductors and air gaps."""
-        self.mesh_data.mesh_accuracy_core = mesh_accuracy_core
-        self.mesh_data.mesh_accuracy_window = mesh_accuracy_window
-        self.mesh_data.mesh_accuracy_conductor = mesh_accuracy_conductor
-        self.mesh_data.mesh_accuracy_air_gaps = mesh_accuracy_air_gaps
+        """
+        Update mesh accuracies for core, windows, conductors and air gaps.
+
+        The given mesh accuracies take precedence over the mesh accuracy profile, see set_core().
+        """
+        self.explicit_mesh_accuracies = {"mesh_accuracy_core": mesh_accuracy_core, "mesh_accuracy_window": mesh_accuracy_window,
+                                         "mesh_accuracy_conductor": mesh_accuracy_conductor,
+                                         "mesh_accuracy_air_gaps": mesh_accuracy_air_gaps}
+        for name, value in self.explicit_mesh_accuracies.items():
+            setattr(self.mesh_data, name, value)
 
     #  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -   -  -  -  -  -  -  -  -  -  -  -
     # Thermal simulation
+    @profiled_phase()
     def thermal_simulation(self, thermal_conductivity_dict: Dict, boundary_temperatures_dict: Dict,
                            boundary_flags_dict: Dict, case_gap_top: float,
                            case_gap_right: float, case_gap_bot: float, show_thermal_simulation_results: bool = True,
@@ -327,10 +407,12 @@ class MagneticComponent:
             "show_thermal_fem_results": show_thermal_simulation_results,
             "print_sensor_values": False,
             "silent": self.verbosity == Verbosity.Silent,  # Add verbosity for thermal simulation
-            "flag_insulation": flag_insulation
+            "flag_insulation": flag_insulation,
+            "meshing_engine": self.meshing_engine
         }
 
-        thermal_simulation.run_thermal(**thermal_parameters)
+        with self.meshing_engine.session():
+            thermal_simulation.run_thermal(**thermal_parameters)
 
     #  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -   -  -  -  -  -  -  -  -  -  -  -
     # Setup
@@ -386,6 +468,7 @@ class MagneticComponent:
 
     #  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -   -  -  -  -  -  -  -  -  -  -  -
     # Geometry Parts
+    @profiled_phase()
     def high_level_geo_gen(self, frequency: float = None, skin_mesh_factor: float = None):
         """Update the mesh data and creates the model and mesh objects.
 
@@ -411,6 +494,38 @@ class MagneticComponent:
         self.mesh = Mesh(self.two_d_axi, self.windings, self.winding_windows, self.core.correct_outer_leg,
                          self.file_data, self.verbosity, self.logger, None, self.wwr_enabled)
         # self.mesh = Mesh(self.two_d_axi, self.windings, self.core.correct_outer_leg, self.file_data, None, ff.silent)
+        if self.mesh_cache is not None:
+            self.mesh.mesh_cache = self.mesh_cache
+            self.mesh.mesh_cache_key = self.mesh_cache_key()
+        self.mesh.in_memory_gmsh_model = self.in_memory_gmsh_model
+        self.mesh.write_geo_file = self.write_geo_file
+        self.mesh.meshing_engine = self.meshing_engine
+        self.mesh.profiler = self.profiler
+
+    def mesh_cache_key(self) -> str:
+        """
+        Create the key of the current geometry and mesh settings for the mesh cache.
+
+        The key consists of the geometry part of encode_settings() and the mesh data. The frequency enters the key via
+        the skin depth dependent conductor mesh sizes.
+
+        :return: mesh cache key
+        :rtype: str
+        """
+        geometry_settings = MagneticComponent.encode_settings(self)
+        for key in ["simulation_name", "date", "working_directory"]:
+            geometry_settings.pop(key)
+        # core material properties do not affect the mesh
+        geometry_settings["core"] = {key: value for key, value in geometry_settings["core"].items()
+                                     if key in ["core_type", "core_inner_diameter", "core_h", "window_w", "window_h",
+                                                "window_h_bot", "window_h_top", "correct_outer_leg"]}
+
+        mesh_settings = {key: getattr(self.mesh_data, key, None) for key in
+                         ["mesh_accuracy_core", "mesh_accuracy_window", "mesh_accuracy_conductor", "mesh_accuracy_air_gaps",
+                          "padding", "center_factor", "skin_mesh_factor", "c_core", "c_window", "c_air_gaps",
+                          "c_conductor", "c_center_conductor"]}
+
+        return MeshCache.create_key(geometry_settings, mesh_settings, self.component_type.name, self.wwr_enabled)
 
     def mesh(self, frequency: float = None, skin_mesh_factor: float = None):
         """Generate model and mesh.
@@ -512,16 +627,33 @@ class MagneticComponent:
                         vww.turns.append(0)
 
     def set_core(self, core: Core):
-        """Add the core to the model.
+        """Add the core to the model and apply the mesh accuracy profile of the topology (if any).
 
         :param core: Core object
         :type core: Core
         """
         self.core = core
 
+        if self.mesh_accuracy_profile_file_path is not None:
+            mesh_accuracies = load_mesh_accuracy_profile(self.mesh_accuracy_profile_file_path, self.component_type, core.core_type)
+            if mesh_accuracies is None:
+                self.femmt_print(f"No mesh accuracy profile for {mesh_accuracy_profile_key(self.component_type, core.core_type)} "
+                                 f"in {self.mesh_accuracy_profile_file_path}, the default mesh accuracies are used.")
+            else:
+                kept_mesh_accuracies = {name: value for name, value in self.explicit_mesh_accuracies.items()
+                                        if value != mesh_accuracies[name]}
+                if kept_mesh_accuracies:
+                    profile_mesh_accuracies = {name: mesh_accuracies[name] for name in kept_mesh_accuracies}
+                    self.femmt_print(f"The mesh accuracies {kept_mesh_accuracies} set by update_mesh_accuracies() are kept "
+                                     f"instead of the values {profile_mesh_accuracies} of the mesh accuracy profile.")
+                for name, value in mesh_accuracies.items():
+                    if name not in self.explicit_mesh_accuracies:
+                        setattr(self.mesh_data, name, value)
+
     #  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -   -  -  -  -  -  -  -  -  -  -  -
     # Pre-Processing
 
+    @profiled_phase()
     def create_model(self, freq: float, skin_mesh_factor: float = 0.5, pre_visualize_geometry: bool = False,
                      save_png: bool = False, color_scheme: Dict = ff.colors_femmt_default,
                      colors_geometry: Dict = ff.colors_geometry_femmt_default, benchmark: bool = False):
@@ -553,13 +685,13 @@ class MagneticComponent:
             raise Exception("Winding windows are not set properly. Please check the winding creation")
 
         if benchmark:
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.high_level_geo_gen(frequency=freq, skin_mesh_factor=skin_mesh_factor)
-            high_level_geo_gen_time = time.time() - start_time
-            start_time = time.time()
+            high_level_geo_gen_time = time.perf_counter() - start_time
+            start_time = time.perf_counter()
             self.mesh.generate_hybrid_mesh(visualize_before=pre_visualize_geometry, save_png=save_png,
                                            color_scheme=color_scheme, colors_geometry=colors_geometry)
-            generate_hybrid_mesh_time = time.time() - start_time
+            generate_hybrid_mesh_time = time.perf_counter() - start_time
 
             return high_level_geo_gen_time, generate_hybrid_mesh_time
         else:
@@ -978,6 +1110,7 @@ class MagneticComponent:
 
     #  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -
     # GetDP Interaction / Simulation / Excitation
+    @profiled_phase()
     def excitation(self, frequency: float, amplitude_list: List, phase_deg_list: List = None, ex_type: str = 'current',
                    plot_interpolation: bool = False):
         """
@@ -1076,6 +1209,7 @@ class MagneticComponent:
             for num in range(len(self.windings)):
                 self.red_freq[num] = 0
 
+    @profiled_phase()
     def excitation_time_domain(self, current_list: List[List[float]], time_list: List[float],
                                number_of_periods: int, ex_type: str = 'current',
                                plot_interpolation: bool = False, imposed_red_f=0):
@@ -1175,18 +1309,24 @@ class MagneticComponent:
             for num in range(len(self.windings)):
                 self.red_freq[num] = 0
 
+    @profiled_phase()
     def simulate(self):
         """Initialize a onelab client. Provides the GetDP based solver with the created mesh file."""
         self.femmt_print("\n---\n"
                          "Initialize ONELAB API\n"
                          "Run Simulation\n")
+        # result files change with the simulation
+        self.result_tables = None
         self.log_material_properties()
 
         # -- Simulation --
         # create a new onelab client
 
         # Initial Clearing of gmsh data
-        gmsh.clear()
+        if self.mesh is not None:
+            self.mesh.clear_gmsh_data()
+        else:
+            self.meshing_engine.clear()
 
         # get model file names with correct path
 
@@ -1207,6 +1347,11 @@ class MagneticComponent:
         # Run simulations as sub clients (non-blocking??)
         getdp_filepath = os.path.join(self.file_data.onelab_folder_path, "getdp")
         if self.simulation_type == SimulationType.FreqDomain:
+            if self.use_getdp_session:
+                session = get_getdp_session(self.file_data.onelab_folder_path, self.file_data.electro_magnetic_folder_path)
+                if session.solve(self.file_data.e_m_mesh_file, verbose, to_file_str):
+                    return
+                self.femmt_print("GetDP session could not be used. Fall back to a full GetDP run.")
             self.onelab_client.runSubClient("myGetDP", getdp_filepath + " " + solver_freq + " -msh " + \
                                             self.file_data.e_m_mesh_file + " -solve Analysis -v2 " + verbose + to_file_str)
         if self.simulation_type == SimulationType.TimeDomain:
@@ -1216,6 +1361,139 @@ class MagneticComponent:
             # self.onelab_client.runSubClient("myGetDP", getdp_filepath + " " + solver + " -msh " + self.file_data.e_m_mesh_file +
             # " -solve Analysis -v2 " + verbose) # freeing solutions
 
+    def write_sweep_step_pro_files(self, sweep_step: int, results_folder_path: str):
+        """
+        Store the parameter files of one step of a parallel excitation sweep.
+
+        The current Parameter.pro (and core_materials_temp.pro, if existing) are copied to the sweep folder, the
+        postquantities.pro of the step is written to the sweep folder. GetDP selects the files of a step by the
+        number 'Sweep_Step', see simulate_sweep().
+
+        :param sweep_step: number of the step in the excitation sweep, starting from 0
+        :type sweep_step: int
+        :param results_folder_path: results folder of the step, which is merged after the simulation, see
+            sweep_step_results_folder_path()
+        :type results_folder_path: str
+        """
+        self.file_data.create_folders(self.file_data.e_m_sweep_folder_path)
+        shutil.copy(os.path.join(self.file_data.electro_magnetic_folder_path, "Parameter.pro"),
+                    os.path.join(self.file_data.e_m_sweep_folder_path, f"Parameter_{sweep_step}.pro"))
+        core_materials_file = os.path.join(self.file_data.electro_magnetic_folder_path, "core_materials_temp.pro")
+        if os.path.exists(core_materials_file):
+            shutil.copy(core_materials_file, os.path.join(self.file_data.e_m_sweep_folder_path, f"core_materials_temp_{sweep_step}.pro"))
+        os.makedirs(results_folder_path, exist_ok=True)
+        self.write_electro_magnetic_post_pro(
+            post_pro_file=os.path.join(self.file_data.e_m_sweep_folder_path, f"postquantities_{sweep_step}.pro"),
+            results_folder_path=results_folder_path)
+
+    def sweep_step_results_folder_path(self, sweep_step: int) -> str:
+        """
+        Return the results folder of one step of a parallel excitation sweep.
+
+        :param sweep_step: number of the step in the excitation sweep, starting from 0
+        :type sweep_step: int
+        :return: results folder of the sweep step
+        :rtype: str
+        """
+        return os.path.join(self.file_data.results_folder_path, "sweep", f"step_{sweep_step}")
+
+    @profiled_phase()
+    def simulate_sweep(self, number_of_sweep_steps: int, number_of_processes: int):
+        """
+        Run the GetDP simulations of a parallel excitation sweep.
+
+        The parameter files of all steps need to be written by write_sweep_step_pro_files() before. The steps are
+        solved concurrently by separate GetDP processes. Each step writes into its own results folder (see
+        sweep_step_results_folder_path()), the results are merged into the results folder in the order of the sweep
+        steps afterwards, exactly like sequential calls of simulate(). An exception is raised in case a GetDP run
+        fails, before any results are merged.
+
+        :param number_of_sweep_steps: number of steps in the excitation sweep
+        :type number_of_sweep_steps: int
+        :param number_of_processes: number of GetDP processes running at the same time
+        :type number_of_processes: int
+        """
+        self.femmt_print("\n---\n"
+                         f"Run parallel simulation of {number_of_sweep_steps} sweep steps\n")
+        # result files change with the simulation
+        self.result_tables = None
+
+        # Initial Clearing of gmsh data
+        if self.mesh is not None:
+            self.mesh.clear_gmsh_data()
+        else:
+            self.meshing_engine.clear()
+
+        solver_freq = os.path.join(self.file_data.electro_magnetic_folder_path, "ind_axi_python_controlled.pro")
+        os.chdir(self.file_data.working_directory)
+
+        if self.verbosity == Verbosity.Silent:
+            verbose = "-verbose 1"
+        else:
+            verbose = "-verbose 5"
+
+        if self.verbosity == Verbosity.ToFile and os.path.exists(self.file_data.getdp_log):
+            # the logs of the steps are appended by merge_sweep_step_results()
+            os.remove(self.file_data.getdp_log)
+
+        getdp_filepath = os.path.join(self.file_data.onelab_folder_path, "getdp")
+        # GetDP writes the .pre and .res files next to the given name, so every step needs its own name
+        commands = []
+        for sweep_step in range(number_of_sweep_steps):
+            step_folder_path = self.sweep_step_results_folder_path(sweep_step)
+            step_to_file_str = " > " + os.path.join(step_folder_path, "log_getdp.txt") if self.verbosity == Verbosity.ToFile else ""
+            commands.append(f"{getdp_filepath} {solver_freq} -msh {self.file_data.e_m_mesh_file} "
+                            f"-name {os.path.join(step_folder_path, 'ind_axi_python_controlled')} "
+                            f"-setnumber Sweep_Step {sweep_step} -solve Analysis -v2 {verbose}{step_to_file_str}")
+
+        # GetDP runs in separate processes, so threads are sufficient to keep several of them busy
+        with concurrent.futures.ThreadPoolExecutor(max_workers=number_of_processes) as executor:
+            return_codes = list(executor.map(lambda command: subprocess.run(command, shell=True).returncode, commands))
+        failed_sweep_steps = {sweep_step: return_code for sweep_step, return_code in enumerate(return_codes) if return_code != 0}
+        if failed_sweep_steps:
+            # the results of the failed steps are missing or outdated, so they must not be merged
+            raise Exception(f"GetDP simulations of the sweep steps {list(failed_sweep_steps)} failed with the return codes "
+                            f"{list(failed_sweep_steps.values())}. The step results are kept in "
+                            f"{os.path.join(self.file_data.results_folder_path, 'sweep')}.")
+
+        self.merge_sweep_step_results(number_of_sweep_steps)
+
+    def merge_sweep_step_results(self, number_of_sweep_steps: int):
+        """
+        Merge the results folders of a parallel excitation sweep into the results folder.
+
+        The result files of the values and the circuit are appended in the order of the sweep steps, so the merged
+        files equal the result files of a sequential sweep. The fields of the last sweep step are kept.
+
+        :param number_of_sweep_steps: number of steps in the excitation sweep
+        :type number_of_sweep_steps: int
+        """
+        merge_folders = [("values", self.file_data.e_m_values_folder_path),
+                         ("circuit", self.file_data.e_m_circuit_folder_path)]
+        for sweep_step in range(number_of_sweep_steps):
+            step_folder_path = self.sweep_step_results_folder_path(sweep_step)
+            for folder_name, destination_folder_path in merge_folders:
+                step_result_folder_path = os.path.join(step_folder_path, folder_name)
+                for root, _, file_names in os.walk(step_result_folder_path):
+                    destination_root = os.path.join(destination_folder_path, os.path.relpath(root, step_result_folder_path))
+                    os.makedirs(destination_root, exist_ok=True)
+                    for file_name in sorted(file_names):
+                        with open(os.path.join(root, file_name), "r") as source, \
+                                open(os.path.join(destination_root, file_name), "a") as destination:
+                            shutil.copyfileobj(source, destination)
+
+            step_log = os.path.join(step_folder_path, "log_getdp.txt")
+            if os.path.exists(step_log):
+                with open(step_log, "r") as source, open(self.file_data.getdp_log, "a") as destination:
+                    shutil.copyfileobj(source, destination)
+
+        last_step_fields_folder_path = os.path.join(self.sweep_step_results_folder_path(number_of_sweep_steps - 1), "fields")
+        if os.path.isdir(last_step_fields_folder_path):
+            shutil.copytree(last_step_fields_folder_path, self.file_data.e_m_fields_folder_path, dirs_exist_ok=True)
+
+        shutil.rmtree(os.path.join(self.file_data.results_folder_path, "sweep"), ignore_errors=True)
+
+    @profiled_phase()
     def write_simulation_parameters_to_pro_files(self):
         """
         Interaction between python and Prolog files.
@@ -1269,6 +1547,7 @@ class MagneticComponent:
             with open(os.path.join(os.path.join(self.file_data.e_m_mesh_file)), "w") as mesh_file:
                 mesh_file.write(mesh_data)
 
+    @profiled_phase()
     def single_simulation(self, freq: float, current: List[float], phi_deg: List[float] = None,
                           plot_interpolation: bool = False, show_fem_simulation_results: bool = True,
                           benchmark: bool = False):
@@ -1296,11 +1575,11 @@ class MagneticComponent:
 
         phi_deg = phi_deg or []
         if benchmark:
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.mesh.generate_electro_magnetic_mesh()
-            generate_electro_magnetic_mesh_time = time.time() - start_time
+            generate_electro_magnetic_mesh_time = time.perf_counter() - start_time
 
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.excitation(frequency=freq, amplitude_list=current, phase_deg_list=phi_deg,
                             plot_interpolation=plot_interpolation)  # frequency and current
             self.check_create_empty_material_log()
@@ -1308,15 +1587,15 @@ class MagneticComponent:
             self.write_simulation_parameters_to_pro_files()
             self.generate_load_litz_approximation_parameters()
 
-            prepare_simulation_time = time.time() - start_time
+            prepare_simulation_time = time.perf_counter() - start_time
 
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.simulate()
-            real_simulation_time = time.time() - start_time
+            real_simulation_time = time.perf_counter() - start_time
 
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.calculate_and_write_freq_domain_log()  # TODO: reuse center tapped
-            logging_time = time.time() - start_time
+            logging_time = time.perf_counter() - start_time
             if show_fem_simulation_results:
                 self.visualize()
 
@@ -1334,6 +1613,107 @@ class MagneticComponent:
             if show_fem_simulation_results:
                 self.visualize()
 
+    def read_total_losses_and_self_inductances(self) -> List[float]:
+        """
+        Read the total losses and the self inductances (real part) of all windings of the last single simulation.
+
+        :return: total losses, followed by the self inductances of the windings
+        :rtype: List[float]
+        """
+        with open(self.file_data.e_m_results_log_path, "r") as fd:
+            log = json.load(fd)
+        return [log["total_losses"]["total_losses"],
+                *[log["single_sweeps"][0][f"winding{winding_number + 1}"]["flux_over_current"][0]
+                  for winding_number in range(len(self.windings))]]
+
+    @profiled_phase()
+    def adaptive_single_simulation(self, freq: float, current: List[float], phi_deg: List[float] = None,
+                                   tolerance: float = 0.01, maximum_number_of_refinements: int = 5,
+                                   refinement_fraction: float = 0.5, refinement_factor: float = 0.5,
+                                   plot_interpolation: bool = False, show_fem_simulation_results: bool = False) -> List[Dict]:
+        """
+        Start a _single_ electromagnetic ONELAB simulation with an adaptive mesh refinement.
+
+        The first simulation uses the mesh of the mesh accuracies, which can therefore be coarse. After every
+        simulation, the elements with the largest flux density jumps to their neighbours are refined (see
+        femmt.adaptive_meshing) and the simulation is repeated. The refinement stops, as soon as the total losses and the
+        self inductances of all windings change less than the tolerance between two simulations.
+
+        :param freq: frequency to simulate
+        :type freq: float
+        :param current: current to simulate
+        :type current: List[float]
+        :param phi_deg: phase angle in degree
+        :type phi_deg: List[float]
+        :param tolerance: relative tolerance of the losses and inductances between two refinement steps
+        :type tolerance: float
+        :param maximum_number_of_refinements: maximum number of refined meshes
+        :type maximum_number_of_refinements: int
+        :param refinement_fraction: fraction of the total squared error, which is refined per step (0...1)
+        :type refinement_fraction: float
+        :param refinement_factor: factor of the mesh size of the refined elements per step
+        :type refinement_factor: float
+        :param plot_interpolation:
+        :param show_fem_simulation_results: Set to True to show the simulation results after the simulation has finished
+        :type show_fem_simulation_results: bool
+        :return: number of elements, total losses, self inductances and relative change of every refinement step
+        :rtype: List[Dict]
+        """
+        if not isinstance(current, list):
+            raise Exception("The current must be given in a list.")
+        for current_value in current:
+            if current_value < 0:
+                raise ValueError(
+                    "Negative currents are not allowed. Use the phase + 180 degree to generate a negative current.")
+
+        phi_deg = phi_deg or []
+        # the error indicator needs the flux density field
+        plot_fields = self.plot_fields
+        self.plot_fields = "standard"
+
+        refinement_steps = []
+        previous_values = None
+        try:
+            for refinement_step in range(maximum_number_of_refinements + 1):
+                self.mesh.generate_electro_magnetic_mesh(refine=0 if refinement_step == 0 else 1)
+                self.excitation(frequency=freq, amplitude_list=current, phase_deg_list=phi_deg,
+                                plot_interpolation=plot_interpolation)  # frequency and current
+                self.check_create_empty_material_log()
+                self.check_model_mqs_condition()
+                self.write_simulation_parameters_to_pro_files()
+                self.generate_load_litz_approximation_parameters()
+                self.simulate()
+                self.calculate_and_write_freq_domain_log()
+
+                values = self.read_total_losses_and_self_inductances()
+                total_losses, self_inductances = values[0], values[1:]
+                change = relative_change(values, previous_values)
+                previous_values = values
+
+                node_coordinates, node_values = self.mesh.read_refinement_field(
+                    os.path.join(self.file_data.e_m_fields_folder_path, "Magb.pos"))
+                number_of_elements = len(node_values)
+                refinement_steps.append({"number_of_elements": number_of_elements, "total_losses": total_losses,
+                                         "self_inductances": self_inductances, "relative_change": change})
+                self.femmt_print(f"Adaptive mesh refinement step {refinement_step}: {number_of_elements} elements, "
+                                 f"total losses {total_losses} W, relative change {change}")
+                if change <= tolerance:
+                    break
+                if refinement_step == maximum_number_of_refinements:
+                    self.femmt_print(f"Adaptive mesh refinement stopped after {maximum_number_of_refinements} refinements "
+                                     f"without reaching the tolerance {tolerance}")
+                    break
+
+                # the size field is only needed for a further refinement step
+                self.mesh.set_refinement_size_field(node_coordinates, node_values, refinement_fraction, refinement_factor)
+        finally:
+            self.plot_fields = plot_fields
+
+        if show_fem_simulation_results:
+            self.visualize()
+        return refinement_steps
+
+    @profiled_phase()
     def time_domain_simulation(self, current_period_vec: List[List[float]], time_period_vec: List[float],
                                number_of_periods: int,
                                plot_interpolation: bool = False, show_fem_simulation_results: bool = True,
@@ -1361,11 +1741,11 @@ class MagneticComponent:
         self.check_create_empty_material_log()
 
         if benchmark:
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.mesh.generate_electro_magnetic_mesh()
-            generate_electro_magnetic_mesh_time = time.time() - start_time
+            generate_electro_magnetic_mesh_time = time.perf_counter() - start_time
 
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.excitation_time_domain(current_list=current_period_vec, time_list=time_period_vec,
                                         number_of_periods=number_of_periods, plot_interpolation=plot_interpolation)
 
@@ -1373,14 +1753,14 @@ class MagneticComponent:
             self.write_simulation_parameters_to_pro_files()
             self.generate_load_litz_approximation_parameters()
 
-            prepare_simulation_time = time.time() - start_time
+            prepare_simulation_time = time.perf_counter() - start_time
 
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.simulate()
-            real_simulation_time = time.time() - start_time
+            real_simulation_time = time.perf_counter() - start_time
 
-            start_time = time.time()
-            logging_time = time.time() - start_time
+            start_time = time.perf_counter()
+            logging_time = time.perf_counter() - start_time
             self.calculate_average_files()
             self.calculate_and_write_time_domain_log()  # TODO: reuse center tapped
             if show_fem_simulation_results:
@@ -1405,13 +1785,15 @@ class MagneticComponent:
             if show_rolling_average:
                 self.get_rolling_average(window_size=rolling_avg_window_size)
 
+    @profiled_phase()
     def excitation_sweep(self, frequency_list: List, current_list_list: List, phi_deg_list_list: List,
                          show_last_fem_simulation: bool = False,
                          excitation_meshing_type: ExcitationMeshingType = None, skin_mesh_factor: float = 0.5,
                          visualize_before: bool = False, save_png: bool = False,
                          color_scheme: Dict = ff.colors_femmt_default,
                          colors_geometry: Dict = ff.colors_geometry_femmt_default,
-                         inductance_dict: Dict = None, core_hyst_loss: List[float] | np.ndarray = None) -> None:
+                         inductance_dict: Dict = None, core_hyst_loss: List[float] | np.ndarray = None,
+                         number_of_processes: int = 1) -> None:
         """
         Perform a sweep simulation for frequency-current pairs.
 
@@ -1456,6 +1838,9 @@ class MagneticComponent:
         :param core_hyst_loss: List with hysteresis list. If given, the hysteresis losses in this function be
             overwritten in the result log.
         :type core_hyst_loss: List
+        :param number_of_processes: number of GetDP processes to solve the frequencies concurrently. Only used in case
+            the mesh is not re-generated for each frequency.
+        :type number_of_processes: int
         """
         # negative currents are not allowed and lead to wrong simulation results. Check for this.
         # this message appears before meshing and before simulation
@@ -1476,6 +1861,8 @@ class MagneticComponent:
 
         self.check_create_empty_material_log()
 
+        parallel_sweep = number_of_processes > 1 and self.simulation_type == SimulationType.FreqDomain
+
         # If one conductor is solid and no meshing type is given then change the meshing type to MeshEachFrequency
         # In case of litz wire, only the lowest frequency is meshed (frequency indecent due to litz-approximation)
         if excitation_meshing_type is None:
@@ -1522,8 +1909,14 @@ class MagneticComponent:
                     check_model_mqs_condition_already_performed = True
                 self.write_simulation_parameters_to_pro_files()
                 self.generate_load_litz_approximation_parameters()
-                self.simulate()
+                if parallel_sweep:
+                    self.log_material_properties()
+                    self.write_sweep_step_pro_files(count_frequency, self.sweep_step_results_folder_path(count_frequency))
+                else:
+                    self.simulate()
                 # self.visualize()
+            if parallel_sweep:
+                self.simulate_sweep(len(frequency_list), number_of_processes=number_of_processes)
         self.write_and_calculate_common_log(inductance_dict=inductance_dict)
         self.calculate_and_write_freq_domain_log(number_frequency_simulations=len(frequency_list), current_amplitude_list=current_list_list,
                                                  frequencies=frequency_list, phase_deg_list=phi_deg_list_list,
@@ -1533,7 +1926,9 @@ class MagneticComponent:
             self.write_simulation_parameters_to_pro_files()
             self.visualize()
 
-    def component_study(self, time_current_vectors: List[List[List[float]]], fft_filter_value_factor: float = 0.01):
+    @profiled_phase()
+    def component_study(self, time_current_vectors: List[List[List[float]]], fft_filter_value_factor: float = 0.01,
+                        number_of_processes: int = 1):
         """
         Full study for the component: inductance values and losses.
 
@@ -1542,6 +1937,8 @@ class MagneticComponent:
         :param fft_filter_value_factor: Factor to filter frequencies from the fft. E.g. 0.01 [default] removes all
             amplitudes below 1 % of the maximum amplitude from the result-frequency list
         :type fft_filter_value_factor: float
+        :param number_of_processes: number of GetDP processes to solve the harmonics concurrently
+        :type number_of_processes: int
 
         """
         # winding losses
@@ -1610,7 +2007,7 @@ class MagneticComponent:
 
         # calculate the winding losses
         self.excitation_sweep(frequency_list, current_list_list, phi_deg_list_list, inductance_dict=inductance_dict,
-                              core_hyst_loss=p_hyst_core_parts)
+                              core_hyst_loss=p_hyst_core_parts, number_of_processes=number_of_processes)
 
     def center_tapped_pre_study(self, time_current_vectors: List[List[List[float]]], plot_waveforms: bool = False,
                                 fft_filter_value_factor: float = 0.01) -> Dict:
@@ -1928,6 +2325,7 @@ class MagneticComponent:
 
     #  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -
     # Post-Processing
+    @profiled_phase()
     def get_inductances(self, I0: float, op_frequency: float = 0, skin_mesh_factor: float = 1,
                         visualize_last_fem_simulation: bool = False, silent: bool = False):
         """
@@ -2312,8 +2710,9 @@ class MagneticComponent:
             self.femmt_print(f"Cell surface area: {self.windings[winding_number].a_cell} \n"
                              f"Reduced frequency: {self.red_freq[winding_number]}")
 
-            if self.red_freq[winding_number] > 1.25 and self.windings[winding_number].conductor_type == ConductorType.RoundLitz:
-                # TODO: Allow higher reduced frequencies
+            if self.red_freq[winding_number] > LITZ_COEFFICIENTS_REDUCED_FREQUENCIES[-1] and self.litz_coefficient_tolerance is None \
+                    and self.windings[winding_number].conductor_type == ConductorType.RoundLitz:
+                # Higher reduced frequencies need an adaptive grid, see litz_coefficient_tolerance
                 self.femmt_print("Litz Coefficients only implemented for X<=1.25")
                 raise Warning
             # Reduced Frequency
@@ -2366,30 +2765,48 @@ class MagneticComponent:
 
         text_file.close()
 
-    def write_electro_magnetic_post_pro(self):
+    def write_electro_magnetic_post_pro(self, post_pro_file: str = None, results_folder_path: str = None):
         """Write field solutions into the given folder structure.
 
         If self.plot_fields == 'standard', all fields are stored for a later error search.
+
+        :param post_pro_file: path of the written file, defaults to None (postquantities.pro in the electro_magnetic folder)
+        :type post_pro_file: str
+        :param results_folder_path: results folder of the simulation, defaults to None (results folder of file_data).
+            The values, fields and circuit results are stored in the corresponding sub folders.
+        :type results_folder_path: str
         """
-        text_file = open(os.path.join(self.file_data.electro_magnetic_folder_path, "postquantities.pro"), "w")
+        if post_pro_file is None:
+            post_pro_file = os.path.join(self.file_data.electro_magnetic_folder_path, "postquantities.pro")
+        if results_folder_path is None:
+            results_folder_path = self.file_data.results_folder_path
+            values_folder_path = self.file_data.e_m_values_folder_path
+            fields_folder_path = self.file_data.e_m_fields_folder_path
+            circuit_folder_path = self.file_data.e_m_circuit_folder_path
+        else:
+            values_folder_path = os.path.join(results_folder_path, "values")
+            fields_folder_path = os.path.join(results_folder_path, "fields")
+            circuit_folder_path = os.path.join(results_folder_path, "circuit")
+
+        text_file = open(post_pro_file, "w")
 
         # This is needed because the f string cant contain a \ in {}
         backslash = "\\"
 
-        text_file.write(f"DirRes = \"{self.file_data.results_folder_path.replace(backslash, '/')}/\";\n")
-        text_file.write(f"DirResFields = \"{self.file_data.e_m_fields_folder_path.replace(backslash, '/')}/\";\n")
-        text_file.write(f"DirResVals = \"{self.file_data.e_m_values_folder_path.replace(backslash, '/')}/\";\n")
+        text_file.write(f"DirRes = \"{results_folder_path.replace(backslash, '/')}/\";\n")
+        text_file.write(f"DirResFields = \"{fields_folder_path.replace(backslash, '/')}/\";\n")
+        text_file.write(f"DirResVals = \"{values_folder_path.replace(backslash, '/')}/\";\n")
         text_file.write(
-            f"DirResValsCore = \"{self.file_data.e_m_values_folder_path.replace(backslash, '/')}/core_parts/\";\n")
+            f"DirResValsCore = \"{values_folder_path.replace(backslash, '/')}/core_parts/\";\n")
         for i in range(1, len(self.windings) + 1):
             text_file.write(
-                f"DirResValsWinding_{i} = \"{self.file_data.e_m_values_folder_path.replace(backslash, '/')}/Winding_{i}/\";\n")
+                f"DirResValsWinding_{i} = \"{values_folder_path.replace(backslash, '/')}/Winding_{i}/\";\n")
             # text_file.write(f"DirResValsSecondary = \
             # "{self.file_data.e_m_values_folder_path.replace(backslash, '/')}/Secondary/\";\n")
             # text_file.write(f"DirResValsTertiary = \
             # "{self.file_data.e_m_values_folder_path.replace(backslash, '/')}/Tertiary/\";\n")
-        text_file.write(f"DirResCirc = \"{self.file_data.e_m_circuit_folder_path.replace(backslash, '/')}/\";\n")
-        text_file.write(f"OptionPos = \"{self.file_data.results_folder_path.replace(backslash, '/')}/option.pos\";\n")
+        text_file.write(f"DirResCirc = \"{circuit_folder_path.replace(backslash, '/')}/\";\n")
+        text_file.write(f"OptionPos = \"{results_folder_path.replace(backslash, '/')}/option.pos\";\n")
         text_file.write(
             f"DirStrandCoeff = \"{self.file_data.e_m_strands_coefficients_folder_path.replace(backslash, '/')}/\";\n")
 
@@ -2401,6 +2818,7 @@ class MagneticComponent:
 
         text_file.close()
 
+    @profiled_phase()
     def calculate_and_write_freq_domain_log(self, number_frequency_simulations: int = 1, current_amplitude_list: List = None,
                                             phase_deg_list: List = None, frequencies: List = None,
                                             core_hyst_losses: List[float] = None):
@@ -2437,6 +2855,9 @@ class MagneticComponent:
         """
         fundamental_index = 0  # index of the fundamental frequency
 
+        # parse every result file only once, load_result() indexes into the parsed tables
+        self.result_tables = {}
+
         log_dict = {"single_sweeps": [], "total_losses": {}, "simulation_settings": {}}
 
         for single_simulation in range(0, number_frequency_simulations):
@@ -2678,13 +3099,18 @@ class MagneticComponent:
         log_dict["total_losses"]["total_losses"] = log_dict["total_losses"]["hyst_core_fundamental_freq"] + \
             log_dict["total_losses"]["eddy_core"] + log_dict["total_losses"]["all_windings"]
 
+        self.result_tables = None
+
         # final_log_dict: freq dict + common dict
         common_log_dict = self.write_and_calculate_common_log()
         final_log_dict = {**log_dict, **common_log_dict}
         # ====== save data as JSON ======
         with open(self.file_data.e_m_results_log_path, "w+", encoding='utf-8') as outfile:
             json.dump(final_log_dict, outfile, indent=2, ensure_ascii=False)
+        if self.binary_log:
+            write_binary_log(final_log_dict, self.file_data.e_m_results_log_path)
 
+    @profiled_phase()
     def calculate_and_write_time_domain_log(self):
         """
         Process and log the results of time domain simulations.
@@ -2906,6 +3332,8 @@ class MagneticComponent:
         final_log_dict = {**log_dict, **common_log_dict}
         with open(self.file_data.e_m_results_log_path, "w+", encoding='utf-8') as outfile:
             json.dump(final_log_dict, outfile, indent=2, ensure_ascii=False)
+        if self.binary_log:
+            write_binary_log(final_log_dict, self.file_data.e_m_results_log_path)
 
     def write_and_calculate_common_log(self, inductance_dict: dict = None):
         """
@@ -3462,12 +3890,19 @@ class MagneticComponent:
 
         if self.simulation_type == SimulationType.FreqDomain:
 
-            with open(os.path.join(res_path, f"{res_name}.dat")) as fd:
-                lines = fd.readlines()[-last_n:]
-                if part == "real":
-                    result = [float(line.split(sep=' ')[1 + 2 * position + 1]) for n, line in enumerate(lines)]
-                if part == "imaginary":
-                    result = [float(line.split(sep=' ')[2 + 2 * position + 1]) for n, line in enumerate(lines)]
+            result_file = os.path.join(res_path, f"{res_name}.dat")
+            if self.result_tables is None:
+                table = ff.read_getdp_result_table(result_file)
+            else:
+                # result files are parsed only once while the log is written
+                if result_file not in self.result_tables:
+                    self.result_tables[result_file] = ff.read_getdp_result_table(result_file)
+                table = self.result_tables[result_file]
+
+            if part == "real":
+                result = table[-last_n:, 1 + 2 * position + 1].tolist()
+            if part == "imaginary":
+                result = table[-last_n:, 2 + 2 * position + 1].tolist()
 
         elif self.simulation_type == SimulationType.TimeDomain:
 
@@ -3499,6 +3934,7 @@ class MagneticComponent:
 
     #  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -
     # Litz Approximation [internal methods]
+    @profiled_phase()
     def generate_load_litz_approximation_parameters(self):
         """
         Determine the litz-approximation coefficients.
@@ -3508,13 +3944,9 @@ class MagneticComponent:
         """
         for num in range(len(self.windings)):
             if self.windings[num].conductor_type == ConductorType.RoundLitz:
-                # ---
-                # Litz Approximation Coefficients were created with 4 layers
-                # That's why here a hard-coded 4 is implemented
-                # if os.path.isfile(self.path +
-                # f"/Strands_Coefficients/coeff/pB_RS_la{self.windings[num].ff}_{self.n_layers[num]}layer.dat"):
-                if os.path.exists(os.path.join(self.file_data.e_m_strands_coefficients_folder_path, "coeff",
-                                               f"pB_RS_la{self.windings[num].ff}_4layer.dat")):
+                if self.litz_coefficient_store is None and self.litz_coefficient_tolerance is None and os.path.exists(
+                        os.path.join(self.file_data.e_m_strands_coefficients_folder_path, "coeff",
+                                     litz_coefficient_file_names(self.windings[num].ff)[0])):
                     self.femmt_print("Coefficients for stands approximation are found.")
 
                 else:
@@ -3522,101 +3954,167 @@ class MagneticComponent:
                     X = self.red_freq[num]
                     X = np.around(X, decimals=3)
                     self.femmt_print(f"Rounded Reduced frequency X = {X}")
-                    self.create_strand_coeff(num)
+                    self.load_or_create_litz_coefficients(self.windings[num].ff, self.windings[num].strand_radius,
+                                                          self.red_freq[num])
+
+    def load_or_create_litz_coefficients(self, fill_factor: float, strand_radius: float,
+                                         reduced_frequency: Optional[float] = None) -> None:
+        """
+        Provide the litz-approximation coefficients of a certain litz wire in the strands coefficients folder.
+
+        The global litz coefficient store is consulted first. Coefficients, which are missing in the store, are created
+        by a single process and are stored afterwards. Without a store, existing coefficients in the strands
+        coefficients folder are used or the coefficients are created.
+
+        With a litz coefficient tolerance, the coefficients are created on an adaptively refined grid, which covers the
+        given reduced frequency (see femmt.litz_coefficients.adaptive_litz_reduced_frequencies()). Existing coefficients
+        are only used, in case their grid covers the reduced frequency with the same or a lower tolerance.
+
+        :param fill_factor: fill factor of the litz wire
+        :type fill_factor: float
+        :param strand_radius: strand radius in m
+        :type strand_radius: float
+        :param reduced_frequency: reduced frequency, which needs to be covered. Only used with a litz coefficient
+            tolerance. Defaults to None (upper limit of the default grid)
+        :type reduced_frequency: float
+        """
+        coeff_folder = os.path.join(self.file_data.e_m_strands_coefficients_folder_path, "coeff")
+        maximum_reduced_frequency = None
+        if self.litz_coefficient_tolerance is not None:
+            maximum_reduced_frequency = litz_coefficients_reduced_frequency_range(reduced_frequency or 0)
+            settings = read_litz_coefficient_settings(coeff_folder, fill_factor)
+            if settings is not None and settings["tolerance"] is not None and \
+                    settings["tolerance"] <= self.litz_coefficient_tolerance and \
+                    settings["maximum_reduced_frequency"] >= maximum_reduced_frequency and \
+                    settings["strand_radius"] == strand_radius:
+                self.femmt_print("Coefficients for stands approximation are found.")
+                return
+
+        def create_coefficients():
+            self.create_litz_coefficients(fill_factor, strand_radius, maximum_reduced_frequency=maximum_reduced_frequency,
+                                          tolerance=self.litz_coefficient_tolerance)
+
+        if self.litz_coefficient_store is None:
+            if self.litz_coefficient_tolerance is not None or \
+                    not os.path.exists(os.path.join(coeff_folder, litz_coefficient_file_names(fill_factor)[0])):
+                create_coefficients()
+        elif self.litz_coefficient_store.load_or_create(fill_factor, strand_radius, coeff_folder, create_coefficients,
+                                                        maximum_reduced_frequency, self.litz_coefficient_tolerance):
+            self.femmt_print("Coefficients for stands approximation are loaded from the litz coefficient store.")
 
     def create_strand_coeff(self, winding_number: int) -> None:
         """
-        Create the initial strand coefficients for a certain litz wire.
+        Create the initial strand coefficients for the litz wire of a certain winding.
 
-        This function comes into account in case of the litz-coefficients are not known so far.
-        After generating the litz-coefficients, the results are stored to avoid a second time-consuming
+        Public entry point to create the litz-coefficients of a winding in case they are not known so far. The
+        simulation itself is done by create_litz_coefficients(), which is called directly by the simulation with the
+        fill factor and strand radius of the litz wire. The results are stored to avoid a second time-consuming
         strand coefficients generation.
 
-        This function sends commands via text-file to gmsh to generate the strand coefficients. The onelab (gmsh) client
-        is generated in a new instance.
-
         :param winding_number: Winding number
         :type winding_number: int
         """
+        self.create_litz_coefficients(self.windings[winding_number].ff, self.windings[winding_number].strand_radius)
+
+    @profiled_phase()
+    def create_litz_coefficients(self, fill_factor: float, strand_radius: float, number_of_processes: Optional[int] = None,
+                                 maximum_reduced_frequency: Optional[float] = None, tolerance: Optional[float] = None) -> None:
+        """
+        Create the strand coefficients for a litz wire with the given fill factor and strand radius.
+
+        The cell is meshed once by gmsh. Afterwards, the cell simulations of all (mode, reduced frequency) combinations
+        are solved concurrently by separate GetDP processes, each in its own scratch folder. The coefficient files are
+        assembled from the single results and written atomically to the coeff folder.
+
+        :param fill_factor: fill factor of the litz wire
+        :type fill_factor: float
+        :param strand_radius: strand radius in m
+        :type strand_radius: float
+        :param number_of_processes: number of GetDP processes running at the same time. Defaults to None (number of
+            CPUs, at most one process per cell simulation)
+        :type number_of_processes: int
+        :param maximum_reduced_frequency: upper limit of the reduced frequency grid. Defaults to None (default grid)
+        :type maximum_reduced_frequency: float
+        :param tolerance: relative interpolation tolerance, the grid is refined until the linear interpolation of the
+            coefficients is below the tolerance. Defaults to None (no refinement)
+        :type tolerance: float
+        """
         self.femmt_print("\n"
                          "Pre-Simulation\n"
                          "-----------------------------------------\n"
                          "Create coefficients for strands approximation\n")
 
-        text_file = open(os.path.join(self.file_data.e_m_strands_coefficients_folder_path, "PreParameter.pro"), "w")
-
-        # Litz Approximation Coefficients are created with 4 layers
-        # That's why here a hard-coded 4 is implemented
-        # text_file.write(f"NbrLayers = {self.n_layers[num]};\n")
-        text_file.write("NbrLayers = 4;\n")
-        text_file.write(f"Fill = {self.windings[winding_number].ff};\n")
-        text_file.write(f"Rc = {self.windings[winding_number].strand_radius};\n")  # double named!!! must be changed
-        text_file.close()
-        cell_geo = os.path.join(self.file_data.e_m_strands_coefficients_folder_path, "cell.geo")
+        def write_pre_parameters(folder_path: str, pre_parameters: List[str]):
+            # Litz Approximation Coefficients are created with 4 layers
+            with open(os.path.join(folder_path, "PreParameter.pro"), "w") as text_file:
+                litz_parameters = [f"NbrLayers = {LITZ_COEFFICIENTS_NUMBER_OF_LAYERS}", f"Fill = {fill_factor}", f"Rc = {strand_radius}"]
+                text_file.write("".join(f"{pre_parameter};\n" for pre_parameter in [*pre_parameters, *litz_parameters]))  # double named!!! must be changed
 
         verbose = "-verbose 1" if self.silent else "-verbose 5"
-
-        # Run gmsh as a sub client
-        gmsh_client = os.path.join(self.file_data.onelab_folder_path, "gmsh")
-        self.onelab_client.runSubClient("myGmsh", gmsh_client + " " + cell_geo + " -2 " + verbose)
-
-        modes = [1, 2]  # 1 = "skin", 2 = "proximity"
-        reduced_frequencies = np.linspace(0, 1.25, 6)  # must be even
-        for mode in modes:
-            for rf in reduced_frequencies:
-                # -- Pre-Simulation Settings --
-                text_file = open(os.path.join(self.file_data.e_m_strands_coefficients_folder_path, "PreParameter.pro"),
-                                 "w")
-                text_file.write(f"Rr_cell = {rf};\n")
-                text_file.write(f"Mode = {mode};\n")
-                # Litz Approximation Coefficients are created with 4 layers
-                # That's why here a hard-coded 4 is implemented
-                # text_file.write(f"NbrLayers = {self.n_layers[num]};\n")
-                text_file.write("NbrLayers = 4;\n")
-                text_file.write(f"Fill = {self.windings[winding_number].ff};\n")
-                text_file.write(
-                    f"Rc = {self.windings[winding_number].strand_radius};\n")  # double named!!! must be changed
-                text_file.close()
-
-                # get model file names with correct path
-                input_file = os.path.join(self.file_data.e_m_strands_coefficients_folder_path, "cell_dat.pro")
-                cell = os.path.join(self.file_data.e_m_strands_coefficients_folder_path, "cell.pro")
-
-                # Run simulations as sub clients
-                mygetdp = os.path.join(self.file_data.onelab_folder_path, "getdp")
-                self.onelab_client.runSubClient("myGetDP", mygetdp + " " + cell + " -input " + input_file + " -solve MagDyn_a " + verbose)
-
-        # Formatting stuff
-        # Litz Approximation Coefficients are created with 4 layers
-        # That's why here a hard-coded 4 is implemented
-        # files = [self.path + f"/Strands_Coefficients/coeff/pB_RS_la{self.windings
-        # [num].ff}_{self.n_layers[num]}layer.dat",
-        #         self.path + f"/Strands_Coefficients/coeff/pI_RS_la{self.windings
-        #         [num].ff}_{self.n_layers[num]}layer.dat",
-        # self.path + f"/Strands_Coefficients/coeff/qB_RS_la{self.windings
-        #         [num].ff}_{self.n_layers[num]}layer.dat",
-        # self.path + f"/Strands_Coefficients/coeff/qI_RS_la{self.windings[
-        #         num].ff}_{self.n_layers[num]}layer.dat"]
-
-        coeff_folder = os.path.join(self.file_data.e_m_strands_coefficients_folder_path, "coeff")
-        if not os.path.isdir(coeff_folder):
-            os.mkdir(coeff_folder)
-
-        files = [os.path.join(coeff_folder, f"pB_RS_la{self.windings[winding_number].ff}_4layer.dat"),
-                 os.path.join(coeff_folder, f"pI_RS_la{self.windings[winding_number].ff}_4layer.dat"),
-                 os.path.join(coeff_folder, f"qB_RS_la{self.windings[winding_number].ff}_4layer.dat"),
-                 os.path.join(coeff_folder, f"qI_RS_la{self.windings[winding_number].ff}_4layer.dat")]
-        for i in range(0, 4):
-            with fileinput.FileInput(files[i], inplace=True) as file:
-                for line in file:
-                    print(line.replace(' 0\n', '\n'), end='')
-
-        # Corrects pB coefficient error at 0Hz
-        # Must be changed in future in cell.pro
-        for i in range(0, 4):
-            with fileinput.FileInput(files[i], inplace=True) as file:
-                for line in file:
-                    print(line.replace(' 0\n', ' 1\n'), end='')
+        strands_coefficients_folder_path = self.file_data.e_m_strands_coefficients_folder_path
+        if number_of_processes is None:
+            number_of_processes = os.cpu_count() or 1
+
+        # Every simulation runs in its own scratch folder, as GetDP writes the PreParameter.pro, the .pre and .res files
+        # and the results next to the cell files
+        scratch_folder_path = tempfile.mkdtemp(prefix=".tmp_cells_", dir=strands_coefficients_folder_path)
+        try:
+            for file_name in ["cell.geo", "cell.pro", "cell_dat.pro"]:
+                shutil.copyfile(os.path.join(strands_coefficients_folder_path, file_name),
+                                os.path.join(scratch_folder_path, file_name))
+            write_pre_parameters(scratch_folder_path, [])
+
+            # Run gmsh as a sub client
+            gmsh_client = os.path.join(self.file_data.onelab_folder_path, "gmsh")
+            cell_geo_file_path = os.path.join(scratch_folder_path, "cell.geo")
+            self.onelab_client.runSubClient("myGmsh", f"{gmsh_client} {cell_geo_file_path} -2 {verbose}")
+
+            mygetdp = os.path.join(self.file_data.onelab_folder_path, "getdp")
+            cell_coeff_folder_paths = {mode: {} for mode in LITZ_COEFFICIENTS_MODES}
+
+            def solve(reduced_frequencies: List[float]) -> Dict[float, Dict[str, float]]:
+                commands = []
+                for rf in reduced_frequencies:
+                    for mode in LITZ_COEFFICIENTS_MODES:
+                        cell_folder_path = os.path.join(scratch_folder_path, f"mode_{mode}_{len(cell_coeff_folder_paths[mode])}")
+                        os.mkdir(cell_folder_path)
+                        for file_name in ["cell.pro", "cell_dat.pro", "cell.msh"]:
+                            shutil.copyfile(os.path.join(scratch_folder_path, file_name), os.path.join(cell_folder_path, file_name))
+                        write_pre_parameters(cell_folder_path, [f"Rr_cell = {rf}", f"Mode = {mode}"])
+                        cell_coeff_folder_paths[mode][rf] = os.path.join(cell_folder_path, "coeff")
+                        commands.append((f"{mygetdp} {os.path.join(cell_folder_path, 'cell.pro')} -input "
+                                         f"{os.path.join(cell_folder_path, 'cell_dat.pro')} -solve MagDyn_a {verbose}",
+                                         cell_folder_path))
+
+                # GetDP runs in separate processes, so threads are sufficient to keep several of them busy
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(number_of_processes, len(commands)))) as executor:
+                    futures = {executor.submit(subprocess.run, command, shell=True, cwd=cell_folder_path,
+                                               stdout=subprocess.DEVNULL if self.silent else None): command
+                               for command, cell_folder_path in commands}
+                    for future in concurrent.futures.as_completed(futures):
+                        return_code = future.result().returncode
+                        if return_code != 0:
+                            # the cell simulations, which are not started yet, are not needed anymore
+                            for pending_future in futures:
+                                pending_future.cancel()
+                            raise Exception(f"GetDP cell simulation failed with return code {return_code}: {futures[future]}")
+
+                return {rf: {name: read_litz_cell_coefficient(cell_coeff_folder_paths[mode][rf], name)
+                             for mode, names in LITZ_COEFFICIENTS_MODES.items() for name in names}
+                        for rf in reduced_frequencies}
+
+            reduced_frequencies = sorted(adaptive_litz_reduced_frequencies(solve, maximum_reduced_frequency, tolerance))
+            self.femmt_print(f"Litz coefficients calculated for {len(reduced_frequencies)} reduced frequencies "
+                             f"up to X = {reduced_frequencies[-1]}")
+
+            write_litz_coefficient_files({mode: [cell_coeff_folder_paths[mode][rf] for rf in reduced_frequencies]
+                                          for mode in LITZ_COEFFICIENTS_MODES},
+                                         os.path.join(strands_coefficients_folder_path, "coeff"), fill_factor,
+                                         settings={"maximum_reduced_frequency": reduced_frequencies[-1],
+                                                   "tolerance": tolerance, "strand_radius": strand_radius,
+                                                   "reduced_frequencies": reduced_frequencies})
+        finally:
+            shutil.rmtree(scratch_folder_path, ignore_errors=True)
 
     #  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -  -
     # FEMM [alternative Solver]
@@ -4367,118 +4865,166 @@ class MagneticComponent:
             settings = content["simulation_settings"]
 
         if settings is not None:
-            cwd = working_directory if working_directory is not None else settings["working_directory"]
-            geo = MagneticComponent(component_type=ComponentType[settings["component_type"]], working_directory=cwd,
-                                    verbosity=verbosity)
-
-            settings["core"]["loss_approach"] = LossApproach[settings["core"]["loss_approach"]]
-            core_type = settings["core"]["core_type"]
-            if core_type == CoreType.Single:
-                core_dimensions = SingleCoreDimensions(core_inner_diameter=settings["core"]["core_inner_diameter"],
-                                                       window_w=settings["core"]["window_w"],
-                                                       window_h=settings["core"]["window_h"],
-                                                       core_h=settings["core"]["core_h"])
-
-            elif core_type == CoreType.Stacked:
-                core_dimensions = StackedCoreDimensions(core_inner_diameter=settings["core"]["core_inner_diameter"],
-                                                        window_w=settings["core"]["window_w"],
-                                                        window_h_bot=settings["core"]["window_h_bot"],
-                                                        window_h_top=settings["core"]["window_h_top"])
-                # ToDo: core_h not implemented yet.
-                # core_h=settings["core"]["core_h"])
-            else:
-                raise ValueError("unknown core_type for decoding from result_log.")
-
-            if isinstance(settings["core"]["sigma"], List):
-                # in case of sigma is a complex number, it is given as a list and needs to translated to complex.
-                settings["core"]["sigma"] = complex(settings["core"]["sigma"][0], settings["core"]["sigma"][1])
-
-            if settings["core"]["material"] != 'custom':
-                # a custom core does not need a material, measurement_setup and _datatype
-                settings["core"]["material"] = Material(settings["core"]["material"])
-                settings["core"]["permeability_measurement_setup"] = \
-                    MeasurementSetup(settings["core"]["permeability_measurement_setup"])
-                settings["core"]["permeability_datatype"] = \
-                    MeasurementDataType(settings["core"]["permeability_datatype"])
-                settings["core"]["permittivity_measurement_setup"] = \
-                    MeasurementSetup(settings["core"]["permittivity_measurement_setup"])
-                settings["core"]["permittivity_datatype"] = \
-                    MeasurementDataType(settings["core"]["permittivity_datatype"])
-
-            settings["core"]["permeability_datasource"] = \
-                MaterialDataSource(settings["core"]["permeability_datasource"])
-            settings["core"]["permittivity_datasource"] = \
-                MaterialDataSource(settings["core"]["permittivity_datasource"])
-
-            core = Core(core_dimensions=core_dimensions, **settings["core"])
-            geo.set_core(core)
-
-            if "air_gaps" in settings:
-                air_gaps = AirGaps(AirGapMethod[settings["air_gaps"]["method"]], core)
-                for air_gap in settings["air_gaps"]["air_gaps"]:
-                    air_gaps.add_air_gap(AirGapLegPosition[air_gap["leg_position"]], air_gap["height"],
-                                         air_gap["position_value"], )
-                geo.set_air_gaps(air_gaps)
-
-            if "insulation" in settings:
-                insulation = Insulation()
-                insulation.add_core_insulations(*settings["insulation"]["core_insulations"])
-                insulation.add_winding_insulations(settings["insulation"]["inner_winding_insulations"])
-                geo.set_insulation(insulation)
-
-            if "stray_path" in settings:
-                stray_path = StrayPath(**settings["stray_path"])
-                geo.set_stray_path(stray_path)
-
-            new_virtual_winding_windows = []
-            winding_windows = settings["winding_windows"]
-            for winding_window in winding_windows:
-                virtual_winding_windows = winding_window["virtual_winding_windows"]
-                for vww in virtual_winding_windows:
-                    turns = vww["turns"]
-                    conductors = []
-                    for winding in vww["windings"]:
-                        winding_number = winding["winding_number"]
-                        conductor = Conductor(winding["winding_number"], Conductivity[winding["conductivity"]])
+            return MagneticComponent.decode_settings(settings, working_directory, verbosity)
+
+        raise Exception(f"Couldn't extract settings from file {log_file_path}")
+
+    @staticmethod
+    def decode_settings(settings: Dict, working_directory: str = None, verbosity: Verbosity = Verbosity.Silent,
+                        simulation_type: SimulationType = SimulationType.FreqDomain, component_options: Optional[Dict] = None):
+        """
+        Create the magnetic component from the given settings.
+
+        The settings are the output of encode_settings(), e.g. the 'simulation_settings' of a result log. As they
+        are JSON-serializable, they are a lightweight description of the model, e.g. to send models to other processes.
+
+        :param settings: settings of the magnetic component, see encode_settings()
+        :type settings: Dict
+        :param working_directory: If the working directory shall be a different from the settings enter a new one
+            here, defaults to None
+        :type working_directory: str, optional
+        :param verbosity: Set the verbosity to choose your destination. E.g. ToConsole or ToFile
+        :type verbosity: femmt.Verbosity
+        :param simulation_type: simulation type of the magnetic component
+        :type simulation_type: femmt.SimulationType
+        :param component_options: further arguments of the MagneticComponent (e.g. use_getdp_session, binary_log),
+            defaults to None (default arguments)
+        :type component_options: Dict
+        :return: Magnetic component containing the model
+        :rtype: MagneticComponent
+        """
+        # the settings are modified during decoding
+        settings = copy.deepcopy(settings)
+        cwd = working_directory if working_directory is not None else settings["working_directory"]
+        geo = MagneticComponent(simulation_type=simulation_type, component_type=ComponentType[settings["component_type"]],
+                                working_directory=cwd, verbosity=verbosity, simulation_name=settings.get("simulation_name"),
+                                **(component_options or {}))
+
+        settings["core"]["loss_approach"] = LossApproach[settings["core"]["loss_approach"]]
+        # the outer leg correction is called detailed_core_model in the constructor of the core
+        settings["core"]["detailed_core_model"] = settings["core"].pop("correct_outer_leg", False)
+        core_type = settings["core"]["core_type"]
+        if core_type == CoreType.Single:
+            # with the outer leg correction, the height of the center leg is the core height of the core database
+            core_dimensions = SingleCoreDimensions(core_inner_diameter=settings["core"]["core_inner_diameter"],
+                                                   window_w=settings["core"]["window_w"],
+                                                   window_h=settings["core"]["window_h"],
+                                                   core_h=settings["core"].get("core_h_center_leg", settings["core"]["core_h"]))
+
+        elif core_type == CoreType.Stacked:
+            # the core height of a stacked core follows from the window heights and the core thickness
+            core_dimensions = StackedCoreDimensions(core_inner_diameter=settings["core"]["core_inner_diameter"],
+                                                    window_w=settings["core"]["window_w"],
+                                                    window_h_bot=settings["core"]["window_h_bot"],
+                                                    window_h_top=settings["core"]["window_h_top"])
+        else:
+            raise ValueError("unknown core_type for decoding from result_log.")
+
+        if isinstance(settings["core"]["sigma"], List):
+            # in case of sigma is a complex number, it is given as a list and needs to translated to complex.
+            settings["core"]["sigma"] = complex(settings["core"]["sigma"][0], settings["core"]["sigma"][1])
+
+        if settings["core"]["material"] != 'custom':
+            # a custom core does not need a material, measurement_setup and _datatype
+            settings["core"]["material"] = Material(settings["core"]["material"])
+            # measurement setup and datatype are not given in case of custom material data
+            for key, enum_type in [("permeability_measurement_setup", MeasurementSetup),
+                                   ("permeability_datatype", MeasurementDataType),
+                                   ("permittivity_measurement_setup", MeasurementSetup),
+                                   ("permittivity_datatype", MeasurementDataType)]:
+                if settings["core"][key] is not None:
+                    settings["core"][key] = enum_type(settings["core"][key])
+
+        settings["core"]["permeability_datasource"] = \
+            MaterialDataSource(settings["core"]["permeability_datasource"])
+        settings["core"]["permittivity_datasource"] = \
+            MaterialDataSource(settings["core"]["permittivity_datasource"])
+
+        core = Core(core_dimensions=core_dimensions, **settings["core"])
+        geo.set_core(core)
+
+        if settings.get("air_gaps"):
+            air_gaps = AirGaps(AirGapMethod[settings["air_gaps"]["method"]], core)
+            for air_gap in settings["air_gaps"]["air_gaps"]:
+                stacked_position = StackedPosition[air_gap["stacked_position"]] \
+                    if air_gap.get("stacked_position") is not None else None
+                air_gaps.add_air_gap(AirGapLegPosition[air_gap["leg_position"]], air_gap["height"],
+                                     air_gap["position_value"], stacked_position)
+            geo.set_air_gaps(air_gaps)
+
+        insulation = None
+        if settings.get("insulation"):
+            insulation = Insulation(max_aspect_ratio=settings["insulation"].get("max_aspect_ratio", 10),
+                                    flag_insulation=settings["insulation"].get("flag_insulation", True))
+            insulation.add_core_insulations(*settings["insulation"]["core_insulations"])
+            insulation.add_winding_insulations(settings["insulation"]["inner_winding_insulations"])
+            geo.set_insulation(insulation)
+
+        if "stray_path" in settings:
+            stray_path = StrayPath(**settings["stray_path"])
+            geo.set_stray_path(stray_path)
+
+        # conductors of the same winding in several virtual winding windows are the same object
+        conductors = {}
+        winding_windows = []
+        for winding_window_settings in settings["winding_windows"]:
+            winding_window = WindingWindow(core, insulation, geo.stray_path, geo.air_gaps)
+            # the bounds are taken from the settings, as the window may be modified after its creation
+            for bound in ["max_bot_bound", "max_top_bound", "max_left_bound", "max_right_bound"]:
+                setattr(winding_window, bound, winding_window_settings[bound])
+
+            winding_window.virtual_winding_windows = []
+            for vww in winding_window_settings["virtual_winding_windows"]:
+                turns = vww["turns"]
+                vww_conductors = []
+                for winding in vww["windings"]:
+                    winding_number = winding["winding_number"]
+                    if winding_number not in conductors:
+                        conductor = Conductor(winding_number, Conductivity[winding["conductivity"]],
+                                              parallel=winding.get("parallel", False))
                         conductor_type = ConductorType[winding["conductor_type"]]
+                        # the conductor arrangement of round conductors is optional (None)
+                        conductor_arrangement = ConductorArrangement[winding["conductor_arrangement"]] \
+                            if winding.get("conductor_arrangement") is not None else None
                         if conductor_type == ConductorType.RectangularSolid:
                             conductor.set_rectangular_conductor(winding["thickness"])
                         elif conductor_type == ConductorType.RoundLitz:
                             # 3 of 4 wire preferences are allowed, so fill-factor is set to None,
                             # even the value is known from the log.
                             conductor.set_litz_round_conductor(winding["conductor_radius"], winding["number_strands"],
-                                                               winding["strand_radius"], None,
-                                                               ConductorArrangement[winding["conductor_arrangement"]])
+                                                               winding["strand_radius"], None, conductor_arrangement)
                         elif conductor_type == ConductorType.RoundSolid:
-                            conductor.set_solid_round_conductor(winding["conductor_radius"],
-                                                                ConductorArrangement[winding["conductor_arrangement"]])
+                            conductor.set_solid_round_conductor(winding["conductor_radius"], conductor_arrangement)
                         else:
                             raise Exception(f"Unknown conductor type {conductor_type.name}")
+                        conductors[winding_number] = conductor
+
+                    vww_conductors.append(conductors[winding_number])
+
+                new_vww = VirtualWindingWindow(vww["bot_bound"], vww["top_bound"], vww["left_bound"],
+                                               vww["right_bound"])
+                winding_type = WindingType[vww["winding_type"]]
+                if winding_type == WindingType.Single:
+                    winding_scheme = WindingScheme[vww["winding_scheme"]] if vww["winding_scheme"] \
+                        is not None else None
+                    alignment = Align[vww["alignment"]] if vww.get("alignment") is not None else None
+                    placing_strategy = ConductorDistribution[vww["placing_strategy"]] \
+                        if vww.get("placing_strategy") is not None else None
+                    wrap_para_type = WrapParaType[vww["wrap_para"]] if vww["wrap_para"] is not None else None
+                    new_vww.set_winding(vww_conductors[0], turns[vww_conductors[0].winding_number], winding_scheme,
+                                        alignment=alignment, placing_strategy=placing_strategy,
+                                        zigzag=vww.get("zigzag", False), wrap_para_type=wrap_para_type)
+                elif winding_type == WindingType.TwoInterleaved:
+                    new_vww.set_interleaved_winding(vww_conductors[0], turns[0], vww_conductors[1], turns[1],
+                                                    InterleavedWindingScheme[vww["winding_scheme"]])
+                elif winding_type == WindingType.CenterTappedGroup:
+                    new_vww.set_center_tapped_winding(vww_conductors[0], turns[0], vww_conductors[1], turns[1],
+                                                      vww_conductors[2], turns[2], *vww["winding_insulation"])
+                else:
+                    raise Exception(f"Winding type {winding_type} is not implemented")
+                winding_window.virtual_winding_windows.append(new_vww)
+            winding_windows.append(winding_window)
 
-                        conductors.append(conductor)
-
-                    new_vww = VirtualWindingWindow(vww["bot_bound"], vww["top_bound"], vww["left_bound"],
-                                                   vww["right_bound"])
-                    winding_type = WindingType[vww["winding_type"]]
-                    if winding_type == WindingType.Single:
-                        print("Winding Type Single")
-                        winding_scheme = WindingScheme[vww["winding_scheme"]] if vww["winding_scheme"] \
-                            is not None else None
-                        wrap_para_type = WrapParaType[vww["wrap_para"]] if vww["wrap_para"] is not None else None
-                        new_vww.set_winding(conductors[0], turns[winding_number], winding_scheme, wrap_para_type)
-                        print(turns[0])
-                    elif winding_type == WindingType.TwoInterleaved:
-                        new_vww.set_interleaved_winding(conductors[0], turns[0], conductors[1], turns[1],
-                                                        InterleavedWindingScheme[vww["winding_scheme"]],
-                                                        vww["winding_insulation"])
-                    else:
-                        raise Exception(f"Winding type {winding_type} is not implemented")
-                    new_virtual_winding_windows.append(new_vww)
-
-            winding_window = WindingWindow(core, insulation)
-            winding_window.virtual_winding_windows = new_virtual_winding_windows
-            geo.set_winding_windows([winding_window])
-
-            return geo
+        geo.set_winding_windows(winding_windows)
 
-        raise Exception(f"Couldn't extract settings from file {log_file_path}")
+        return geo
@@ -1,6 +1,7 @@
 """Contains information about the file structure."""
 # Python standard libraries
 import os
+import shutil
 
 import numpy as np
 from typing import List
@@ -10,6 +11,9 @@ from femmt.enumerations import ConductorType
 from femmt.model import Conductor
 from typing import Optional
 
+# GetDP files of the electromagnetic simulation, which are not changed by a simulation
+ELECTRO_MAGNETIC_TEMPLATE_FILES = ["fields.pro", "ind_axi_python_controlled.pro", "solver.pro", "values.pro"]
+
 
 class FileData:
     """Contains paths to every folder and file needed in femmt."""
@@ -26,14 +30,47 @@ class FileData:
             if not os.path.exists(folder):
                 os.mkdir(folder)
 
+    @staticmethod
+    def link_template_files(template_folder_path: str, electro_magnetic_folder_path: str,
+                            file_names: List[str] = None) -> None:
+        """
+        Provide the unchanged GetDP files in an electro_magnetic folder of a single simulation (e.g. of a parallel job).
+
+        The files are linked to the template folder, so all simulations share a single read-only copy. GetDP resolves
+        the includes relative to the linked file, so the simulation specific files (Parameter.pro,
+        postquantities.pro, ...) are still read from the electro_magnetic folder of the simulation. In case symbolic
+        links are not available (e.g. on Windows without the necessary rights), the files are copied.
+
+        :param template_folder_path: folder containing the template files, e.g. the electro_magnetic folder of femmt
+        :type template_folder_path: str
+        :param electro_magnetic_folder_path: electro_magnetic folder of the simulation
+        :type electro_magnetic_folder_path: str
+        :param file_names: names of the files, defaults to None (ELECTRO_MAGNETIC_TEMPLATE_FILES)
+        :type file_names: List[str]
+        """
+        file_names = ELECTRO_MAGNETIC_TEMPLATE_FILES if file_names is None else file_names
+        for file_name in file_names:
+            source = os.path.abspath(os.path.join(template_folder_path, file_name))
+            destination = os.path.join(electro_magnetic_folder_path, file_name)
+            if os.path.islink(destination) and os.path.realpath(destination) == os.path.realpath(source):
+                continue
+            # link to a temporary name first, to replace existing files in a single step
+            temporary_destination = f"{destination}.{os.getpid()}.tmp"
+            try:
+                os.symlink(source, temporary_destination)
+            except OSError:
+                shutil.copy(source, temporary_destination)
+            os.replace(temporary_destination, destination)
+
     def clear_previous_simulation_results(self):
         """
         Clear all simulation results from previous simulations.
 
         Therefore, the result-folder structure as well as some temporary files
-        (Parameter.pro, core_materials_temp.pro are cleaned up.
+        (Parameter.pro, core_materials_temp.pro, parameter files of parallel sweeps) are cleaned up.
         """
         self.clean_folder_structure(self.results_folder_path)
+        self.clean_folder_structure(self.e_m_sweep_folder_path)
         if os.path.exists(os.path.join(self.electro_magnetic_folder_path, "core_materials_temp.pro")):
             os.remove(os.path.join(self.electro_magnetic_folder_path, "core_materials_temp.pro"))
         if os.path.exists(os.path.join(self.electro_magnetic_folder_path, "Parameter.pro")):
@@ -78,6 +115,7 @@ class FileData:
             self.e_m_strands_coefficients_folder_path = strands_coefficients_folder_path
         else:
             self.e_m_strands_coefficients_folder_path = os.path.join(self.electro_magnetic_folder_path, "Strands_Coefficients")
+        self.e_m_sweep_folder_path = os.path.join(self.electro_magnetic_folder_path, "sweep")
         self.femm_folder_path = os.path.join(self.working_directory, "femm")
         self.reluctance_model_folder_path = os.path.join(self.working_directory, "reluctance_model")
         self.thermal_results_folder_path = os.path.join(self.results_folder_path, "thermal")
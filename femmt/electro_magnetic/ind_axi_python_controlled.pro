@@ -1,10 +1,20 @@
 // ----------------------
 // Files and Directories
 // ----------------------
-Include "Parameter.pro";
-Include "postquantities.pro";
+DefineConstant[ Sweep_Step = -1 ]; // step of a parallel excitation sweep, set by "-setnumber Sweep_Step <step>"
+If(Sweep_Step < 0)
+  Include "Parameter.pro";
+  Include "postquantities.pro";
+Else
+  Include Sprintf("sweep/Parameter_%g.pro", Sweep_Step);
+  Include Sprintf("sweep/postquantities_%g.pro", Sweep_Step);
+EndIf
 If(Flag_Permeability_From_Data)
-  Include "core_materials_temp.pro";
+  If(Sweep_Step < 0)
+    Include "core_materials_temp.pro";
+  Else
+    Include Sprintf("sweep/core_materials_temp_%g.pro", Sweep_Step);
+  EndIf
 EndIf
 ExtGmsh = ".pos";
 
@@ -260,7 +270,9 @@ Function {
 
   For n In {1:n_windings}
       FSinusoidal~{n}[] = F_Cos_wt_p[]{2*Pi*Freq, Phase~{n}}; //Complex_MH[1,0]{Freq} ; //Cos F_Cos_wt_p[]{2*Pi*Freq, 0};
-      Fct_Src~{n}[] = FSinusoidal~{n}[];
+      // the amplitude is part of the time function, so it is evaluated at runtime and a GetDP session can re-use the
+      // pre-processing for other currents (see femmt.getdp_session)
+      Fct_Src~{n}[] = Val_EE~{n} * FSinusoidal~{n}[];
       Signn~{n} = (Phase~{n}==Pi) ? -1 : 1;
   EndFor
 
@@ -326,10 +338,10 @@ Constraint {
       For n In {1:n_windings}
           If(1)
              If(Flag_Circuit==0 && Flag_HomogenisedModel~{n}==0)
-               { Region Winding~{n} ; Value Val_EE~{n}; TimeFunction Fct_Src~{n}[] ; }
+               { Region Winding~{n} ; Value 1.; TimeFunction Fct_Src~{n}[] ; }
              EndIf
              If(Flag_Circuit==0 && Flag_HomogenisedModel~{n}==1)
-               { Region StrandedWinding~{n} ; Value Val_EE~{n}; TimeFunction Fct_Src~{n}[] ; }
+               { Region StrandedWinding~{n} ; Value 1.; TimeFunction Fct_Src~{n}[] ; }
              EndIf
           EndIf
       EndFor
@@ -404,6 +416,9 @@ Resolution {
 
     Operation {
 
+      // the frequency of a re-used pre-processing is replaced by the frequency of this simulation
+      SetFrequency[A, Freq];
+
       CreateDir[DirResValsCore];
       For n In {1:n_windings}
           CreateDir[DirResValsWinding~{n}];
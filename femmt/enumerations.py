@@ -314,6 +314,18 @@ class ExcitationMeshingType(IntEnum):
     MeshEachFrequency = 3
 
 
+class MeshAlgorithm2D(IntEnum):
+    """Sets the 2D meshing algorithm of gmsh (gmsh option Mesh.Algorithm)."""
+
+    MeshAdapt = 1
+    Automatic = 2
+    Delaunay = 5
+    FrontalDelaunay = 6
+    BAMG = 7
+    FrontalDelaunayForQuads = 8
+    PackingOfParallelograms = 9
+
+
 # Following Enums must always be consistent with the materialdatabase
 class MaterialDataSource(str, Enum):
     """Sets the source from where data is taken."""
@@ -4,7 +4,6 @@ import json
 import csv
 import re
 import os
-import shutil
 from itertools import product
 import logging
 import inspect
@@ -14,7 +13,6 @@ import time
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import proj3d
-from scipy.interpolate import interp1d
 import materialdatabase as mdb
 
 # femmt libraries
@@ -357,7 +355,9 @@ def load_fem_simulation_results(working_directory: str):
     print("##########################")
     print(f"{fem_simulation_results_directory =}")
     print("##########################")
-    file_names = [f for f in os.listdir(fem_simulation_results_directory) if os.path.isfile(os.path.join(fem_simulation_results_directory, f))]
+    # only the JSON log files, the FEMMTLogParser reads their binary companions (.npz) by itself
+    file_names = [f for f in os.listdir(fem_simulation_results_directory)
+                  if f.endswith('.json') and os.path.isfile(os.path.join(fem_simulation_results_directory, f))]
 
     counter = 0
     for name in file_names:
@@ -410,6 +410,12 @@ class AutomatedDesign:
     component_type_dict = {'inductor': fmt.ComponentType.Inductor,
                            'integrated_transformer': fmt.ComponentType.IntegratedTransformer}
 
+    # Columns added by the filters, in the order of the data_matrix columns 16...31
+    flux_columns = ['total_flux_max', 'b_max_center', 'b_max_middle', 'b_max_outer']
+    conductor_columns = ['litz_conductor_r', 'litz_strand_r', 'litz_strand_n', 'litz_fill_factor', 'solid_conductor_r', 'conductor_radius']
+    loss_result_columns = ['total_hyst_loss', 'dc_wire_loss', 'total_loss', 'normalized_total_loss', 'total_volume', 'normalized_total_volume']
+    streaming_columns = flux_columns + conductor_columns + loss_result_columns
+
     def __init__(self, working_directory: str,
                  magnetic_component: str,
                  target_inductance: float,
@@ -440,7 +446,9 @@ class AutomatedDesign:
                  manual_litz_conductor_r: list,
                  manual_litz_strand_r: list,
                  manual_litz_strand_n: list,
-                 manual_litz_fill_factor: list):
+                 manual_litz_fill_factor: list,
+                 chunk_size: int = None,
+                 material_cache_folder_path: str = None):
         """
         Initialize the automated design.
 
@@ -500,6 +508,13 @@ class AutomatedDesign:
         :type inner_winding_insulation: float
         :param temperature: core temperature [in degree Celsius]
         :type temperature: float
+        :param chunk_size: if given, the reluctance model is evaluated in blocks of chunk_size parameter combinations,
+            see iterate_reluctance_designs(). data_matrix_0...data_matrix_3 are not stored in this case, the number of
+            design cases after each filter is given by number_of_cases.
+        :type chunk_size: int
+        :param material_cache_folder_path: folder to cache the material tables across runs, see fmt.MaterialLookup.
+            Defaults to None (no cache on disk).
+        :type material_cache_folder_path: str
         """
         self.working_directory = working_directory
         self.set_up_folder_structure(working_directory)
@@ -560,16 +575,35 @@ class AutomatedDesign:
                                  no_of_turns=self.no_of_turns, n_air_gaps=self.n_air_gaps,
                                  air_gap_h=self.air_gap_height, air_gap_position=self.air_gap_position,
                                  mu_r_abs=self.mu_r_abs, mult_air_gap_type=self.mult_air_gap_type_list,
-                                 air_gap_method='Percent', component_type=self.magnetic_component, sim_type='sweep')
+                                 air_gap_method='Percent', component_type=self.magnetic_component, sim_type='sweep',
+                                 chunk_size=chunk_size)
         self.param = mc.get_parameters_position_dict()
 
+        # mu_r_imag(B) of all core materials at the operating point, loaded from the cache if possible
+        self.material_lookup = fmt.MaterialLookup(material_cache_folder_path, interpolation_kind="cubic", material_database=material_db)
+        self.material_lookup.precompute(self.core_material, [self.frequency], [self.temperature])
+
+        # Number of design cases after each filter step
+        self.number_of_cases = [0, 0, 0, 0, 0, 0]
+
         # Filtration of the design cases which are not important
-        self.data_matrix_0 = mc.data_matrix
-        self.data_matrix_1 = self.filter_reluctance_target_inductance(self.data_matrix_0)
-        self.data_matrix_2 = self.filter_reluctance_flux_saturation(self.data_matrix_1)
-        self.data_matrix_3 = self.filter_reluctance_winding_window(self.data_matrix_2)
-        self.data_matrix_4 = self.filter_reluctance_losses(self.data_matrix_3)
+        if chunk_size is None:
+            self.data_matrix_0 = mc.data_matrix
+            self.data_matrix_1 = self.filter_reluctance_target_inductance(self.data_matrix_0)
+            self.data_matrix_2 = self.filter_reluctance_flux_saturation(self.data_matrix_1)
+            self.data_matrix_3 = self.filter_reluctance_winding_window(self.data_matrix_2)
+            self.data_matrix_4 = self.filter_reluctance_losses(self.data_matrix_3)
+            self.number_of_cases[0:4] = [len(self.data_matrix_0), len(self.data_matrix_1), len(self.data_matrix_2), len(self.data_matrix_3)]
+        else:
+            self.data_matrix_0, self.data_matrix_1, self.data_matrix_2, self.data_matrix_3 = None, None, None, None
+            survivors = list(self.iterate_reluctance_designs(mc, chunk_size))
+            if not survivors:
+                # no block calculated: no design cases, but the full column layout
+                survivors = [mc.empty_sweep_block(additional_columns=self.streaming_columns)]
+                self.param = mc.get_parameters_position_dict()
+            self.data_matrix_4 = self.select_reluctance_losses(np.concatenate(survivors, axis=0))
         self.data_matrix_5 = self.filter_reluctance_pareto_front_tolerance(self.data_matrix_4)
+        self.number_of_cases[4:6] = [len(self.data_matrix_4), len(self.data_matrix_5)]
         self.data_matrix_fem = self.data_matrix_5
 
     def set_up_folder_structure(self, working_directory):
@@ -658,12 +692,14 @@ class AutomatedDesign:
                                                                      ((100 + self.goal_inductance_percent_tolerance) / 100) * self.goal_inductance))]
         return data_matrix
 
-    def filter_reluctance_flux_saturation(self, data_matrix):
+    def flux_density_columns(self, data_matrix):
         """
-        Filter out design cases based on the maximum magnetic flux allowed in the magnetic core.
+        Calculate the maximum magnetic flux and flux densities of the design cases.
 
-        param data_matrix: Matrix containing the design parameters
+        :param data_matrix: Matrix containing the design parameters
         :type data_matrix: ndarray
+        :return: total_flux_max, b_max_center, b_max_middle, b_max_outer, b_sat (saturation flux density per design case)
+        :rtype: tuple
         """
         # Dictionary to store {initial_permeability: 'Material_name'} to map material_name during FEM iteration
         b_sat_dict = {}
@@ -672,12 +708,11 @@ class AutomatedDesign:
             b_sat_dict[b_sat_key] = material_db.get_material_property(material_name=material_name,
                                                                       property="max_flux_density")
             self.core_material_dict[b_sat_key] = material_name
-        # print(self.core_material_dict)
 
         # Creating B_saturated array corresponding to the material type
-        b_sat = np.zeros((len(data_matrix), 1))
-        for index in range(len(data_matrix)):
-            b_sat[index] = b_sat_dict[data_matrix[index, self.param["mu_r_abs"]]]
+        b_sat = np.zeros(len(data_matrix))
+        for mu_r_abs, material_b_sat in b_sat_dict.items():
+            b_sat[data_matrix[:, self.param["mu_r_abs"]] == mu_r_abs] = material_b_sat
 
         # flux_max = L * i_max / N
         total_flux_max = (data_matrix[:, self.param["inductance"]] * self.peak_current) / data_matrix[:, self.param["no_of_turns"]]
@@ -685,19 +720,35 @@ class AutomatedDesign:
         b_max_middle = total_flux_max / (np.pi * data_matrix[:, self.param["core_inner_diameter"]] * data_matrix[:, self.param["core_h_middle"]])
         b_max_outer = total_flux_max / data_matrix[:, self.param["outer_leg_area"]]
 
+        return total_flux_max, b_max_center, b_max_middle, b_max_outer, b_sat
+
+    def flux_saturation_mask(self, data_matrix, b_sat):
+        """
+        Return the mask of the design cases below the allowed percentage of the saturation flux density.
+
+        :param data_matrix: Matrix containing the design parameters including the flux density columns
+        :type data_matrix: ndarray
+        :param b_sat: saturation flux density per design case
+        :type b_sat: ndarray
+        """
+        return (data_matrix[:, self.param["b_max_center"]] < (self.percent_of_b_sat / 100) * b_sat) & \
+            (data_matrix[:, self.param["b_max_outer"]] < (self.percent_of_b_sat / 100) * b_sat)
+
+    def filter_reluctance_flux_saturation(self, data_matrix):
+        """
+        Filter out design cases based on the maximum magnetic flux allowed in the magnetic core.
+
+        param data_matrix: Matrix containing the design parameters
+        :type data_matrix: ndarray
+        """
+        total_flux_max, b_max_center, b_max_middle, b_max_outer, b_sat = self.flux_density_columns(data_matrix)
+
         data_matrix = self.add_column_to_data_matrix(data_matrix, total_flux_max, 'total_flux_max')     # 16
         data_matrix = self.add_column_to_data_matrix(data_matrix, b_max_center, 'b_max_center')         # 17
         data_matrix = self.add_column_to_data_matrix(data_matrix, b_max_middle, 'b_max_middle')         # 18
         data_matrix = self.add_column_to_data_matrix(data_matrix, b_max_outer, 'b_max_outer')           # 19
 
-        data_matrix_temp = np.zeros((0, len(data_matrix[0])))
-        for index in range(len(data_matrix)):
-            if (data_matrix[index, self.param["b_max_center"]] < (self.percent_of_b_sat / 100) * b_sat[index]) & \
-                    (data_matrix[index, self.param["b_max_center"]] < (self.percent_of_b_sat / 100) * b_sat[index]) & \
-                    (data_matrix[index, self.param["b_max_outer"]] < (self.percent_of_b_sat / 100) * b_sat[index]):
-                data_matrix_temp = np.vstack([data_matrix_temp, data_matrix[index, :]])
-
-        return data_matrix_temp
+        return data_matrix[self.flux_saturation_mask(data_matrix, b_sat)]
 
     def filter_reluctance_winding_window(self, data_matrix):
         """
@@ -762,49 +813,52 @@ class AutomatedDesign:
             raise Exception("Please input at least one conductor type")
 
         # Filter based on the geometry
-        window_area = final_data_matrix[:, self.param["window_h"]] * final_data_matrix[:, self.param["window_w"]]
-        insulation_area = ((self.left_core_insulation + self.right_core_insulation) * final_data_matrix[:, self.param["window_h"]]) + \
+        return final_data_matrix[self.winding_window_mask(final_data_matrix)]
+
+    def winding_window_mask(self, data_matrix):
+        """
+        Return the mask of the design cases, whose conductors fit into the winding window.
+
+        :param data_matrix: Matrix containing the design parameters including the conductor columns
+        :type data_matrix: ndarray
+        """
+        window_area = data_matrix[:, self.param["window_h"]] * data_matrix[:, self.param["window_w"]]
+        insulation_area = ((self.left_core_insulation + self.right_core_insulation) * data_matrix[:, self.param["window_h"]]) + \
                           ((self.top_core_insulation + self.bot_core_insulation) * \
-                           (final_data_matrix[:, self.param["window_w"]] - (self.left_core_insulation + self.right_core_insulation)))
+                           (data_matrix[:, self.param["window_w"]] - (self.left_core_insulation + self.right_core_insulation)))
 
-        data_matrix = final_data_matrix[
-            np.where((final_data_matrix[:, self.param["no_of_turns"]] * np.pi * final_data_matrix[:, self.param["conductor_radius"]] ** 2) < \
-                     (self.winding_factor * (window_area - insulation_area)))]
+        return (data_matrix[:, self.param["no_of_turns"]] * np.pi * data_matrix[:, self.param["conductor_radius"]] ** 2) < \
+            (self.winding_factor * (window_area - insulation_area))
 
-        return data_matrix
+    def conductor_table(self):
+        """
+        Return the conductor columns of all litz and solid conductors, in the order used by filter_reluctance_winding_window().
 
-    def filter_reluctance_losses(self, data_matrix):
+        :return: one row per conductor: litz_conductor_r, litz_strand_r, litz_strand_n, litz_fill_factor, solid_conductor_r, conductor_radius
+        :rtype: ndarray
         """
-        Filter out design cases based on the calculated hysteresis and DC loss.
+        litz_rows = [[self.litz_conductor_r[i], self.litz_strand_r[i], self.litz_strand_n[i], self.litz_fill_factor[i], np.nan,
+                      self.litz_conductor_r[i]] for i in range(len(self.litz_conductor_r))]
+        solid_rows = [[np.nan, np.nan, np.nan, np.nan, solid_conductor_r, solid_conductor_r] for solid_conductor_r in self.solid_conductor_r]
+        return np.array(litz_rows + solid_rows, dtype=float).reshape(-1, len(self.conductor_columns))
 
-        :param data_matrix: Matrix containing the design parameters
+    def loss_columns(self, data_matrix):
+        """
+        Calculate the hysteresis and DC losses and the volume of the design cases.
+
+        :param data_matrix: Matrix containing the design parameters including the flux density and conductor columns
         :type data_matrix: ndarray
+        :return: total_hyst_loss, dc_wire_loss, total_loss, total_volume
+        :rtype: tuple
         """
-        # Dictionary to store {initial_permeability: counter}
-        mu_r_imag_dict = {}
-        counter = 0
-        for material_name in self.core_material:
-            mu_r_imag_key = material_db.get_material_property(material_name=material_name, property="initial_permeability")
-            mu_r_imag_dict[mu_r_imag_key] = counter
-            counter = counter + 1
-
-        material_data_list = [material_db.permeability_data_to_pro_file(material_name=material_name,
-                                                                        temperature=self.temperature,
-                                                                        frequency=self.frequency,
-                                                                        datatype="complex_permeability",
-                                                                        datasource=mdb.MaterialDataSource.ManufacturerDatasheet
-                                                                        )
-                              for material_name in self.core_material]
-        # print(material_data_list)
-
-        # Creating interpolation function between mu_imaginary and magnetic flux density
-        mu_r_imag_interpol_func = [interp1d(material_data_list[i][0], material_data_list[i][1], kind="cubic") for i in range(len(self.core_material))]
-
-        # Creating mu_imag array corresponding to the material type
+        # Creating mu_imag array corresponding to the material type, evaluated from the precomputed material tables
         mu_r_imag = np.zeros(len(data_matrix))
-        for index in range(len(data_matrix)):
-            mu_r_imag[index] = mu_r_imag_interpol_func[mu_r_imag_dict[data_matrix[index, self.param["mu_r_abs"]]]](
-                data_matrix[index, self.param["b_max_center"]])
+        for material_name in self.core_material:
+            mu_r_abs = material_db.get_material_property(material_name=material_name, property="initial_permeability")
+            material_mask = data_matrix[:, self.param["mu_r_abs"]] == mu_r_abs
+            if np.any(material_mask):
+                mu_r_imag[material_mask] = self.material_lookup.mu_r_imag(
+                    material_name, data_matrix[material_mask, self.param["b_max_center"]], self.frequency, self.temperature)
 
         # Volume chosen as per "Masterthesis_Till_Piepenbrock" pg-45
         volume_center = (np.pi * (data_matrix[:, self.param["core_inner_diameter"]] / 2) ** 2) * \
@@ -846,41 +900,100 @@ class AutomatedDesign:
         dc_wire_loss = ((self.peak_current ** 2) / 2) * dc_resistance_wire       # Assuming sinusoidal current waveform
 
         total_hyst_dc_loss = dc_wire_loss + total_hyst_loss
-        max_total_loss = max(total_hyst_dc_loss)
-        normalized_total_loss = total_hyst_dc_loss / max_total_loss
-
         core_2daxi_volume = np.pi * (data_matrix[:, self.param["r_outer"]] ** 2) * data_matrix[:, self.param["core_h"]]
-        max_core_2daxi_volume = max(core_2daxi_volume)
-        normalized_core_2daxi_volume = core_2daxi_volume / max_core_2daxi_volume
+
+        return total_hyst_loss, dc_wire_loss, total_hyst_dc_loss, core_2daxi_volume
+
+    def select_reluctance_losses(self, data_matrix):
+        """
+        Normalize the losses and volumes and keep the percent_of_total_loss design cases with the lowest total loss.
+
+        :param data_matrix: Matrix containing the design parameters including the loss columns
+        :type data_matrix: ndarray
+        """
+        if len(data_matrix):
+            data_matrix[:, self.param["normalized_total_loss"]] = data_matrix[:, self.param["total_loss"]] / \
+                max(data_matrix[:, self.param["total_loss"]])
+            data_matrix[:, self.param["normalized_total_volume"]] = data_matrix[:, self.param["total_volume"]] / \
+                max(data_matrix[:, self.param["total_volume"]])
+
+        data_matrix = data_matrix[data_matrix[:, self.param["total_loss"]].argsort()]
+        data_matrix = data_matrix[0:int((self.percent_of_total_loss / 100) * len(data_matrix)), :]
+
+        return data_matrix
+
+    def filter_reluctance_losses(self, data_matrix):
+        """
+        Filter out design cases based on the calculated hysteresis and DC loss.
+
+        :param data_matrix: Matrix containing the design parameters
+        :type data_matrix: ndarray
+        """
+        total_hyst_loss, dc_wire_loss, total_hyst_dc_loss, core_2daxi_volume = self.loss_columns(data_matrix)
 
         data_matrix = self.add_column_to_data_matrix(data_matrix, total_hyst_loss, 'total_hyst_loss')               # 26
         data_matrix = self.add_column_to_data_matrix(data_matrix, dc_wire_loss, 'dc_wire_loss')                               # 27
         data_matrix = self.add_column_to_data_matrix(data_matrix, total_hyst_dc_loss, 'total_loss')                         # 28
-        data_matrix = self.add_column_to_data_matrix(data_matrix, normalized_total_loss, 'normalized_total_loss')   # 29
+        data_matrix = self.add_column_to_data_matrix(data_matrix, np.zeros(len(data_matrix)), 'normalized_total_loss')   # 29
         data_matrix = self.add_column_to_data_matrix(data_matrix, core_2daxi_volume, 'total_volume')                     # 30
-        data_matrix = self.add_column_to_data_matrix(data_matrix, normalized_core_2daxi_volume, 'normalized_total_volume')   # 31
+        data_matrix = self.add_column_to_data_matrix(data_matrix, np.zeros(len(data_matrix)), 'normalized_total_volume')   # 31
 
-        data_matrix = data_matrix[data_matrix[:, self.param["total_loss"]].argsort()]
-        data_matrix = data_matrix[0:int((self.percent_of_total_loss / 100) * len(data_matrix)), :]
+        return self.select_reluctance_losses(data_matrix)
 
-        return data_matrix
+    def iterate_reluctance_designs(self, magnetic_circuit, chunk_size: int = None):
+        """
+        Evaluate the reluctance model block by block and yield the design cases passing the per-design filters.
+
+        Each block of the parameter grid is calculated into a matrix with all columns allocated up front. The target
+        inductance, flux saturation and winding window filters are applied and the loss columns are calculated. The
+        normalized columns are left for select_reluctance_losses(), as they depend on all design cases. The peak memory
+        is given by chunk_size (times the number of conductors) instead of the size of the design space.
+
+        :param magnetic_circuit: reluctance model with sim_type = 'sweep'
+        :type magnetic_circuit: fmt.MagneticCircuit
+        :param chunk_size: number of parameter combinations per block
+        :type chunk_size: int
+        :return: generator of the surviving design cases per block
+        """
+        conductor_table = self.conductor_table()
+        if not len(conductor_table):
+            raise Exception("Please input at least one conductor type")
+
+        for data_matrix in magnetic_circuit.iterate_sweep(chunk_size, additional_columns=self.streaming_columns):
+            self.param = magnetic_circuit.get_parameters_position_dict()
+            self.number_of_cases[0] += len(data_matrix)
+
+            data_matrix = self.filter_reluctance_target_inductance(data_matrix)
+            self.number_of_cases[1] += len(data_matrix)
+
+            flux_columns = self.flux_density_columns(data_matrix)
+            for column_name, column_value in zip(self.flux_columns, flux_columns):
+                data_matrix[:, self.param[column_name]] = column_value
+            data_matrix = data_matrix[self.flux_saturation_mask(data_matrix, flux_columns[-1])]
+            self.number_of_cases[2] += len(data_matrix)
+
+            # All combinations with the conductors, in the same order as filter_reluctance_winding_window()
+            number_of_designs = len(data_matrix)
+            data_matrix = np.tile(data_matrix, (len(conductor_table), 1))
+            for index, column_name in enumerate(self.conductor_columns):
+                data_matrix[:, self.param[column_name]] = np.repeat(conductor_table[:, index], number_of_designs)
+            data_matrix = data_matrix[self.winding_window_mask(data_matrix)]
+            self.number_of_cases[3] += len(data_matrix)
+
+            for column_name, column_value in zip(["total_hyst_loss", "dc_wire_loss", "total_loss", "total_volume"],
+                                                 self.loss_columns(data_matrix)):
+                data_matrix[:, self.param[column_name]] = column_value
+
+            yield data_matrix
 
     def pareto_front_from_data_matrix(self, data_matrix):
         """Get the pareto front from the data matrix."""
         total_loss_vec = data_matrix[:, self.param["total_loss"]]
         core_2daxi_total_volume_vec = data_matrix[:, self.param["total_volume"]]
 
-        tuple_list = np.array(list(zip(total_loss_vec, core_2daxi_total_volume_vec)))
-
-        pareto_tuple_mask_vec = fmt.is_pareto_efficient(tuple_list)
-
-        x_pareto_vec = []
-        y_pareto_vec = []
-
-        for count_mask, mask in enumerate(pareto_tuple_mask_vec):
-            if mask:
-                x_pareto_vec.append(core_2daxi_total_volume_vec[count_mask])
-                y_pareto_vec.append(total_loss_vec[count_mask])
+        pareto_tuple_mask_vec = fmt.is_pareto_efficient(np.column_stack((total_loss_vec, core_2daxi_total_volume_vec)))
+        x_pareto_vec = core_2daxi_total_volume_vec[pareto_tuple_mask_vec]
+        y_pareto_vec = total_loss_vec[pareto_tuple_mask_vec]
 
         print(f"{len(x_pareto_vec) = }")
 
@@ -899,20 +1012,11 @@ class AutomatedDesign:
         total_loss_vec = data_matrix[:, self.param["total_loss"]]
         total_volume_vec = data_matrix[:, self.param["total_volume"]]
 
-        min_total_loss = np.min(total_loss_vec)
-        print(f"{min_total_loss = }")
-
-        pareto_x_vec, pareto_y_vec = self.pareto_front_from_data_matrix(data_matrix)
-        print(f"{pareto_x_vec = }")
-        print(f"{pareto_y_vec = }")
-
-        loss_offset = factor_min_dc_losses * min_total_loss
-
-        ref_loss_vec = np.interp(total_volume_vec, pareto_x_vec, pareto_y_vec) + loss_offset
-
-        return_data_matrix = data_matrix[np.where(total_loss_vec < ref_loss_vec)]
+        if len(total_loss_vec):
+            min_total_loss = np.min(total_loss_vec)
+            print(f"{min_total_loss = }")
 
-        return return_data_matrix
+        return data_matrix[fmt.pareto_tolerance_mask(total_volume_vec, total_loss_vec, factor_min_dc_losses)]
 
     def fem_simulation(self):
         """Perform FEM simulation of the design cases. Save the result in the given working directory for later analysis."""
@@ -1007,7 +1111,7 @@ class AutomatedDesign:
                 source_json_file = os.path.join(self.femmt_working_directory, "results", "log_electro_magnetic.json")
                 destination_json_file = os.path.join(self.inductor_fem_simulations_results_directory, f'case_{count}.json')
 
-                shutil.copy(source_json_file, destination_json_file)
+                fmt.copy_log_file(source_json_file, destination_json_file)
 
                 data_files.append(destination_json_file)
                 file_names.append(f"case{count}")
@@ -896,6 +896,26 @@ def store_as_npy_in_directory(dir_path: str, file_name: str, numpy_data) -> None
     np.save(dir_path + "/" + file_name, numpy_data)
 
 
+def read_getdp_result_table(file_path: str) -> np.ndarray:
+    """
+    Read a GetDP result file (Format TimeTable) into a numpy array.
+
+    Every line of the file is one row of the array, the columns are the whitespace separated values of a line.
+
+    :param file_path: path of the .dat result file
+    :type file_path: str
+    :return: result table with one row per line
+    :rtype: np.ndarray
+    """
+    with warnings.catch_warnings():
+        # an empty file is reported by the exception below
+        warnings.simplefilter("ignore", UserWarning)
+        table = np.loadtxt(file_path, ndmin=2)
+    if table.size == 0:
+        raise Exception(f"GetDP result file {file_path} is empty. Check the GetDP simulation for errors.")
+    return table
+
+
 def get_dicts_with_keys_and_values(data, **kwargs) -> Dict:
     """
     Return a list of dictionaries out of a list of dictionaries which contains pairs of the given key(s) and value(s).
@@ -1102,6 +1122,89 @@ def point_is_in_rect(x, y, rect):
     return False
 
 
+def winding_window_free_raster_points(left_bound: float, right_bound: float, bot_bound: float, top_bound: float,
+                                      round_conductor_centers: np.ndarray, round_conductor_min_distances: np.ndarray,
+                                      rectangular_conductor_bounds: np.ndarray, number_cols: int = 17,
+                                      block_size: int = 4096) -> np.ndarray:
+    """
+    Rasterize a winding window and return the raster points, which do not collide with a conductor.
+
+    The raster has number_cols + 1 columns, the number of rows follows from the aspect ratio of the winding window.
+    A point collides with a round conductor, if its distance to the conductor center is below the minimum distance,
+    and with a rectangular conductor, if it is inside the bounding box of the conductor. The collision test is
+    vectorized over blocks of points and all conductors.
+
+    :param left_bound: left bound of the winding window
+    :type left_bound: float
+    :param right_bound: right bound of the winding window
+    :type right_bound: float
+    :param bot_bound: bottom bound of the winding window
+    :type bot_bound: float
+    :param top_bound: top bound of the winding window
+    :type top_bound: float
+    :param round_conductor_centers: centers of the round conductors, shape (number of conductors, 2)
+    :type round_conductor_centers: np.ndarray
+    :param round_conductor_min_distances: minimum distances of the points to the round conductor centers
+    :type round_conductor_min_distances: np.ndarray
+    :param rectangular_conductor_bounds: bounding boxes of the rectangular conductors as (x_min, y_min, x_max, y_max),
+        shape (number of conductors, 4)
+    :type rectangular_conductor_bounds: np.ndarray
+    :param number_cols: number of raster columns - 1. More points equal higher raster density
+    :type number_cols: int
+    :param block_size: number of points, which are checked against all conductors at once
+    :type block_size: int
+    :return: free points, shape (number of points, 2), in the order of the columns
+    :rtype: np.ndarray
+    """
+    width = right_bound - left_bound
+    height = top_bound - bot_bound
+
+    number_rows = int(number_cols * height / width)  # Assumption: number_cols/number_rows = width/height
+
+    cell_width = width / (number_cols + 1)
+    cell_height = height / (number_rows + 1)
+
+    # All possible points, column by column
+    x_indices, y_indices = np.meshgrid(np.arange(number_cols + 1), np.arange(number_rows + 1), indexing="ij")
+    x = (left_bound + cell_width / 2) + x_indices.ravel() * cell_width
+    y = (bot_bound + cell_height / 2) + y_indices.ravel() * cell_height
+
+    round_conductor_centers = np.asarray(round_conductor_centers, dtype=float).reshape(-1, 2)
+    round_conductor_min_distances = np.asarray(round_conductor_min_distances, dtype=float).ravel()
+    rectangular_conductor_bounds = np.asarray(rectangular_conductor_bounds, dtype=float).reshape(-1, 4)
+
+    is_free = np.ones(len(x), dtype=bool)
+    for start in range(0, len(x), block_size):
+        x_block = x[start:start + block_size, np.newaxis]
+        y_block = y[start:start + block_size, np.newaxis]
+        collides = np.zeros(len(x_block), dtype=bool)
+        if len(round_conductor_centers):
+            distances = np.sqrt((round_conductor_centers[:, 0] - x_block) ** 2 + (round_conductor_centers[:, 1] - y_block) ** 2)
+            collides |= np.any(distances < round_conductor_min_distances, axis=1)
+        if len(rectangular_conductor_bounds):
+            in_x_range = (x_block > rectangular_conductor_bounds[:, 0]) & (x_block < rectangular_conductor_bounds[:, 2])
+            in_y_range = (y_block > rectangular_conductor_bounds[:, 1]) & (y_block < rectangular_conductor_bounds[:, 3])
+            collides |= np.any(in_x_range & in_y_range, axis=1)
+        is_free[start:start + block_size] = ~collides
+
+    return np.column_stack([x[is_free], y[is_free]])
+
+
+def points_are_in_rect(points: np.ndarray, rect) -> np.ndarray:
+    """
+    Check for several x-y points if they are inside a rectangular field, like point_is_in_rect().
+
+    :param points: points, shape (number of points, 2)
+    :type points: np.ndarray
+    :param rect: List of 4 points given as tuples with (x, y) in the order top-right, top-left, bottom-right, bottom-left
+    :type rect: List
+    :return: True for the points inside the rectangular field
+    :rtype: np.ndarray
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    return (points[:, 1] < rect[0][1]) & (points[:, 1] > rect[3][1]) & (points[:, 0] > rect[0][0]) & (points[:, 0] < rect[1][0])
+
+
 def get_number_of_turns_of_winding(winding_windows, windings: List, winding_number: int):
     """Get the number of turns of a winding."""
     turns = 0
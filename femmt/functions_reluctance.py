@@ -109,6 +109,43 @@ def power_losses_hysteresis_cylinder_radial_direction_mu_r_imag(
                                 args=(flux, cylinder_height), epsabs=1e-4)[0]
 
 
+def power_losses_hysteresis_cylinder_radial_direction_mu_r_imag_vectorized(
+        flux, cylinder_height, cylinder_inner_radius, cylinder_outer_radius,
+        fundamental_frequency, mu_r_abs, flux_density_data_vec, mu_r_imag_data_vec, number_of_nodes: int = 32):
+    """
+    Calculate the hysteresis losses inside cylinders, where the flux flows in radial direction.
+
+    Vectorized version of power_losses_hysteresis_cylinder_radial_direction_mu_r_imag() for arrays of cylinders.
+    Instead of the adaptive integration, a fixed Gauss-Legendre quadrature is used.
+
+    :param flux: flux
+    :param cylinder_height: cylinder height
+    :param cylinder_inner_radius: cylinder inner radius
+    :param cylinder_outer_radius: cylinder outer radius
+    :param fundamental_frequency: fundamental frequency
+    :param mu_r_abs: absolute value of mu_r: abs(mu_r)
+    :param flux_density_data_vec: flux-density data vector
+    :param mu_r_imag_data_vec: imaginary part of u_r as vector
+    :param number_of_nodes: number of nodes of the Gauss-Legendre quadrature
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(number_of_nodes)
+    flux = np.asarray(flux)[..., np.newaxis]
+    cylinder_height = np.asarray(cylinder_height)[..., np.newaxis]
+    cylinder_inner_radius = np.asarray(cylinder_inner_radius)[..., np.newaxis]
+    cylinder_outer_radius = np.asarray(cylinder_outer_radius)[..., np.newaxis]
+
+    # transform the nodes from [-1, 1] to [cylinder_inner_radius, cylinder_outer_radius]
+    half_width = (cylinder_outer_radius - cylinder_inner_radius) / 2
+    cylinder_radius = cylinder_inner_radius + half_width * (nodes + 1)
+
+    flux_density = flux / (2 * np.pi * cylinder_radius * cylinder_height)
+    mu_r_imag = np.interp(flux_density, flux_density_data_vec, mu_r_imag_data_vec)
+    power_loss_density = 2 * np.pi * cylinder_radius * cylinder_height * np.pi * fundamental_frequency * mu_0 * \
+        mu_r_imag * (flux_density / mu_r_abs / mu_0) ** 2
+
+    return np.sum(weights * power_loss_density, axis=-1) * half_width[..., 0]
+
+
 def hyst_losses_core_half_mu_r_imag(core_inner_diameter, window_h_half, window_w, mu_r_abs,
                                     flux_max, fundamental_frequency, flux_density_data_vec, mu_r_imag_data_vec):
     """
@@ -611,7 +648,7 @@ def r_basic_tablet_cyl(tablet_height, air_gap_basic_height, tablet_radius):
     :param tablet_radius: tablet radius
     :return: basic reluctance for tablet - cylinder structure
     """
-    if air_gap_basic_height == 0:
+    if np.any(air_gap_basic_height == 0):
         raise ZeroDivisionError(f"Division by zero: {air_gap_basic_height = }")
 
     conductance_basic = mu_0 * (tablet_height / 2 / air_gap_basic_height + 2 / \
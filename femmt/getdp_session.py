@@ -0,0 +1,164 @@
+"""Keep the GetDP pre-processing of a mesh alive between several electromagnetic solves.
+
+GetDP has no resident mode which accepts new excitations, so every solve needs a new GetDP process. What can be
+kept is the pre-processing (-pre) result: the degrees of freedom of the formulation for a given mesh. As long as the
+mesh, the regions and the function spaces are unchanged, further solves only need the processing step (-cal) on the
+stored pre-processing file. The excitation (frequency, current amplitudes and phases) is evaluated at runtime by the
+time functions of the constraints and by SetFrequency in the resolution, so it does not invalidate the
+pre-processing. One session exists per worker process.
+"""
+# Python standard libraries
+import os
+import re
+import hashlib
+import subprocess
+from typing import Dict, Optional, Tuple
+
+# Parameters of the Parameter.pro file which only enter the material functions of the formulation.
+# Changing one of them does not change the pre-processing result, so the session can be reused.
+MATERIAL_ONLY_PARAMETERS = ["delta", "mur", "mur_real", "mur_imag", "phi_mu_deg", "sigma_core", "sigma_core_imag",
+                            "ki", "alpha", "beta", "e0", r"Rr_\d+", r"sigma_winding_\d+"]
+
+# Parameters of the Parameter.pro file which describe the excitation. They are evaluated at runtime, only a current
+# amplitude of zero changes the formulation (no global term of the winding), so only this information is kept.
+# All other parameters (number of windings, number of turns, flags, ...) invalidate the session.
+EXCITATION_PARAMETERS = ["Freq", r"Phase_\d+", r"Val_EE_\d+"]
+
+_parameter_line_pattern = re.compile(r"^\s*([A-Za-z_]\w*)\s*=\s*([^;]*)")
+_material_only_pattern = re.compile("^(" + "|".join(MATERIAL_ONLY_PARAMETERS) + ")$")
+_excitation_pattern = re.compile("^(" + "|".join(EXCITATION_PARAMETERS) + ")$")
+
+# Sessions of this process, key is the process id and the electro_magnetic folder.
+_sessions: Dict[Tuple[int, str], "GetDPSession"] = {}
+
+
+class GetDPSession:
+    """Solver session, which re-uses the GetDP pre-processing of a mesh for several excitations."""
+
+    def __init__(self, onelab_folder_path: str, electro_magnetic_folder_path: str,
+                 pro_file_name: str = "ind_axi_python_controlled.pro", resolution: str = "Analysis"):
+        """
+        Initialize the solver session.
+
+        :param onelab_folder_path: folder containing the getdp executable
+        :type onelab_folder_path: str
+        :param electro_magnetic_folder_path: folder containing the .pro-files of the simulation
+        :type electro_magnetic_folder_path: str
+        :param pro_file_name: name of the main .pro-file
+        :type pro_file_name: str
+        :param resolution: name of the resolution to pre-process
+        :type resolution: str
+        """
+        self.getdp_filepath = os.path.join(onelab_folder_path, "getdp")
+        self.electro_magnetic_folder_path = electro_magnetic_folder_path
+        self.pro_file = os.path.join(electro_magnetic_folder_path, pro_file_name)
+        self.pre_file = os.path.splitext(self.pro_file)[0] + ".pre"
+        self.resolution = resolution
+        self.signature: Optional[str] = None
+        self.number_of_pre_processings = 0
+        self.number_of_solves = 0
+
+    def structure_signature(self, mesh_file: str) -> Optional[str]:
+        """
+        Calculate the signature of everything which determines the GetDP pre-processing.
+
+        The signature consists of the mesh file (path, size, modification time) and all lines of the Parameter.pro
+        file, except of the material-only parameters. Of the excitation parameters, only the information whether a
+        current amplitude is zero is part of the signature.
+
+        :param mesh_file: mesh file for the simulation
+        :type mesh_file: str
+        :return: signature, or None in case of missing files
+        :rtype: str
+        """
+        parameter_file = os.path.join(self.electro_magnetic_folder_path, "Parameter.pro")
+        if not os.path.isfile(mesh_file) or not os.path.isfile(parameter_file):
+            return None
+
+        mesh_stat = os.stat(mesh_file)
+        signature = hashlib.sha1(f"{os.path.abspath(mesh_file)};{mesh_stat.st_size};{mesh_stat.st_mtime_ns}".encode())
+        with open(parameter_file, "r") as fd:
+            for line in fd:
+                match = _parameter_line_pattern.match(line)
+                if match is not None and _material_only_pattern.match(match.group(1)):
+                    continue
+                if match is not None and _excitation_pattern.match(match.group(1)):
+                    if match.group(1).startswith("Val_EE_"):
+                        signature.update(f"{match.group(1)} != 0: {_is_non_zero(match.group(2))}\n".encode())
+                    continue
+                signature.update(line.encode())
+        return signature.hexdigest()
+
+    def invalidate(self) -> None:
+        """Forget the pre-processing. The next solve runs the pre-processing again."""
+        self.signature = None
+        if os.path.exists(self.pre_file):
+            os.remove(self.pre_file)
+
+    def _run(self, arguments: str, verbose: str, to_file_str: str) -> bool:
+        command = f"{self.getdp_filepath} {self.pro_file} {arguments} {verbose}{to_file_str}"
+        return subprocess.run(command, shell=True).returncode == 0
+
+    def solve(self, mesh_file: str, verbose: str, to_file_str: str = "") -> bool:
+        """
+        Solve the electromagnetic problem, re-using the pre-processing if possible.
+
+        :param mesh_file: mesh file for the simulation
+        :type mesh_file: str
+        :param verbose: GetDP verbosity argument, e.g. "-verbose 1"
+        :type verbose: str
+        :param to_file_str: shell redirection of the GetDP output, e.g. " > log_getdp.txt". The output of the solve is
+            appended to the output of the pre-processing.
+        :type to_file_str: str
+        :return: True in case of a successful solve. False in case the session could not be used. Then, the caller
+            needs to fall back to a full GetDP run.
+        :rtype: bool
+        """
+        signature = self.structure_signature(mesh_file)
+        if signature is None:
+            self.invalidate()
+            return False
+
+        if signature != self.signature or not os.path.isfile(self.pre_file):
+            self.signature = None
+            if not self._run(f"-msh {mesh_file} -pre {self.resolution}", verbose, to_file_str):
+                self.invalidate()
+                return False
+            self.signature = signature
+            self.number_of_pre_processings += 1
+            # do not overwrite the output of the pre-processing
+            if to_file_str.lstrip().startswith(">") and not to_file_str.lstrip().startswith(">>"):
+                to_file_str = to_file_str.replace(">", ">>", 1)
+
+        if not self._run(f"-msh {mesh_file} -cal -v2", verbose, to_file_str):
+            self.invalidate()
+            return False
+        self.number_of_solves += 1
+        return True
+
+
+def _is_non_zero(value: str) -> bool:
+    """Inner function. Check, if the value of a parameter is not zero. Values, which are no numbers, count as non-zero."""
+    try:
+        return float(value) != 0
+    except ValueError:
+        return True
+
+
+def get_getdp_session(onelab_folder_path: str, electro_magnetic_folder_path: str) -> GetDPSession:
+    """
+    Return the solver session of this worker process for the given electro_magnetic folder.
+
+    Sessions are stored per process id, so forked worker processes do not re-use the session of their parent.
+
+    :param onelab_folder_path: folder containing the getdp executable
+    :type onelab_folder_path: str
+    :param electro_magnetic_folder_path: folder containing the .pro-files of the simulation
+    :type electro_magnetic_folder_path: str
+    :return: solver session
+    :rtype: GetDPSession
+    """
+    key = (os.getpid(), os.path.abspath(electro_magnetic_folder_path))
+    if key not in _sessions:
+        _sessions[key] = GetDPSession(onelab_folder_path, electro_magnetic_folder_path)
+    return _sessions[key]
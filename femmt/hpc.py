@@ -1,12 +1,21 @@
 """Functions to provide parallel computing on multiple processes. Each process has its own thread."""
 # Python standard libraries
-from multiprocessing import Pool
-from typing import List, Dict, Callable
+import multiprocessing
+import multiprocessing.connection
+from typing import List, Dict, Callable, Optional
 import os
+import json
+import time
 import shutil
+import tempfile
+import warnings
+import traceback
 
 # Third parry libraries
 from femmt import MagneticComponent
+from femmt.enumerations import Verbosity, SimulationType, MeshAlgorithm2D
+from femmt.meshing_engine import MeshingEngine
+from femmt.data import FileData
 
 
 def _copy_electro_magnetic_necessary_files(src_folder: str, dest_folder: str):
@@ -19,12 +28,7 @@ def _copy_electro_magnetic_necessary_files(src_folder: str, dest_folder: str):
         folder for the corresponding simulation.
     :type dest_folder: str
     """
-    files = ["fields.pro", "ind_axi_python_controlled.pro", "solver.pro", "values.pro"]
-
-    for file in files:
-        from_path = os.path.join(src_folder, file)
-        to_path = os.path.join(dest_folder, file)
-        shutil.copy(from_path, to_path)
+    FileData.link_template_files(src_folder, dest_folder)
 
 
 def hpc_single_simulation(parameters: Dict):
@@ -57,16 +61,224 @@ def hpc_single_simulation(parameters: Dict):
     model.single_simulation(freq=freq, current=current, plot_interpolation=False, show_fem_simulation_results=False)
 
 
-def run_hpc(n_processes: int, models: List[MagneticComponent], simulation_parameters: List[Dict],
-            working_directory: str, custom_hpc: Callable = None):
+def create_component_options(model: MagneticComponent) -> Dict:
+    """
+    Collect the constructor options of the given model, which are not part of the settings of encode_settings().
+
+    The profiler is not part of the options, as its spans can not be collected from the worker processes. Activate a
+    profiler within a custom hpc function instead (see femmt.profiling).
+
+    :param model: magnetic component
+    :type model: MagneticComponent
+    :return: JSON-serializable constructor options, see model_from_spec()
+    :rtype: Dict
+    """
+    meshing_engine = model.meshing_engine
+    return {
+        "wwr_enabled": model.wwr_enabled,
+        "use_getdp_session": model.use_getdp_session,
+        "mesh_cache_folder_path": model.mesh_cache.cache_folder_path if model.mesh_cache is not None else None,
+        "mesh_cache_max_size": model.mesh_cache.max_size if model.mesh_cache is not None else 1e9,
+        "binary_log": model.binary_log,
+        "litz_coefficient_store_folder_path":
+            model.litz_coefficient_store.store_folder_path if model.litz_coefficient_store is not None else None,
+        "litz_coefficient_tolerance": model.litz_coefficient_tolerance,
+        "in_memory_gmsh_model": model.in_memory_gmsh_model,
+        "write_geo_file": model.write_geo_file,
+        "mesh_accuracy_profile_file_path": model.mesh_accuracy_profile_file_path,
+        "meshing_engine": {"number_of_threads": meshing_engine.number_of_threads,
+                           "algorithm_2d": int(meshing_engine.algorithm_2d) if meshing_engine.algorithm_2d is not None else None,
+                           "isolated": meshing_engine.isolated}
+    }
+
+
+def create_model_spec(model: MagneticComponent) -> Dict:
+    """
+    Create a lightweight, JSON-serializable description of the given model.
+
+    The description contains the settings of MagneticComponent.encode_settings(), the simulation type, the
+    verbosity, the mesh accuracies and the constructor options (see create_component_options()). In contrast to the
+    model itself, it contains no material database handles, loggers or gmsh state, so it is cheap to send to worker
+    processes.
+
+    :param model: magnetic component
+    :type model: MagneticComponent
+    :return: model description, see model_from_spec()
+    :rtype: Dict
+    """
+    return {
+        "settings": MagneticComponent.encode_settings(model),
+        "simulation_type": model.simulation_type.name,
+        "verbosity": int(model.verbosity),
+        "mesh_accuracies": [model.mesh_data.mesh_accuracy_core, model.mesh_data.mesh_accuracy_window,
+                            model.mesh_data.mesh_accuracy_conductor, model.mesh_data.mesh_accuracy_air_gaps],
+        "component_options": create_component_options(model)
+    }
+
+
+def model_from_spec(model_spec: Dict, working_directory: str = None) -> MagneticComponent:
+    """
+    Rebuild the magnetic component from the given model description.
+
+    :param model_spec: model description, see create_model_spec()
+    :type model_spec: Dict
+    :param working_directory: working directory of the model, defaults to None (working directory of the description)
+    :type working_directory: str, optional
+    :return: magnetic component
+    :rtype: MagneticComponent
+    """
+    component_options = dict(model_spec.get("component_options", {}))
+    if component_options.get("meshing_engine") is not None:
+        meshing_engine = component_options["meshing_engine"]
+        component_options["meshing_engine"] = MeshingEngine(
+            meshing_engine["number_of_threads"],
+            MeshAlgorithm2D(meshing_engine["algorithm_2d"]) if meshing_engine["algorithm_2d"] is not None else None,
+            meshing_engine["isolated"])
+    model = MagneticComponent.decode_settings(model_spec["settings"], working_directory,
+                                              Verbosity(model_spec.get("verbosity", Verbosity.Silent)),
+                                              SimulationType[model_spec.get("simulation_type", SimulationType.FreqDomain.name)],
+                                              component_options)
+    if "mesh_accuracies" in model_spec:
+        model.update_mesh_accuracies(*model_spec["mesh_accuracies"])
+    return model
+
+
+def model_spec_round_trips(model: MagneticComponent, model_spec: Dict) -> bool:
+    """
+    Check, if the model rebuilt from the given model description has the same settings as the model.
+
+    The settings of MagneticComponent.encode_settings() are compared, except of the date and the working directory.
+
+    :param model: magnetic component
+    :type model: MagneticComponent
+    :param model_spec: model description of the magnetic component, see create_model_spec()
+    :type model_spec: Dict
+    :return: True, if the model description is sufficient to rebuild the model
+    :rtype: bool
+    """
+    def comparable_settings(settings: Dict) -> Dict:
+        return {key: value for key, value in settings.items() if key not in ["date", "working_directory"]}
+
+    with tempfile.TemporaryDirectory() as working_directory:
+        try:
+            rebuilt_model = model_from_spec(model_spec, working_directory)
+            return comparable_settings(MagneticComponent.encode_settings(rebuilt_model)) == \
+                comparable_settings(MagneticComponent.encode_settings(model))
+        except Exception:
+            return False
+
+
+def _hpc_job(hpc_function: Callable, model_spec: Dict | MagneticComponent, simulation_parameters: Dict,
+             model_working_directory: str, model_electro_magnetic_directory: str, strands_coefficients_folder: str,
+             connection) -> None:
+    """
+    Inner function. Rebuild the model and run a single job in a worker process, report the outcome to the scheduler.
+
+    :param hpc_function: function to execute, see hpc_single_simulation()
+    :type hpc_function: Callable
+    :param model_spec: model description (see create_model_spec()) or the model itself, in case it can not be rebuilt
+        from its description
+    :type model_spec: Dict | MagneticComponent
+    :param simulation_parameters: simulation parameters of the model
+    :type simulation_parameters: Dict
+    :param model_working_directory: working directory of the model
+    :type model_working_directory: str
+    :param model_electro_magnetic_directory: electro_magnetic folder of the model, containing the template files
+    :type model_electro_magnetic_directory: str
+    :param strands_coefficients_folder: folder of the litz strand coefficients
+    :type strands_coefficients_folder: str
+    :param connection: sending end of the pipe to the scheduler
+    """
+    try:
+        model = model_spec if isinstance(model_spec, MagneticComponent) else model_from_spec(model_spec, model_working_directory)
+        model.file_data.update_paths(model_working_directory, model_electro_magnetic_directory,
+                                     strands_coefficients_folder)
+        model.file_data.clear_previous_simulation_results()
+        hpc_function({"model": model, "simulation_parameters": simulation_parameters})
+        connection.send(None)
+    except BaseException:
+        connection.send(traceback.format_exc())
+    finally:
+        connection.close()
+
+
+def read_hpc_journal(journal_file: str) -> Dict[str, Dict]:
+    """
+    Read the job journal of run_hpc().
+
+    The journal contains one JSON entry per line. Later entries of a job overwrite earlier ones. Incomplete lines
+    (e.g. from a killed batch) are ignored.
+
+    :param journal_file: path of the journal file
+    :type journal_file: str
+    :return: last journal entry per job, key is the job name
+    :rtype: Dict[str, Dict]
+    """
+    entries = {}
+    if not os.path.isfile(journal_file):
+        return entries
+    with open(journal_file, "r") as fd:
+        for line in fd:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries[entry["name"]] = entry
+    return entries
+
+
+def _write_hpc_journal_entry(journal_file: str, entry: Dict) -> None:
+    """
+    Inner function. Append an entry to the job journal and flush it to the disk.
+
+    :param journal_file: path of the journal file
+    :type journal_file: str
+    :param entry: journal entry
+    :type entry: Dict
+    """
+    with open(journal_file, "a") as fd:
+        fd.write(json.dumps(entry) + "\n")
+        fd.flush()
+        os.fsync(fd.fileno())
+
+
+def _read_result_log(model_working_directory: str) -> Optional[Dict]:
+    """
+    Inner function. Read the electromagnetic result log of a simulated model.
+
+    :param model_working_directory: working directory of the model
+    :type model_working_directory: str
+    :return: result log, None if not existing
+    :rtype: Dict
+    """
+    try:
+        with open(os.path.join(model_working_directory, "results", "log_electro_magnetic.json"), "r") as fd:
+            return json.load(fd)
+    except (OSError, ValueError):
+        return None
+
+
+def run_hpc(n_processes: int, models: List[MagneticComponent | Dict], simulation_parameters: List[Dict],
+            working_directory: str, custom_hpc: Callable = None, timeout: float = None, retries: int = 0,
+            resume: bool = False, result_callback: Callable = None, scratch_directory: str = None) -> List[Dict]:
     """Execute the given models on the given number of parallel processes.
 
     Typically, this number shouldn't be higher than the number of cores of the processor.
 
+    The unchanged GetDP files are linked from the femmt installation instead of being copied for every model.
+
+    Every model is simulated in its own worker process. A free worker slot always takes the next pending model, so a
+    slow model does not block the others. A failing or crashing model does not stop the batch. Every finished job is
+    written to the journal 'hpc_journal.jsonl' in the working directory, which allows to resume a killed batch.
+
     :param n_processes: Number of parallel processes. If None, the number returned by os.cpu_count() is used.
     :type n_processes: int
-    :param models: List of MagneticComponents which shall be simulated in parallel.
-    :type models: List[MagneticComponent]
+    :param models: List of MagneticComponents or model descriptions (see create_model_spec()) which shall be
+        simulated in parallel. Only the model descriptions are sent to the worker processes, which rebuild the
+        MagneticComponents. A MagneticComponent, which can not be rebuilt from its description (see
+        model_spec_round_trips()), is sent to the worker process itself. Pass model descriptions to avoid holding all
+        MagneticComponents in the main process.
+    :type models: List[MagneticComponent | Dict]
     :param simulation_parameters: List of dictionaries containing the parameters for the parallel simulation.
         The Nth item corresponds to the Nth MagneticComponent in models.
         For the default hpc_function this dictionary needs the frequency and the current
@@ -81,6 +293,25 @@ def run_hpc(n_processes: int, models: List[MagneticComponent], simulation_parame
         will be called for the parallel execution and the funtion parameters is the simulation_parameter dict taken
         from the simulation_parameters list., defaults to None
     :type custom_hpc: Callable, optional
+    :param timeout: maximum run time of a single job in seconds. Jobs exceeding the time are terminated. None for no
+        limit, defaults to None
+    :type timeout: float, optional
+    :param retries: number of repetitions of failed or terminated jobs, defaults to 0
+    :type retries: int, optional
+    :param resume: True to skip all models, which are marked as successfully finished in the journal of a previous
+        batch in the same working directory, defaults to False
+    :type resume: bool, optional
+    :param result_callback: function, which is called with the job report (see return value) as soon as a job is
+        finished, defaults to None
+    :type result_callback: Callable, optional
+    :param scratch_directory: folder for the temporary GetDP files (Parameter.pro, postquantities.pro, solver
+        output, ...) of the jobs, e.g. a tmpfs like '/dev/shm'. Every job uses its own sub folder, which is removed as
+        soon as the job is finished. Defaults to None (electro_magnetic folder in the working directory of the model)
+    :type scratch_directory: str, optional
+    :return: job report per model: 'name', 'status' ('done', 'failed', 'timeout' or 'resumed'), 'attempts',
+        'duration' in seconds, 'error' (traceback or None), 'result' (result log of the electromagnetic simulation or
+        None), 'finished' (number of finished jobs) and 'eta' (estimated remaining time in seconds)
+    :rtype: List[Dict]
     """
     electro_magnetic_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "electro_magnetic")
     strands_coefficients_folder = os.path.join(electro_magnetic_folder, "Strands_Coefficients")
@@ -88,34 +319,131 @@ def run_hpc(n_processes: int, models: List[MagneticComponent], simulation_parame
     if not os.path.isdir(working_directory):
         os.mkdir(working_directory)
 
+    journal_file = os.path.join(working_directory, "hpc_journal.jsonl")
+    journal = read_hpc_journal(journal_file) if resume else {}
+    if not resume and os.path.exists(journal_file):
+        os.remove(journal_file)
+
+    model_names = []
+    # model descriptions or models, which are sent to the worker processes
+    job_models = []
+    reports = []
+    pending = []
     for index, model in enumerate(models):
+        if isinstance(model, MagneticComponent):
+            model_spec = create_model_spec(model)
+            if model_spec_round_trips(model, model_spec):
+                job_models.append(model_spec)
+            else:
+                warnings.warn(f"Model {index} can not be rebuilt from its description, so the model itself is sent to the "
+                              f"worker process.", stacklevel=2)
+                job_models.append(model)
+        else:
+            model_spec = model
+            job_models.append(model_spec)
+
         # Setup necessary files and directories
-        model_name = model.simulation_name if model.simulation_name is not None else f"model_{index}"
+        model_name = model_spec["settings"]["simulation_name"]
+        if model_name is None:
+            model_name = f"model_{index}"
+        model_names.append(model_name)
         model_working_directory = os.path.join(working_directory, model_name)
         model_electro_magnetic_directory = os.path.join(model_working_directory, "electro_magnetic")
         if not os.path.isdir(model_working_directory):
             os.mkdir(model_working_directory)
-        if not os.path.isdir(model_electro_magnetic_directory):
-            os.mkdir(model_electro_magnetic_directory)
+        if scratch_directory is None:
+            if not os.path.isdir(model_electro_magnetic_directory):
+                os.mkdir(model_electro_magnetic_directory)
+            _copy_electro_magnetic_necessary_files(electro_magnetic_folder, model_electro_magnetic_directory)
 
-        _copy_electro_magnetic_necessary_files(electro_magnetic_folder, model_electro_magnetic_directory)
+        if isinstance(model, MagneticComponent):
+            # Update directories for each model, so the results can be found by the caller
+            model.file_data.update_paths(model_working_directory, model_electro_magnetic_directory,
+                                         strands_coefficients_folder)
 
-        # Update directories for each model
-        model.file_data.update_paths(model_working_directory, model_electro_magnetic_directory,
-                                     strands_coefficients_folder)
-        model.file_data.clear_previous_simulation_results()
+        if journal.get(model_name, {}).get("status") == "done":
+            reports.append({"name": model_name, "status": "resumed", "attempts": journal[model_name]["attempts"],
+                            "duration": journal[model_name]["duration"], "error": None,
+                            "result": _read_result_log(model_working_directory), "finished": None, "eta": None})
+            continue
+        reports.append(None)
+        pending.append(index)
 
-    # Create pool of workers and apply _hpc to it
-    with Pool(processes=n_processes) as pool:
-        parameters = []
-        for _, (model, simulation_parameter) in enumerate(zip(models, simulation_parameters)):
-            # Fill parameters list
-            parameters.append({
-                "model": model,
-                "simulation_parameters": simulation_parameter
-            })
-            
-        if custom_hpc is None:
-            pool.map(hpc_single_simulation, parameters)
-        else:
-            pool.map(custom_hpc, parameters)
+    hpc_function = hpc_single_simulation if custom_hpc is None else custom_hpc
+    number_of_processes = n_processes if n_processes is not None else os.cpu_count()
+    number_of_jobs = len(pending)
+    attempts = [0] * len(models)
+    running = {}
+    # outcome of the running jobs, which already reported: None in case of success, otherwise the error
+    outcomes = {}
+    finished = 0
+    start_time = time.time()
+
+    while pending or running:
+        # fill free worker slots with the next pending jobs
+        while pending and len(running) < number_of_processes:
+            index = pending.pop(0)
+            model_working_directory = os.path.join(working_directory, model_names[index])
+            if scratch_directory is None:
+                model_electro_magnetic_directory = os.path.join(model_working_directory, "electro_magnetic")
+            else:
+                model_electro_magnetic_directory = tempfile.mkdtemp(prefix=f"femmt_{model_names[index]}_",
+                                                                    dir=scratch_directory)
+                _copy_electro_magnetic_necessary_files(electro_magnetic_folder, model_electro_magnetic_directory)
+            receiving_connection, sending_connection = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_hpc_job, args=(
+                hpc_function, job_models[index], simulation_parameters[index], model_working_directory,
+                model_electro_magnetic_directory, strands_coefficients_folder, sending_connection))
+            process.start()
+            sending_connection.close()
+            attempts[index] += 1
+            running[index] = (process, receiving_connection, time.time(), model_electro_magnetic_directory)
+
+        sentinels = [process.sentinel for process, _, _, _ in running.values()]
+        receiving_connections = [receiving_connection for _, receiving_connection, _, _ in running.values()]
+        multiprocessing.connection.wait(sentinels + receiving_connections, timeout=1)
+
+        for index, (process, receiving_connection, job_start_time, model_electro_magnetic_directory) in \
+                list(running.items()):
+            # receive the outcome before joining the worker, as a large traceback does not fit into the pipe buffer
+            # and the worker can not exit before it is received
+            is_alive = process.is_alive()
+            if index not in outcomes and receiving_connection.poll():
+                try:
+                    outcomes[index] = receiving_connection.recv()
+                except EOFError:
+                    pass
+            duration = time.time() - job_start_time
+            if is_alive:
+                if timeout is None or duration < timeout:
+                    continue
+                process.terminate()
+                process.join()
+                outcomes.pop(index, None)
+                status, error = "timeout", f"Job exceeded the timeout of {timeout} s."
+            else:
+                process.join()
+                error = outcomes.pop(index) if index in outcomes else f"Worker process exited with code {process.exitcode}."
+                status = "done" if error is None else "failed"
+            receiving_connection.close()
+            del running[index]
+            if scratch_directory is not None:
+                # also cleans up after terminated jobs
+                shutil.rmtree(model_electro_magnetic_directory, ignore_errors=True)
+
+            if status != "done" and attempts[index] <= retries:
+                pending.append(index)
+                continue
+
+            finished += 1
+            elapsed_time = time.time() - start_time
+            report = {"name": model_names[index], "status": status, "attempts": attempts[index],
+                      "duration": duration, "error": error,
+                      "result": _read_result_log(os.path.join(working_directory, model_names[index])) if status == "done" else None,
+                      "finished": finished, "eta": elapsed_time / finished * (number_of_jobs - finished)}
+            reports[index] = report
+            _write_hpc_journal_entry(journal_file, {key: report[key] for key in ["name", "status", "attempts", "duration", "error"]})
+            if result_callback is not None:
+                result_callback(report)
+
+    return reports
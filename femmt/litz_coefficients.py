@@ -0,0 +1,517 @@
+"""Global content-addressed store for the litz approximation coefficients.
+
+The litz approximation coefficients (pB, pI, qB, qI) are calculated by a series of cell simulations, which takes
+much longer than most of the actual simulations. Usually, every working directory (and every process of an
+optimization) calculates its own coefficients. The LitzCoefficientStore keeps the coefficients of every
+(fill factor, strand radius) combination once in a global folder, which all processes consult before calculating the
+coefficients. A lock file per entry makes sure, the coefficients of a certain litz wire are only calculated by a single
+process at once, while the other processes wait and load the result afterwards.
+
+The store is enabled by the 'litz_coefficient_store_folder_path' argument of the MagneticComponent or for all
+processes by the environment variable FEMMT_LITZ_COEFFICIENT_STORE. The store can be filled in advance for all litz
+wires of the litz_database() by
+
+    python -m femmt.litz_coefficients <store_folder_path>
+"""
+# Python standard libraries
+import os
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import contextlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 3rd party libraries
+import numpy as np
+
+# Version of the store entries. Increase in case of changes in the coefficient calculation, to not re-use outdated
+# coefficients.
+LITZ_COEFFICIENTS_VERSION = 1
+
+# Environment variable to enable the store for all processes
+LITZ_COEFFICIENT_STORE_ENVIRONMENT_VARIABLE = "FEMMT_LITZ_COEFFICIENT_STORE"
+
+# Litz approximation coefficients are created with 4 layers
+LITZ_COEFFICIENTS_NUMBER_OF_LAYERS = 4
+
+# Reduced frequencies of the cell simulations (must be even)
+LITZ_COEFFICIENTS_REDUCED_FREQUENCIES = np.linspace(0, 1.25, 6)
+
+# Maximum number of reduced frequencies of an adaptively refined grid
+LITZ_COEFFICIENTS_MAXIMUM_NUMBER_OF_REDUCED_FREQUENCIES = 64
+
+# Coefficients, which are calculated by the cell simulations of a certain mode (1 = skin, 2 = proximity)
+LITZ_COEFFICIENTS_MODES = {1: ["pI", "qI"], 2: ["pB", "qB"]}
+
+_coefficient_names = ["pB", "pI", "qB", "qI"]
+_settings_file_name = "settings.json"
+
+
+def litz_coefficient_file_names(fill_factor: float) -> List[str]:
+    """
+    Return the file names of the litz approximation coefficients, as they are read by GetDP.
+
+    :param fill_factor: fill factor of the litz wire
+    :type fill_factor: float
+    :return: file names of the pB, pI, qB and qI coefficients
+    :rtype: List[str]
+    """
+    return [f"{name}_RS_la{fill_factor}_{LITZ_COEFFICIENTS_NUMBER_OF_LAYERS}layer.dat" for name in _coefficient_names]
+
+
+def litz_coefficient_settings_file_name(fill_factor: float) -> str:
+    """
+    Return the file name of the grid settings, which are stored next to the litz approximation coefficients.
+
+    :param fill_factor: fill factor of the litz wire
+    :type fill_factor: float
+    :return: file name of the grid settings
+    :rtype: str
+    """
+    return f"settings_RS_la{fill_factor}_{LITZ_COEFFICIENTS_NUMBER_OF_LAYERS}layer.json"
+
+
+def read_litz_coefficient_settings(coeff_folder_path: str, fill_factor: float) -> Optional[Dict]:
+    """
+    Read the grid settings of the litz approximation coefficients in the coefficient folder.
+
+    :param coeff_folder_path: coefficient folder of the simulation (Strands_Coefficients/coeff)
+    :type coeff_folder_path: str
+    :param fill_factor: fill factor of the litz wire
+    :type fill_factor: float
+    :return: grid settings ('maximum_reduced_frequency', 'tolerance', 'reduced_frequencies'), None in case the
+        coefficients were created without settings
+    :rtype: Dict
+    """
+    try:
+        with open(os.path.join(coeff_folder_path, litz_coefficient_settings_file_name(fill_factor)), "r") as fd:
+            return json.load(fd)
+    except (OSError, ValueError):
+        return None
+
+
+def litz_coefficients_reduced_frequency_range(reduced_frequency: float) -> float:
+    """
+    Return the upper limit of the reduced frequency grid, which covers the given reduced frequency.
+
+    The upper limit of the default grid is doubled until the reduced frequency is covered, so only a few different
+    grids are calculated for a sweep over many harmonics.
+
+    :param reduced_frequency: reduced frequency, which needs to be covered
+    :type reduced_frequency: float
+    :return: upper limit of the reduced frequency grid
+    :rtype: float
+    """
+    maximum_reduced_frequency = float(LITZ_COEFFICIENTS_REDUCED_FREQUENCIES[-1])
+    while maximum_reduced_frequency < reduced_frequency:
+        maximum_reduced_frequency *= 2
+    return maximum_reduced_frequency
+
+
+def adaptive_litz_reduced_frequencies(solve: Callable[[List[float]], Dict[float, Dict[str, float]]],
+                                      maximum_reduced_frequency: Optional[float] = None, tolerance: Optional[float] = None,
+                                      maximum_number_of_reduced_frequencies: int = LITZ_COEFFICIENTS_MAXIMUM_NUMBER_OF_REDUCED_FREQUENCIES) \
+        -> Dict[float, Dict[str, float]]:
+    """
+    Solve the cell simulations on an adaptively refined reduced frequency grid.
+
+    The default grid is extended by the doubled upper limits up to the maximum reduced frequency. Afterwards, every
+    interval is bisected as long as the coefficients at the midpoint differ from the linear interpolation (as used by
+    GetDP) by more than the tolerance, relative to the largest absolute value of the coefficient.
+
+    :param solve: function to solve the cell simulations of the given reduced frequencies, returns the coefficient
+        values per reduced frequency, e.g. {0.25: {'pI': 1.0, 'qI': 0.99, 'pB': 0.01, 'qB': 0.98}}
+    :type solve: Callable[[List[float]], Dict[float, Dict[str, float]]]
+    :param maximum_reduced_frequency: upper limit of the grid, see litz_coefficients_reduced_frequency_range().
+        Defaults to None (upper limit of the default grid)
+    :type maximum_reduced_frequency: float
+    :param tolerance: relative interpolation tolerance. Defaults to None (no refinement)
+    :type tolerance: float
+    :param maximum_number_of_reduced_frequencies: the refinement stops at this number of reduced frequencies
+    :type maximum_number_of_reduced_frequencies: int
+    :return: coefficient values per reduced frequency
+    :rtype: Dict[float, Dict[str, float]]
+    """
+    reduced_frequencies = LITZ_COEFFICIENTS_REDUCED_FREQUENCIES.tolist()
+    while maximum_reduced_frequency is not None and reduced_frequencies[-1] < maximum_reduced_frequency:
+        reduced_frequencies.append(2 * reduced_frequencies[-1])
+    values = solve(reduced_frequencies)
+
+    intervals = list(zip(reduced_frequencies[:-1], reduced_frequencies[1:])) if tolerance is not None else []
+    while intervals and len(values) < maximum_number_of_reduced_frequencies:
+        intervals = intervals[:maximum_number_of_reduced_frequencies - len(values)]
+        midpoints = [(lower + upper) / 2 for lower, upper in intervals]
+        values.update(solve(midpoints))
+
+        scales = {name: max(max(abs(single_values[name]) for single_values in values.values()), 1e-12)
+                  for name in values[midpoints[0]]}
+        refined_intervals = []
+        for (lower, upper), midpoint in zip(intervals, midpoints):
+            error = max(abs(values[midpoint][name] - (values[lower][name] + values[upper][name]) / 2) / scale
+                        for name, scale in scales.items())
+            if error > tolerance:
+                refined_intervals += [(lower, midpoint), (midpoint, upper)]
+        intervals = refined_intervals
+    return values
+
+
+def read_litz_cell_coefficient(cell_coeff_folder_path: str, name: str) -> float:
+    """
+    Read a coefficient from the results of a single cell simulation.
+
+    :param cell_coeff_folder_path: coeff folder of the cell simulation
+    :type cell_coeff_folder_path: str
+    :param name: name of the coefficient, e.g. 'pB'
+    :type name: str
+    :return: coefficient value
+    :rtype: float
+    """
+    return float(_read_litz_cell_coefficient_lines(cell_coeff_folder_path, name).split()[1])
+
+
+def _read_litz_cell_coefficient_lines(cell_coeff_folder_path: str, name: str) -> str:
+    # GetDP formats the fill factor by itself, so the file is found by its prefix
+    cell_file_names = [file_name for file_name in os.listdir(cell_coeff_folder_path) if
+                       file_name.startswith(f"{name}_RS_la")] if os.path.isdir(cell_coeff_folder_path) else []
+    if not cell_file_names:
+        raise Exception(f"Litz coefficient {name} is missing in the results of the cell simulation "
+                        f"{cell_coeff_folder_path}.")
+    with open(os.path.join(cell_coeff_folder_path, cell_file_names[0]), "r") as fd:
+        # Removes the zero imaginary part and corrects the pB coefficient error at 0 Hz
+        # Must be changed in future in cell.pro
+        return fd.read().replace(" 0\n", "\n").replace(" 0\n", " 1\n")
+
+
+def write_litz_coefficient_files(cell_coeff_folder_paths: Dict[int, List[str]], coeff_folder_path: str,
+                                 fill_factor: float, settings: Optional[Dict] = None) -> None:
+    """
+    Assemble the coefficient files from the results of the single cell simulations.
+
+    Every cell simulation writes a single line per coefficient into its own coeff folder. The lines are joined in the
+    order of the reduced frequencies and every file is written atomically, so simulations in parallel never read an
+    incomplete file.
+
+    :param cell_coeff_folder_paths: coeff folders of the cell simulations per mode, sorted by the reduced frequency
+    :type cell_coeff_folder_paths: Dict[int, List[str]]
+    :param coeff_folder_path: coefficient folder of the simulation (Strands_Coefficients/coeff)
+    :type coeff_folder_path: str
+    :param fill_factor: fill factor of the litz wire, which is part of the file names
+    :type fill_factor: float
+    :param settings: grid settings, which are written next to the coefficients (see read_litz_coefficient_settings())
+    :type settings: Dict
+    """
+    os.makedirs(coeff_folder_path, exist_ok=True)
+    contents = {}
+    for mode, names in LITZ_COEFFICIENTS_MODES.items():
+        for name in names:
+            contents[f"{name}_RS_la{fill_factor}_{LITZ_COEFFICIENTS_NUMBER_OF_LAYERS}layer.dat"] = "".join(
+                _read_litz_cell_coefficient_lines(cell_coeff_folder_path, name)
+                for cell_coeff_folder_path in cell_coeff_folder_paths[mode])
+    if settings is not None:
+        contents[litz_coefficient_settings_file_name(fill_factor)] = json.dumps(settings)
+
+    for file_name, content in contents.items():
+        file_descriptor, temporary_file_path = tempfile.mkstemp(prefix=".tmp_", dir=coeff_folder_path)
+        with os.fdopen(file_descriptor, "w") as fd:
+            fd.write(content)
+        os.replace(temporary_file_path, os.path.join(coeff_folder_path, file_name))
+
+
+def litz_database_fill_factors_and_strand_radii(litz_names: Optional[List[str]] = None) -> List[Tuple[float, float]]:
+    """
+    Return the unique (fill factor, strand radius) combinations of the litz wires in the litz_database().
+
+    The fill factor is calculated like in Conductor.set_litz_round_conductor() without a given fill factor.
+
+    :param litz_names: names of the litz wires, e.g. ['1.5x105x0.1']. Defaults to None (all litz wires)
+    :type litz_names: List[str]
+    :return: sorted (fill factor, strand radius) combinations
+    :rtype: List[Tuple[float, float]]
+    """
+    # local import, as femmt.functions imports gmsh
+    from femmt.functions import litz_database
+
+    database = litz_database()
+    combinations = set()
+    for litz_name in (database.keys() if litz_names is None else litz_names):
+        litz = database[litz_name]
+        fill_factor = np.around(litz["strands_numbers"] * litz["strand_radii"] ** 2 / litz["conductor_radii"] ** 2,
+                                decimals=2)
+        combinations.add((float(fill_factor), float(litz["strand_radii"])))
+    return sorted(combinations)
+
+
+class LitzCoefficientStore:
+    """Lock-protected store for litz approximation coefficients, shared by all processes."""
+
+    def __init__(self, store_folder_path: str, lock_timeout: float = 3600, poll_interval: float = 1):
+        """
+        Initialize the litz coefficient store.
+
+        :param store_folder_path: folder to store the coefficients
+        :type store_folder_path: str
+        :param lock_timeout: age of a lock file in seconds, after which it is treated as left over by a crashed process
+        :type lock_timeout: float
+        :param poll_interval: time in seconds between two checks of a lock, which is held by another process
+        :type poll_interval: float
+        """
+        self.store_folder_path = store_folder_path
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.number_of_hits = 0
+        self.number_of_misses = 0
+        if not os.path.exists(self.store_folder_path):
+            os.makedirs(self.store_folder_path, exist_ok=True)
+
+    @staticmethod
+    def create_key(fill_factor: float, strand_radius: float, maximum_reduced_frequency: Optional[float] = None,
+                   tolerance: Optional[float] = None) -> str:
+        """
+        Create the store key of a litz wire.
+
+        :param fill_factor: fill factor of the litz wire
+        :type fill_factor: float
+        :param strand_radius: strand radius in m
+        :type strand_radius: float
+        :param maximum_reduced_frequency: upper limit of the reduced frequency grid. Defaults to None (default grid)
+        :type maximum_reduced_frequency: float
+        :param tolerance: relative interpolation tolerance of the grid refinement. Defaults to None (no refinement)
+        :type tolerance: float
+        :return: store key
+        :rtype: str
+        """
+        key_content = [LITZ_COEFFICIENTS_VERSION, f"{fill_factor}", float(strand_radius),
+                       LITZ_COEFFICIENTS_NUMBER_OF_LAYERS, LITZ_COEFFICIENTS_REDUCED_FREQUENCIES.tolist()]
+        if maximum_reduced_frequency is not None or tolerance is not None:
+            key_content += [maximum_reduced_frequency, tolerance, LITZ_COEFFICIENTS_MAXIMUM_NUMBER_OF_REDUCED_FREQUENCIES]
+        return hashlib.sha1(json.dumps(key_content).encode()).hexdigest()
+
+    @staticmethod
+    def _entry_files(fill_factor: float) -> List[Tuple[str, str]]:
+        # (file name in the store, file name in the coefficient folder), the settings file is optional
+        return [(f"{name}.dat", file_name) for name, file_name in
+                zip(_coefficient_names, litz_coefficient_file_names(fill_factor))] + \
+            [(_settings_file_name, litz_coefficient_settings_file_name(fill_factor))]
+
+    def _entry_folder_path(self, key: str) -> str:
+        return os.path.join(self.store_folder_path, key)
+
+    def contains(self, key: str) -> bool:
+        """
+        Check if a complete entry for the given key exists.
+
+        :param key: store key
+        :type key: str
+        :return: True in case of an existing entry
+        :rtype: bool
+        """
+        entry_folder_path = self._entry_folder_path(key)
+        return all(os.path.isfile(os.path.join(entry_folder_path, f"{name}.dat")) for name in _coefficient_names)
+
+    def load(self, key: str, coeff_folder_path: str, fill_factor: float) -> bool:
+        """
+        Copy the stored coefficients to the coefficient folder, which is read by GetDP.
+
+        :param key: store key
+        :type key: str
+        :param coeff_folder_path: coefficient folder of the simulation (Strands_Coefficients/coeff)
+        :type coeff_folder_path: str
+        :param fill_factor: fill factor of the litz wire, which is part of the file names
+        :type fill_factor: float
+        :return: True in case the coefficients were found
+        :rtype: bool
+        """
+        if not self.contains(key):
+            self.number_of_misses += 1
+            return False
+
+        entry_folder_path = self._entry_folder_path(key)
+        try:
+            os.makedirs(coeff_folder_path, exist_ok=True)
+            for entry_file_name, file_name in self._entry_files(fill_factor):
+                if entry_file_name == _settings_file_name and not os.path.isfile(os.path.join(entry_folder_path, entry_file_name)):
+                    # settings of other coefficients must not remain next to the loaded coefficients
+                    with contextlib.suppress(OSError):
+                        os.remove(os.path.join(coeff_folder_path, file_name))
+                    continue
+                # copy to a temporary file first, so a simulation in parallel never reads an incomplete file
+                temporary_file_path = os.path.join(coeff_folder_path, f".tmp_{os.getpid()}_{file_name}")
+                shutil.copyfile(os.path.join(entry_folder_path, entry_file_name), temporary_file_path)
+                os.replace(temporary_file_path, os.path.join(coeff_folder_path, file_name))
+        except OSError:
+            self.number_of_misses += 1
+            return False
+
+        self.number_of_hits += 1
+        return True
+
+    def store(self, key: str, coeff_folder_path: str, fill_factor: float) -> None:
+        """
+        Store the coefficients of the given coefficient folder.
+
+        :param key: store key
+        :type key: str
+        :param coeff_folder_path: coefficient folder of the simulation (Strands_Coefficients/coeff)
+        :type coeff_folder_path: str
+        :param fill_factor: fill factor of the litz wire, which is part of the file names
+        :type fill_factor: float
+        """
+        if self.contains(key):
+            return
+
+        # Write the entry to a temporary folder first and rename it afterwards, so other processes never see an
+        # incomplete entry.
+        temporary_folder_path = tempfile.mkdtemp(prefix=".tmp_", dir=self.store_folder_path)
+        try:
+            for entry_file_name, file_name in self._entry_files(fill_factor):
+                if entry_file_name == _settings_file_name and not os.path.isfile(os.path.join(coeff_folder_path, file_name)):
+                    continue
+                shutil.copyfile(os.path.join(coeff_folder_path, file_name), os.path.join(temporary_folder_path, entry_file_name))
+            os.rename(temporary_folder_path, self._entry_folder_path(key))
+        except OSError:
+            # missing coefficient files or entry was stored by another process in the meantime
+            shutil.rmtree(temporary_folder_path, ignore_errors=True)
+
+    @contextlib.contextmanager
+    def lock(self, key: str):
+        """
+        Context manager, which holds the lock of the given key.
+
+        The lock is a file, which is created exclusively. This works for several processes on the same machine and
+        also on most network file systems. Lock files older than lock_timeout are removed.
+
+        :param key: store key
+        :type key: str
+        """
+        lock_file_path = os.path.join(self.store_folder_path, f"{key}.lock")
+        while True:
+            try:
+                file_descriptor = os.open(lock_file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                with os.fdopen(file_descriptor, "w") as fd:
+                    fd.write(str(os.getpid()))
+                break
+            except FileExistsError:
+                try:
+                    lock_age = time.time() - os.path.getmtime(lock_file_path)
+                except FileNotFoundError:
+                    # lock was released in the meantime
+                    continue
+                if lock_age > self.lock_timeout:
+                    # several processes may remove the same stale lock, only one of them creates the new lock by O_EXCL
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(lock_file_path)
+                    continue
+                time.sleep(self.poll_interval)
+        try:
+            yield
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(lock_file_path)
+
+    def load_or_create(self, fill_factor: float, strand_radius: float, coeff_folder_path: str,
+                       create_coefficients: Callable[[], None], maximum_reduced_frequency: Optional[float] = None,
+                       tolerance: Optional[float] = None) -> bool:
+        """
+        Load the coefficients from the store or create them once and store them.
+
+        In case the coefficients are missing, the lock of the entry is acquired and the store is checked again, as
+        another process may have created the coefficients in the meantime. Only then, create_coefficients() is called,
+        which must write the coefficient files to the coefficient folder.
+
+        :param fill_factor: fill factor of the litz wire
+        :type fill_factor: float
+        :param strand_radius: strand radius in m
+        :type strand_radius: float
+        :param coeff_folder_path: coefficient folder of the simulation (Strands_Coefficients/coeff)
+        :type coeff_folder_path: str
+        :param create_coefficients: function to create the coefficient files
+        :type create_coefficients: Callable[[], None]
+        :param maximum_reduced_frequency: upper limit of the reduced frequency grid. Defaults to None (default grid)
+        :type maximum_reduced_frequency: float
+        :param tolerance: relative interpolation tolerance of the grid refinement. Defaults to None (no refinement)
+        :type tolerance: float
+        :return: True in case the coefficients were loaded from the store, False in case they were created
+        :rtype: bool
+        """
+        key = self.create_key(fill_factor, strand_radius, maximum_reduced_frequency, tolerance)
+        if self.load(key, coeff_folder_path, fill_factor):
+            return True
+
+        with self.lock(key):
+            if self.load(key, coeff_folder_path, fill_factor):
+                return True
+            create_coefficients()
+            self.store(key, coeff_folder_path, fill_factor)
+        return False
+
+
+def litz_coefficient_store_from_environment() -> Optional[LitzCoefficientStore]:
+    """
+    Return the store of the folder given by the environment variable FEMMT_LITZ_COEFFICIENT_STORE.
+
+    :return: litz coefficient store, None in case the environment variable is not set
+    :rtype: LitzCoefficientStore
+    """
+    store_folder_path = os.environ.get(LITZ_COEFFICIENT_STORE_ENVIRONMENT_VARIABLE)
+    return LitzCoefficientStore(store_folder_path) if store_folder_path else None
+
+
+def precompute_litz_coefficients(store_folder_path: str, working_directory: Optional[str] = None,
+                                 litz_names: Optional[List[str]] = None, maximum_reduced_frequency: Optional[float] = None,
+                                 tolerance: Optional[float] = None) -> List[Tuple[float, float]]:
+    """
+    Fill the store with the coefficients of all litz wires of the litz_database().
+
+    Coefficients, which are already stored, are not calculated again. Several processes can fill the same store in
+    parallel. With a tolerance, the coefficients are created on an adaptively refined grid up to the maximum reduced
+    frequency, as requested by a MagneticComponent with the same litz_coefficient_tolerance.
+
+    :param store_folder_path: folder of the litz coefficient store
+    :type store_folder_path: str
+    :param working_directory: working directory of the cell simulations. Defaults to None (temporary folder)
+    :type working_directory: str
+    :param litz_names: names of the litz wires, e.g. ['1.5x105x0.1']. Defaults to None (all litz wires)
+    :type litz_names: List[str]
+    :param maximum_reduced_frequency: reduced frequency, which needs to be covered by the grid. Only used with a
+        tolerance. Defaults to None (upper limit of the default grid)
+    :type maximum_reduced_frequency: float
+    :param tolerance: relative interpolation tolerance of the grid refinement. Defaults to None (default grid)
+    :type tolerance: float
+    :return: (fill factor, strand radius) combinations, which are in the store
+    :rtype: List[Tuple[float, float]]
+    """
+    # local import, as the MagneticComponent uses the store
+    from femmt.component import MagneticComponent
+    from femmt.enumerations import Verbosity
+
+    combinations = litz_database_fill_factors_and_strand_radii(litz_names)
+    with contextlib.ExitStack() as stack:
+        if working_directory is None:
+            working_directory = stack.enter_context(tempfile.TemporaryDirectory(prefix="femmt_litz_"))
+        component = MagneticComponent(working_directory=working_directory, verbosity=Verbosity.Silent,
+                                      litz_coefficient_store_folder_path=store_folder_path,
+                                      litz_coefficient_tolerance=tolerance)
+        for fill_factor, strand_radius in combinations:
+            component.load_or_create_litz_coefficients(fill_factor, strand_radius, maximum_reduced_frequency)
+    return combinations
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Fill the litz coefficient store for the litz wires of the litz_database().")
+    parser.add_argument("store_folder_path", nargs="?", default=os.environ.get(LITZ_COEFFICIENT_STORE_ENVIRONMENT_VARIABLE),
+                        help=f"folder of the store, defaults to ${LITZ_COEFFICIENT_STORE_ENVIRONMENT_VARIABLE}")
+    parser.add_argument("--working-directory", default=None, help="working directory of the cell simulations")
+    parser.add_argument("--litz", nargs="*", default=None, help="names of the litz wires, defaults to all")
+    parser.add_argument("--tolerance", type=float, default=None, help="relative interpolation tolerance of an adaptive grid")
+    parser.add_argument("--maximum-reduced-frequency", type=float, default=None,
+                        help="reduced frequency, which needs to be covered by an adaptive grid")
+    arguments = parser.parse_args()
+    if not arguments.store_folder_path:
+        parser.error(f"store_folder_path or ${LITZ_COEFFICIENT_STORE_ENVIRONMENT_VARIABLE} is required")
+    for stored_fill_factor, stored_strand_radius in precompute_litz_coefficients(
+            arguments.store_folder_path, arguments.working_directory, arguments.litz, arguments.maximum_reduced_frequency,
+            arguments.tolerance):
+        print(f"Stored coefficients: fill factor {stored_fill_factor}, strand radius {stored_strand_radius} m")
@@ -1,8 +1,10 @@
 """Functions and methods to load simulations from result-log files."""
 import os
 import json
+import shutil
+import numpy as np
 import matplotlib.pyplot as plt
-from typing import List, Dict
+from typing import List, Dict, Optional
 from enum import Enum
 from dataclasses import dataclass
 
@@ -182,6 +184,46 @@ class FEMMTLogParser:
                 raise Exception(f"In order to parse complex values the list needs a size of 2: {data}")
         return float(data)
 
+    @staticmethod
+    def parse_binary_log(file_path: str, binary_log: Dict[str, np.ndarray]) -> FileData:
+        """Create the class structure from the binary companion of a log file. Internal function.
+
+        :param file_path: Full path to the JSON log file
+        :type file_path: str
+        :param binary_log: Arrays of the binary log, see read_binary_log()
+        :type binary_log: Dict[str, np.ndarray]
+        :return: Data stored in a class
+        :rtype: FileData
+        """
+        sweeps = binary_log["sweeps"]
+        total_losses = binary_log["total_losses"][0]
+        misc = binary_log["misc"][0]
+
+        sweeps_data = []
+        for sweep in sweeps:
+            windings = [WindingData(flux=complex(sweep["flux"][index]),
+                                    turns=int(sweep["number_turns"][index]),
+                                    flux_over_current=complex(sweep["flux_over_current"][index]),
+                                    voltage=complex(sweep["V"][index]),
+                                    current=complex(sweep["I"][index]),
+                                    active_power=float(sweep["P"][index]),
+                                    reactive_power=float(sweep["Q"][index]),
+                                    apparent_power=float(sweep["S"][index])) for index in range(sweep["flux"].shape[0])]
+            sweeps_data.append(SweepData(frequency=float(sweep["f"]),
+                                         core_eddy_losses=float(sweep["core_eddy_losses"]),
+                                         core_hyst_losses=float(sweep["core_hyst_losses"]),
+                                         winding_losses=float(sweep["all_winding_losses"]),
+                                         windings=windings))
+
+        return FileData(file_path=file_path,
+                        sweeps=sweeps_data,
+                        total_winding_losses=float(total_losses["all_windings"]),
+                        total_core_eddy_losses=float(total_losses["eddy_core"]),
+                        total_core_hyst_losses=float(total_losses["hyst_core_fundamental_freq"]),
+                        total_core_losses=float(total_losses["core"]),
+                        core_2daxi_total_volume=float(misc["core_2daxi_total_volume"]),
+                        total_cost=float(misc["total_cost_incl_margin"]))
+
     @staticmethod
     def parse_file(file_path: str, sweep_type: SweepTypes) -> FileData:
         """Parse the JSON-File to a Class structure. Internal function.
@@ -197,6 +239,11 @@ class FEMMTLogParser:
         if not sweep_type == SweepTypes.SingleSweep:
             raise Exception("Currently only single sweep is supported")
 
+        # Use the binary companion of the log file, if available
+        binary_log = read_binary_log(file_path)
+        if binary_log is not None and "sweeps" in binary_log:
+            return FEMMTLogParser.parse_binary_log(file_path, binary_log)
+
         with open(file_path, "r") as fd:
             full_data = json.loads(fd.read())
 
@@ -248,3 +295,215 @@ class FEMMTLogParser:
         }
 
         return FileData(**total)
+
+
+def binary_log_file_path(log_file_path: str) -> str:
+    """
+    Return the path of the binary companion of a JSON log file.
+
+    :param log_file_path: path of the JSON log file, e.g. .../log_electro_magnetic.json
+    :type log_file_path: str
+    :return: path of the binary log file, e.g. .../log_electro_magnetic.npz
+    :rtype: str
+    """
+    return os.path.splitext(log_file_path)[0] + ".npz"
+
+
+def _numeric_scalars_to_record(data: Dict) -> np.ndarray:
+    """
+    Store all numeric scalars of a (nested) dictionary in a structured array with a single record.
+
+    Keys of nested dictionaries are joined by '/', e.g. 'winding1/total'. Lists and strings are skipped.
+
+    :param data: dictionary of the log
+    :type data: Dict
+    :return: structured array with one record
+    :rtype: np.ndarray
+    """
+    scalars = {}
+
+    def collect(sub_data: Dict, prefix: str):
+        for key, value in sub_data.items():
+            if isinstance(value, dict):
+                collect(value, f"{prefix}{key}/")
+            elif isinstance(value, (bool, int, float, np.number)):
+                scalars[f"{prefix}{key}"] = value
+
+    collect(data, "")
+    record = np.zeros(1, dtype=[(key, np.float64) for key in scalars])
+    for key, value in scalars.items():
+        record[key] = value
+    return record
+
+
+def _freq_domain_log_to_arrays(log_dict: Dict) -> Dict[str, np.ndarray]:
+    sweeps = log_dict["single_sweeps"]
+    number_of_windings = 0
+    while f"winding{number_of_windings + 1}" in sweeps[0]:
+        number_of_windings += 1
+
+    shape = (number_of_windings,)
+    sweep_array = np.zeros(len(sweeps), dtype=[
+        ("f", np.float64), ("core_eddy_losses", np.float64), ("core_hyst_losses", np.float64),
+        ("all_winding_losses", np.float64), ("number_turns", np.int64, shape), ("winding_losses", np.float64, shape),
+        ("flux", np.complex128, shape), ("flux_over_current", np.complex128, shape), ("V", np.complex128, shape),
+        ("I", np.complex128, shape), ("P", np.float64, shape), ("Q", np.float64, shape), ("S", np.float64, shape)])
+    arrays = {}
+    for sweep_index, sweep in enumerate(sweeps):
+        for key in ["f", "core_eddy_losses", "core_hyst_losses", "all_winding_losses"]:
+            sweep_array[sweep_index][key] = sweep[key]
+        for winding_index in range(number_of_windings):
+            winding = sweep[f"winding{winding_index + 1}"]
+            for key in ["number_turns", "winding_losses", "P", "Q", "S"]:
+                sweep_array[sweep_index][key][winding_index] = winding[key]
+            for key in ["flux", "flux_over_current", "V", "I"]:
+                sweep_array[sweep_index][key][winding_index] = complex(winding[key][0], winding[key][1])
+    arrays["sweeps"] = sweep_array
+
+    # turn losses have a different length for each winding
+    for winding_index in range(number_of_windings):
+        arrays[f"turn_losses_winding{winding_index + 1}"] = np.array(
+            [sweep[f"winding{winding_index + 1}"]["turn_losses"] for sweep in sweeps], dtype=np.float64)
+    arrays["total_losses"] = _numeric_scalars_to_record(log_dict["total_losses"])
+    return arrays
+
+
+def _time_domain_log_to_arrays(log_dict: Dict) -> Dict[str, np.ndarray]:
+    time_domain_simulation = log_dict["time_domain_simulation"]
+    steps = [list(step.values())[0] for step in time_domain_simulation[1:]]
+    number_of_windings = len(steps[0]["windings"]) if steps else 0
+
+    shape = (number_of_windings,)
+    step_array = np.zeros(len(steps), dtype=[("V", np.float64, shape), ("flux", np.float64, shape), ("I", np.float64, shape)])
+    for step_index, step in enumerate(steps):
+        for winding_index in range(number_of_windings):
+            winding = step["windings"][f"winding{winding_index + 1}"]
+            for key in ["V", "flux", "I"]:
+                value = winding[key]
+                # load_result() returns (value,)-tuples for time domain results
+                step_array[step_index][key][winding_index] = np.nan if value is None else np.ravel(value)[0]
+
+    return {"time_steps": step_array,
+            "time_domain_parameters": _numeric_scalars_to_record(time_domain_simulation[0]),
+            "total_losses": _numeric_scalars_to_record(log_dict["total_losses"])}
+
+
+def write_binary_log(log_dict: Dict, log_file_path: str) -> None:
+    """
+    Write the binary companion of a JSON log file.
+
+    The binary log is an uncompressed .npz file with a fixed schema, which can be read without JSON parsing:
+     * frequency domain: 'sweeps' (one record per frequency with f, losses and per-winding arrays flux,
+       flux_over_current, V, I, P, Q, S, winding_losses, number_turns), 'turn_losses_winding<n>' (frequency x turn)
+     * time domain: 'time_steps' (one record per time step with per-winding arrays V, flux, I) and
+       'time_domain_parameters'
+     * both: 'total_losses' and 'misc' (a single record with all numeric values of the log section)
+
+    :param log_dict: log dictionary, which is written to the JSON log file
+    :type log_dict: Dict
+    :param log_file_path: path of the JSON log file
+    :type log_file_path: str
+    """
+    if "single_sweeps" in log_dict:
+        arrays = _freq_domain_log_to_arrays(log_dict)
+    elif "time_domain_simulation" in log_dict:
+        arrays = _time_domain_log_to_arrays(log_dict)
+    else:
+        raise ValueError("Log dictionary contains neither frequency domain nor time domain results.")
+    arrays["misc"] = _numeric_scalars_to_record(log_dict.get("misc", {}))
+
+    np.savez(binary_log_file_path(log_file_path), **arrays)
+
+
+def read_binary_log(log_file_path: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Read the binary companion of a JSON log file.
+
+    :param log_file_path: path of the JSON log file
+    :type log_file_path: str
+    :return: arrays of the binary log, see write_binary_log(). None in case of a missing or outdated binary log.
+    :rtype: Dict[str, np.ndarray]
+    """
+    binary_file_path = binary_log_file_path(log_file_path)
+    if not os.path.isfile(binary_file_path):
+        return None
+    # A JSON log written after the binary log is not described by the binary log anymore
+    if os.path.isfile(log_file_path) and os.path.getmtime(log_file_path) > os.path.getmtime(binary_file_path):
+        return None
+
+    with np.load(binary_file_path) as npz_file:
+        return {key: npz_file[key] for key in npz_file.files}
+
+
+def _record_to_nested_dict(record: np.ndarray) -> Dict:
+    """
+    Restore the (nested) dictionary of a single record array, see _numeric_scalars_to_record().
+
+    :param record: structured array with one record
+    :type record: np.ndarray
+    :return: dictionary with the numeric scalars of the log section
+    :rtype: Dict
+    """
+    data = {}
+    for key in record.dtype.names:
+        *parent_keys, name = key.split("/")
+        sub_data = data
+        for parent_key in parent_keys:
+            sub_data = sub_data.setdefault(parent_key, {})
+        sub_data[name] = float(record[key][0])
+    return data
+
+
+def _freq_domain_arrays_to_log(binary_log: Dict[str, np.ndarray]) -> Dict:
+    sweeps = []
+    for sweep_index, sweep in enumerate(binary_log["sweeps"]):
+        sweep_dict = {key: float(sweep[key]) for key in ["f", "core_eddy_losses", "core_hyst_losses", "all_winding_losses"]}
+        for winding_index in range(sweep["flux"].shape[0]):
+            winding = {"number_turns": int(sweep["number_turns"][winding_index])}
+            for key in ["winding_losses", "P", "Q", "S"]:
+                winding[key] = float(sweep[key][winding_index])
+            for key in ["flux", "flux_over_current", "V", "I"]:
+                value = sweep[key][winding_index]
+                winding[key] = [float(value.real), float(value.imag)]
+            winding["turn_losses"] = binary_log[f"turn_losses_winding{winding_index + 1}"][sweep_index].tolist()
+            sweep_dict[f"winding{winding_index + 1}"] = winding
+        sweeps.append(sweep_dict)
+    return {"single_sweeps": sweeps}
+
+
+def load_log_dict(log_file_path: str) -> Dict:
+    """
+    Load a frequency domain result log as a dictionary, from its binary companion if available.
+
+    The dictionary restored from the binary log contains the values of the binary log schema (see write_binary_log()):
+    'single_sweeps' and the numeric values of 'total_losses' and 'misc'. Lists and strings of the 'total_losses' and
+    'misc' sections are only available from the JSON log file.
+
+    :param log_file_path: path of the JSON log file
+    :type log_file_path: str
+    :return: log dictionary
+    :rtype: Dict
+    """
+    binary_log = read_binary_log(log_file_path)
+    if binary_log is None or "sweeps" not in binary_log:
+        with open(log_file_path, "r") as fd:
+            return json.loads(fd.read())
+
+    log_dict = _freq_domain_arrays_to_log(binary_log)
+    log_dict["total_losses"] = _record_to_nested_dict(binary_log["total_losses"])
+    log_dict["misc"] = _record_to_nested_dict(binary_log["misc"])
+    return log_dict
+
+
+def copy_log_file(source_log_file_path: str, destination_log_file_path: str) -> None:
+    """
+    Copy a JSON log file together with its binary companion (if available).
+
+    :param source_log_file_path: path of the JSON log file to copy
+    :type source_log_file_path: str
+    :param destination_log_file_path: destination path of the JSON log file
+    :type destination_log_file_path: str
+    """
+    shutil.copy(source_log_file_path, destination_log_file_path)
+    if os.path.isfile(binary_log_file_path(source_log_file_path)):
+        shutil.copy(binary_log_file_path(source_log_file_path), binary_log_file_path(destination_log_file_path))
@@ -0,0 +1,238 @@
+"""Precomputed lookup tables of the complex permeability for the reluctance model based optimizations.
+
+The material database interpolates the datasheet curves for a single operating point (temperature, frequency) per call.
+The MaterialLookup samples these curves once per study on a dense, uniform flux density grid for all requested
+frequencies and temperatures. Afterwards, mu_r_imag and mu_r_real are evaluated for whole arrays of design cases by
+index arithmetic. Optionally, the tables are stored on disk, so later runs with the same materials and operating points
+do not need the material database at all.
+"""
+# Python standard libraries
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+# 3rd party libraries
+import numpy as np
+from scipy.interpolate import interp1d
+import materialdatabase as mdb
+from materialdatabase.dtos import MaterialCurve
+
+# Version of the table files. Increase in case of changes in the table generation, to not re-use outdated tables.
+MATERIAL_LOOKUP_VERSION = 1
+
+
+class MaterialLookup:
+    """Dense (flux density, frequency, temperature) tables of mu_r_imag and mu_r_real for several materials."""
+
+    def __init__(self, cache_folder_path: Optional[str] = None, number_of_flux_density_points: int = 512,
+                 interpolation_kind: str = "linear", material_database: Optional[mdb.MaterialDatabase] = None):
+        """
+        Initialize the material lookup.
+
+        :param cache_folder_path: folder to store the tables. Defaults to None (tables are only kept in memory)
+        :type cache_folder_path: str
+        :param number_of_flux_density_points: number of points of the uniform flux density grid
+        :type number_of_flux_density_points: int
+        :param interpolation_kind: interpolation of the database curves onto the flux density grid, e.g. 'linear'
+            or 'cubic' (see scipy.interpolate.interp1d)
+        :type interpolation_kind: str
+        :param material_database: material database to read the curves from. Defaults to a new silent database,
+            which is only created in case of a table, which is not in the cache.
+        :type material_database: mdb.MaterialDatabase
+        """
+        self.cache_folder_path = cache_folder_path
+        self.number_of_flux_density_points = number_of_flux_density_points
+        self.interpolation_kind = interpolation_kind
+        self.material_database = material_database
+        self.tables: Dict[str, Dict[str, np.ndarray]] = {}
+        self.number_of_database_calls = 0
+        if self.cache_folder_path is not None and not os.path.exists(self.cache_folder_path):
+            os.makedirs(self.cache_folder_path, exist_ok=True)
+
+    def _database(self) -> mdb.MaterialDatabase:
+        if self.material_database is None:
+            self.material_database = mdb.MaterialDatabase(is_silent=True)
+        return self.material_database
+
+    def _table_file_path(self, material_name: str, frequencies: List[float], temperatures: List[float]) -> Optional[str]:
+        if self.cache_folder_path is None:
+            return None
+        content = json.dumps([MATERIAL_LOOKUP_VERSION, str(material_name), frequencies, temperatures,
+                              self.number_of_flux_density_points, self.interpolation_kind], default=str)
+        return os.path.join(self.cache_folder_path, f"{hashlib.sha1(content.encode()).hexdigest()}.npz")
+
+    def precompute(self, material_names: List[str], frequencies: List[float], temperatures: List[float]) -> None:
+        """
+        Calculate (or load from the cache) the tables of the given materials for all combinations of frequency and temperature.
+
+        :param material_names: material names, e.g. ['N95', 'N87']
+        :type material_names: List[str]
+        :param frequencies: frequencies in Hz
+        :type frequencies: List[float]
+        :param temperatures: temperatures in °C
+        :type temperatures: List[float]
+        """
+        frequencies = sorted(float(frequency) for frequency in np.atleast_1d(frequencies))
+        temperatures = sorted(float(temperature) for temperature in np.atleast_1d(temperatures))
+        for material_name in material_names:
+            table_file_path = self._table_file_path(material_name, frequencies, temperatures)
+            if table_file_path is not None and os.path.isfile(table_file_path):
+                try:
+                    with np.load(table_file_path) as table_file:
+                        self.tables[material_name] = {key: table_file[key] for key in table_file.files}
+                    continue
+                except (OSError, ValueError, KeyError):
+                    # broken file, calculate the table again
+                    pass
+            self.tables[material_name] = self._calculate_table(material_name, frequencies, temperatures)
+            if table_file_path is not None:
+                self._store_table(table_file_path, self.tables[material_name])
+
+    def _calculate_table(self, material_name: str, frequencies: List[float], temperatures: List[float]) -> Dict[str, np.ndarray]:
+        material_database = self._database()
+        curves = []
+        for temperature in temperatures:
+            for frequency in frequencies:
+                self.number_of_database_calls += 1
+                flux_density_vec, mu_r_imag_vec, mu_r_real_vec = material_database.permeability_data_to_pro_file(
+                    temperature, frequency, material_name, datasource=mdb.MaterialDataSource.ManufacturerDatasheet,
+                    datatype='permeability_data', plot_interpolation=False)
+                curves.append((np.asarray(flux_density_vec, dtype=float), np.asarray(mu_r_imag_vec, dtype=float),
+                               np.asarray(mu_r_real_vec, dtype=float)))
+
+        # One flux density grid for all operating points, values outside a curve are clamped to its end values
+        flux_density_vec = np.linspace(min(curve[0][0] for curve in curves), max(curve[0][-1] for curve in curves),
+                                       self.number_of_flux_density_points)
+        mu_r_imag = np.zeros((len(temperatures), len(frequencies), len(flux_density_vec)))
+        mu_r_real = np.zeros_like(mu_r_imag)
+        for index, (curve_flux_density_vec, curve_mu_r_imag_vec, curve_mu_r_real_vec) in enumerate(curves):
+            index_temperature, index_frequency = divmod(index, len(frequencies))
+            clamped_flux_density_vec = np.clip(flux_density_vec, curve_flux_density_vec[0], curve_flux_density_vec[-1])
+            for table, curve_vec in [(mu_r_imag, curve_mu_r_imag_vec), (mu_r_real, curve_mu_r_real_vec)]:
+                table[index_temperature, index_frequency] = interp1d(
+                    curve_flux_density_vec, curve_vec, kind=self.interpolation_kind)(clamped_flux_density_vec)
+
+        return {"flux_density_vec": flux_density_vec, "frequency_vec": np.array(frequencies),
+                "temperature_vec": np.array(temperatures), "mu_r_imag": mu_r_imag, "mu_r_real": mu_r_real,
+                "mu_r_abs": np.array(material_database.get_material_attribute(material_name=material_name,
+                                                                              attribute="initial_permeability")),
+                "saturation_flux_density": np.array(material_database.get_saturation_flux_density(material_name=material_name))}
+
+    def _store_table(self, table_file_path: str, table: Dict[str, np.ndarray]) -> None:
+        # Write to a temporary file first and rename it afterwards, so other processes never read an incomplete table.
+        file_descriptor, temporary_file_path = tempfile.mkstemp(prefix=".tmp_", suffix=".npz", dir=self.cache_folder_path)
+        try:
+            with os.fdopen(file_descriptor, "wb") as fd:
+                np.savez(fd, **table)
+            os.replace(temporary_file_path, table_file_path)
+        except OSError:
+            if os.path.exists(temporary_file_path):
+                os.remove(temporary_file_path)
+
+    def _table(self, material_name: str, frequency, temperature) -> Dict[str, np.ndarray]:
+        if material_name not in self.tables:
+            # no precomputed table: create a table for this single operating point
+            self.precompute([material_name], list(np.unique(frequency)), list(np.unique(temperature)))
+        table = self.tables[material_name]
+        for values, grid, name in [(frequency, table["frequency_vec"], "frequency"), (temperature, table["temperature_vec"], "temperature")]:
+            if np.any(np.asarray(values) < grid[0]) or np.any(np.asarray(values) > grid[-1]):
+                raise ValueError(f"The {name} {values} is not covered by the table of {material_name} "
+                                 f"({grid[0]} ... {grid[-1]}). Call precompute() with the operating points of the study.")
+        return table
+
+    @staticmethod
+    def _grid_weights(values: np.ndarray, grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the lower and upper grid indices and the weight of the upper index for linear interpolation."""
+        fractional_index = np.interp(values, grid, np.arange(len(grid), dtype=float))
+        lower_index = np.minimum(np.floor(fractional_index).astype(int), len(grid) - 1)
+        upper_index = np.minimum(lower_index + 1, len(grid) - 1)
+        return lower_index, upper_index, fractional_index - lower_index
+
+    def _evaluate(self, table_name: str, material_name: str, flux_density, frequency, temperature) -> np.ndarray:
+        table = self._table(material_name, frequency, temperature)
+        flux_density_vec = table["flux_density_vec"]
+
+        # uniform flux density grid: the indices are calculated directly
+        flux_density = np.asarray(flux_density, dtype=float)
+        step = (flux_density_vec[-1] - flux_density_vec[0]) / max(len(flux_density_vec) - 1, 1)
+        fractional_index = np.clip((flux_density - flux_density_vec[0]) / step if step > 0 else 0 * flux_density,
+                                   0, len(flux_density_vec) - 1)
+        b_lower = np.minimum(np.floor(fractional_index).astype(int), len(flux_density_vec) - 1)
+        b_upper = np.minimum(b_lower + 1, len(flux_density_vec) - 1)
+        b_weight = fractional_index - b_lower
+
+        f_lower, f_upper, f_weight = self._grid_weights(np.broadcast_to(frequency, flux_density.shape), table["frequency_vec"])
+        t_lower, t_upper, t_weight = self._grid_weights(np.broadcast_to(temperature, flux_density.shape), table["temperature_vec"])
+
+        values = table[table_name]
+        result = np.zeros(flux_density.shape)
+        for t_index, t_factor in [(t_lower, 1 - t_weight), (t_upper, t_weight)]:
+            for f_index, f_factor in [(f_lower, 1 - f_weight), (f_upper, f_weight)]:
+                b_interpolated = (1 - b_weight) * values[t_index, f_index, b_lower] + b_weight * values[t_index, f_index, b_upper]
+                result += t_factor * f_factor * b_interpolated
+        return result
+
+    def mu_r_imag(self, material_name: str, flux_density, frequency, temperature) -> np.ndarray:
+        """
+        Return the imaginary part of the relative permeability.
+
+        flux_density, frequency and temperature are broadcast against each other.
+
+        :param material_name: material name, e.g. 'N95'
+        :type material_name: str
+        :param flux_density: flux density in T
+        :type flux_density: float or np.ndarray
+        :param frequency: frequency in Hz
+        :type frequency: float or np.ndarray
+        :param temperature: temperature in °C
+        :type temperature: float or np.ndarray
+        :return: mu_r_imag
+        :rtype: np.ndarray
+        """
+        flux_density, frequency, temperature = np.broadcast_arrays(flux_density, frequency, temperature)
+        return self._evaluate("mu_r_imag", material_name, flux_density, frequency, temperature)
+
+    def mu_r_real(self, material_name: str, flux_density, frequency, temperature) -> np.ndarray:
+        """
+        Return the real part of the relative permeability.
+
+        flux_density, frequency and temperature are broadcast against each other.
+
+        :param material_name: material name, e.g. 'N95'
+        :type material_name: str
+        :param flux_density: flux density in T
+        :type flux_density: float or np.ndarray
+        :param frequency: frequency in Hz
+        :type frequency: float or np.ndarray
+        :param temperature: temperature in °C
+        :type temperature: float or np.ndarray
+        :return: mu_r_real
+        :rtype: np.ndarray
+        """
+        flux_density, frequency, temperature = np.broadcast_arrays(flux_density, frequency, temperature)
+        return self._evaluate("mu_r_real", material_name, flux_density, frequency, temperature)
+
+    def material_curve(self, material_name: str, frequency: float, temperature: float) -> MaterialCurve:
+        """
+        Return the material curve of a single operating point, like MaterialDatabase.material_data_interpolation_to_dto().
+
+        The curve is sampled on the uniform flux density grid of the table.
+
+        :param material_name: material name, e.g. 'N95'
+        :type material_name: str
+        :param frequency: frequency in Hz
+        :type frequency: float
+        :param temperature: temperature in °C
+        :type temperature: float
+        :return: material curve
+        :rtype: MaterialCurve
+        """
+        table = self._table(material_name, frequency, temperature)
+        flux_density_vec = table["flux_density_vec"]
+        return MaterialCurve(material_name, float(table["mu_r_abs"]), flux_density_vec,
+                             self.mu_r_imag(material_name, flux_density_vec, frequency, temperature),
+                             self.mu_r_real(material_name, flux_density_vec, frequency, temperature),
+                             float(table["saturation_flux_density"]),
+                             boundary_frequency=frequency, boundary_temperature=temperature)
@@ -12,7 +12,7 @@ import os
 import numpy as np
 import warnings
 from logging import Logger
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # Third parry libraries
 import gmsh
@@ -23,6 +23,10 @@ from femmt.enumerations import ComponentType, ConductorType, WindingType, CoreTy
 from femmt.data import FileData
 from femmt.model import Conductor, Core, StrayPath, AirGaps, Insulation, WindingWindow
 from femmt.drawing import TwoDaxiSymmetric
+from femmt.mesh_cache import MeshCache, MESH_CACHE_ATTRIBUTE_PREFIXES
+from femmt.meshing_engine import MeshingEngine, gmsh_session
+from femmt.profiling import PhaseProfiler, profiled_phase
+from femmt.adaptive_meshing import refinement_sizes
 
 
 class Mesh:
@@ -50,6 +54,27 @@ class Mesh:
     logger: Logger
     wwr_enabled: bool
 
+    # Optional mesh cache, set by the MagneticComponent
+    mesh_cache: Optional[MeshCache]
+    mesh_cache_key: Optional[str]
+    mesh_cache_hit: bool
+
+    # In-memory gmsh model, set by the MagneticComponent
+    in_memory_gmsh_model: bool
+    write_geo_file: bool
+    geometry_model_name: Optional[str]
+    geometry_in_memory: bool
+    geometry_file_written: bool
+
+    # Meshing engine (gmsh options, gmsh models of this mesh), set by the MagneticComponent
+    meshing_engine: MeshingEngine
+
+    # Phase profiler of the mesh generation spans, set by the MagneticComponent
+    profiler: Optional[PhaseProfiler]
+
+    # Size field of the adaptive mesh refinement: element node coordinates and mesh sizes, see set_refinement_size_field()
+    refinement_size_field: Optional[Tuple[np.ndarray, np.ndarray]]
+
     # Additionally there are all the needed lists for points, lines, curve_loops and plane_surfaces
     # See set_empty_lists()
 
@@ -97,6 +122,22 @@ class Mesh:
         self.thermal_mesh_file = file_paths.thermal_mesh_file
         self.gmsh_log = file_paths.gmsh_log
 
+        self.mesh_cache = None
+        self.mesh_cache_key = None
+        self.mesh_cache_hit = False
+
+        self.in_memory_gmsh_model = False
+        self.write_geo_file = False
+        self.geometry_model_name = None
+        self.geometry_in_memory = False
+        self.geometry_file_written = False
+        # tags of the gmsh post-processing views created by this mesh, which are not removed yet
+        self.view_tags = set()
+
+        self.meshing_engine = MeshingEngine()
+        self.profiler = None
+        self.refinement_size_field = None
+
     def femmt_print(self, text: str):
         """Print text to terminal or to log-file, dependent on the current verbosity."""
         if not self.verbosity == Verbosity.Silent:
@@ -1047,6 +1088,8 @@ class Mesh:
             gmsh.write(self.hybrid_color_png_file)  # save png
             gmsh.fltk.finalize()
 
+    @profiled_phase()
+    @gmsh_session
     def generate_hybrid_mesh(self, color_scheme: Dict = ff.colors_femmt_default, colors_geometry: Dict = ff.colors_geometry_femmt_default,
                              visualize_before: bool = False,
                              save_png: bool = True, refine=0, alternative_error=0):
@@ -1056,12 +1099,25 @@ class Mesh:
         - interaction with gmsh
         - mesh generation
             - Skin depth based forward meshing
-            - adaptive refinement [future TODO]
-                - with the help of mesh-size-fields/background meshes
-                - with an appropriate local error metric
+            - adaptive refinement is applied to the electro magnetic mesh, see set_refinement_size_field() and
+              generate_electro_magnetic_mesh(refine=1)
 
         :return:
         """
+        # In case of a cache hit, the geometry and the mesh are copied from the cache. gmsh is not needed.
+        self.mesh_cache_hit = False
+        self.geometry_in_memory = False
+        self.geometry_file_written = False
+        if self.mesh_cache is not None and self.mesh_cache_key is not None and not visualize_before and not save_png:
+            attributes = self.mesh_cache.load(self.mesh_cache_key, self.model_geo_file, self.e_m_mesh_file)
+            if attributes is not None:
+                self.femmt_print("Hybrid Mesh loaded from mesh cache")
+                for name, value in attributes.items():
+                    setattr(self, name, value)
+                self.mesh_cache_hit = True
+                self.geometry_file_written = True
+                return
+
         self.femmt_print("Hybrid Mesh Generation in Gmsh")
         # Initialization
         self.set_empty_plane_lists()
@@ -1070,7 +1126,9 @@ class Mesh:
         curve_loop_cond, curve_loop_island, curve_loop_air, curve_loop_air_gaps, curve_loop_iso_core = self.set_empty_curve_loop_lists()
 
         # Set path for storing the mesh file
-        gmsh.model.add(os.path.join(self.e_m_mesh_file, "geometry"))
+        self.geometry_model_name = os.path.join(self.e_m_mesh_file, "geometry")
+        # In case of an in-memory model, a geometry of a former call (e.g. with the case of the thermal mesh) is replaced
+        self.meshing_engine.add_model(self.geometry_model_name, replace=self.in_memory_gmsh_model)
 
         # Define mesh for core
         if self.core.core_type == CoreType.Single:
@@ -1109,25 +1167,146 @@ class Mesh:
         self.visualize(visualize_before, save_png)
 
         # If rectangular conductors are set, here additional points are added to make them more coarse in the center
+        embeddings = []
         if any([x.conductor_type == ConductorType.RectangularSolid for x in self.windings]):
-            self.rectangular_conductor_center_points()
+            embeddings = self.rectangular_conductor_center_points()
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        # TODO The following algorithms try to modify the mesh in order to reduce the runtime. But maybe the synchronize() calls
-        # have a high runtime. Check if this is true and when it does try to reduce the number of synchronize() calls by adding
-        # all points first and embed them later together:
+        # The following algorithms try to modify the mesh in order to reduce the runtime. All points are added first and
+        # are embedded together after a single synchronize() call.
         # This is added here therefore the additional points are not seen in the pictures and views
-        self.forward_meshing(p_cond)
+        self.forward_meshing(p_cond, embeddings)
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # No mesh is generated here, because generating a mesh, saving it as *.msh, loading it, appending more geometry data
         # and then mesh again can cause bugs in the mesh
         # Therefore only the model geometry is saved and the mesh will be generated later
+        # With an in-memory gmsh model, the geometry is kept in gmsh instead. The file is only written for debugging or
+        # for the mesh cache.
         # -> Save file as geo: File extension must be *.geo_unrolled
-        gmsh.write(self.model_geo_file)
+        self.geometry_in_memory = self.in_memory_gmsh_model
+        if not self.in_memory_gmsh_model or self.write_geo_file or self.mesh_cache is not None:
+            gmsh.write(self.model_geo_file)
+            self.geometry_file_written = True
 
+    @gmsh_session
+    def load_geometry(self):
+        """
+        Load the geometry of generate_hybrid_mesh() into gmsh, to add the physical entities and to generate a mesh.
+
+        With an in-memory gmsh model, the geometry model is re-used after removing its mesh and physical groups.
+        Otherwise, the model.geo_unrolled is opened. In case the in-memory geometry has been cleared or modified (e.g.
+        by the thermal mesh) and no model.geo_unrolled has been written, the geometry is generated again.
+        """
+        if self.geometry_in_memory and self.geometry_model_name in gmsh.model.list():
+            gmsh.model.setCurrent(self.geometry_model_name)
+            gmsh.model.mesh.clear()
+            gmsh.model.geo.removePhysicalGroups()
+            gmsh.model.removePhysicalGroups()
+            gmsh.model.geo.synchronize()
+        elif not self.in_memory_gmsh_model or self.geometry_file_written:
+            self.meshing_engine.open(self.model_geo_file)
+        else:
+            self.femmt_print("Geometry is not in memory anymore, generate it again")
+            self.generate_hybrid_mesh(visualize_before=False, save_png=False)
+            if self.geometry_in_memory:
+                gmsh.model.setCurrent(self.geometry_model_name)
+            else:
+                self.meshing_engine.open(self.model_geo_file)
+
+    @gmsh_session
+    def clear_gmsh_data(self):
+        """
+        Clear the gmsh data before the simulation.
+
+        An in-memory geometry is kept for the thermal mesh, only its mesh and the post-processing views of this mesh are
+        removed. Otherwise, all gmsh models are removed (only the models of this mesh with an isolated meshing engine).
+        """
+        if self.geometry_in_memory and self.geometry_model_name in gmsh.model.list():
+            gmsh.model.setCurrent(self.geometry_model_name)
+            gmsh.model.mesh.clear()
+            self.remove_views(self.view_tags)
+        else:
+            self.meshing_engine.clear()
+
+    def remove_views(self, view_tags: Iterable[int]):
+        """
+        Remove post-processing views of this mesh from gmsh, views of other meshes or of the user are kept.
+
+        :param view_tags: tags of the views
+        :type view_tags: Iterable[int]
+        """
+        existing_view_tags = gmsh.view.getTags()
+        for view_tag in list(view_tags):
+            if view_tag in existing_view_tags:
+                gmsh.view.remove(view_tag)
+            self.view_tags.discard(view_tag)
+
+    @gmsh_session
+    def read_refinement_field(self, field_file_path: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read the field of the last simulation, which is used as error indicator of the adaptive mesh refinement.
+
+        :param field_file_path: file path of the scalar field (.pos-file, typically the magnitude of the flux density
+            Magb.pos), written by GetDP on the elements
+        :type field_file_path: str
+        :return: node coordinates (elements x 3 nodes x 2) and node values (elements x 3 nodes) of the simulated mesh
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        number_of_views = len(gmsh.view.getTags())
+        gmsh.merge(field_file_path)
+        view_tags = gmsh.view.getTags()[number_of_views:]
+        self.view_tags.update(view_tags)
+        if not view_tags:
+            raise Exception(f"No field found in {field_file_path}.")
+        data_types, numbers_of_elements, list_data = gmsh.view.getListData(view_tags[0])
+        self.remove_views(view_tags)
+
+        # Scalar triangles: x-, y-, z-coordinates of the 3 nodes, then the 3 node values of every time step
+        if "ST" not in data_types:
+            raise Exception(f"The field in {field_file_path} contains no scalar values on triangles.")
+        number_of_elements = numbers_of_elements[data_types.index("ST")]
+        element_data = np.asarray(list_data[data_types.index("ST")], dtype=float).reshape(number_of_elements, -1)
+        node_coordinates = element_data[:, :6].reshape(number_of_elements, 2, 3).transpose(0, 2, 1)
+        # Complex results are written as two time steps (real and imaginary part)
+        node_values = np.sqrt(np.sum(element_data[:, 9:].reshape(number_of_elements, -1, 3) ** 2, axis=1))
+        return node_coordinates, node_values
+
+    def set_refinement_size_field(self, node_coordinates: np.ndarray, node_values: np.ndarray, refinement_fraction: float = 0.5,
+                                  refinement_factor: float = 0.5):
+        """
+        Calculate the size field of the adaptive mesh refinement from a field of the last simulation.
+
+        The error indicators are the jumps of the field between neighbouring elements (see femmt.adaptive_meshing). The
+        mesh size of the elements with the largest error indicators is reduced. The size field is used by
+        generate_electro_magnetic_mesh(refine=1).
+
+        :param node_coordinates: node coordinates of the field, see read_refinement_field()
+        :type node_coordinates: np.ndarray
+        :param node_values: node values of the field, see read_refinement_field()
+        :type node_values: np.ndarray
+        :param refinement_fraction: fraction of the total squared error, which is refined (0...1)
+        :type refinement_fraction: float
+        :param refinement_factor: factor of the mesh size of the refined elements
+        :type refinement_factor: float
+        """
+        sizes = refinement_sizes(node_coordinates, node_values, refinement_fraction, refinement_factor)
+        self.refinement_size_field = (node_coordinates, sizes)
+
+    @profiled_phase()
+    @gmsh_session
     def generate_electro_magnetic_mesh(self, refine=0):
-        """Generate the mesh for the electro magnetic FEM simulation."""
+        """
+        Generate the mesh for the electro magnetic FEM simulation.
+
+        :param refine: 1 to refine the mesh by the size field of set_refinement_size_field(), 0 for the standard mesh
+        :type refine: int
+        """
+        if self.mesh_cache_hit and refine == 0:
+            # electro_magnetic.msh has already been copied from the cache in generate_hybrid_mesh()
+            self.femmt_print("Electro Magnetic Mesh loaded from mesh cache")
+            return
+
         self.femmt_print("Electro Magnetic Mesh Generation in Gmsh (write physical entities)")
 
         self.PN_BOUND = 111111
@@ -1136,7 +1315,7 @@ class Mesh:
         self.PN_COND_SOLID = 130000
         self.PN_ROUND_LITZ = 150000
 
-        gmsh.open(self.model_geo_file)
+        self.load_geometry()
 
         def set_physical_surface_core():
             self.ps_core = []
@@ -1223,25 +1402,40 @@ class Mesh:
         gmsh.option.setNumber("Mesh.SurfaceFaces", 0)
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        # TODO: Adaptive Meshing
+        # Adaptive Meshing
         if refine == 1:
+            if self.refinement_size_field is None:
+                raise Exception("No size field for the mesh refinement. Call set_refinement_size_field() first.")
             self.femmt_print("\n ------- \nRefined Mesh Creation ")
-            # mesh the new gmsh.model using the size field
+            # size field as a post-processing view: x-, y-, z-coordinates and the mesh size at the 3 nodes per element
+            node_coordinates, sizes = self.refinement_size_field
+            size_field_data = np.column_stack([node_coordinates[:, :, 0], node_coordinates[:, :, 1],
+                                               np.zeros((len(sizes), 3)), np.repeat(sizes[:, np.newaxis], 3, axis=1)])
+            size_field_view = gmsh.view.add("refinement size field")
+            self.view_tags.add(size_field_view)
+            gmsh.view.addListData(size_field_view, "ST", len(sizes), size_field_data.ravel().tolist())
+
+            # mesh the new gmsh.model using the size field, the mesh sizes of the points still apply (minimum of both)
             bg_field = gmsh.model.mesh.field.add("PostView")
-            # TODO: gmsh.model.mesh.field.setNumber(bg_field, "ViewTag", sf_view)
+            gmsh.model.mesh.field.setNumber(bg_field, "ViewTag", size_field_view)
             gmsh.model.mesh.field.setAsBackgroundMesh(bg_field)
             self.femmt_print("\nMeshing...\n")
-            gmsh.model.mesh.generate(2)
+            self.meshing_engine.generate(2)
+            gmsh.model.mesh.field.remove(bg_field)
+            self.remove_views([size_field_view])
         else:
             # Mesh the model
             self.femmt_print("\nMeshing...\n")
-            gmsh.model.mesh.generate(2)
+            self.meshing_engine.generate(2)
 
         if not os.path.exists(self.mesh_folder_path):
             os.mkdir(self.mesh_folder_path)
 
         gmsh.write(self.e_m_mesh_file)
 
+        if self.mesh_cache is not None and self.mesh_cache_key is not None and refine == 0:
+            self.mesh_cache.store(self.mesh_cache_key, self.model_geo_file, self.e_m_mesh_file, self.mesh_cache_attributes())
+
         if self.verbosity == Verbosity.ToFile:
             lines = gmsh.logger.get()
             text = ""
@@ -1250,11 +1444,24 @@ class Mesh:
             with open(self.gmsh_log, "w") as fd:
                 fd.write(text)
 
+    def mesh_cache_attributes(self) -> Dict:
+        """
+        Collect the gmsh entity tags, which are needed after the mesh generation and are stored in the mesh cache.
+
+        :return: attributes of the mesh object
+        :rtype: Dict
+        """
+        return {name: value for name, value in self.__dict__.items() if name.startswith(MESH_CACHE_ATTRIBUTE_PREFIXES)}
+
+    @profiled_phase()
+    @gmsh_session
     def generate_thermal_mesh(self, case_gap_top, case_gap_right, case_gap_bot, color_scheme, colors_geometry, visualize_before):
         """Generate the mesh for the thermal FEM simulation."""
         self.femmt_print("Thermal Mesh Generation in Gmsh (write physical entities)")
 
-        gmsh.open(self.model_geo_file)
+        self.load_geometry()
+        # the case is added to the geometry, so it can not be used for the electro magnetic mesh anymore
+        self.geometry_in_memory = False
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
@@ -1549,15 +1756,23 @@ class Mesh:
             gmsh.fltk.run()
 
         # Output .msh file
-        gmsh.model.mesh.generate(2)
+        self.meshing_engine.generate(2)
 
         if not os.path.exists(self.mesh_folder_path):
             os.mkdir(self.mesh_folder_path)
 
         gmsh.write(self.thermal_mesh_file)
 
-    def inter_conductor_meshing(self, p_cond):
-        """To be defined."""
+    def inter_conductor_meshing(self, p_cond) -> List[Tuple[List[int], int]]:
+        """
+        Add points between round solid conductors and at their centers to raise the mesh density.
+
+        The points are only added to the geometry, they are embedded into the surfaces by embed_points().
+
+        :return: point tags and the tag of the surface to embed them into
+        :rtype: List[Tuple[List[int], int]]
+        """
+        embeddings = []
         p_inter = None
         for ww in self.model.winding_windows:
             for vww in ww.virtual_winding_windows:
@@ -1596,216 +1811,173 @@ class Mesh:
             self.femmt_print("Making use of skin based meshing\n")
             for num in range(len(self.windings)):
                 for i in range(0, int(len(p_cond[num]) / 5)):
-                    gmsh.model.mesh.embed(0, [p_cond[num][5 * i + 0]], 2, self.plane_surface_cond[num][i])
+                    embeddings.append(([p_cond[num][5 * i + 0]], self.plane_surface_cond[num][i]))
 
             # Embed points for mesh refinement
             # Inter Conductors
             for ww in self.model.winding_windows:
                 for vww in ww.virtual_winding_windows:
-                    if vww.winding_type != WindingType.TwoInterleaved:
-                        gmsh.model.geo.synchronize()  # added by Othman and need to be reviewed
-                        gmsh.model.mesh.embed(0, p_inter, 2, self.plane_surface_air[0])
+                    if vww.winding_type != WindingType.TwoInterleaved and p_inter:
+                        embeddings.append((p_inter, self.plane_surface_air[0]))
 
             # Stray path
             # mshopt gmsh.model.mesh.embed(0, stray_path_mesh_optimizer, 2, plane_surface_core[2])
+        return embeddings
 
-    def forward_meshing(self, p_cond):
-        """In this function multiple techniques in order to raise the mesh density at certain points are applied.
-
-        :return:
+    def rasterize_winding_window(self, left_bound: float, right_bound: float, bot_bound: float, top_bound: float,
+                                 air_surface: int) -> List[Tuple[List[int], int]]:
         """
-        def point_is_in_conductor(x, y, p1, p2, p3, p4, p5):
-            x_values = [p1[0], p2[0], p3[0], p4[0], p5[0]]
-            y_values = [p1[1], p2[1], p3[1], p4[1], p5[1]]
-            x_min = min(x_values)
-            y_min = min(y_values)
-            x_max = max(x_values)
-            y_max = max(y_values)
-            return point_is_in_rect(x, y, x_min, y_max, x_max, y_min)
-
-        def point_is_in_rect(x, y, left, top, right, bottom):
-            return x > left and x < right and y > bottom and y < top
-
-        def rasterize_winding_window(left_bound, right_bound, bot_bound, top_bound):
-            # Winding window rasterization:
-            # In order adjust the mesh density in empty parts of the winding window a grid of possible points
-            # is put on the winding window. Every point that is too close to the conductors is removed.
-            # Every remaining point is added to the mesh with a higher mesh density
-
-            # min_distance = max([winding.conductor_radius for winding in self.windings]) + max(self.insulation.inner_winding_insulations)
-            # min_distance = self.windings[0].conductor_radius
-            # min_distance = 0  # TODO: MA Project?
-
-            width = right_bound - left_bound
-            height = top_bound - bot_bound
-
-            number_cols = 17  # Can be changed. More points equal higher raster density
-            number_rows = int(number_cols * height / width)  # Assumption: number_cols/number_rows = width/height
-
-            cell_width = width / (number_cols + 1)
-            cell_height = height / (number_rows + 1)
-
-            # Get all possible points
-            possible_points = []
-            x = left_bound + cell_width / 2
-            y = bot_bound + cell_height / 2
-            for i in range(number_cols + 1):
-                for j in range(number_rows + 1):
-                    possible_points.append([x + i * cell_width, y + j * cell_height])
-
-            fixed_points = []  # Points from the conductors which should be avoided by this method
-            conductors = self.model.p_conductor
-            for winding_number, _ in enumerate(self.windings):
-                for i in range(len(conductors[winding_number]) // 5):
-                    p1 = conductors[winding_number][i * 5]
-                    p2 = conductors[winding_number][i * 5 + 1]
-                    p3 = conductors[winding_number][i * 5 + 2]
-                    p4 = conductors[winding_number][i * 5 + 3]
-                    p5 = conductors[winding_number][i * 5 + 4]
-                    fixed_points.append([p1, p2, p3, p4, p5, winding_number])
-                
-            # Because the points need to be embed into the right surface. The points now will be split between different insulations and the
-            # air in the winding window.
-            # TODO Currently primary secondary insulation is not considered
-            left_iso = []
-            right_iso = []
-            top_iso = []
-            bot_iso = []
-            air = []
+        Add the free raster points of a winding window to the geometry.
 
+        In order adjust the mesh density in empty parts of the winding window a grid of possible points is put on the
+        winding window. Every point that is too close to the conductors is removed (see
+        ff.winding_window_free_raster_points()). Every remaining point is added to the mesh with a higher mesh density.
+        The points are only added to the geometry, they are embedded into the surfaces by embed_points().
+
+        :return: point tags and the tag of the surface to embed them into
+        :rtype: List[Tuple[List[int], int]]
+        """
+        # min_distance = max([winding.conductor_radius for winding in self.windings]) + max(self.insulation.inner_winding_insulations)
+        # min_distance = self.windings[0].conductor_radius
+        # min_distance = 0  # TODO: MA Project?
+
+        # Points from the conductors which should be avoided by this method
+        round_conductor_centers = []
+        round_conductor_min_distances = []
+        rectangular_conductor_bounds = []
+        for winding_number, winding in enumerate(self.windings):
+            number_of_turns = len(self.model.p_conductor[winding_number]) // 5
+            if number_of_turns == 0:
+                continue
+            turn_points = np.array([point[:2] for point in self.model.p_conductor[winding_number][:5 * number_of_turns]],
+                                   dtype=float).reshape(number_of_turns, 5, 2)
+            if winding.conductor_type in [ConductorType.RoundLitz, ConductorType.RoundSolid]:
+                round_conductor_centers.append(turn_points[:, 0])
+                round_conductor_min_distances.append(np.full(number_of_turns, 1.1 * winding.conductor_radius))
+            elif winding.conductor_type == ConductorType.RectangularSolid:
+                # TODO Add a padding around the rect conductor so that the points cannot be arbitrarily near the conductor
+                rectangular_conductor_bounds.append(np.column_stack([turn_points.min(axis=1), turn_points.max(axis=1)]))
+            else:
+                print(f"Winding window rasterization skipped becuase ConductorType {winding.conductor_type.name} is not supported.")
+                return []
+
+        free_points = ff.winding_window_free_raster_points(
+            left_bound, right_bound, bot_bound, top_bound,
+            np.concatenate(round_conductor_centers) if round_conductor_centers else np.empty((0, 2)),
+            np.concatenate(round_conductor_min_distances) if round_conductor_min_distances else np.empty(0),
+            np.concatenate(rectangular_conductor_bounds) if rectangular_conductor_bounds else np.empty((0, 4)))
+
+        # Skip points in the stray_path
+        if self.component_type == ComponentType.IntegratedTransformer and self.core.core_type == CoreType.Single:
+            start_index = self.stray_path.start_index
+            stray_path_top_bound = self.air_gaps.midpoints[start_index + 1][1] - self.air_gaps.midpoints[start_index + 1][2] / 2
+            stray_path_bot_bound = self.air_gaps.midpoints[start_index][1] + self.air_gaps.midpoints[start_index][2] / 2
+            stray_path_right_bound = self.stray_path.length
+            stray_path_left_bound = left_bound
+
+            in_x_range = (free_points[:, 0] > stray_path_left_bound) & (free_points[:, 0] < stray_path_right_bound)
+            in_y_range = (free_points[:, 1] > stray_path_bot_bound) & (free_points[:, 1] < stray_path_top_bound)
+            free_points = free_points[~(in_x_range & in_y_range)]
+
+        # Because the points need to be embed into the right surface. The points now will be split between different insulations and the
+        # air in the winding window.
+        # TODO Currently primary secondary insulation is not considered
+        # surface index per point: 0 = air, 1..4 = left, top, right, bot insulation, -1 = not embedded
+        surfaces = [air_surface]
+        if self.component_type == ComponentType.IntegratedTransformer or not self.insulation.flag_insulation:
+            surface_indices = np.zeros(len(free_points), dtype=int)
+        elif self.model.p_iso_core:
             # insulations are currently not implemented for integrated transformers
-            if self.component_type != ComponentType.IntegratedTransformer:
-                if self.model.p_iso_core:  # check if list is not empty
-                    iso_core_left = self.model.p_iso_core[0]
-                    iso_core_top = self.model.p_iso_core[1]
-                    iso_core_right = self.model.p_iso_core[2]
-                    iso_core_bot = self.model.p_iso_core[3]
-
-            # Extract all free_points
-            for i in range(len(possible_points)):
-                x = possible_points[i][0]
-                y = possible_points[i][1]
-
-                # Check collision with fixed points
-                valid = True
-                for fixed_point in fixed_points:
-                    winding = self.windings[fixed_point[5]]
-                    p1 = fixed_point[0]
-                    p2 = fixed_point[1]
-                    p3 = fixed_point[2]
-                    p4 = fixed_point[3]
-                    p5 = fixed_point[4]
-
-                    if winding.conductor_type in [ConductorType.RoundLitz, ConductorType.RoundSolid]:
-                        current_min_distance = 1.1 * winding.conductor_radius
-                        dist = np.sqrt((p1[0] - x) ** 2 + (p1[1] - y) ** 2)
-                        if dist < current_min_distance:
-                            valid = False
-                            break
-                    elif winding.conductor_type == ConductorType.RectangularSolid:
-                        # TODO Add a padding around the rect conductor so that the points cannot be arbitrarily near the conductor
-                        if point_is_in_conductor(x, y, p1, p2, p3, p4, p5):
-                            valid = False
-                            break
-                    else:
-                        print(f"Winding window rasterization skipped becuase ConductorType {winding.conductor_type.name} is not supported.")
-                        return
+            surfaces += self.plane_surface_iso_core[:4]
+            surface_indices = np.zeros(len(free_points), dtype=int)
+            for iso_index in reversed(range(4)):
+                surface_indices[ff.points_are_in_rect(free_points, self.model.p_iso_core[iso_index])] = iso_index + 1
+        else:
+            surface_indices = np.full(len(free_points), -1)
 
-                if not valid:
-                    continue
+        # Add the points in the order of the raster
+        point_tags = [[] for _ in surfaces]
+        for (x, y), surface_index in zip(free_points.tolist(), surface_indices.tolist()):
+            if surface_index >= 0:
+                point_tags[surface_index].append(gmsh.model.geo.addPoint(x, y, 0, 10 * self.mesh_data.c_window))
 
-                # Check if point is in stray_path, skip if yes
-                if self.component_type == ComponentType.IntegratedTransformer and self.core.core_type == CoreType.Single:
-                    start_index = self.stray_path.start_index
-                    stray_path_top_bound = self.air_gaps.midpoints[start_index + 1][1] - self.air_gaps.midpoints[start_index + 1][2] / 2
-                    stray_path_bot_bound = self.air_gaps.midpoints[start_index][1] + self.air_gaps.midpoints[start_index][2] / 2
-                    stray_path_right_bound = self.stray_path.length
-                    stray_path_left_bound = left_bound
+        return [(tags, surface) for tags, surface in zip(point_tags, surfaces) if tags]
 
-                    if x > stray_path_left_bound and x < stray_path_right_bound and y > stray_path_bot_bound and y < stray_path_top_bound:
-                        continue
+    @staticmethod
+    def embed_points(embeddings: List[Tuple[List[int], int]]):
+        """
+        Add the points to the model and embed them into their surfaces.
 
-                # Point seems to be valid. Now find out in which surface the point belongs
-                center_point = gmsh.model.geo.addPoint(x, y, 0, 10 * self.mesh_data.c_window)
+        All points are added by a single synchronize() call and every surface is embedded by a single embed() call.
 
-                if self.component_type == ComponentType.IntegratedTransformer or not self.insulation.flag_insulation:
-                    air.append(center_point)
-                
-                if self.insulation.flag_insulation:
-                    if self.model.p_iso_core:  # check if list is not empty
-                        if ff.point_is_in_rect(x, y, iso_core_left):
-                            # Left iso
-                            left_iso.append(center_point)
-                        elif ff.point_is_in_rect(x, y, iso_core_top):
-                            # Top iso
-                            top_iso.append(center_point)
-                        elif ff.point_is_in_rect(x, y, iso_core_right):
-                            # Right iso
-                            right_iso.append(center_point)
-                        elif ff.point_is_in_rect(x, y, iso_core_bot):
-                            # Bot iso
-                            bot_iso.append(center_point)
-                        else:
-                            # Air
-                            air.append(center_point)
-
-            # Call synchronize so the points will be added to the model
-            gmsh.model.geo.synchronize()
+        :param embeddings: point tags and the tag of the surface to embed them into
+        :type embeddings: List[Tuple[List[int], int]]
+        """
+        # Call synchronize so the points will be added to the model
+        gmsh.model.geo.synchronize()
 
-            # Embed points into surfaces
-            if self.component_type != ComponentType.IntegratedTransformer and self.insulation.flag_insulation:
-                gmsh.model.mesh.embed(0, left_iso, 2, self.plane_surface_iso_core[0])
-                gmsh.model.mesh.embed(0, top_iso, 2, self.plane_surface_iso_core[1])
-                gmsh.model.mesh.embed(0, right_iso, 2, self.plane_surface_iso_core[2])
-                gmsh.model.mesh.embed(0, bot_iso, 2, self.plane_surface_iso_core[3])
+        point_tags_per_surface = {}
+        for point_tags, surface in embeddings:
+            point_tags_per_surface.setdefault(surface, []).extend(point_tags)
+        for surface, point_tags in point_tags_per_surface.items():
+            if point_tags:
+                gmsh.model.mesh.embed(0, list(dict.fromkeys(point_tags)), 2, surface)
 
-            return air
+    def forward_meshing(self, p_cond, embeddings: Optional[List[Tuple[List[int], int]]] = None):
+        """In this function multiple techniques in order to raise the mesh density at certain points are applied.
+
+        All points are added first and are embedded together by embed_points() afterwards.
+
+        :param embeddings: points of former steps, which are embedded together with the points of the forward meshing,
+            e.g. the center points of rectangular conductors
+        :type embeddings: List[Tuple[List[int], int]]
+        :return:
+        """
+        embeddings = [] if embeddings is None else list(embeddings)
 
         if self.core.core_type == CoreType.Single:
             # Inter Conductors
-            self.inter_conductor_meshing(p_cond)
+            embeddings += self.inter_conductor_meshing(p_cond)
 
             # Iterate over every winding window (typically one) and then iterate over every virtual winding window
             if self.wwr_enabled:
                 for winding_window in self.winding_windows:
                     for vww in winding_window.virtual_winding_windows:
-                        air_tags = rasterize_winding_window(vww.left_bound, vww.right_bound, vww.bot_bound, vww.top_bound)
-                        if air_tags is None or air_tags == []:
-                            continue
-                        gmsh.model.mesh.embed(0, air_tags, 2, self.plane_surface_air[0])
+                        embeddings += self.rasterize_winding_window(vww.left_bound, vww.right_bound, vww.bot_bound,
+                                                                    vww.top_bound, self.plane_surface_air[0])
 
         if self.core.core_type == CoreType.Stacked:
             # Inter Conductors
-            self.inter_conductor_meshing(p_cond)
+            embeddings += self.inter_conductor_meshing(p_cond)
 
             if self.wwr_enabled:
                 # Winding Windows list has exactly two winding windows: top and bot: 
                 if len(self.winding_windows) != 2:
                     print(f"Winding Window Rasterization is only implemented for stacked core with exactly 2 winding windows. "
                           f"{len(self.winding_windows)} winding windows were given.")
-                    gmsh.model.geo.synchronize()
-                    return
-
-                # Top window
-                for vww in self.winding_windows[0].virtual_winding_windows:
-                    air_tags = rasterize_winding_window(vww.left_bound, vww.right_bound, vww.bot_bound, vww.top_bound)
-                    if air_tags is None or air_tags == []:
-                        continue
-                    gmsh.model.mesh.embed(0, air_tags, 2, self.plane_surface_air_top[0])
-
-                for vww in self.winding_windows[1].virtual_winding_windows:
-                    air_tags = rasterize_winding_window(vww.left_bound, vww.right_bound, vww.bot_bound, vww.top_bound)
-                    if air_tags is None or air_tags == []:
-                        continue
-                    gmsh.model.mesh.embed(0, air_tags, 2, self.plane_surface_air_bot[0])
+                else:
+                    # Top window
+                    for vww in self.winding_windows[0].virtual_winding_windows:
+                        embeddings += self.rasterize_winding_window(vww.left_bound, vww.right_bound, vww.bot_bound,
+                                                                    vww.top_bound, self.plane_surface_air_top[0])
+
+                    for vww in self.winding_windows[1].virtual_winding_windows:
+                        embeddings += self.rasterize_winding_window(vww.left_bound, vww.right_bound, vww.bot_bound,
+                                                                    vww.top_bound, self.plane_surface_air_bot[0])
 
         # self.visualize(visualize_before=True, save_png=False)
 
-        # Synchronize again
-        gmsh.model.geo.synchronize()
+        self.embed_points(embeddings)
+
+    def rectangular_conductor_center_points(self) -> List[Tuple[List[int], int]]:
+        """
+        Add center points for rectangular conductors for better meshing.
 
-    def rectangular_conductor_center_points(self):
-        """Add center points for rectangular conductors for better meshing."""
+        The points are only added to the geometry, they are embedded into the surfaces by embed_points().
+
+        :return: point tags and the tag of the surface to embed them into
+        :rtype: List[Tuple[List[int], int]]
+        """
         def calculate_center_points(left_bound, right_bound, top_bound, bottom_bound, center_point, min_distance):
             """Calculate the coordinates for the new center points."""
             # As upper bound use a maximum of 10 points per direction
@@ -1861,14 +2033,10 @@ class Mesh:
 
                 new_gmsh_center_points.append(new_gmsh_winding_center_points)
 
-        # Call synchronize so the points will be added to the model
-        gmsh.model.geo.synchronize()
-        
-        # Embed new points into mesh
+        # New points for the embedding into the conductors
+        embeddings = []
         for winding_center_points in new_gmsh_center_points:
             for turn_number, turn_center_points in enumerate(winding_center_points):
                 winding_number = turn_center_points[0]
-                gmsh.model.mesh.embed(0, turn_center_points[1], 2, self.plane_surface_cond[winding_number][turn_number])
-
-        # Synchronize again
-        gmsh.model.geo.synchronize()
+                embeddings.append((turn_center_points[1], self.plane_surface_cond[winding_number][turn_number]))
+        return embeddings
@@ -0,0 +1,170 @@
+"""Content-addressed on-disk cache for the gmsh geometry and the electromagnetic mesh.
+
+An entry stores the model.geo_unrolled, the electro_magnetic.msh and the gmsh entity tags of the Mesh object, which
+are needed by the later steps (physical groups, Parameter.pro). The entry key is a hash of the geometry settings and
+the mesh data. Entries are evicted in least-recently-used order, as soon as the cache exceeds its maximum size.
+"""
+# Python standard libraries
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from typing import Dict, List, Optional
+
+# Version of the cache entries. Increase in case of changes in the mesh generation, to not re-use outdated meshes.
+MESH_CACHE_VERSION = 1
+
+# Attributes of the Mesh object, which are restored from the cache (gmsh entity tags)
+MESH_CACHE_ATTRIBUTE_PREFIXES = ("plane_surface_", "ps_", "pc_", "PN_", "l_bound_tmp")
+
+_geo_file_name = "model.geo_unrolled"
+_mesh_file_name = "electro_magnetic.msh"
+_attributes_file_name = "mesh_attributes.json"
+
+
+class MeshCache:
+    """Size-bounded least-recently-used cache for meshes."""
+
+    def __init__(self, cache_folder_path: str, max_size: float = 1e9):
+        """
+        Initialize the mesh cache.
+
+        :param cache_folder_path: folder to store the cache entries
+        :type cache_folder_path: str
+        :param max_size: maximum size of the cache in bytes
+        :type max_size: float
+        """
+        self.cache_folder_path = cache_folder_path
+        self.max_size = max_size
+        self.number_of_hits = 0
+        self.number_of_misses = 0
+        if not os.path.exists(self.cache_folder_path):
+            os.makedirs(self.cache_folder_path, exist_ok=True)
+
+    @staticmethod
+    def create_key(*key_content) -> str:
+        """
+        Create the cache key for the given content.
+
+        :param key_content: JSON-serializable content, which determines the mesh (e.g. geometry settings, mesh data)
+        :return: cache key
+        :rtype: str
+        """
+        content = json.dumps([MESH_CACHE_VERSION, *key_content], sort_keys=True, default=str)
+        return hashlib.sha1(content.encode()).hexdigest()
+
+    def _entry_folder_path(self, key: str) -> str:
+        return os.path.join(self.cache_folder_path, key)
+
+    def contains(self, key: str) -> bool:
+        """
+        Check if a complete entry for the given key exists.
+
+        :param key: cache key
+        :type key: str
+        :return: True in case of an existing entry
+        :rtype: bool
+        """
+        entry_folder_path = self._entry_folder_path(key)
+        return all(os.path.isfile(os.path.join(entry_folder_path, file_name))
+                   for file_name in [_geo_file_name, _mesh_file_name, _attributes_file_name])
+
+    def load(self, key: str, model_geo_file: str, e_m_mesh_file: str) -> Optional[Dict]:
+        """
+        Copy the cached files to the given paths and return the cached mesh attributes.
+
+        :param key: cache key
+        :type key: str
+        :param model_geo_file: destination of the model.geo_unrolled
+        :type model_geo_file: str
+        :param e_m_mesh_file: destination of the electro_magnetic.msh
+        :type e_m_mesh_file: str
+        :return: mesh attributes, None in case of a cache miss
+        :rtype: Dict
+        """
+        if not self.contains(key):
+            self.number_of_misses += 1
+            return None
+
+        entry_folder_path = self._entry_folder_path(key)
+        try:
+            with open(os.path.join(entry_folder_path, _attributes_file_name), "r") as fd:
+                attributes = json.load(fd)
+            for file_name, destination in [(_geo_file_name, model_geo_file), (_mesh_file_name, e_m_mesh_file)]:
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                shutil.copyfile(os.path.join(entry_folder_path, file_name), destination)
+            # mark the entry as recently used
+            os.utime(entry_folder_path)
+        except (OSError, ValueError):
+            # entry was evicted by another process in the meantime or is broken
+            self.number_of_misses += 1
+            return None
+
+        self.number_of_hits += 1
+        return attributes
+
+    def store(self, key: str, model_geo_file: str, e_m_mesh_file: str, attributes: Dict) -> None:
+        """
+        Store the given files and mesh attributes in the cache and evict old entries if necessary.
+
+        :param key: cache key
+        :type key: str
+        :param model_geo_file: path of the model.geo_unrolled
+        :type model_geo_file: str
+        :param e_m_mesh_file: path of the electro_magnetic.msh
+        :type e_m_mesh_file: str
+        :param attributes: JSON-serializable mesh attributes
+        :type attributes: Dict
+        """
+        if self.contains(key):
+            return
+
+        # Write the entry to a temporary folder first and rename it afterwards, so other processes never see an
+        # incomplete entry.
+        temporary_folder_path = tempfile.mkdtemp(prefix=".tmp_", dir=self.cache_folder_path)
+        try:
+            shutil.copyfile(model_geo_file, os.path.join(temporary_folder_path, _geo_file_name))
+            shutil.copyfile(e_m_mesh_file, os.path.join(temporary_folder_path, _mesh_file_name))
+            with open(os.path.join(temporary_folder_path, _attributes_file_name), "w") as fd:
+                json.dump(attributes, fd)
+            os.rename(temporary_folder_path, self._entry_folder_path(key))
+        except (OSError, TypeError):
+            # entry was stored by another process in the meantime or the attributes are not serializable
+            shutil.rmtree(temporary_folder_path, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self) -> List[str]:
+        """
+        Remove the least recently used entries until the cache size is below the maximum size.
+
+        :return: keys of the removed entries
+        :rtype: List[str]
+        """
+        entries = []
+        total_size = 0
+        for key in os.listdir(self.cache_folder_path):
+            entry_folder_path = self._entry_folder_path(key)
+            if key.startswith(".") or not os.path.isdir(entry_folder_path):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(entry_folder_path) if entry.is_file())
+                entries.append((os.stat(entry_folder_path).st_mtime, key, size))
+            except OSError:
+                continue
+            total_size += size
+
+        removed_keys = []
+        for _, key, size in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(self._entry_folder_path(key), ignore_errors=True)
+            total_size -= size
+            removed_keys.append(key)
+        return removed_keys
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for key in os.listdir(self.cache_folder_path):
+            shutil.rmtree(self._entry_folder_path(key), ignore_errors=True)
@@ -0,0 +1,418 @@
+"""Mesh accuracy tuning: the coarsest mesh accuracies per topology, which keep the results within a tolerance.
+
+A profile file is a JSON file with one profile per topology (component type and core type, see
+mesh_accuracy_profile_key()). A profile contains the mesh accuracies of the core, the window, the conductors and the
+air gaps, which are applied by the MagneticComponent (see its argument mesh_accuracy_profile_file_path). The profiles
+are created by convergence studies of a reference design per topology (see create_mesh_accuracy_profiles()):
+
+    python -m femmt.mesh_tuning mesh_accuracy_profiles.json --tolerance 0.01
+"""
+# Python standard libraries
+import os
+import json
+import argparse
+import tempfile
+import contextlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Local libraries
+from femmt.enumerations import ComponentType, CoreType
+from femmt.adaptive_meshing import relative_change
+
+# Version of the profile files. Increase in case of changes in the mesh generation, to not re-use outdated profiles.
+MESH_ACCURACY_PROFILES_VERSION = 1
+
+# Mesh accuracies of a profile, in the order of the tuning
+MESH_ACCURACY_NAMES = ["mesh_accuracy_core", "mesh_accuracy_window", "mesh_accuracy_conductor", "mesh_accuracy_air_gaps"]
+
+# Mesh accuracy of the reference simulation and the coarser candidates of the tuning (higher values are coarser)
+DEFAULT_REFERENCE_MESH_ACCURACY = 0.1
+DEFAULT_MESH_ACCURACY_CANDIDATES = [0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0]
+
+
+def mesh_accuracy_profile_key(component_type: ComponentType, core_type: CoreType = CoreType.Single) -> str:
+    """
+    Get the key of the profile of a topology.
+
+    :param component_type: component type
+    :type component_type: ComponentType
+    :param core_type: core type
+    :type core_type: CoreType
+    :return: profile key, e.g. 'Inductor_Single'
+    :rtype: str
+    """
+    return f"{ComponentType(component_type).name}_{CoreType(core_type).name}"
+
+
+def read_mesh_accuracy_profiles(profile_file_path: str) -> Dict[str, Dict]:
+    """
+    Read all profiles of a profile file.
+
+    Profile files of another version are ignored.
+
+    :param profile_file_path: file path of the profile file
+    :type profile_file_path: str
+    :return: profiles, key is the profile key
+    :rtype: Dict[str, Dict]
+    """
+    if not os.path.isfile(profile_file_path):
+        return {}
+    with open(profile_file_path, "r") as fd:
+        content = json.load(fd)
+    if content.get("version") != MESH_ACCURACY_PROFILES_VERSION:
+        return {}
+    return content.get("profiles", {})
+
+
+def write_mesh_accuracy_profile(profile_file_path: str, profile_key: str, profile: Dict):
+    """
+    Add or replace a profile in a profile file.
+
+    The file is replaced atomically, so readers never see a partially written file.
+
+    :param profile_file_path: file path of the profile file
+    :type profile_file_path: str
+    :param profile_key: profile key, see mesh_accuracy_profile_key()
+    :type profile_key: str
+    :param profile: profile, at least containing the mesh accuracies of MESH_ACCURACY_NAMES
+    :type profile: Dict
+    """
+    missing_names = [name for name in MESH_ACCURACY_NAMES if name not in profile]
+    if missing_names:
+        raise ValueError(f"The profile misses the mesh accuracies {missing_names}.")
+
+    profiles = read_mesh_accuracy_profiles(profile_file_path)
+    profiles[profile_key] = profile
+
+    profile_folder_path = os.path.dirname(os.path.abspath(profile_file_path))
+    os.makedirs(profile_folder_path, exist_ok=True)
+    file_descriptor, temporary_file_path = tempfile.mkstemp(suffix=".json", dir=profile_folder_path)
+    with os.fdopen(file_descriptor, "w") as fd:
+        json.dump({"version": MESH_ACCURACY_PROFILES_VERSION, "profiles": profiles}, fd, indent=2)
+    os.replace(temporary_file_path, profile_file_path)
+
+
+def load_mesh_accuracy_profile(profile_file_path: str, component_type: ComponentType,
+                               core_type: CoreType = CoreType.Single) -> Optional[Dict[str, float]]:
+    """
+    Load the mesh accuracies of a topology.
+
+    :param profile_file_path: file path of the profile file
+    :type profile_file_path: str
+    :param component_type: component type
+    :type component_type: ComponentType
+    :param core_type: core type
+    :type core_type: CoreType
+    :return: mesh accuracies, key is the name of the mesh accuracy. None in case of no profile for the topology.
+    :rtype: Dict[str, float]
+    """
+    profile = read_mesh_accuracy_profiles(profile_file_path).get(mesh_accuracy_profile_key(component_type, core_type))
+    if profile is None:
+        return None
+    return {name: profile[name] for name in MESH_ACCURACY_NAMES}
+
+
+def tune_mesh_accuracies(simulate: Callable[[Dict[str, float]], List[float]], tolerance: float = 0.01,
+                         reference_mesh_accuracy: float = DEFAULT_REFERENCE_MESH_ACCURACY,
+                         mesh_accuracy_candidates: Optional[List[float]] = None) -> Dict:
+    """
+    Find the coarsest mesh accuracies, which keep the simulation results within the tolerance of a fine reference.
+
+    The mesh accuracies are coarsened one after the other (in the order of MESH_ACCURACY_NAMES), every accuracy up to
+    the coarsest candidate, which is still within the tolerance together with the already coarsened accuracies. So the
+    resulting combination of mesh accuracies is always within the tolerance.
+
+    :param simulate: function, which simulates the reference design for the given mesh accuracies (key is the name
+        of the mesh accuracy) and returns the results to compare, e.g. the total losses and the self inductances
+    :type simulate: Callable[[Dict[str, float]], List[float]]
+    :param tolerance: relative tolerance of all results compared to the reference simulation
+    :type tolerance: float
+    :param reference_mesh_accuracy: mesh accuracy of the reference simulation
+    :type reference_mesh_accuracy: float
+    :param mesh_accuracy_candidates: coarser mesh accuracies to try, defaults to DEFAULT_MESH_ACCURACY_CANDIDATES
+    :type mesh_accuracy_candidates: List[float]
+    :return: profile with the mesh accuracies, the tolerance, the relative error and the results of the reference
+        and the tuned simulation and the number of simulations
+    :rtype: Dict
+    """
+    if mesh_accuracy_candidates is None:
+        mesh_accuracy_candidates = DEFAULT_MESH_ACCURACY_CANDIDATES
+    mesh_accuracy_candidates = sorted(candidate for candidate in mesh_accuracy_candidates if candidate > reference_mesh_accuracy)
+
+    results = {}
+
+    def simulate_once(mesh_accuracies: Dict[str, float]) -> List[float]:
+        key = tuple(mesh_accuracies[name] for name in MESH_ACCURACY_NAMES)
+        if key not in results:
+            results[key] = [float(value) for value in simulate(dict(mesh_accuracies))]
+        return results[key]
+
+    tuned_mesh_accuracies = {name: reference_mesh_accuracy for name in MESH_ACCURACY_NAMES}
+    reference_values = simulate_once(tuned_mesh_accuracies)
+    relative_error = 0.0
+    for name in MESH_ACCURACY_NAMES:
+        for candidate in mesh_accuracy_candidates:
+            trial_mesh_accuracies = {**tuned_mesh_accuracies, name: candidate}
+            trial_relative_error = relative_change(simulate_once(trial_mesh_accuracies), reference_values)
+            if trial_relative_error > tolerance:
+                break
+            tuned_mesh_accuracies = trial_mesh_accuracies
+            relative_error = trial_relative_error
+
+    return {**tuned_mesh_accuracies,
+            "tolerance": tolerance,
+            "relative_error": relative_error,
+            "reference_mesh_accuracy": reference_mesh_accuracy,
+            "reference_values": reference_values,
+            "values": simulate_once(tuned_mesh_accuracies),
+            "number_of_simulations": len(results)}
+
+
+# Topologies with a reference design: (component type, core type)
+REFERENCE_TOPOLOGIES = [(ComponentType.Inductor, CoreType.Single), (ComponentType.Transformer, CoreType.Single),
+                        (ComponentType.IntegratedTransformer, CoreType.Single),
+                        (ComponentType.IntegratedTransformer, CoreType.Stacked)]
+
+
+def reference_design(component_type: ComponentType, core_type: CoreType, working_directory: str,
+                     mesh_accuracies: Dict[str, float]) -> Tuple:
+    """
+    Create the reference design of a topology for the mesh accuracy tuning.
+
+    The designs follow the basic examples, but use a material with a fixed permeability, so no material measurements
+    are needed.
+
+    :param component_type: component type
+    :type component_type: ComponentType
+    :param core_type: core type
+    :type core_type: CoreType
+    :param working_directory: working directory of the design
+    :type working_directory: str
+    :param mesh_accuracies: mesh accuracies, key is the name of the mesh accuracy
+    :type mesh_accuracies: Dict[str, float]
+    :return: magnetic component, frequency, currents and phases of the reference simulation
+    :rtype: Tuple
+    """
+    # local imports, as the MagneticComponent uses the profiles
+    from femmt.component import MagneticComponent
+    from femmt.model import Core, AirGaps, Insulation, WindingWindow, Conductor, StrayPath
+    from femmt.dtos import SingleCoreDimensions, StackedCoreDimensions
+    from femmt.functions import core_database
+    from femmt.functions_topologies import create_stacked_winding_windows
+    from femmt.enumerations import (Verbosity, MaterialDataSource, AirGapMethod, AirGapLegPosition, StackedPosition, Conductivity,
+                                    ConductorArrangement, WindingWindowSplit, InterleavedWindingScheme, Align, ConductorDistribution)
+
+    topology = (ComponentType(component_type), CoreType(core_type))
+    if topology not in REFERENCE_TOPOLOGIES:
+        raise ValueError(f"No reference design for {mesh_accuracy_profile_key(*topology)}. "
+                         f"Reference designs: {[mesh_accuracy_profile_key(*item) for item in REFERENCE_TOPOLOGIES]}")
+
+    geo = MagneticComponent(component_type=component_type, working_directory=working_directory, verbosity=Verbosity.Silent)
+    geo.update_mesh_accuracies(*[mesh_accuracies[name] for name in MESH_ACCURACY_NAMES])
+    material = {"mu_r_abs": 3100, "phi_mu_deg": 12, "sigma": 1.2, "permeability_datasource": MaterialDataSource.Custom,
+                "permittivity_datasource": MaterialDataSource.Custom}
+
+    if topology == (ComponentType.Inductor, CoreType.Single):
+        core_db = core_database()["PQ 40/40"]
+        core_dimensions = SingleCoreDimensions(core_inner_diameter=core_db["core_inner_diameter"], window_w=core_db["window_w"],
+                                               window_h=core_db["window_h"], core_h=core_db["core_h"])
+        core = Core(core_type=CoreType.Single, core_dimensions=core_dimensions, **material)
+        geo.set_core(core)
+
+        air_gaps = AirGaps(AirGapMethod.Percent, core)
+        air_gaps.add_air_gap(AirGapLegPosition.CenterLeg, 0.0005, 50)
+        geo.set_air_gaps(air_gaps)
+
+        insulation = Insulation(flag_insulation=True)
+        insulation.add_core_insulations(0.001, 0.001, 0.003, 0.001)
+        insulation.add_winding_insulations([[0.0005]])
+        geo.set_insulation(insulation)
+
+        winding_window = WindingWindow(core, insulation)
+        vww = winding_window.split_window(WindingWindowSplit.NoSplit)
+        winding = Conductor(0, Conductivity.Copper)
+        winding.set_solid_round_conductor(conductor_radius=0.0013, conductor_arrangement=ConductorArrangement.Square)
+        winding.parallel = False
+        vww.set_winding(winding, 14, None, Align.ToEdges, placing_strategy=ConductorDistribution.HorizontalRightward_VerticalUpward,
+                        zigzag=True)
+        geo.set_winding_windows([winding_window])
+        return geo, 270000, [4.5], []
+
+    if topology == (ComponentType.Transformer, CoreType.Single):
+        core_dimensions = SingleCoreDimensions(core_inner_diameter=0.015, window_w=0.012, window_h=0.0295, core_h=0.04)
+        core = Core(core_dimensions=core_dimensions, **material)
+        geo.set_core(core)
+
+        air_gaps = AirGaps(AirGapMethod.Percent, core)
+        air_gaps.add_air_gap(AirGapLegPosition.CenterLeg, 0.0005, 50)
+        geo.set_air_gaps(air_gaps)
+
+        insulation = Insulation(flag_insulation=True)
+        insulation.add_core_insulations(0.001, 0.001, 0.002, 0.001)
+        insulation.add_winding_insulations([[0.0002, 0.001], [0.001, 0.0002]])
+        geo.set_insulation(insulation)
+
+        winding_window = WindingWindow(core, insulation)
+        bot, top = winding_window.split_window(WindingWindowSplit.HorizontalSplit, split_distance=0.001)
+        winding1 = Conductor(0, Conductivity.Copper)
+        winding1.set_solid_round_conductor(0.0011, ConductorArrangement.Square)
+        winding2 = Conductor(1, Conductivity.Copper)
+        winding2.set_solid_round_conductor(0.0011, ConductorArrangement.Square)
+        winding2.parallel = False
+        bot.set_winding(winding2, 10, None, Align.ToEdges, ConductorDistribution.VerticalUpward_HorizontalRightward, zigzag=False)
+        top.set_winding(winding1, 10, None, Align.ToEdges, ConductorDistribution.VerticalUpward_HorizontalRightward, zigzag=False)
+        geo.set_winding_windows([winding_window])
+        return geo, 200000, [2, 2], [0, 180]
+
+    if topology == (ComponentType.IntegratedTransformer, CoreType.Single):
+        core_dimensions = SingleCoreDimensions(core_inner_diameter=0.02, window_w=0.011, window_h=0.03, core_h=0.08)
+        core = Core(core_dimensions=core_dimensions, **material)
+        geo.set_core(core)
+
+        stray_path = StrayPath(start_index=0, length=geo.core.core_inner_diameter / 2 + geo.core.window_w - 0.001)
+        geo.set_stray_path(stray_path)
+
+        air_gaps = AirGaps(AirGapMethod.Percent, core)
+        air_gaps.add_air_gap(AirGapLegPosition.CenterLeg, 0.003, 30)
+        air_gaps.add_air_gap(AirGapLegPosition.CenterLeg, 0.003, 60)
+        air_gaps.add_air_gap(AirGapLegPosition.CenterLeg, 0.001, 80)
+        geo.set_air_gaps(air_gaps)
+
+        insulation = Insulation(flag_insulation=False)
+        insulation.add_core_insulations(0.001, 0.001, 0.002, 0.001)
+        insulation.add_winding_insulations([[0.0002, 0.001], [0.001, 0.0002]])
+        geo.set_insulation(insulation)
+
+        winding_window = WindingWindow(core, insulation, stray_path, air_gaps)
+        top, bot = winding_window.split_window(WindingWindowSplit.HorizontalSplit)
+        winding1 = Conductor(0, Conductivity.Copper)
+        winding1.set_solid_round_conductor(0.0008, ConductorArrangement.Square)
+        winding2 = Conductor(1, Conductivity.Copper)
+        winding2.set_solid_round_conductor(0.0008, ConductorArrangement.Square)
+        top.set_interleaved_winding(winding1, 3, winding2, 6, InterleavedWindingScheme.HorizontalAlternating)
+        bot.set_interleaved_winding(winding1, 1, winding2, 2, InterleavedWindingScheme.HorizontalAlternating)
+        geo.set_winding_windows([winding_window])
+        return geo, 250000, [8.0, 4.0], [0, 180]
+
+    # integrated transformer with a stacked core
+    core_dimensions = StackedCoreDimensions(core_inner_diameter=0.02, window_w=0.02, window_h_top=0.01, window_h_bot=0.03)
+    core = Core(core_type=CoreType.Stacked, core_dimensions=core_dimensions, **material)
+    geo.set_core(core)
+
+    air_gaps = AirGaps(AirGapMethod.Stacked, core)
+    air_gaps.add_air_gap(AirGapLegPosition.CenterLeg, 0.002, stacked_position=StackedPosition.Top)
+    air_gaps.add_air_gap(AirGapLegPosition.CenterLeg, 0.001, stacked_position=StackedPosition.Bot)
+    geo.set_air_gaps(air_gaps)
+
+    insulation = Insulation(flag_insulation=False)
+    insulation.add_core_insulations(0.001, 0.001, 0.001, 0.001)
+    insulation.add_winding_insulations([[0.0002, 0.001], [0.001, 0.0002]])
+    geo.set_insulation(insulation)
+
+    winding_window_top, winding_window_bot = create_stacked_winding_windows(core, insulation)
+    vww_top = winding_window_top.split_window(WindingWindowSplit.NoSplit)
+    vww_bot = winding_window_bot.split_window(WindingWindowSplit.NoSplit)
+    winding1 = Conductor(0, Conductivity.Copper)
+    winding1.set_solid_round_conductor(0.0008, ConductorArrangement.Square)
+    winding2 = Conductor(1, Conductivity.Copper)
+    winding2.set_solid_round_conductor(1e-3, ConductorArrangement.Square)
+    vww_top.set_interleaved_winding(winding1, 16, winding2, 0, InterleavedWindingScheme.HorizontalAlternating)
+    vww_bot.set_interleaved_winding(winding1, 40, winding2, 20, InterleavedWindingScheme.HorizontalAlternating)
+    geo.set_winding_windows([winding_window_top, winding_window_bot])
+    return geo, 250000, [2.0, 4.0], [0, 180]
+
+
+def create_mesh_accuracy_profile(profile_file_path: str, component_type: ComponentType, core_type: CoreType = CoreType.Single,
+                                 working_directory: Optional[str] = None, tolerance: float = 0.01,
+                                 reference_mesh_accuracy: float = DEFAULT_REFERENCE_MESH_ACCURACY,
+                                 mesh_accuracy_candidates: Optional[List[float]] = None) -> Dict:
+    """
+    Tune the mesh accuracies of a topology by its reference design and store the profile in the profile file.
+
+    :param profile_file_path: file path of the profile file
+    :type profile_file_path: str
+    :param component_type: component type
+    :type component_type: ComponentType
+    :param core_type: core type
+    :type core_type: CoreType
+    :param working_directory: working directory of the simulations. Defaults to None (temporary folder)
+    :type working_directory: str
+    :param tolerance: relative tolerance of the total losses and the self inductances
+    :type tolerance: float
+    :param reference_mesh_accuracy: mesh accuracy of the reference simulation
+    :type reference_mesh_accuracy: float
+    :param mesh_accuracy_candidates: coarser mesh accuracies to try, defaults to DEFAULT_MESH_ACCURACY_CANDIDATES
+    :type mesh_accuracy_candidates: List[float]
+    :return: profile
+    :rtype: Dict
+    """
+    with contextlib.ExitStack() as stack:
+        if working_directory is None:
+            working_directory = stack.enter_context(tempfile.TemporaryDirectory(prefix="femmt_mesh_tuning_"))
+
+        def simulate(mesh_accuracies: Dict[str, float]) -> List[float]:
+            geo, frequency, current, phi_deg = reference_design(component_type, core_type, working_directory, mesh_accuracies)
+            geo.create_model(freq=frequency, pre_visualize_geometry=False, save_png=False)
+            geo.single_simulation(freq=frequency, current=current, phi_deg=phi_deg, show_fem_simulation_results=False)
+            return geo.read_total_losses_and_self_inductances()
+
+        profile = tune_mesh_accuracies(simulate, tolerance, reference_mesh_accuracy, mesh_accuracy_candidates)
+
+    write_mesh_accuracy_profile(profile_file_path, mesh_accuracy_profile_key(component_type, core_type), profile)
+    return profile
+
+
+def create_mesh_accuracy_profiles(profile_file_path: str, topologies: Optional[List[Tuple[ComponentType, CoreType]]] = None,
+                                  working_directory: Optional[str] = None, tolerance: float = 0.01,
+                                  reference_mesh_accuracy: float = DEFAULT_REFERENCE_MESH_ACCURACY,
+                                  mesh_accuracy_candidates: Optional[List[float]] = None) -> Dict[str, Dict]:
+    """
+    Tune the mesh accuracies of several topologies and store the profiles in the profile file.
+
+    :param profile_file_path: file path of the profile file
+    :type profile_file_path: str
+    :param topologies: (component type, core type) of the topologies, defaults to REFERENCE_TOPOLOGIES
+    :type topologies: List[Tuple[ComponentType, CoreType]]
+    :param working_directory: working directory of the simulations. Defaults to None (temporary folder)
+    :type working_directory: str
+    :param tolerance: relative tolerance of the total losses and the self inductances
+    :type tolerance: float
+    :param reference_mesh_accuracy: mesh accuracy of the reference simulations
+    :type reference_mesh_accuracy: float
+    :param mesh_accuracy_candidates: coarser mesh accuracies to try, defaults to DEFAULT_MESH_ACCURACY_CANDIDATES
+    :type mesh_accuracy_candidates: List[float]
+    :return: profiles, key is the profile key
+    :rtype: Dict[str, Dict]
+    """
+    profiles = {}
+    for component_type, core_type in topologies or REFERENCE_TOPOLOGIES:
+        profiles[mesh_accuracy_profile_key(component_type, core_type)] = create_mesh_accuracy_profile(
+            profile_file_path, component_type, core_type, working_directory, tolerance, reference_mesh_accuracy,
+            mesh_accuracy_candidates)
+    return profiles
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Tune the mesh accuracies of the reference designs and store the profiles.")
+    parser.add_argument("profile_file_path", help="file path of the profile file")
+    parser.add_argument("--topologies", nargs="*", default=None,
+                        help=f"profile keys of the topologies, defaults to all: "
+                             f"{[mesh_accuracy_profile_key(*topology) for topology in REFERENCE_TOPOLOGIES]}")
+    parser.add_argument("--working-directory", default=None, help="working directory of the simulations")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="relative tolerance of the losses and inductances")
+    parser.add_argument("--reference-mesh-accuracy", type=float, default=DEFAULT_REFERENCE_MESH_ACCURACY,
+                        help="mesh accuracy of the reference simulations")
+    arguments = parser.parse_args()
+    selected_topologies = None
+    if arguments.topologies is not None:
+        topologies_by_key = {mesh_accuracy_profile_key(*topology): topology for topology in REFERENCE_TOPOLOGIES}
+        unknown_keys = [key for key in arguments.topologies if key not in topologies_by_key]
+        if unknown_keys:
+            parser.error(f"unknown topologies {unknown_keys}")
+        selected_topologies = [topologies_by_key[key] for key in arguments.topologies]
+    for key, created_profile in create_mesh_accuracy_profiles(
+            arguments.profile_file_path, selected_topologies, arguments.working_directory, arguments.tolerance,
+            arguments.reference_mesh_accuracy).items():
+        mesh_accuracies = ", ".join(f"{name} {created_profile[name]}" for name in MESH_ACCURACY_NAMES)
+        print(f"{key}: {mesh_accuracies} (relative error {created_profile['relative_error']:.3g}, "
+              f"{created_profile['number_of_simulations']} simulations)")
@@ -0,0 +1,218 @@
+"""Meshing engine to configure and isolate the gmsh state of the magnetic components.
+
+gmsh keeps a single global state per process (models, options, post-processing views) and its API is not thread-safe.
+The MeshingEngine serializes all gmsh calls of a component within a process by a process-wide lock, applies the
+number of meshing threads and the meshing algorithm per call of generate() and restores the former options afterwards.
+In isolated mode, the engine only removes the gmsh models it created itself instead of clearing the whole gmsh state,
+so several components can use gmsh in the same process.
+
+mesh_in_pool() meshes several designs at once. In a process pool every worker process has its own gmsh state and the
+designs are meshed really in parallel. In a thread pool the gmsh calls of the designs are serialized by the lock, but
+everything else (e.g. the geometry generation or the GetDP solver runs) overlaps.
+"""
+# Python standard libraries
+import os
+import threading
+import functools
+import contextlib
+import multiprocessing
+import concurrent.futures
+from typing import Callable, Dict, List, Optional
+
+# Third parry libraries
+import gmsh
+
+# Local libraries
+from femmt.enumerations import MeshAlgorithm2D
+
+# Process-wide lock for all gmsh calls, re-entrant to allow nested sessions
+gmsh_lock = threading.RLock()
+
+
+class MeshingEngine:
+    """Configure the gmsh meshing and keep track of the gmsh models of a single magnetic component."""
+
+    def __init__(self, number_of_threads: Optional[int] = None, algorithm_2d: Optional[MeshAlgorithm2D] = None,
+                 isolated: bool = False):
+        """
+        Initialize the meshing engine.
+
+        :param number_of_threads: number of threads of the gmsh meshing, 0 for all CPU cores. Defaults to None (gmsh
+            option is not changed). Multithreaded meshing needs a gmsh build with OpenMP support.
+        :type number_of_threads: int
+        :param algorithm_2d: 2D meshing algorithm, defaults to None (gmsh option is not changed)
+        :type algorithm_2d: MeshAlgorithm2D
+        :param isolated: True to only remove the gmsh models of this engine, instead of clearing the whole gmsh state
+        :type isolated: bool
+        """
+        self.number_of_threads = number_of_threads
+        self.algorithm_2d = algorithm_2d
+        self.isolated = isolated
+        self.model_names: List[str] = []
+
+    def gmsh_options(self, number_of_threads: Optional[int] = None, algorithm_2d: Optional[MeshAlgorithm2D] = None) -> Dict[str, float]:
+        """
+        Get the gmsh options of a generate() call.
+
+        :param number_of_threads: number of threads of this call, defaults to None (number of threads of the engine)
+        :type number_of_threads: int
+        :param algorithm_2d: 2D meshing algorithm of this call, defaults to None (algorithm of the engine)
+        :type algorithm_2d: MeshAlgorithm2D
+        :return: gmsh option names and values
+        :rtype: Dict[str, float]
+        """
+        number_of_threads = self.number_of_threads if number_of_threads is None else number_of_threads
+        algorithm_2d = self.algorithm_2d if algorithm_2d is None else algorithm_2d
+
+        options = {}
+        if number_of_threads is not None:
+            options["General.NumThreads"] = number_of_threads
+            options["Mesh.MaxNumThreads2D"] = number_of_threads
+        if algorithm_2d is not None:
+            options["Mesh.Algorithm"] = int(algorithm_2d)
+        return options
+
+    @contextlib.contextmanager
+    def session(self):
+        """Context manager to get the exclusive access to gmsh within this process."""
+        with gmsh_lock:
+            if not gmsh.isInitialized():
+                gmsh.initialize()
+            yield self
+
+    @contextlib.contextmanager
+    def options(self, options: Dict[str, float]):
+        """
+        Context manager to set the given gmsh options and to restore the former values afterwards.
+
+        :param options: gmsh option names and values
+        :type options: Dict[str, float]
+        """
+        with self.session():
+            former_options = {name: gmsh.option.getNumber(name) for name in options}
+            try:
+                for name, value in options.items():
+                    gmsh.option.setNumber(name, value)
+                yield
+            finally:
+                for name, value in former_options.items():
+                    gmsh.option.setNumber(name, value)
+
+    def generate(self, dimension: int = 2, number_of_threads: Optional[int] = None, algorithm_2d: Optional[MeshAlgorithm2D] = None):
+        """
+        Mesh the current gmsh model.
+
+        :param dimension: dimension of the mesh
+        :type dimension: int
+        :param number_of_threads: number of threads of this call, defaults to None (number of threads of the engine)
+        :type number_of_threads: int
+        :param algorithm_2d: 2D meshing algorithm of this call, defaults to None (algorithm of the engine)
+        :type algorithm_2d: MeshAlgorithm2D
+        """
+        with self.options(self.gmsh_options(number_of_threads, algorithm_2d)):
+            gmsh.model.mesh.generate(dimension)
+
+    def _register_current_model(self):
+        model_name = gmsh.model.getCurrent()
+        if model_name not in self.model_names:
+            self.model_names.append(model_name)
+
+    def add_model(self, model_name: str, replace: bool = False):
+        """
+        Add a new gmsh model and set it as the current model.
+
+        :param model_name: name of the model
+        :type model_name: str
+        :param replace: True to remove an existing model with the same name before
+        :type replace: bool
+        """
+        with self.session():
+            if replace and model_name in gmsh.model.list():
+                gmsh.model.setCurrent(model_name)
+                gmsh.model.remove()
+            gmsh.model.add(model_name)
+            self._register_current_model()
+
+    def open(self, file_path: str):
+        """
+        Open the given file (e.g. geometry or mesh) in gmsh.
+
+        :param file_path: file path
+        :type file_path: str
+        """
+        with self.session():
+            gmsh.open(file_path)
+            self._register_current_model()
+
+    def clear(self):
+        """
+        Clear the gmsh data.
+
+        In isolated mode, only the gmsh models of this engine are removed. Otherwise, all gmsh data is cleared.
+        """
+        with self.session():
+            if self.isolated:
+                existing_model_names = gmsh.model.list()
+                for model_name in self.model_names:
+                    if model_name in existing_model_names:
+                        gmsh.model.setCurrent(model_name)
+                        gmsh.model.remove()
+            else:
+                gmsh.clear()
+            self.model_names = []
+
+
+def gmsh_session(method: Callable) -> Callable:
+    """
+    Decorate a method, which uses gmsh, to run within a session of the meshing engine of its object.
+
+    :param method: method of an object with a meshing_engine attribute
+    :type method: Callable
+    :return: decorated method
+    :rtype: Callable
+    """
+    @functools.wraps(method)
+    def method_in_session(self, *args, **kwargs):
+        with self.meshing_engine.session():
+            return method(self, *args, **kwargs)
+    return method_in_session
+
+
+def _initialize_gmsh_worker():
+    """Inner function. Initialize the own gmsh state of a worker process."""
+    if not gmsh.isInitialized():
+        gmsh.initialize()
+    gmsh.option.setNumber("General.Terminal", 0)
+
+
+def mesh_in_pool(mesh_function: Callable, items: List, number_of_workers: Optional[int] = None,
+                 use_processes: bool = True) -> List:
+    """
+    Mesh several designs at once.
+
+    Processes are started by the 'spawn' method, so every worker process has its own gmsh state. For a process pool,
+    the mesh function and the items need to be picklable (e.g. a module level function and model descriptions, see
+    femmt.hpc.create_model_spec()). In a thread pool, use a MeshingEngine with isolated=True for every design.
+
+    :param mesh_function: function to mesh a single design, gets a single item
+    :type mesh_function: Callable
+    :param items: designs to mesh
+    :type items: List
+    :param number_of_workers: number of parallel workers, defaults to None (number of CPU cores)
+    :type number_of_workers: int
+    :param use_processes: True for a process pool, False for a thread pool
+    :type use_processes: bool
+    :return: results of the mesh function in the order of the items
+    :rtype: List
+    """
+    if number_of_workers is None:
+        number_of_workers = os.cpu_count() or 1
+    number_of_workers = max(1, min(number_of_workers, len(items)))
+
+    if use_processes:
+        executor = concurrent.futures.ProcessPoolExecutor(number_of_workers, mp_context=multiprocessing.get_context("spawn"),
+                                                          initializer=_initialize_gmsh_worker)
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(number_of_workers)
+    with executor:
+        return list(executor.map(mesh_function, items))
@@ -154,7 +154,8 @@ class Conductor:
             "conductor_arrangement": self.conductor_arrangement.name if self.conductor_arrangement is not None else None,
             "number_strands": self.n_strands,
             "strand_radius": self.strand_radius,
-            "fill_factor": self.ff
+            "fill_factor": self.ff,
+            "parallel": self.parallel
         }
 
 
@@ -431,6 +432,7 @@ class Core:
                 "core_type": self.core_type,
                 "core_inner_diameter": self.core_inner_diameter,
                 "core_h": self.core_h,
+                "core_h_center_leg": self.core_h_center_leg,
                 "window_w": self.window_w,
                 "window_h": self.window_h,
                 "material": self.material,
@@ -453,6 +455,7 @@ class Core:
             return {
                 "core_type": self.core_type,
                 "core_inner_diameter": self.core_inner_diameter,
+                "core_h": self.core_h,
                 "window_w": self.window_w,
                 "window_h_bot": self.window_h_bot,
                 "window_h_top": self.window_h_top,
@@ -521,7 +524,7 @@ class AirGaps:
             "leg_position": leg_position.name,
             "position_value": position_value,
             "height": height,
-            "stacked_position": stacked_position})
+            "stacked_position": stacked_position.name if stacked_position is not None else None})
 
         for index, midpoint in enumerate(self.midpoints):
             if midpoint[0] == leg_position and midpoint[1] + midpoint[2] < position_value - height \
@@ -668,7 +671,9 @@ class Insulation:
 
         return {
             "inner_winding_insulations": self.cond_cond,
-            "core_insulations": self.core_cond
+            "core_insulations": self.core_cond,
+            "flag_insulation": self.flag_insulation,
+            "max_aspect_ratio": self.max_aspect_ratio
         }
 
 
@@ -825,32 +830,27 @@ class VirtualWindingWindow:
 
     def to_dict(self):
         """Transfer object parameters to a dictionary. Important method to create the final result-log."""
+        content = {
+            "bot_bound": self.bot_bound,
+            "top_bound": self.top_bound,
+            "left_bound": self.left_bound,
+            "right_bound": self.right_bound,
+            "winding_type": self.winding_type.name,
+            "winding_scheme": self.winding_scheme.name if self.winding_scheme is not None else None,
+            "wrap_para": self.wrap_para.name if self.wrap_para is not None else None,
+            "windings": [winding.to_dict() for winding in self.windings],
+            "turns": self.turns,
+        }
+
+        if self.winding_type == WindingType.Single:
+            content["alignment"] = self.alignment.name if self.alignment is not None else None
+            content["placing_strategy"] = self.placing_strategy.name if self.placing_strategy is not None else None
+            content["zigzag"] = self.zigzag
+
         if hasattr(self, 'winding_insulation'):
-            return {
-                "bot_bound": self.bot_bound,
-                "top_bound": self.top_bound,
-                "left_bound": self.left_bound,
-                "right_bound": self.right_bound,
-                "winding_type": self.winding_type.name,
-                "winding_scheme": self.winding_scheme.name if self.winding_scheme is not None else None,
-                "wrap_para": self.wrap_para.name if self.wrap_para is not None else None,
-                "windings": [winding.to_dict() for winding in self.windings],
-                "turns": self.turns,
-                "winding_insulation": self.winding_insulation
-            }
+            content["winding_insulation"] = self.winding_insulation
 
-        else:
-            return {
-                "bot_bound": self.bot_bound,
-                "top_bound": self.top_bound,
-                "left_bound": self.left_bound,
-                "right_bound": self.right_bound,
-                "winding_type": self.winding_type.name,
-                "winding_scheme": self.winding_scheme.name if self.winding_scheme is not None else None,
-                "wrap_para": self.wrap_para.name if self.wrap_para is not None else None,
-                "windings": [winding.to_dict() for winding in self.windings],
-                "turns": self.turns,
-            }
+        return content
 
     # TODO Since in combine_vww it is necessary to compare vwws maybe a __eq__ and __ne__
     # function should be implemented.
@@ -128,6 +128,248 @@ def plot_2d(x_value: list, y_value: list, x_label: str, y_label: str, title: str
     ax.grid()
     plt.show()
 
+def bisect_vectorized(function, lower_bound: float, upper_bound: float, args: tuple = (),
+                      number_of_iterations: int = 50) -> tuple:
+    """
+    Find the roots of a function for arrays of parameters by bisection.
+
+    Vectorized replacement of scipy.optimize.brentq() for many root searches at once. The function must accept
+    numpy arrays and must be continuous between the bounds.
+
+    :param function: function f(x, *args), which is evaluated element-wise
+    :param lower_bound: lower bound of the search interval
+    :type lower_bound: float
+    :param upper_bound: upper bound of the search interval
+    :type upper_bound: float
+    :param args: further arguments of the function, arrays are broadcast with the result
+    :type args: tuple
+    :param number_of_iterations: number of bisection steps, each step halves the search interval
+    :type number_of_iterations: int
+    :return: roots and mask of the valid roots. Roots are invalid, if the function has the same sign at both
+        bounds (brentq() raises a ValueError in this case).
+    :rtype: tuple
+    """
+    f_lower = function(lower_bound, *args)
+    f_upper = function(upper_bound, *args)
+    lower = np.full(np.shape(f_lower), lower_bound, dtype=float)
+    upper = np.full(np.shape(f_upper), upper_bound, dtype=float)
+    valid_mask = f_lower * f_upper <= 0
+
+    for _ in range(number_of_iterations):
+        middle = (lower + upper) / 2
+        f_middle = function(middle, *args)
+        same_sign_as_lower = np.sign(f_middle) == np.sign(f_lower)
+        lower = np.where(same_sign_as_lower, middle, lower)
+        f_lower = np.where(same_sign_as_lower, f_middle, f_lower)
+        upper = np.where(same_sign_as_lower, upper, middle)
+
+    return (lower + upper) / 2, valid_mask
+
+
+def pareto_front_mask(costs, block_size: int = 1024) -> np.ndarray:
+    """
+    Find the Pareto-efficient points (minimization of all costs).
+
+    A point is efficient, if no other point is lower or equal in all costs. Of identical points, only the first one is
+    efficient. After a lexicographic sort, a point can only be dominated by points in front of it:
+
+    * two costs: sweep line, a point is efficient if its second cost is below the running minimum, O(n log n)
+    * more costs: the sorted points are filtered block by block against the efficient points found so far and
+      against the points in front of them in the same block.
+
+    :param costs: An (n_points, n_costs) array
+    :param block_size: number of points per block for more than two costs
+    :type block_size: int
+    :return: An (n_points, ) boolean array, indicating whether each point is Pareto efficient
+    :rtype: np.ndarray
+    """
+    costs = np.asarray(costs, dtype=float)
+    if costs.ndim == 1:
+        costs = costs[:, np.newaxis]
+    n_points, n_costs = costs.shape
+    is_efficient = np.zeros(n_points, dtype=bool)
+    if n_points == 0:
+        return is_efficient
+
+    # lexicographic order, identical points are kept in their original order (stable sort)
+    order = np.lexsort(costs.T[::-1])
+    sorted_costs = costs[order]
+
+    if n_costs == 1:
+        is_efficient[order[0]] = True
+    elif n_costs == 2:
+        running_minimum = np.minimum.accumulate(sorted_costs[:, 1])
+        is_efficient[order] = np.concatenate(([True], sorted_costs[1:, 1] < running_minimum[:-1]))
+    else:
+        front = np.zeros((0, n_costs))
+        for start in range(0, n_points, block_size):
+            block = sorted_costs[start:start + block_size]
+            # dominated by (or identical to) an efficient point of the previous blocks
+            block_mask = np.ones(len(block), dtype=bool)
+            for front_start in range(0, len(front), block_size):
+                front_block = front[front_start:front_start + block_size]
+                block_mask &= ~np.any(np.all(front_block[:, np.newaxis, :] <= block[np.newaxis, :, :], axis=2), axis=0)
+            # dominated by (or identical to) a point in front of it in the same block. It is sufficient to compare
+            # the remaining points, as a point dominated by a removed point is dominated by an efficient point, too.
+            remaining_indices = np.flatnonzero(block_mask)
+            remaining = block[remaining_indices]
+            weakly_dominates = np.all(remaining[:, np.newaxis, :] <= remaining[np.newaxis, :, :], axis=2)
+            block_mask[remaining_indices] = ~np.any(np.triu(weakly_dominates, k=1), axis=0)
+            is_efficient[order[start:start + block_size]] = block_mask
+            front = np.concatenate((front, block[block_mask]))
+    return is_efficient
+
+
+class ParetoFront:
+    """
+    Incremental Pareto front (minimization of all costs).
+
+    New points are merged into the existing front, without recomputing the front from all points seen so far.
+    """
+
+    def __init__(self, number_of_costs: int = 2):
+        """
+        Initialize an empty Pareto front.
+
+        :param number_of_costs: number of costs per point
+        :type number_of_costs: int
+        """
+        self.costs = np.zeros((0, number_of_costs))
+        self.ids = np.zeros(0, dtype=int)
+        self.number_of_points = 0
+
+    def add(self, costs, ids=None) -> np.ndarray:
+        """
+        Merge new points into the front.
+
+        Points of the front are kept in case of identical costs.
+
+        :param costs: An (n_points, n_costs) array of the new points
+        :param ids: identifiers of the new points, defaults to consecutive numbers of all points added so far
+        :return: An (n_points, ) boolean array, indicating which new points entered the front
+        :rtype: np.ndarray
+        """
+        costs = np.asarray(costs, dtype=float).reshape(-1, self.costs.shape[1])
+        if ids is None:
+            ids = np.arange(self.number_of_points, self.number_of_points + len(costs))
+        self.number_of_points += len(costs)
+
+        mask = pareto_front_mask(np.concatenate((self.costs, costs)))
+        new_mask = mask[len(self.costs):]
+        self.costs = np.concatenate((self.costs[mask[:len(self.costs)]], costs[new_mask]))
+        self.ids = np.concatenate((self.ids[mask[:len(self.ids)]], np.asarray(ids)[new_mask]))
+        return new_mask
+
+
+def pareto_tolerance_mask(volumes, losses, factor_min_losses: float = 1) -> np.ndarray:
+    """
+    Select the designs, whose losses are below the volume/loss Pareto front plus a loss offset.
+
+    The reference loss of a design is the Pareto front, linearly interpolated at the volume of the design, plus
+    factor_min_losses times the minimum loss of all designs. All designs are evaluated at once by binary search
+    on the sorted front, O(n log n) in total.
+
+    :param volumes: volumes of the designs
+    :param losses: losses of the designs
+    :param factor_min_losses: loss offset as a factor of the minimum loss
+    :type factor_min_losses: float
+    :return: An (n_points, ) boolean array, indicating which designs are within the tolerance band
+    :rtype: np.ndarray
+    """
+    volumes = np.asarray(volumes, dtype=float)
+    losses = np.asarray(losses, dtype=float)
+    if len(volumes) == 0:
+        return np.zeros(0, dtype=bool)
+    front_mask = pareto_front_mask(np.column_stack((volumes, losses)))
+    front_order = np.argsort(volumes[front_mask])
+    reference_losses = np.interp(volumes, volumes[front_mask][front_order], losses[front_mask][front_order]) + \
+        factor_min_losses * np.min(losses)
+    return losses < reference_losses
+
+
+class ParetoToleranceBand:
+    """
+    Selection of the designs within the Pareto tolerance band (see pareto_tolerance_mask()) for designs arriving chunk by chunk.
+
+    The Pareto front is updated incrementally. Designs are only kept as candidates while they may still be inside the
+    final band: the interpolated final front at a volume is never above the lowest loss of all designs up to this
+    volume, and the loss offset only decreases. The final selection equals pareto_tolerance_mask() of all designs.
+    """
+
+    def __init__(self, factor_min_losses: float = 1):
+        """
+        Initialize an empty tolerance band.
+
+        :param factor_min_losses: loss offset as a factor of the minimum loss
+        :type factor_min_losses: float
+        """
+        self.factor_min_losses = factor_min_losses
+        self.pareto_front = ParetoFront(number_of_costs=2)
+        self.min_loss = np.inf
+        self.candidate_volumes = np.zeros(0)
+        self.candidate_losses = np.zeros(0)
+        self.candidate_items = []
+        self._number_of_candidates_after_pruning = 0
+
+    def _upper_bound_reference_losses(self, volumes: np.ndarray) -> np.ndarray:
+        """Return an upper bound of the final reference losses: the current front as a staircase, plus the current offset."""
+        front_order = np.argsort(self.pareto_front.costs[:, 0])
+        front_volumes = self.pareto_front.costs[front_order, 0]
+        front_losses = self.pareto_front.costs[front_order, 1]
+        staircase_index = np.searchsorted(front_volumes, volumes, side="right") - 1
+        staircase_losses = np.where(staircase_index >= 0, front_losses[np.maximum(staircase_index, 0)], np.inf)
+        return staircase_losses + self.factor_min_losses * self.min_loss
+
+    def add(self, volumes, losses, items: list = None) -> None:
+        """
+        Add a chunk of designs.
+
+        :param volumes: volumes of the designs
+        :param losses: losses of the designs
+        :param items: designs (e.g. result DTOs), which are returned by select(). Defaults to the running number of the designs.
+        :type items: list
+        """
+        volumes = np.asarray(volumes, dtype=float).reshape(-1)
+        losses = np.asarray(losses, dtype=float).reshape(-1)
+        if items is None:
+            items = list(range(self.pareto_front.number_of_points, self.pareto_front.number_of_points + len(volumes)))
+        if len(volumes) == 0:
+            return
+        self.pareto_front.add(np.column_stack((volumes, losses)))
+        self.min_loss = min(self.min_loss, np.min(losses))
+
+        candidate_mask = losses < self._upper_bound_reference_losses(volumes)
+        self.candidate_volumes = np.concatenate((self.candidate_volumes, volumes[candidate_mask]))
+        self.candidate_losses = np.concatenate((self.candidate_losses, losses[candidate_mask]))
+        self.candidate_items.extend(item for item, is_candidate in zip(items, candidate_mask) if is_candidate)
+
+        # remove the candidates, which dropped out of the band because of the new designs
+        if len(self.candidate_items) > 2 * self._number_of_candidates_after_pruning:
+            candidate_mask = self.candidate_losses < self._upper_bound_reference_losses(self.candidate_volumes)
+            self._keep_candidates(candidate_mask)
+            self._number_of_candidates_after_pruning = len(self.candidate_items)
+
+    def _keep_candidates(self, candidate_mask: np.ndarray) -> None:
+        self.candidate_volumes = self.candidate_volumes[candidate_mask]
+        self.candidate_losses = self.candidate_losses[candidate_mask]
+        self.candidate_items = [item for item, is_candidate in zip(self.candidate_items, candidate_mask) if is_candidate]
+
+    def select(self) -> list:
+        """
+        Return the designs within the tolerance band of all designs added so far, in the order they were added.
+
+        :return: designs within the tolerance band
+        :rtype: list
+        """
+        if len(self.candidate_items) == 0:
+            return []
+        front_order = np.argsort(self.pareto_front.costs[:, 0])
+        reference_losses = np.interp(self.candidate_volumes, self.pareto_front.costs[front_order, 0],
+                                     self.pareto_front.costs[front_order, 1]) + self.factor_min_losses * self.min_loss
+        # the candidates are not removed here, as the interpolated front may rise locally by later designs
+        return [item for item, is_selected in zip(self.candidate_items, self.candidate_losses < reference_losses) if is_selected]
+
+
 # Faster than is_pareto_efficient_simple, but less readable.
 def is_pareto_efficient(costs, return_mask=True):
     """
@@ -139,21 +381,12 @@ def is_pareto_efficient(costs, return_mask=True):
         If return_mask is True, this will be an (n_points, ) boolean array
         Otherwise it will be a (n_efficient_points, ) integer array of indices.
     """
-    is_efficient = np.arange(costs.shape[0])
-    n_points = costs.shape[0]
-    next_point_index = 0  # Next index in the is_efficient array to search for
-    while next_point_index < len(costs):
-        nondominated_point_mask = np.any(costs < costs[next_point_index], axis=1)
-        nondominated_point_mask[next_point_index] = True
-        is_efficient = is_efficient[nondominated_point_mask]  # Remove dominated points
-        costs = costs[nondominated_point_mask]
-        next_point_index = np.sum(nondominated_point_mask[:next_point_index]) + 1
+    is_efficient_mask = pareto_front_mask(costs)
     if return_mask:
-        is_efficient_mask = np.zeros(n_points, dtype=bool)
-        is_efficient_mask[is_efficient] = True
         return is_efficient_mask
     else:
-        return is_efficient
+        return np.flatnonzero(is_efficient_mask)
+
 
 def pareto_front_from_dtos(dto_list: List[ItoSingleResultFile]) -> tuple:
     """
@@ -164,26 +397,12 @@ def pareto_front_from_dtos(dto_list: List[ItoSingleResultFile]) -> tuple:
     :return: x-Pareto vector, y-Pareto vector
     :rtype: tuple
     """
-    x_vec = np.array([])
-    y_vec = np.array([])
-    tuple_vec = []
-
-    for dto in dto_list:
-        x_vec = np.append(x_vec, dto.core_2daxi_total_volume)
-        y_vec = np.append(y_vec, dto.total_loss)
-        tuple_vec.append((dto.core_2daxi_total_volume, dto.total_loss))
-
-    tuple_vec = np.array(tuple_vec)
-
-    pareto_tuple_mask_vec = is_pareto_efficient(tuple_vec)
-
-    x_pareto_vec = []
-    y_pareto_vec = []
+    x_vec = np.array([dto.core_2daxi_total_volume for dto in dto_list], dtype=float)
+    y_vec = np.array([dto.total_loss for dto in dto_list], dtype=float)
 
-    for count_mask, mask in enumerate(pareto_tuple_mask_vec):
-        if mask:
-            x_pareto_vec.append(x_vec[count_mask])
-            y_pareto_vec.append(y_vec[count_mask])
+    pareto_tuple_mask_vec = is_pareto_efficient(np.column_stack((x_vec, y_vec)))
+    x_pareto_vec = x_vec[pareto_tuple_mask_vec]
+    y_pareto_vec = y_vec[pareto_tuple_mask_vec]
 
     print(f"{len(x_pareto_vec) = }")
 
@@ -199,26 +418,13 @@ def pareto_front_from_result_dicts(result_dict_list: List[Dict]) -> tuple:
     :return: x-Pareto vector, y-Pareto vector
     :rtype: tuple
     """
-    x_vec = np.array([])
-    y_vec = np.array([])
-    tuple_vec = []
-
-    for result_dict in result_dict_list:
-        x_vec = np.append(x_vec, result_dict["misc"]["core_2daxi_total_volume"])
-        y_vec = np.append(y_vec, result_dict["total_losses"]["all_windings"] + result_dict["total_losses"]["core"])
-        tuple_vec.append((result_dict["misc"]["core_2daxi_total_volume"], result_dict["total_losses"]["all_windings"] + result_dict["total_losses"]["core"]))
-
-    tuple_vec = np.array(tuple_vec)
-
-    pareto_tuple_mask_vec = is_pareto_efficient(tuple_vec)
-
-    x_pareto_vec = []
-    y_pareto_vec = []
+    x_vec = np.array([result_dict["misc"]["core_2daxi_total_volume"] for result_dict in result_dict_list], dtype=float)
+    y_vec = np.array([result_dict["total_losses"]["all_windings"] + result_dict["total_losses"]["core"]
+                      for result_dict in result_dict_list], dtype=float)
 
-    for count_mask, mask in enumerate(pareto_tuple_mask_vec):
-        if mask:
-            x_pareto_vec.append(x_vec[count_mask])
-            y_pareto_vec.append(y_vec[count_mask])
+    pareto_tuple_mask_vec = is_pareto_efficient(np.column_stack((x_vec, y_vec)))
+    x_pareto_vec = x_vec[pareto_tuple_mask_vec]
+    y_pareto_vec = y_vec[pareto_tuple_mask_vec]
 
     print(f"{len(x_pareto_vec) = }")
 
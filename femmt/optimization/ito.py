@@ -5,7 +5,7 @@ import json
 import itertools
 import shutil
 import dataclasses
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterator
 
 # 3rd party library import
 import materialdatabase as mdb
@@ -19,6 +19,7 @@ import femmt.optimization.functions_optimization as fo
 from femmt.optimization.ito_dtos import *
 import femmt.optimization.optuna_femmt_parser as op
 import femmt.optimization.ito_functions as itof
+from femmt.material_lookup import MaterialLookup
 import femmt
 
 class MyJSONEncoder(json.JSONEncoder):
@@ -191,8 +192,52 @@ class IntegratedTransformerOptimization:
             # initial optimization
             #############################
             @staticmethod
-            def brute_force_calculation(config_file: ItoSingleInputConfig):
-                """Brute force calculation for the integrated transformer."""
+            def brute_force_calculation(config_file: ItoSingleInputConfig, chunk_size: int = 200000,
+                                        material_cache_folder_path: str = None) -> List[ItoSingleResultFile]:
+                """
+                Brute force calculation for the integrated transformer.
+
+                Collects all valid designs of brute_force_calculation_chunks().
+
+                :param config_file: integrated transformer input configuration
+                :type config_file: ItoSingleInputConfig
+                :param chunk_size: number of design candidates, which are evaluated at once
+                :type chunk_size: int
+                :param material_cache_folder_path: folder to cache the material tables across runs, see femmt.MaterialLookup
+                :type material_cache_folder_path: str
+                :return: valid designs
+                :rtype: List[ItoSingleResultFile]
+                """
+                valid_design_list = []
+                for valid_design_chunk in femmt.IntegratedTransformerOptimization.ReluctanceModel.BruteForce.\
+                        brute_force_calculation_chunks(config_file, chunk_size, material_cache_folder_path):
+                    valid_design_list.extend(valid_design_chunk)
+
+                print(f"Number of valid designs: {len(valid_design_list)}")
+                return valid_design_list
+
+            @staticmethod
+            def brute_force_calculation_chunks(config_file: ItoSingleInputConfig, chunk_size: int = 200000,
+                                               material_cache_folder_path: str = None) -> Iterator[List[ItoSingleResultFile]]:
+                """
+                Brute force calculation for the integrated transformer, which returns the valid designs chunk by chunk.
+
+                The grid of core materials, core geometries, litz wires and turns is split into chunks of design
+                candidates. All candidates of a chunk are evaluated at once by numpy arrays, the flux density, air gap
+                and winding window filters are applied as boolean masks. The valid designs are returned after each
+                chunk, so large grids do not need to be stored in memory.
+
+                :param config_file: integrated transformer input configuration
+                :type config_file: ItoSingleInputConfig
+                :param chunk_size: number of design candidates, which are evaluated at once
+                :type chunk_size: int
+                :param material_cache_folder_path: folder to cache the material tables across runs, see femmt.MaterialLookup.
+                    Must not be inside the working directory, as the working directory is emptied first.
+                :type material_cache_folder_path: str
+                :return: valid designs of every chunk
+                :rtype: Iterator[List[ItoSingleResultFile]]
+                """
+                brute_force = femmt.IntegratedTransformerOptimization.ReluctanceModel.BruteForce
                 case_number = 0
 
                 # 0. Empty folder
@@ -201,9 +246,8 @@ class IntegratedTransformerOptimization:
 
                 material_db = mdb.MaterialDatabase(is_silent=True)
 
-                sweep_dto = femmt.IntegratedTransformerOptimization.ReluctanceModel.BruteForce.calculate_sweep_tensors(config_file)
+                sweep_dto = brute_force.calculate_sweep_tensors(config_file)
 
-                wire_database = ff.wire_material_database()
                 litz_database = ff.litz_database()
 
                 # 1. Extract fundamental frequency from current vectors
@@ -217,37 +261,31 @@ class IntegratedTransformerOptimization:
                 i_rms_1 = fr.i_rms(sweep_dto.time_current_1_vec)
                 i_rms_2 = fr.i_rms(sweep_dto.time_current_2_vec)
 
+                # material curves of all core materials at the operating point, loaded from the cache if possible
+                material_lookup = MaterialLookup(material_cache_folder_path, material_database=material_db)
+                material_lookup.precompute(sweep_dto.t1_core_material, [fundamental_frequency], [config_file.temperature])
+
                 # generate list of all parameter combinations
                 t2_core_geometry_sweep = np.array(list(itertools.product(sweep_dto.t1_window_w, sweep_dto.t1_window_h_top,
                                                                          sweep_dto.t1_window_h_bot,
                                                                          sweep_dto.t1_core_inner_diameter)))
 
-                t2_litz_sweep = np.array(
-                    list(itertools.product(sweep_dto.t1_primary_litz_wire_list, sweep_dto.t1_secondary_litz_wire_list)))
-
-                # report simulation progress
-                number_of_geometry_simulations = len(t2_core_geometry_sweep) * len(sweep_dto.t1_core_material)
-
-                geometry_simulations_per_percent = int(number_of_geometry_simulations / 99)
-                simulation_progress_percent = 0
-
-                valid_design_list = []
+                t2_litz_sweep = list(itertools.product(sweep_dto.t1_primary_litz_wire_list, sweep_dto.t1_secondary_litz_wire_list))
 
                 # initialize parameters staying same form simulation
-                t2_inductance_matrix = [
-                    [sweep_dto.l_s_target_value + sweep_dto.l_h_target_value,
-                     sweep_dto.l_h_target_value / sweep_dto.n_target_value],
-                    [sweep_dto.l_h_target_value / sweep_dto.n_target_value,
-                     sweep_dto.l_h_target_value / (sweep_dto.n_target_value ** 2)]]
+                t2_inductance_matrix = np.array(fr.calculate_inductance_matrix_from_ls_lh_n(
+                    sweep_dto.l_s_target_value, sweep_dto.l_h_target_value, sweep_dto.n_target_value))
 
+                number_of_geometry_simulations = len(t2_core_geometry_sweep) * len(t2_litz_sweep) * len(sweep_dto.t1_core_material)
                 geometry_simulation_counter = 0
-                for _, material_name in enumerate(sweep_dto.t1_core_material):
+
+                for material_name in sweep_dto.t1_core_material:
                     """
                     outer core material loop loads material properties from material database
                      * mu_r_abs
                      * saturation_flux_density and calculates the dimensioning_flux_density from it
                      * material vectors for mu_r_real and mu_r_imag depending on flux_density
-    
+
                     """
                     mu_r_abs = material_db.get_material_property(material_name=material_name,
                                                                  property="initial_permeability")
@@ -256,248 +294,285 @@ class IntegratedTransformerOptimization:
                     dimensioning_max_flux_density = saturation_flux_density * sweep_dto.factor_max_flux_density
 
                     # get material data from material database.
-                    material_dto = material_db.material_data_interpolation_to_dto(material_name, fundamental_frequency, config_file.temperature)
+                    material_dto = material_lookup.material_curve(material_name, fundamental_frequency, config_file.temperature)
 
-                    for count_geometry, t1d_core_geometry_material in enumerate(t2_core_geometry_sweep):
-
-                        window_w = t1d_core_geometry_material[0]
-                        window_h_top = t1d_core_geometry_material[1]
-                        window_h_bot = t1d_core_geometry_material[2]
-                        core_inner_diameter = t1d_core_geometry_material[3]
-
-                        # report about simulation progress
-                        # if geometry_simulation_counter == geometry_simulations_per_percent * simulation_progress_percent:
-                        #     simulation_progress_percent += 1
-                        #     print(f"{simulation_progress_percent} simulation_progress_percent")
-                        # geometry_simulation_counter += 1
-                        simulation_progress_percent = count_geometry / number_of_geometry_simulations * 100
-                        print(f"{simulation_progress_percent = } %")
-
-                        # print(geometry_simulation_counter)
-
-                        for primary_litz_wire, secondary_litz_wire in t2_litz_sweep:
+                    candidate_parts = []
+                    number_of_candidates = 0
+                    for window_w, window_h_top, window_h_bot, core_inner_diameter in t2_core_geometry_sweep:
+                        for litz_pair_number, (primary_litz_wire, secondary_litz_wire) in enumerate(t2_litz_sweep):
+                            geometry_simulation_counter += 1
                             primary_litz = litz_database[primary_litz_wire]
                             secondary_litz = litz_database[secondary_litz_wire]
 
-                            # cross-section comparison is according to a square for round wire.
-                            # this approximation is more realistic
-                            # insulation
-                            insulation_distance = 1e-3
-                            insulation_cross_section_top = 2 * insulation_distance * (window_w + window_h_top)
-                            insulation_cross_section_bot = 2 * insulation_distance * (window_w + window_h_bot)
-
-                            total_available_window_cross_section_top = window_h_top * window_w - insulation_cross_section_top
-
-                            #########################################################
-                            # set dynamic wire count parameters as optimization parameters
-                            #########################################################
-                            # set the winding search space dynamic
-                            # https://optuna.readthedocs.io/en/stable/faq.html#what-happens-when-i-dynamically-alter-a-search-space
-
-                            # n_p_top suggestion
-                            n_p_top_max = total_available_window_cross_section_top / (2 * primary_litz["conductor_radii"]) ** 2
-                            t1_n_p_top_max = np.arange(0, n_p_top_max + 1)
-
-                            for _, n_p_top in enumerate(t1_n_p_top_max):
-                                winding_cross_section_n_p_top = n_p_top * (2 * primary_litz["conductor_radii"]) ** 2
-
-                                winding_cross_section_n_p_top_max = n_p_top * (2 * primary_litz["conductor_radii"]) ** 2
-                                n_s_top_max = int((total_available_window_cross_section_top - winding_cross_section_n_p_top_max) / (
-                                    2 * secondary_litz["conductor_radii"]) ** 2)
-                                t1_n_s_top_max = np.arange(0, n_s_top_max + 1)
-
-                                for _, n_s_top in enumerate(t1_n_s_top_max):
-
-                                    total_available_window_cross_section_bot = window_h_bot * window_w - insulation_cross_section_bot
-
-                                    # n_p_bot suggestion
-                                    n_p_bot_max = total_available_window_cross_section_bot / (2 * primary_litz["conductor_radii"]) ** 2
-                                    t1_n_p_bot = np.arange(0, n_p_bot_max + 1)
-
-                                    for _, n_p_bot in enumerate(t1_n_p_bot):
-                                        winding_cross_section_n_p_bot = n_p_bot * (2 * primary_litz["conductor_radii"]) ** 2
-
-                                        # n_s_bot suggestion
-                                        winding_cross_section_n_p_bot_max = n_p_bot * (2 * primary_litz["conductor_radii"]) ** 2
-                                        n_s_bot_max = int((total_available_window_cross_section_bot - winding_cross_section_n_p_bot_max) / (
-                                            2 * secondary_litz["conductor_radii"]) ** 2)
-                                        t1_n_s_bot = np.arange(0, n_s_bot_max + 1)
-
-                                        for _, n_s_bot in enumerate(t1_n_s_bot):
-
-                                            core_top_bot_height = core_inner_diameter / 4
-                                            core_cross_section = (core_inner_diameter / 2) ** 2 * np.pi
-
-                                            # generate winding matrix
-                                            # note that the t11 winding-matrix will be reshaped later!
-                                            t2_winding_matrix = [[n_p_top, n_s_top], [n_p_bot, n_s_bot]]
-
-                                            # matrix reshaping
-                                            t2_winding_matrix_transpose = np.transpose(t2_winding_matrix, (1, 0))
-
-                                            t2_reluctance_matrix = femmt.IntegratedTransformerOptimization.ReluctanceModel.BruteForce.\
-                                                t2_calculate_reluctance_matrix(t2_inductance_matrix, t2_winding_matrix, t2_winding_matrix_transpose)
-
-                                            if np.linalg.det(t2_reluctance_matrix) != 0 and np.linalg.det(
-                                                    np.transpose(t2_winding_matrix)) != 0 and np.linalg.det(t2_inductance_matrix) != 0:
-                                                # calculate the flux
-                                                flux_top_vec, flux_bot_vec, flux_stray_vec = fr.flux_vec_from_current_vec(
-                                                    current_extracted_1_vec,
-                                                    current_extracted_2_vec,
-                                                    t2_winding_matrix,
-                                                    t2_inductance_matrix)
+                            # DC resistance is proportional to the number of turns
+                            primary_resistance_per_turn = fr.resistance_solid_wire(
+                                core_inner_diameter, window_w, 1,
+                                np.sqrt(primary_litz["strands_numbers"] * primary_litz["strand_radii"] ** 2), material='Copper')
+                            secondary_resistance_per_turn = fr.resistance_solid_wire(
+                                core_inner_diameter, window_w, 1,
+                                np.sqrt(secondary_litz["strands_numbers"] * secondary_litz["strand_radii"] ** 2), material='Copper')
+
+                            for n_p_top, n_s_top, n_p_bot, n_s_bot in brute_force.calculate_turns_grid(
+                                    window_w, window_h_top, window_h_bot, primary_litz["conductor_radii"],
+                                    secondary_litz["conductor_radii"], chunk_size):
+                                number_of_turns_combinations = len(n_p_top)
+                                candidate_parts.append({
+                                    "window_w": np.full(number_of_turns_combinations, window_w),
+                                    "window_h_top": np.full(number_of_turns_combinations, window_h_top),
+                                    "window_h_bot": np.full(number_of_turns_combinations, window_h_bot),
+                                    "core_inner_diameter": np.full(number_of_turns_combinations, core_inner_diameter),
+                                    "litz_pair_number": np.full(number_of_turns_combinations, litz_pair_number),
+                                    "primary_resistance_per_turn": np.full(number_of_turns_combinations, primary_resistance_per_turn),
+                                    "secondary_resistance_per_turn": np.full(number_of_turns_combinations, secondary_resistance_per_turn),
+                                    "n_p_top": n_p_top, "n_s_top": n_s_top, "n_p_bot": n_p_bot, "n_s_bot": n_s_bot})
+                                number_of_candidates += number_of_turns_combinations
+
+                                if number_of_candidates < chunk_size:
+                                    continue
+
+                                candidates = {key: np.concatenate([part[key] for part in candidate_parts]) for key in candidate_parts[0]}
+                                candidate_parts = []
+                                number_of_candidates = 0
+                                valid_designs = brute_force.evaluate_candidates(
+                                    candidates, t2_inductance_matrix, current_extracted_1_vec, current_extracted_2_vec,
+                                    mu_r_abs, dimensioning_max_flux_density, fundamental_frequency, material_dto,
+                                    i_rms_1, i_rms_2)
+                                valid_design_list = brute_force.candidates_to_result_list(
+                                    valid_designs, case_number, material_name, t2_litz_sweep)
+                                case_number += len(valid_design_list)
+                                print(f"simulation_progress_percent = {geometry_simulation_counter / number_of_geometry_simulations * 100} %")
+                                yield valid_design_list
+
+                    if candidate_parts:
+                        candidates = {key: np.concatenate([part[key] for part in candidate_parts]) for key in candidate_parts[0]}
+                        valid_designs = brute_force.evaluate_candidates(
+                            candidates, t2_inductance_matrix, current_extracted_1_vec, current_extracted_2_vec,
+                            mu_r_abs, dimensioning_max_flux_density, fundamental_frequency, material_dto,
+                            i_rms_1, i_rms_2)
+                        valid_design_list = brute_force.candidates_to_result_list(
+                            valid_designs, case_number, material_name, t2_litz_sweep)
+                        case_number += len(valid_design_list)
+                        yield valid_design_list
 
-                                                # calculate maximum values
-                                                flux_top_max, flux_bot_max, flux_stray_max = fr.max_value_from_value_vec(
-                                                    flux_top_vec, flux_bot_vec,
-                                                    flux_stray_vec)
-
-                                                flux_density_top_max = flux_top_max / core_cross_section
-                                                flux_density_bot_max = flux_bot_max / core_cross_section
-                                                flux_density_middle_max = flux_stray_max / core_cross_section
-
-                                                if (flux_density_top_max < dimensioning_max_flux_density) and (
-                                                        flux_density_bot_max < dimensioning_max_flux_density) and (
-                                                        flux_density_middle_max < dimensioning_max_flux_density):
-
-                                                    # calculate target values for r_top and r_bot out of reluctance matrix
-                                                    r_core_middle_cylinder_radial = fr.r_core_top_bot_radiant(
-                                                        core_inner_diameter, window_w, mu_r_abs, core_top_bot_height)
-
-                                                    r_middle_target = -t2_reluctance_matrix[0][1]
-                                                    r_top_target = t2_reluctance_matrix[0][0] - r_middle_target
-                                                    r_bot_target = t2_reluctance_matrix[1][1] - r_middle_target
-
-                                                    # calculate the core reluctance of top and bottom and middle part
-                                                    r_core_top_cylinder_inner = fr.r_core_round(core_inner_diameter,
-                                                                                                window_h_top, mu_r_abs)
-                                                    r_core_top = 2 * r_core_top_cylinder_inner + r_core_middle_cylinder_radial
-                                                    r_air_gap_top_target = r_top_target - r_core_top
-
-                                                    r_core_bot_cylinder_inner = fr.r_core_round(core_inner_diameter,
-                                                                                                window_h_bot, mu_r_abs)
-                                                    r_core_bot = 2 * r_core_bot_cylinder_inner + r_core_middle_cylinder_radial
-                                                    r_air_gap_bot_target = r_bot_target - r_core_bot
-
-                                                    r_air_gap_middle_target = r_middle_target - r_core_middle_cylinder_radial
-
-                                                    if r_air_gap_top_target > 0 and r_air_gap_bot_target > 0 and r_air_gap_middle_target > 0:
-
-                                                        minimum_air_gap_length = 1e-6
-                                                        maximum_air_gap_length = 1e-3
-                                                        minimum_sort_out_air_gap_length = 100e-6
+            @staticmethod
+            def calculate_turns_grid(window_w: float, window_h_top: float, window_h_bot: float,
+                                     primary_conductor_radius: float, secondary_conductor_radius: float,
+                                     chunk_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+                """
+                Calculate all combinations of turns, which fit into the winding windows of the given core geometry.
+
+                The cross-section comparison is according to a square for the round litz wires, which is a more
+                realistic approximation. An insulation of 1 mm is considered around the winding windows.
+
+                :param window_w: window width
+                :type window_w: float
+                :param window_h_top: top window height
+                :type window_h_top: float
+                :param window_h_bot: bottom window height
+                :type window_h_bot: float
+                :param primary_conductor_radius: conductor radius of the primary litz wire
+                :type primary_conductor_radius: float
+                :param secondary_conductor_radius: conductor radius of the secondary litz wire
+                :type secondary_conductor_radius: float
+                :param chunk_size: maximum number of combinations per returned part
+                :type chunk_size: int
+                :return: parts of the arrays n_p_top, n_s_top, n_p_bot, n_s_bot
+                :rtype: Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+                """
+                insulation_distance = 1e-3
+                primary_cross_section = (2 * primary_conductor_radius) ** 2
+                secondary_cross_section = (2 * secondary_conductor_radius) ** 2
+
+                def window_turns(window_h: float) -> Tuple[np.ndarray, np.ndarray]:
+                    """Return all pairs of primary and secondary turns in a winding window."""
+                    total_available_window_cross_section = window_h * window_w - 2 * insulation_distance * (window_w + window_h)
+                    t1_n_p = np.arange(0, total_available_window_cross_section / primary_cross_section + 1)
+                    n_s_max = np.trunc((total_available_window_cross_section - t1_n_p * primary_cross_section) / secondary_cross_section)
+                    counts = np.maximum(n_s_max + 1, 0).astype(int)
+                    n_p = np.repeat(t1_n_p, counts)
+                    # number of secondary turns counts from 0 for every number of primary turns
+                    n_s = np.arange(np.sum(counts)) - np.repeat(np.cumsum(counts) - counts, counts)
+                    return n_p.astype(int), n_s
+
+                n_p_top, n_s_top = window_turns(window_h_top)
+                n_p_bot, n_s_bot = window_turns(window_h_bot)
+                if len(n_p_top) == 0 or len(n_p_bot) == 0:
+                    return
+
+                # cartesian product of the top and bottom combinations, split into parts of less than chunk_size
+                top_rows_per_part = max(1, chunk_size // len(n_p_bot))
+                for start in range(0, len(n_p_top), top_rows_per_part):
+                    top_index = np.repeat(np.arange(start, min(start + top_rows_per_part, len(n_p_top))), len(n_p_bot))
+                    bot_index = np.tile(np.arange(len(n_p_bot)), len(top_index) // len(n_p_bot))
+                    yield n_p_top[top_index], n_s_top[top_index], n_p_bot[bot_index], n_s_bot[bot_index]
 
-                                                        try:
-                                                            l_top_air_gap = optimize.brentq(
-                                                                fr.r_air_gap_round_inf_sct, minimum_air_gap_length, maximum_air_gap_length,
-                                                                args=(core_inner_diameter, window_h_top, r_air_gap_top_target), full_output=True)[0]
-                                                            l_bot_air_gap = optimize.brentq(fr.r_air_gap_round_round_sct, minimum_air_gap_length,
-                                                                                            maximum_air_gap_length, args=(core_inner_diameter, window_h_bot / 2,
-                                                                                                                          window_h_bot / 2,
-                                                                                                                          r_air_gap_bot_target),
-                                                                                            full_output=True)[0]
-                                                            l_middle_air_gap = optimize.brentq(fr.r_air_gap_tablet_cylinder_sct,
-                                                                                               minimum_air_gap_length,
-                                                                                               maximum_air_gap_length, args=(core_inner_diameter,
-                                                                                                                             core_inner_diameter / 4, window_w,
-                                                                                                                             r_air_gap_middle_target),
-                                                                                               full_output=True)[0]
-                                                        except ValueError:
-                                                            break
-
-                                                        if l_top_air_gap > minimum_sort_out_air_gap_length and l_bot_air_gap > minimum_sort_out_air_gap_length \
-                                                                and l_middle_air_gap > minimum_sort_out_air_gap_length:
-                                                            p_hyst_top = fr.hyst_losses_core_half_mu_r_imag(core_inner_diameter,
-                                                                                                            window_h_top,
-                                                                                                            window_w,
-                                                                                                            mu_r_abs,
-                                                                                                            flux_top_max,
-                                                                                                            fundamental_frequency,
-                                                                                                            material_dto.material_flux_density_vec,
-                                                                                                            material_dto.material_mu_r_imag_vec)
-
-                                                            p_hyst_middle = fr.power_losses_hysteresis_cylinder_radial_direction_mu_r_imag(
-                                                                flux_stray_max, core_inner_diameter / 4, core_inner_diameter / 2,
-                                                                core_inner_diameter / 2 + window_w, fundamental_frequency,
-                                                                mu_r_abs, material_dto.material_flux_density_vec, material_dto.material_mu_r_imag_vec)
-
-                                                            p_hyst_bot = fr.hyst_losses_core_half_mu_r_imag(core_inner_diameter,
-                                                                                                            window_h_bot,
-                                                                                                            window_w,
-                                                                                                            mu_r_abs,
-                                                                                                            flux_bot_max,
-                                                                                                            fundamental_frequency,
-                                                                                                            material_dto.material_flux_density_vec,
-                                                                                                            material_dto.material_mu_r_imag_vec)
-
-                                                            p_hyst = p_hyst_top + p_hyst_bot + p_hyst_middle
-
-                                                            core_2daxi_total_volume = fr.calculate_core_2daxi_total_volume(
-                                                                core_inner_diameter,
-                                                                (window_h_bot + window_h_top + core_inner_diameter / 4),
-                                                                window_w)
-
-                                                            primary_effective_conductive_cross_section = primary_litz["strands_numbers"] * \
-                                                                primary_litz["strand_radii"] ** 2 * np.pi
-                                                            primary_effective_conductive_radius = np.sqrt(
-                                                                primary_effective_conductive_cross_section / np.pi)
-                                                            primary_resistance = fr.resistance_solid_wire(
-                                                                core_inner_diameter, window_w,
-                                                                n_p_top + n_p_bot,
-                                                                primary_effective_conductive_radius,
-                                                                material='Copper')
-                                                            primary_dc_loss = primary_resistance * i_rms_1 ** 2
-
-                                                            secondary_effective_conductive_cross_section = secondary_litz["strands_numbers"] * \
-                                                                secondary_litz["strand_radii"] ** 2 * np.pi
-                                                            secondary_effective_conductive_radius = np.sqrt(
-                                                                secondary_effective_conductive_cross_section / np.pi)
-                                                            secondary_resistance = fr.resistance_solid_wire(
-                                                                core_inner_diameter, window_w,
-                                                                n_s_top + n_s_bot,
-                                                                secondary_effective_conductive_radius,
-                                                                material='Copper')
-                                                            secondary_dc_loss = secondary_resistance * i_rms_2 ** 2
-
-                                                            total_loss = p_hyst + primary_dc_loss + secondary_dc_loss
-
-                                                            valid_design_dict = ItoSingleResultFile(
-                                                                case=case_number,
-                                                                air_gap_top=l_top_air_gap,
-                                                                air_gap_bot=l_bot_air_gap,
-                                                                air_gap_middle=l_middle_air_gap,
-                                                                n_p_top=n_p_top,
-                                                                n_p_bot=n_p_bot,
-                                                                n_s_top=n_s_top,
-                                                                n_s_bot=n_s_bot,
-                                                                window_h_top=window_h_top,
-                                                                window_h_bot=window_h_bot,
-                                                                window_w=window_w,
-                                                                core_material=material_name,
-                                                                core_inner_diameter=core_inner_diameter,
-                                                                primary_litz_wire=primary_litz_wire,
-                                                                secondary_litz_wire=secondary_litz_wire,
-                                                                # results
-                                                                flux_top_max=flux_top_max,
-                                                                flux_bot_max=flux_bot_max,
-                                                                flux_stray_max=flux_stray_max,
-                                                                flux_density_top_max=flux_density_top_max,
-                                                                flux_density_bot_max=flux_density_bot_max,
-                                                                flux_density_stray_max=flux_density_middle_max,
-                                                                p_hyst=p_hyst,
-                                                                core_2daxi_total_volume=core_2daxi_total_volume,
-                                                                primary_litz_wire_loss=primary_dc_loss,
-                                                                secondary_litz_wire_loss=secondary_dc_loss,
-                                                                total_loss=total_loss
-
-                                                            )
-
-                                                            # Add dict to list of valid designs
-                                                            valid_design_list.append(valid_design_dict)
-                                                            case_number += 1
+            @staticmethod
+            def evaluate_candidates(candidates: Dict[str, np.ndarray], t2_inductance_matrix: np.ndarray,
+                                    current_1_vec: np.ndarray, current_2_vec: np.ndarray, mu_r_abs: float,
+                                    dimensioning_max_flux_density: float, fundamental_frequency: float, material_dto,
+                                    i_rms_1: float, i_rms_2: float) -> Dict[str, np.ndarray]:
+                """
+                Evaluate the reluctance model for arrays of design candidates and return the valid designs.
+
+                :param candidates: arrays of the candidate parameters (window_w, window_h_top, window_h_bot,
+                    core_inner_diameter, litz_pair_number, primary_resistance_per_turn, secondary_resistance_per_turn,
+                    n_p_top, n_s_top, n_p_bot, n_s_bot)
+                :type candidates: Dict[str, np.ndarray]
+                :param t2_inductance_matrix: target inductance matrix
+                :type t2_inductance_matrix: np.ndarray
+                :param current_1_vec: primary current values
+                :type current_1_vec: np.ndarray
+                :param current_2_vec: secondary current values
+                :type current_2_vec: np.ndarray
+                :param mu_r_abs: relative permeability of the core material
+                :type mu_r_abs: float
+                :param dimensioning_max_flux_density: maximum allowed flux density
+                :type dimensioning_max_flux_density: float
+                :param fundamental_frequency: fundamental frequency
+                :type fundamental_frequency: float
+                :param material_dto: material data of the core material
+                :param i_rms_1: primary rms current
+                :type i_rms_1: float
+                :param i_rms_2: secondary rms current
+                :type i_rms_2: float
+                :return: arrays of the valid designs, including the results of the reluctance model
+                :rtype: Dict[str, np.ndarray]
+                """
+                def select(mask: np.ndarray) -> None:
+                    for key in list(candidates):
+                        candidates[key] = candidates[key][mask]
+
+                candidates = dict(candidates)
+                # winding matrix [[n_p_top, n_s_top], [n_p_bot, n_s_bot]]
+                n_p_top, n_s_top = candidates["n_p_top"].astype(float), candidates["n_s_top"].astype(float)
+                n_p_bot, n_s_bot = candidates["n_p_bot"].astype(float), candidates["n_s_bot"].astype(float)
+                winding_matrix_det = n_p_top * n_s_bot - n_s_top * n_p_bot
+                select(winding_matrix_det != 0)
+
+                # reluctance matrix R = N * L^-1 * N^T
+                winding_matrix = np.stack([np.stack([candidates["n_p_top"], candidates["n_s_top"]], axis=-1),
+                                           np.stack([candidates["n_p_bot"], candidates["n_s_bot"]], axis=-1)], axis=-2).astype(float)
+                t2_reluctance_matrix = femmt.IntegratedTransformerOptimization.ReluctanceModel.BruteForce.t2_calculate_reluctance_matrix(
+                    t2_inductance_matrix, winding_matrix, np.transpose(winding_matrix, (0, 2, 1)))
+
+                # flux = (N^T)^-1 * L * i, stray flux = flux_bot - flux_top
+                inductance_current = np.matmul(t2_inductance_matrix, np.array([current_1_vec, current_2_vec]))
+                flux_vec = np.matmul(np.linalg.inv(np.transpose(winding_matrix, (0, 2, 1))), inductance_current)
+                candidates["flux_top_max"] = np.max(np.abs(flux_vec[:, 0, :]), axis=-1)
+                candidates["flux_bot_max"] = np.max(np.abs(flux_vec[:, 1, :]), axis=-1)
+                candidates["flux_stray_max"] = np.max(np.abs(flux_vec[:, 1, :] - flux_vec[:, 0, :]), axis=-1)
+                candidates["r_middle_target"] = -t2_reluctance_matrix[:, 0, 1]
+                candidates["r_top_target"] = t2_reluctance_matrix[:, 0, 0] - candidates["r_middle_target"]
+                candidates["r_bot_target"] = t2_reluctance_matrix[:, 1, 1] - candidates["r_middle_target"]
+                select(np.linalg.det(t2_reluctance_matrix) != 0)
+
+                core_inner_diameter = candidates["core_inner_diameter"]
+                core_cross_section = (core_inner_diameter / 2) ** 2 * np.pi
+                candidates["flux_density_top_max"] = candidates["flux_top_max"] / core_cross_section
+                candidates["flux_density_bot_max"] = candidates["flux_bot_max"] / core_cross_section
+                candidates["flux_density_stray_max"] = candidates["flux_stray_max"] / core_cross_section
+                select((candidates["flux_density_top_max"] < dimensioning_max_flux_density) & \
+                       (candidates["flux_density_bot_max"] < dimensioning_max_flux_density) & \
+                       (candidates["flux_density_stray_max"] < dimensioning_max_flux_density))
+
+                # calculate the core reluctance of top and bottom and middle part and the air gap target reluctances
+                core_inner_diameter, window_w = candidates["core_inner_diameter"], candidates["window_w"]
+                window_h_top, window_h_bot = candidates["window_h_top"], candidates["window_h_bot"]
+                r_core_middle_cylinder_radial = fr.r_core_top_bot_radiant(core_inner_diameter, window_w, mu_r_abs, core_inner_diameter / 4)
+                r_core_top = 2 * fr.r_core_round(core_inner_diameter, window_h_top, mu_r_abs) + r_core_middle_cylinder_radial
+                r_core_bot = 2 * fr.r_core_round(core_inner_diameter, window_h_bot, mu_r_abs) + r_core_middle_cylinder_radial
+                candidates["r_air_gap_top_target"] = candidates["r_top_target"] - r_core_top
+                candidates["r_air_gap_bot_target"] = candidates["r_bot_target"] - r_core_bot
+                candidates["r_air_gap_middle_target"] = candidates["r_middle_target"] - r_core_middle_cylinder_radial
+                select((candidates["r_air_gap_top_target"] > 0) & (candidates["r_air_gap_bot_target"] > 0) & \
+                       (candidates["r_air_gap_middle_target"] > 0))
+
+                minimum_air_gap_length = 1e-6
+                maximum_air_gap_length = 1e-3
+                minimum_sort_out_air_gap_length = 100e-6
+
+                core_inner_diameter, window_w = candidates["core_inner_diameter"], candidates["window_w"]
+                window_h_top, window_h_bot = candidates["window_h_top"], candidates["window_h_bot"]
+                candidates["air_gap_top"], valid_top = fo.bisect_vectorized(
+                    fr.r_air_gap_round_inf_sct, minimum_air_gap_length, maximum_air_gap_length,
+                    args=(core_inner_diameter, window_h_top, candidates["r_air_gap_top_target"]))
+                candidates["air_gap_bot"], valid_bot = fo.bisect_vectorized(
+                    fr.r_air_gap_round_round_sct, minimum_air_gap_length, maximum_air_gap_length,
+                    args=(core_inner_diameter, window_h_bot / 2, window_h_bot / 2, candidates["r_air_gap_bot_target"]))
+                candidates["air_gap_middle"], valid_middle = fo.bisect_vectorized(
+                    fr.r_air_gap_tablet_cylinder_sct, minimum_air_gap_length, maximum_air_gap_length,
+                    args=(core_inner_diameter, core_inner_diameter / 4, window_w, candidates["r_air_gap_middle_target"]))
+                select(valid_top & valid_bot & valid_middle & (candidates["air_gap_top"] > minimum_sort_out_air_gap_length) & \
+                       (candidates["air_gap_bot"] > minimum_sort_out_air_gap_length) & \
+                       (candidates["air_gap_middle"] > minimum_sort_out_air_gap_length))
+
+                # hysteresis losses: inner cylinders, radial top / bottom parts and the radial middle part
+                core_inner_diameter, window_w = candidates["core_inner_diameter"], candidates["window_w"]
+                window_h_top, window_h_bot = candidates["window_h_top"], candidates["window_h_bot"]
+                core_cross_section = (core_inner_diameter / 2) ** 2 * np.pi
+                p_hyst = np.zeros(len(core_inner_diameter))
+                for flux_max, flux_density_max, window_h in [
+                        (candidates["flux_top_max"], candidates["flux_density_top_max"], window_h_top),
+                        (candidates["flux_bot_max"], candidates["flux_density_bot_max"], window_h_bot)]:
+                    p_hyst += 2 * fr.power_loss_hysteresis_simple_volume_mu_r_imag(
+                        fundamental_frequency, flux_density_max, mu_r_abs, core_cross_section * window_h,
+                        material_dto.material_flux_density_vec, material_dto.material_mu_r_imag_vec)
+                    p_hyst += fr.power_losses_hysteresis_cylinder_radial_direction_mu_r_imag_vectorized(
+                        flux_max, core_inner_diameter / 4, core_inner_diameter / 2, core_inner_diameter / 2 + window_w,
+                        fundamental_frequency, mu_r_abs, material_dto.material_flux_density_vec, material_dto.material_mu_r_imag_vec)
+                p_hyst += fr.power_losses_hysteresis_cylinder_radial_direction_mu_r_imag_vectorized(
+                    candidates["flux_stray_max"], core_inner_diameter / 4, core_inner_diameter / 2, core_inner_diameter / 2 + window_w,
+                    fundamental_frequency, mu_r_abs, material_dto.material_flux_density_vec, material_dto.material_mu_r_imag_vec)
+                candidates["p_hyst"] = p_hyst
+
+                candidates["core_2daxi_total_volume"] = fr.calculate_core_2daxi_total_volume(
+                    core_inner_diameter, window_h_bot + window_h_top + core_inner_diameter / 4, window_w)
+                candidates["primary_litz_wire_loss"] = candidates["primary_resistance_per_turn"] * \
+                    (candidates["n_p_top"] + candidates["n_p_bot"]) * i_rms_1 ** 2
+                candidates["secondary_litz_wire_loss"] = candidates["secondary_resistance_per_turn"] * \
+                    (candidates["n_s_top"] + candidates["n_s_bot"]) * i_rms_2 ** 2
+                candidates["total_loss"] = p_hyst + candidates["primary_litz_wire_loss"] + candidates["secondary_litz_wire_loss"]
+
+                return candidates
 
-                print(f"Number of valid designs: {len(valid_design_list)}")
-                return valid_design_list
+            @staticmethod
+            def candidates_to_result_list(valid_designs: Dict[str, np.ndarray], first_case_number: int, material_name: str,
+                                          t2_litz_sweep: List[Tuple[str, str]]) -> List[ItoSingleResultFile]:
+                """
+                Convert the arrays of valid designs to result files.
+
+                :param valid_designs: arrays of the valid designs, see evaluate_candidates()
+                :type valid_designs: Dict[str, np.ndarray]
+                :param first_case_number: case number of the first design
+                :type first_case_number: int
+                :param material_name: core material name
+                :type material_name: str
+                :param t2_litz_sweep: pairs of primary and secondary litz wire names
+                :type t2_litz_sweep: List[Tuple[str, str]]
+                :return: result files of the valid designs
+                :rtype: List[ItoSingleResultFile]
+                """
+                result_columns = ["air_gap_top", "air_gap_bot", "air_gap_middle", "window_h_top", "window_h_bot", "window_w",
+                                  "core_inner_diameter", "flux_top_max", "flux_bot_max", "flux_stray_max", "flux_density_top_max",
+                                  "flux_density_bot_max", "flux_density_stray_max", "p_hyst", "core_2daxi_total_volume",
+                                  "primary_litz_wire_loss", "secondary_litz_wire_loss", "total_loss"]
+                # convert the columns once to python types, which is much faster than converting single numpy values
+                columns = {key: valid_designs[key].tolist() for key in result_columns + ["n_p_top", "n_p_bot", "n_s_top",
+                                                                                         "n_s_bot", "litz_pair_number"]}
+                result_list = []
+                for count in range(len(valid_designs["n_p_top"])):
+                    primary_litz_wire, secondary_litz_wire = t2_litz_sweep[columns["litz_pair_number"][count]]
+                    result_list.append(ItoSingleResultFile(
+                        case=first_case_number + count,
+                        n_p_top=columns["n_p_top"][count],
+                        n_p_bot=columns["n_p_bot"][count],
+                        n_s_top=columns["n_s_top"][count],
+                        n_s_bot=columns["n_s_bot"][count],
+                        core_material=material_name,
+                        primary_litz_wire=primary_litz_wire,
+                        secondary_litz_wire=secondary_litz_wire,
+                        **{key: columns[key][count] for key in result_columns}))
+                return result_list
 
             @staticmethod
             def t2_calculate_reluctance_matrix(t2_inductance_matrix, t2_winding_matrix, t2_winding_matrix_transpose):
@@ -1043,31 +1118,33 @@ class IntegratedTransformerOptimization:
             # figure out pareto front
             # pareto_volume_list, pareto_core_hyst_list, pareto_dto_list = self.pareto_front(volume_list, core_hyst_loss_list, valid_design_list)
 
-            x_pareto_vec, y_pareto_vec = fo.pareto_front_from_dtos(valid_design_list)
-
-            vector_to_sort = np.array([x_pareto_vec, y_pareto_vec])
-
-            # sorting 2d array by 1st row
-            # https://stackoverflow.com/questions/49374253/sort-a-numpy-2d-array-by-1st-row-maintaining-columns
-            sorted_vector = vector_to_sort[:, vector_to_sort[0].argsort()]
-            x_pareto_vec = sorted_vector[0]
-            y_pareto_vec = sorted_vector[1]
+            volume_vec = np.array([dto.core_2daxi_total_volume for dto in valid_design_list], dtype=float)
+            total_loss_vec = np.array([dto.total_loss for dto in valid_design_list], dtype=float)
+            tolerance_mask = fo.pareto_tolerance_mask(volume_vec, total_loss_vec, factor_min_dc_losses)
 
-            total_losses_list = []
-            filtered_design_dto_list = []
+            return [dto for dto, is_selected in zip(valid_design_list, tolerance_mask) if is_selected]
 
-            for dto in valid_design_list:
-                total_losses_list.append(dto.total_loss)
-
-            min_total_dc_losses = total_losses_list[np.argmin(total_losses_list)]
-            loss_offset = factor_min_dc_losses * min_total_dc_losses
+        @staticmethod
+        def filter_loss_list_chunks(valid_design_chunks: Iterator[List[ItoSingleResultFile]],
+                                    factor_min_dc_losses: float = 1.2) -> List[ItoSingleResultFile]:
+            """
+            Remove designs with too high losses compared to the minimum losses, for designs arriving chunk by chunk.
 
-            for dto in valid_design_list:
-                ref_loss = np.interp(dto.core_2daxi_total_volume, x_pareto_vec, y_pareto_vec) + loss_offset
-                if dto.total_loss < ref_loss:
-                    filtered_design_dto_list.append(dto)
+            Gives the same result as filter_loss_list() of all designs, but only the designs which may be inside the
+            tolerance band are kept in memory.
 
-            return filtered_design_dto_list
+            :param valid_design_chunks: chunks of designs, e.g. from BruteForce.brute_force_calculation_chunks()
+            :type valid_design_chunks: Iterator[List[ItoSingleResultFile]]
+            :param factor_min_dc_losses: loss offset to the Pareto front as a factor of the minimum losses
+            :type factor_min_dc_losses: float
+            :return: designs within the tolerance band
+            :rtype: List[ItoSingleResultFile]
+            """
+            tolerance_band = fo.ParetoToleranceBand(factor_min_dc_losses)
+            for valid_design_chunk in valid_design_chunks:
+                tolerance_band.add([dto.core_2daxi_total_volume for dto in valid_design_chunk],
+                                   [dto.total_loss for dto in valid_design_chunk], valid_design_chunk)
+            return tolerance_band.select()
 
         @staticmethod
         def filter_max_air_gap_length(dto_list_to_filter: List[ItoSingleResultFile], max_air_gap_length=1e-6) -> List[ItoSingleResultFile]:
@@ -1206,33 +1283,12 @@ class IntegratedTransformerOptimization:
             # figure out pareto front
             # pareto_volume_list, pareto_core_hyst_list, pareto_dto_list = self.pareto_front(volume_list, core_hyst_loss_list, valid_design_list)
 
-            x_pareto_vec, y_pareto_vec = fo.pareto_front_from_result_dicts(fem_simulations_dict_list)
+            volume_vec = np.array([result_dict["misc"]["core_2daxi_total_volume"] for result_dict in fem_simulations_dict_list], dtype=float)
+            total_loss_vec = np.array([result_dict["total_losses"]["all_windings"] + result_dict["total_losses"]["core"]
+                                       for result_dict in fem_simulations_dict_list], dtype=float)
+            tolerance_mask = fo.pareto_tolerance_mask(volume_vec, total_loss_vec, factor_min_dc_losses)
 
-            vector_to_sort = np.array([x_pareto_vec, y_pareto_vec])
-
-            # sorting 2d array by 1st row
-            # https://stackoverflow.com/questions/49374253/sort-a-numpy-2d-array-by-1st-row-maintaining-columns
-            sorted_vector = vector_to_sort[:, vector_to_sort[0].argsort()]
-            x_pareto_vec = sorted_vector[0]
-            y_pareto_vec = sorted_vector[1]
-
-            total_losses_list = []
-            filtered_design_dto_list = []
-
-            for result_dict in fem_simulations_dict_list:
-                total_loss = result_dict["total_losses"]["all_windings"] + result_dict["total_losses"]["core"]
-                total_losses_list.append(total_loss)
-
-            min_total_dc_losses = total_losses_list[np.argmin(total_losses_list)]
-            loss_offset = factor_min_dc_losses * min_total_dc_losses
-
-            for result_dict in fem_simulations_dict_list:
-                ref_loss = np.interp(result_dict["misc"]["core_2daxi_total_volume"], x_pareto_vec, y_pareto_vec) + loss_offset
-                total_loss = result_dict["total_losses"]["all_windings"] + result_dict["total_losses"]["core"]
-                if total_loss < ref_loss:
-                    filtered_design_dto_list.append(result_dict)
-
-            return filtered_design_dto_list
+            return [result_dict for result_dict, is_selected in zip(fem_simulations_dict_list, tolerance_mask) if is_selected]
 
         @staticmethod
         def plot(result_log_dict_list: List[Dict]) -> None:
@@ -1271,7 +1327,8 @@ class IntegratedTransformerOptimization:
             """
             Load FEM simulations results from a directory.
 
-            This function appends the case number to the dictionary-list.
+            This function appends the case number to the dictionary-list. Results with a binary companion
+            (case_<n>.npz) are loaded from the binary log, see femmt.load_log_dict().
 
             :param filepath: filepath to FEM simulations
             :type: str
@@ -1282,9 +1339,7 @@ class IntegratedTransformerOptimization:
 
             for file in os.listdir(filepath):
                 if file.endswith(".json"):
-                    json_file_path = os.path.join(filepath, file)
-                    with open(json_file_path, "r") as fd:
-                        loaded_data_dict = json.loads(fd.read())
+                    loaded_data_dict = femmt.load_log_dict(os.path.join(filepath, file))
 
                     case_number = file.replace("case_", "").replace(".json", "")
 
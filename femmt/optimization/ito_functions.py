@@ -13,6 +13,7 @@ from femmt.optimization.ito_dtos import *
 import femmt.functions_reluctance as fr
 import femmt.functions as ff
 import femmt as fmt
+from femmt.data import FileData
 
 
 def _copy_electro_magnetic_necessary_files(src_folder: str, dest_folder: str):
@@ -27,12 +28,7 @@ def _copy_electro_magnetic_necessary_files(src_folder: str, dest_folder: str):
         for the corresponding simulation.
     :type dest_folder: str
     """
-    files = ["fields.pro", "ind_axi_python_controlled.pro", "solver.pro", "values.pro"]
-
-    for file in files:
-        from_path = os.path.join(src_folder, file)
-        to_path = os.path.join(dest_folder, file)
-        shutil.copy(from_path, to_path)
+    FileData.link_template_files(src_folder, dest_folder)
 
 
 def dto_list_to_vec(dto_list: List[ItoSingleResultFile]) -> Tuple:
@@ -261,7 +257,7 @@ def integrated_transformer_fem_simulations_from_result_dtos(config_dto: ItoSingl
                 ito_target_and_fixed_parameters_dto.working_directories.fem_simulation_results_directory,
                 f'case_{dto.case}.json')
 
-            shutil.copy(source_json_file, destination_json_file)
+            femmt.copy_log_file(source_json_file, destination_json_file)
 
         except Exception as e:
             print(f"Exception: {e}")
@@ -356,6 +352,6 @@ def integrated_transformer_fem_thermal_simulations_from_result_dtos(
                 ito_target_and_fixed_parameters_dto.working_directories.fem_thermal_simulation_results_directory,
                 f'case_{dto.case}.json')
 
-            shutil.copy(source_json_file, destination_json_file)
+            femmt.copy_log_file(source_json_file, destination_json_file)
         except Exception:
             pass
@@ -290,7 +290,7 @@ class StackedTransformerOptimization:
                 target_and_fixed_parameters.working_directories.fem_simulation_results_directory,
                 f'case_{trial.number}.json')
 
-            shutil.copy(source_json_file, destination_json_file)
+            femmt.copy_log_file(source_json_file, destination_json_file)
 
             # read result-log
             with open(source_json_file, "r") as fd:
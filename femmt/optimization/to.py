@@ -1,7 +1,6 @@
 """Transformer optimization."""
 # python libraries
 import os
-import shutil
 import json
 import gc
 
@@ -282,7 +281,7 @@ class TransformerOptimization:
                 target_and_fixed_parameters.working_directories.fem_simulation_results_directory,
                 f'case_{trial.number}.json')
 
-            shutil.copy(source_json_file, destination_json_file)
+            femmt.copy_log_file(source_json_file, destination_json_file)
 
             # read result-log
             with open(source_json_file, "r") as fd:
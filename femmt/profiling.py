@@ -0,0 +1,268 @@
+"""Structured timing of the simulation phases by nested spans, with optional profiling per span.
+
+A PhaseProfiler records a span for every instrumented phase of the MagneticComponent (model creation, meshing,
+simulations, sweeps, thermal simulation, litz coefficients, log writing, ...). The spans are measured by a monotonic
+clock and nested per thread. The profiler is given to a MagneticComponent (argument profiler) or activated for all
+components created in a block, e.g. by the code of a production sweep:
+
+    profiler = PhaseProfiler(profiler_type="cprofile", profiled_spans=["single_simulation"])
+    with profiler.activate():
+        run_sweep()
+    profiler.write_chrome_trace("trace.json")  # open in chrome://tracing or https://ui.perfetto.dev
+
+The spans are exported as JSON (write_json()) or in the Chrome trace event format (write_chrome_trace()).
+"""
+# Python standard libraries
+import io
+import os
+import json
+import time
+import pstats
+import cProfile
+import threading
+import functools
+import contextlib
+from typing import Callable, Dict, List, Optional
+
+# Version of the exported span files
+PROFILE_FORMAT_VERSION = 1
+
+# Profilers, which can be attached to the spans
+PROFILERS = ["cprofile", "pyinstrument"]
+
+# Activated profilers, the last one is used by components without an own profiler
+_active_profilers: List["PhaseProfiler"] = []
+
+
+class PhaseProfiler:
+    """Record nested spans of the simulation phases and attach a profiler to selected spans."""
+
+    def __init__(self, profiler_type: Optional[str] = None, profiled_spans: Optional[List[str]] = None, profile_lines: int = 30,
+                 profile_folder_path: Optional[str] = None):
+        """
+        Initialize the phase profiler.
+
+        :param profiler_type: profiler of the spans, 'cprofile' or 'pyinstrument' (needs the pyinstrument package).
+            Defaults to None (timing only)
+        :type profiler_type: str
+        :param profiled_spans: names of the spans to profile, defaults to None (all spans). Profiles do not nest, so
+            within a profiled span no further span is profiled.
+        :type profiled_spans: List[str]
+        :param profile_lines: number of lines of the profile report stored in a span
+        :type profile_lines: int
+        :param profile_folder_path: folder to store the complete profiles (cProfile: .prof files, e.g. for snakeviz,
+            pyinstrument: .html files). Defaults to None (only the report is stored in the span)
+        :type profile_folder_path: str
+        """
+        if profiler_type not in [None, *PROFILERS]:
+            raise ValueError(f"Unknown profiler {profiler_type}. Profilers: {PROFILERS}")
+        if profiler_type == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError as error:
+                raise ImportError("pyinstrument is not installed. Install it by 'pip install pyinstrument' or use the profiler 'cprofile'.") \
+                    from error
+        if profile_folder_path is not None:
+            os.makedirs(profile_folder_path, exist_ok=True)
+
+        self.profiler_type = profiler_type
+        self.profiled_spans = profiled_spans
+        self.profile_lines = profile_lines
+        self.profile_folder_path = profile_folder_path
+        self.spans: List[Dict] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._thread_data = threading.local()
+        self._profiling = False
+
+    def _span_stack(self) -> List[Dict]:
+        """Inner function. Get the stack of the open spans of the current thread."""
+        if not hasattr(self._thread_data, "stack"):
+            self._thread_data.stack = []
+        return self._thread_data.stack
+
+    def _start_profile(self, span_name: str):
+        """Inner function. Start a profile for the span, None if the span is not profiled."""
+        if self.profiler_type is None or (self.profiled_spans is not None and span_name not in self.profiled_spans):
+            return None
+        with self._lock:
+            if self._profiling:
+                return None
+            self._profiling = True
+
+        try:
+            if self.profiler_type == "cprofile":
+                profile = cProfile.Profile()
+                profile.enable()
+            else:
+                import pyinstrument
+                profile = pyinstrument.Profiler()
+                profile.start()
+        except (ValueError, RuntimeError):
+            # another profiling tool is already active in this process
+            self._profiling = False
+            return None
+        return profile
+
+    def _stop_profile(self, profile, span: Dict):
+        """Inner function. Stop the profile and store its report in the span."""
+        file_name = f"{span['id']:05d}_{span['name']}"
+        if self.profiler_type == "cprofile":
+            profile.disable()
+            stream = io.StringIO()
+            pstats.Stats(profile, stream=stream).sort_stats("cumulative").print_stats(self.profile_lines)
+            span["profile"] = stream.getvalue()
+            if self.profile_folder_path is not None:
+                profile.dump_stats(os.path.join(self.profile_folder_path, f"{file_name}.prof"))
+        else:
+            profile.stop()
+            span["profile"] = profile.output_text()
+            if self.profile_folder_path is not None:
+                with open(os.path.join(self.profile_folder_path, f"{file_name}.html"), "w") as html_file:
+                    html_file.write(profile.output_html())
+        self._profiling = False
+
+    @contextlib.contextmanager
+    def span(self, span_name: str, **attributes):
+        """
+        Context manager to record a span.
+
+        :param span_name: name of the span (e.g. the phase)
+        :type span_name: str
+        :param attributes: further attributes of the span, need to be JSON serializable
+        """
+        stack = self._span_stack()
+        thread = threading.current_thread()
+        span = {"name": span_name, "parent": stack[-1]["id"] if stack else None, "depth": len(stack),
+                "thread_id": thread.ident, "thread_name": thread.name, "start": None, "duration": None,
+                "attributes": attributes}
+        with self._lock:
+            span["id"] = len(self.spans)
+            self.spans.append(span)
+        stack.append(span)
+
+        profile = self._start_profile(span_name)
+        span["start"] = time.perf_counter() - self._origin
+        try:
+            yield span
+        except BaseException as exception:
+            span["error"] = type(exception).__name__
+            raise
+        finally:
+            span["duration"] = time.perf_counter() - self._origin - span["start"]
+            if profile is not None:
+                self._stop_profile(profile, span)
+            stack.pop()
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Context manager to record the spans of all components without an own profiler in this block."""
+        _active_profilers.append(self)
+        try:
+            yield self
+        finally:
+            _active_profilers.remove(self)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the finished spans by their names.
+
+        :return: number, total, mean and maximum duration in seconds per span name
+        :rtype: Dict[str, Dict[str, float]]
+        """
+        summary = {}
+        for span in self.spans:
+            if span["duration"] is None:
+                continue
+            span_summary = summary.setdefault(span["name"], {"count": 0, "total": 0.0, "max": 0.0})
+            span_summary["count"] += 1
+            span_summary["total"] += span["duration"]
+            span_summary["max"] = max(span_summary["max"], span["duration"])
+        for span_summary in summary.values():
+            span_summary["mean"] = span_summary["total"] / span_summary["count"]
+        return summary
+
+    def to_dict(self) -> Dict:
+        """
+        Export the spans.
+
+        :return: format version, spans (in the order of their start) and summary
+        :rtype: Dict
+        """
+        with self._lock:
+            spans = [dict(span) for span in self.spans]
+        return {"version": PROFILE_FORMAT_VERSION, "spans": spans, "summary": self.summary()}
+
+    def to_chrome_trace(self) -> Dict:
+        """
+        Export the finished spans in the Chrome trace event format (complete events, time in microseconds).
+
+        :return: trace, to be opened in chrome://tracing or https://ui.perfetto.dev
+        :rtype: Dict
+        """
+        process_id = os.getpid()
+        trace_events = []
+        for span in self.to_dict()["spans"]:
+            if span["duration"] is None:
+                continue
+            arguments = dict(span["attributes"])
+            if "error" in span:
+                arguments["error"] = span["error"]
+            trace_events.append({"name": span["name"], "cat": "femmt", "ph": "X", "ts": span["start"] * 1e6,
+                                 "dur": span["duration"] * 1e6, "pid": process_id, "tid": span["thread_id"], "args": arguments})
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write_json(self, file_path: str):
+        """
+        Write the spans to a JSON file, see to_dict().
+
+        :param file_path: file path
+        :type file_path: str
+        """
+        with open(file_path, "w") as json_file:
+            json.dump(self.to_dict(), json_file, indent=2, default=str)
+
+    def write_chrome_trace(self, file_path: str):
+        """
+        Write the spans to a Chrome trace file, see to_chrome_trace().
+
+        :param file_path: file path
+        :type file_path: str
+        """
+        with open(file_path, "w") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file, default=str)
+
+
+def current_profiler() -> Optional[PhaseProfiler]:
+    """
+    Get the last activated phase profiler.
+
+    :return: phase profiler, None if no profiler is activated
+    :rtype: PhaseProfiler
+    """
+    return _active_profilers[-1] if _active_profilers else None
+
+
+def profiled_phase(span_name: Optional[str] = None) -> Callable:
+    """
+    Decorate a method to record a span of the profiler of its object (or the activated profiler).
+
+    Without any profiler, the method is called directly.
+
+    :param span_name: name of the span, defaults to None (name of the method)
+    :type span_name: str
+    :return: decorator
+    :rtype: Callable
+    """
+    def decorator(method: Callable) -> Callable:
+        name = span_name or method.__name__
+
+        @functools.wraps(method)
+        def method_in_span(self, *args, **kwargs):
+            profiler = getattr(self, "profiler", None) or current_profiler()
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            with profiler.span(name, component=type(self).__name__):
+                return method(self, *args, **kwargs)
+        return method_in_span
+    return decorator
@@ -195,11 +195,95 @@ def distributed_type_2(air_gap_height_single_air_gap, core_inner_diameter, n_air
     return reluctance
 
 
+def _data_matrix_shapes(core_inner_diameter: list, no_of_turns: list, n_air_gaps: list, air_gap_h: list,
+                        air_gap_position: list, mu_rel: list, mult_air_gap_type: list):
+    """
+    Return the grid shapes of the single air-gap rows and the distributed air-gap rows of the data matrix.
+
+    The order of the axes equals the nesting of the combinations in the data matrix, the last axis changes fastest.
+    """
+    n_air_gaps_distributed = [n_air_gap for n_air_gap in n_air_gaps if n_air_gap != 1]
+    mult_air_gap_type = [] if mult_air_gap_type is None else mult_air_gap_type
+    single_shape = (len(core_inner_diameter), len(mu_rel), len(no_of_turns), len(air_gap_h),
+                    len(air_gap_position) if 1 in n_air_gaps else 0)
+    distributed_shape = (len(core_inner_diameter), len(mu_rel), len(no_of_turns), len(n_air_gaps_distributed),
+                         len(air_gap_h), len(mult_air_gap_type))
+    return single_shape, distributed_shape, n_air_gaps_distributed
+
+
+def create_data_matrix_block(core_inner_diameter: list, window_h: list, window_w: list, no_of_turns: list,
+                             n_air_gaps: list, air_gap_h: list, air_gap_position: list, mu_rel: list,
+                             mult_air_gap_type: list, start_row: int = 0, stop_row: int = None):
+    """
+    Create the rows start_row...stop_row of the data matrix, without creating the rows in front of start_row.
+
+    The rows are identical to the corresponding rows of create_data_matrix(). For the parameter description,
+    see create_data_matrix().
+
+    :param start_row: first row of the block
+    :type start_row: int
+    :param stop_row: row after the last row of the block, None for the last row of the data matrix
+    :type stop_row: int
+    :return: data matrix block, number of single air-gap rows in the block, number of rows in the block
+    :rtype: tuple
+    """
+    single_shape, distributed_shape, n_air_gaps_distributed = _data_matrix_shapes(
+        core_inner_diameter, no_of_turns, n_air_gaps, air_gap_h, air_gap_position, mu_rel, mult_air_gap_type)
+    single_len = int(np.prod(single_shape))
+    total_len = single_len + int(np.prod(distributed_shape))
+    stop_row = total_len if stop_row is None else min(stop_row, total_len)
+    start_row = min(max(start_row, 0), stop_row)
+
+    core_inner_diameter = np.asarray(core_inner_diameter, dtype=float)
+    window_h = np.asarray(window_h, dtype=float)
+    window_w = np.asarray(window_w, dtype=float)
+    mu_rel = np.asarray(mu_rel, dtype=float)
+    no_of_turns = np.asarray(no_of_turns, dtype=float)
+    air_gap_h = np.asarray(air_gap_h, dtype=float)
+
+    data_matrix = np.zeros((stop_row - start_row, 10))
+
+    # Single air-gap rows: [core, mu_rel, no_of_turns, air_gap_h, air_gap_position]
+    single_rows = np.arange(start_row, min(stop_row, single_len))
+    if len(single_rows):
+        i_core, i_mu, i_turns, i_h, i_position = np.unravel_index(single_rows, single_shape)
+        block = data_matrix[:len(single_rows)]
+        block[:, 0] = core_inner_diameter[i_core]
+        block[:, 1] = window_h[i_core]
+        block[:, 2] = window_w[i_core]
+        block[:, 3] = mu_rel[i_mu]
+        block[:, 4] = no_of_turns[i_turns]
+        block[:, 5] = 1
+        block[:, 6] = air_gap_h[i_h]
+        block[:, 7] = np.asarray(air_gap_position, dtype=float)[i_position]
+        block[:, 8] = np.nan
+
+    # Distributed air-gap rows: [core, mu_rel, no_of_turns, n_air_gaps, air_gap_h, mult_air_gap_type]
+    distributed_rows = np.arange(max(start_row, single_len), stop_row) - single_len
+    if len(distributed_rows):
+        i_core, i_mu, i_turns, i_n, i_h, i_type = np.unravel_index(distributed_rows, distributed_shape)
+        block = data_matrix[len(single_rows):]
+        block[:, 0] = core_inner_diameter[i_core]
+        block[:, 1] = window_h[i_core]
+        block[:, 2] = window_w[i_core]
+        block[:, 3] = mu_rel[i_mu]
+        block[:, 4] = no_of_turns[i_turns]
+        block[:, 5] = np.asarray(n_air_gaps_distributed, dtype=float)[i_n]
+        block[:, 6] = air_gap_h[i_h]
+        block[:, 7] = np.nan
+        block[:, 8] = np.asarray(mult_air_gap_type, dtype=float)[i_type]
+
+    return data_matrix, len(single_rows), len(data_matrix)
+
+
 def create_data_matrix(core_inner_diameter: list, window_h: list, window_w: list, no_of_turns: list,
                        n_air_gaps: list,
                        air_gap_h: list, air_gap_position: list, mu_rel: list, mult_air_gap_type: list):
     """Create matrix consisting of input design parameters with all their combinations.
 
+    The single air-gap rows come first, followed by the distributed air-gap rows. The matrix is built by index
+    arithmetic on the parameter grid, without python loops over the combinations.
+
     :param core_inner_diameter: Diameter of center leg of the core in meter
     :type core_inner_diameter: list
     :param window_h: Height of the core window [in meter]
@@ -223,66 +307,44 @@ def create_data_matrix(core_inner_diameter: list, window_h: list, window_w: list
     """
     # Structure: data_matrix = [core_inner_diameter, window_h, window_w, mu_rel, no_of_turns, n_air_gaps, air_gap_h,
     #                      air_gap_position, mult_air_gap_type, inductance]
-    clone_n_air_gaps = n_air_gaps
-    row_num = 0
-
-    if 1 in clone_n_air_gaps:
-        data_matrix = np.zeros((len(core_inner_diameter) * len(no_of_turns) * len(air_gap_h) * len(mu_rel) * (
-            len(air_gap_position) + (len(n_air_gaps) - 1) * len(mult_air_gap_type)), 10))
-    else:
-        data_matrix = np.zeros(
-            (len(core_inner_diameter) * len(no_of_turns) * len(air_gap_h) * len(n_air_gaps) * len(
-                mu_rel) * len(mult_air_gap_type), 10))
-
-    if 1 in clone_n_air_gaps:
-        clone_n_air_gaps.remove(1)
-        for index_1 in range(len(core_inner_diameter)):
-            for index_2 in range(len(mu_rel)):
-                for index_3 in range(len(no_of_turns)):
-                    for index_4 in range(len(air_gap_h)):
-                        for index_5 in range(len(air_gap_position)):
-                            data_matrix[row_num, 0] = core_inner_diameter[index_1]
-                            data_matrix[row_num, 1] = window_h[index_1]
-                            data_matrix[row_num, 2] = window_w[index_1]
-                            data_matrix[row_num, 3] = mu_rel[index_2]
-                            data_matrix[row_num, 4] = no_of_turns[index_3]
-                            data_matrix[row_num, 5] = 1
-                            data_matrix[row_num, 6] = air_gap_h[index_4]
-                            data_matrix[row_num, 7] = air_gap_position[index_5]
-                            data_matrix[row_num, 8] = np.nan
-                            row_num = row_num + 1
-
-    single_air_gap_len = row_num
-
-    if len(clone_n_air_gaps) != 0:
-        for index_1 in range(len(core_inner_diameter)):
-            for index_2 in range(len(mu_rel)):
-                for index_3 in range(len(no_of_turns)):
-                    for index_4 in range(len(clone_n_air_gaps)):
-                        for index_5 in range(len(air_gap_h)):
-                            for index_6 in range(len(mult_air_gap_type)):
-                                data_matrix[row_num, 0] = core_inner_diameter[index_1]
-                                data_matrix[row_num, 1] = window_h[index_1]
-                                data_matrix[row_num, 2] = window_w[index_1]
-                                data_matrix[row_num, 3] = mu_rel[index_2]
-                                data_matrix[row_num, 4] = no_of_turns[index_3]
-                                data_matrix[row_num, 5] = n_air_gaps[index_4]
-                                data_matrix[row_num, 6] = air_gap_h[index_5]
-                                data_matrix[row_num, 7] = np.nan
-                                data_matrix[row_num, 8] = mult_air_gap_type[index_6]
-                                row_num = row_num + 1
-
-    data_matrix_len = row_num
-
-    return data_matrix, single_air_gap_len, data_matrix_len
+    return create_data_matrix_block(core_inner_diameter, window_h, window_w, no_of_turns, n_air_gaps, air_gap_h,
+                                    air_gap_position, mu_rel, mult_air_gap_type)
+
+
+def iterate_data_matrix(core_inner_diameter: list, window_h: list, window_w: list, no_of_turns: list,
+                        n_air_gaps: list, air_gap_h: list, air_gap_position: list, mu_rel: list,
+                        mult_air_gap_type: list, chunk_size: int = 100000):
+    """
+    Iterate over the data matrix in blocks of chunk_size rows.
+
+    Only one block is kept in memory, so parameter grids larger than the memory can be processed. The concatenated
+    blocks equal the result of create_data_matrix(). For the parameter description, see create_data_matrix().
+
+    :param chunk_size: number of rows per block
+    :type chunk_size: int
+    :return: generator of (data matrix block, number of single air-gap rows in the block, number of rows in the block)
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    single_shape, distributed_shape, _ = _data_matrix_shapes(
+        core_inner_diameter, no_of_turns, n_air_gaps, air_gap_h, air_gap_position, mu_rel, mult_air_gap_type)
+    total_len = int(np.prod(single_shape)) + int(np.prod(distributed_shape))
+    for start_row in range(0, total_len, chunk_size):
+        yield create_data_matrix_block(core_inner_diameter, window_h, window_w, no_of_turns, n_air_gaps, air_gap_h,
+                                       air_gap_position, mu_rel, mult_air_gap_type, start_row,
+                                       start_row + chunk_size)
 
 
 class MagneticCircuit:
     """Class object for calculating the reluctance and inductance of 2D-axis symmetric inductor."""
 
+    # Columns, which are added to the data_matrix by a sweep calculation (behind the 10 input columns)
+    sweep_result_columns = ["core_h_middle", "r_inner", "r_outer", "center_leg_area", "outer_leg_area", "core_h"]
+
     def __init__(self, core_inner_diameter: list, window_h: list, window_w: list, no_of_turns: list, n_air_gaps: list,
                  air_gap_h: list, air_gap_position: list, mu_r_abs: list, mult_air_gap_type: list = None,
-                 air_gap_method: str = 'Percent', component_type: str = 'inductor', sim_type: str = 'single'):
+                 air_gap_method: str = 'Percent', component_type: str = 'inductor', sim_type: str = 'single',
+                 chunk_size: int = None):
         """
         Init the MagneticCircuit class.
 
@@ -313,6 +375,9 @@ class MagneticCircuit:
         :type component_type: str
         :param sim_type: Relative permeability of the core [in F/m]
         :type sim_type: str
+        :param chunk_size: sim_type = 'sweep' only: if given, the sweep is not calculated at initialization. Instead,
+            iterate_sweep() calculates the data matrix in blocks of chunk_size rows.
+        :type chunk_size: int
         """
         # Storing input arguments into object variables
         self.core_inner_diameter = core_inner_diameter
@@ -327,10 +392,17 @@ class MagneticCircuit:
         self.air_gap_method = air_gap_method
         self.sim_type = sim_type
         self.component_type = component_type
+        self.chunk_size = chunk_size
 
         # Checking input variables
         self.input_pre_check()
 
+        # Sweep inputs, which are overwritten by the data_matrix columns after the calculation
+        self.sweep_parameters = {"core_inner_diameter": core_inner_diameter, "window_h": window_h, "window_w": window_w,
+                                 "no_of_turns": no_of_turns, "n_air_gaps": n_air_gaps, "air_gap_h": air_gap_h,
+                                 "air_gap_position": air_gap_position, "mu_r_abs": mu_r_abs,
+                                 "mult_air_gap_type": mult_air_gap_type}
+
         # Definition of data matrix (which stores all inputs and results) and its length variables
         self.data_matrix = np.zeros((1, 10))
         self.single_air_gap_len = None
@@ -375,36 +447,101 @@ class MagneticCircuit:
                 self.core_reluctance()
                 self.air_gap_reluctance_single()
                 self.calculate_inductance()
-            else:
+            elif self.chunk_size is None:
                 # Creates the data matrix with all the input parameter combinations for sim_type = 'sweep'
-                self.data_matrix, self.single_air_gap_len, self.data_matrix_len = \
-                    create_data_matrix(self.core_inner_diameter, self.window_h, self.window_w, self.no_of_turns,
-                                       self.n_air_gaps, self.air_gap_h, self.air_gap_position, self.mu_r_abs,
-                                       self.mult_air_gap_type)
-
-                # Mapping variables to data_matrix columns
-                self.core_inner_diameter = self.data_matrix[:, 0]
-                self.window_h = self.data_matrix[:, 1]
-                self.window_w = self.data_matrix[:, 2]
-                self.mu_r_abs = self.data_matrix[:, 3]
-                self.no_of_turns = self.data_matrix[:, 4]
-                self.n_air_gaps = self.data_matrix[:, 5]
-                self.air_gap_h = self.data_matrix[:, 6]
-                self.air_gap_position = self.data_matrix[:, 7]
-                self.mult_air_gap_type = self.data_matrix[:, 8]
-
-                # Call to functions for sweep inductance calculation
-                self.core_reluctance()
-                self.air_gap_reluctance_sweep()
-                self.calculate_inductance()
+                self.calculate_sweep_block(*create_data_matrix(
+                    self.core_inner_diameter, self.window_h, self.window_w, self.no_of_turns, self.n_air_gaps,
+                    self.air_gap_h, self.air_gap_position, self.mu_r_abs, self.mult_air_gap_type))
+
+    def calculate_sweep_block(self, data_matrix: np.ndarray, single_air_gap_len: int, data_matrix_len: int,
+                              additional_columns: list = None):
+        """
+        Calculate the reluctances and inductances of the given (block of the) data matrix for sim_type = 'sweep'.
+
+        The result matrix is allocated once with all result columns (see sweep_result_columns) and the
+        additional_columns, so later calculation steps can fill their columns without copying the matrix again.
+
+        :param data_matrix: data matrix or block of the data matrix, see create_data_matrix()
+        :type data_matrix: np.ndarray
+        :param single_air_gap_len: number of single air-gap rows in data_matrix
+        :type single_air_gap_len: int
+        :param data_matrix_len: number of rows in data_matrix
+        :type data_matrix_len: int
+        :param additional_columns: names of further columns to reserve (filled with NaN) behind the result columns
+        :type additional_columns: list
+        :return: data matrix including the calculated columns
+        :rtype: np.ndarray
+        """
+        self.data_matrix = self.empty_sweep_block(additional_columns, len(data_matrix))
+        self.data_matrix[:, :data_matrix.shape[1]] = data_matrix
+        self.single_air_gap_len, self.data_matrix_len = single_air_gap_len, data_matrix_len
+
+        # Mapping variables to data_matrix columns
+        self.core_inner_diameter = self.data_matrix[:, 0]
+        self.window_h = self.data_matrix[:, 1]
+        self.window_w = self.data_matrix[:, 2]
+        self.mu_r_abs = self.data_matrix[:, 3]
+        self.no_of_turns = self.data_matrix[:, 4]
+        self.n_air_gaps = self.data_matrix[:, 5]
+        self.air_gap_h = self.data_matrix[:, 6]
+        self.air_gap_position = self.data_matrix[:, 7]
+        self.mult_air_gap_type = self.data_matrix[:, 8]
+
+        # Call to functions for sweep inductance calculation
+        self.core_reluctance()
+        self.air_gap_reluctance_sweep()
+        self.calculate_inductance()
+
+        # Adding other important variables to data_matrix
+        self.data_matrix[:, self.param_pos_dict["core_h_middle"]] = self.core_h_middle  # 10
+        self.data_matrix[:, self.param_pos_dict["r_inner"]] = self.r_inner  # 11
+        self.data_matrix[:, self.param_pos_dict["r_outer"]] = self.r_outer  # 12
+        self.data_matrix[:, self.param_pos_dict["center_leg_area"]] = self.area[:, 0]  # 13
+        self.data_matrix[:, self.param_pos_dict["outer_leg_area"]] = self.area[:, 4]  # 14
+        self.data_matrix[:, self.param_pos_dict["core_h"]] = self.core_h  # 15
+        return self.data_matrix
+
+    def empty_sweep_block(self, additional_columns: list = None, number_of_rows: int = 0) -> np.ndarray:
+        """
+        Allocate a data matrix with the column layout of calculate_sweep_block() and register the column positions.
+
+        With the default of zero rows, the result is a data matrix without any design case, e.g. in case no block of
+        iterate_sweep() is calculated.
+
+        :param additional_columns: names of further columns to reserve (filled with NaN) behind the result columns
+        :type additional_columns: list
+        :param number_of_rows: number of rows of the data matrix
+        :type number_of_rows: int
+        :return: data matrix filled with NaN
+        :rtype: np.ndarray
+        """
+        number_of_input_columns = self.param_pos_dict["inductance"] + 1
+        columns = self.sweep_result_columns + list(additional_columns or [])
+        for index, column_name in enumerate(columns):
+            self.param_pos_dict[column_name] = number_of_input_columns + index
+        return np.full((number_of_rows, number_of_input_columns + len(columns)), np.nan)
 
-                # Adding other important variables to data_matrix
-                self.data_matrix = self.add_column_to_data_matrix(self.data_matrix, self.core_h_middle, 'core_h_middle')  # 10
-                self.data_matrix = self.add_column_to_data_matrix(self.data_matrix, self.r_inner, 'r_inner')  # 11
-                self.data_matrix = self.add_column_to_data_matrix(self.data_matrix, self.r_outer, 'r_outer')  # 12
-                self.data_matrix = self.add_column_to_data_matrix(self.data_matrix, self.area[:, 0], 'center_leg_area')  # 13
-                self.data_matrix = self.add_column_to_data_matrix(self.data_matrix, self.area[:, 4], 'outer_leg_area')  # 14
-                self.data_matrix = self.add_column_to_data_matrix(self.data_matrix, self.core_h, 'core_h')  # 15
+    def iterate_sweep(self, chunk_size: int = None, additional_columns: list = None):
+        """
+        Calculate the sweep block by block, so only one block of the parameter grid is kept in memory.
+
+        The object attributes (data_matrix, reluctance, ...) always refer to the last calculated block.
+
+        :param chunk_size: number of rows per block, defaults to the chunk_size given at initialization
+        :type chunk_size: int
+        :param additional_columns: names of further columns to reserve in each block, see calculate_sweep_block()
+        :type additional_columns: list
+        :return: generator of the calculated data matrix blocks
+        """
+        if self.sim_type != 'sweep':
+            raise Exception("iterate_sweep() requires sim_type = 'sweep'")
+        chunk_size = chunk_size or self.chunk_size or 100000
+        for block in iterate_data_matrix(self.sweep_parameters["core_inner_diameter"], self.sweep_parameters["window_h"],
+                                         self.sweep_parameters["window_w"], self.sweep_parameters["no_of_turns"],
+                                         self.sweep_parameters["n_air_gaps"], self.sweep_parameters["air_gap_h"],
+                                         self.sweep_parameters["air_gap_position"], self.sweep_parameters["mu_r_abs"],
+                                         self.sweep_parameters["mult_air_gap_type"], chunk_size):
+            yield self.calculate_sweep_block(*block, additional_columns=additional_columns)
 
     def input_pre_check(self):
         """Check the correctness of the inputs provided to class MagneticCircuit."""
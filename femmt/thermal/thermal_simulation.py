@@ -426,7 +426,8 @@ def post_operation(case_volume: float, output_file: str, sensor_points_file: str
 def run_thermal(file_data: FileData, tags_dict: Dict, thermal_conductivity_dict: Dict, boundary_temperatures: Dict,
                 boundary_flags: Dict, boundary_physical_groups: Dict, core_area: List, conductor_radii: float,
                 wire_distances: float, case_volume: float,
-                show_thermal_fem_results: bool, print_sensor_values: bool, silent: bool, flag_insulation: bool = True):
+                show_thermal_fem_results: bool, print_sensor_values: bool, silent: bool, flag_insulation: bool = True,
+                meshing_engine=None):
     """
     Run a thermal simulation.
 
@@ -444,6 +445,8 @@ def run_thermal(file_data: FileData, tags_dict: Dict, thermal_conductivity_dict:
     :param print_sensor_values:
     :param silent: True for silent mode (no terminal outputs)
     :param case_volume: volume of the case in m³
+    :param meshing_engine: meshing engine of the component (femmt.meshing_engine.MeshingEngine), defaults to None
+        (gmsh data is cleared completely)
 
     :return: -
     """
@@ -454,7 +457,10 @@ def run_thermal(file_data: FileData, tags_dict: Dict, thermal_conductivity_dict:
     results_log_file_path = file_data.e_m_results_log_path
 
     # Initial Clearing of gmsh data
-    gmsh.clear()
+    if meshing_engine is not None:
+        meshing_engine.clear()
+    else:
+        gmsh.clear()
 
     losses = thermal_f.read_results_log(results_log_file_path)
 
@@ -477,7 +483,10 @@ def run_thermal(file_data: FileData, tags_dict: Dict, thermal_conductivity_dict:
 
     if not gmsh.isInitialized():
         gmsh.initialize()
-    gmsh.open(model_mesh_file_path)
+    if meshing_engine is not None:
+        meshing_engine.open(model_mesh_file_path)
+    else:
+        gmsh.open(model_mesh_file_path)
 
     # Create file wrappers
     parameters_pro = ParametersPro()
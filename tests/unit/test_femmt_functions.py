@@ -2,6 +2,7 @@
 import pytest
 import femmt
 import numpy as np
+import json
 
 def test_fft():
     """Unittest to calculate the FFT of a given waveform."""
@@ -149,3 +150,494 @@ def test_conductivity_temperature():
 
     assert copper_sigma_100_degree_calculated == pytest.approx(4.4874e7, rel=1e-3)
     assert aluminium_sigma_100_degree_calculated == pytest.approx(2.8627e7, rel=1e-3)
+
+def test_mesh_cache(tmp_path):
+    """Unittest to store, load and evict meshes in the mesh cache."""
+    mesh_cache = femmt.MeshCache(str(tmp_path / "cache"), max_size=100)
+    geo_file = tmp_path / "model.geo_unrolled"
+    mesh_file = tmp_path / "electro_magnetic.msh"
+    geo_file.write_text("geo" * 10)
+    mesh_file.write_text("msh" * 10)
+
+    key = femmt.MeshCache.create_key({"core_inner_diameter": 0.02}, {"mesh_accuracy_core": 0.5})
+    assert key == femmt.MeshCache.create_key({"core_inner_diameter": 0.02}, {"mesh_accuracy_core": 0.5})
+    assert key != femmt.MeshCache.create_key({"core_inner_diameter": 0.02}, {"mesh_accuracy_core": 0.4})
+    assert mesh_cache.load(key, str(tmp_path / "a.geo_unrolled"), str(tmp_path / "a.msh")) is None
+
+    mesh_cache.store(key, str(geo_file), str(mesh_file), {"plane_surface_core": [1, 2]})
+    attributes = mesh_cache.load(key, str(tmp_path / "a.geo_unrolled"), str(tmp_path / "a.msh"))
+    assert attributes == {"plane_surface_core": [1, 2]}
+    assert (tmp_path / "a.msh").read_text() == mesh_file.read_text()
+
+    # the second entry exceeds the maximum size, so the least recently used entry is evicted
+    other_key = femmt.MeshCache.create_key({"core_inner_diameter": 0.03}, {"mesh_accuracy_core": 0.5})
+    mesh_cache.store(other_key, str(geo_file), str(mesh_file), {"plane_surface_core": [3]})
+    assert not mesh_cache.contains(key)
+    assert mesh_cache.contains(other_key)
+
+def test_getdp_session_signature(tmp_path):
+    """Unittest to keep the GetDP session for new excitations and to invalidate it for a changed structure."""
+    mesh_file = tmp_path / "electro_magnetic.msh"
+    mesh_file.write_text("msh")
+    parameter_file = tmp_path / "Parameter.pro"
+    session = femmt.GetDPSession(str(tmp_path), str(tmp_path))
+
+    def signature(frequency: float, current: float, number_of_windings: int = 1) -> str:
+        parameter_file.write_text(f"Number_of_Windings = {number_of_windings};\nFreq = {frequency};\n"
+                                  f"Val_EE_1 = {current};\nPhase_1 = 0.5;\nmur = 3000;\n")
+        return session.structure_signature(str(mesh_file))
+
+    # frequency and current amplitude are evaluated at runtime
+    assert signature(100000, 2) == signature(200000, 4.5)
+    # a current of zero removes the global terms of the winding, other windings change the regions
+    assert signature(100000, 2) != signature(100000, 0)
+    assert signature(100000, 2) != signature(100000, 2, number_of_windings=2)
+
+def test_litz_coefficient_store(tmp_path):
+    """Unittest to create the litz coefficients once, store them and load them into another coefficient folder."""
+    store = femmt.LitzCoefficientStore(str(tmp_path / "store"))
+    calls = []
+
+    def create_coefficients(coeff_folder):
+        calls.append(coeff_folder)
+        coeff_folder.mkdir(parents=True, exist_ok=True)
+        for file_name in femmt.litz_coefficient_file_names(0.55):
+            (coeff_folder / file_name).write_text(f"{file_name} 1\n")
+
+    first_folder = tmp_path / "process_1" / "coeff"
+    second_folder = tmp_path / "process_2" / "coeff"
+    assert not store.load_or_create(0.55, 35.5e-6, str(first_folder), lambda: create_coefficients(first_folder))
+    assert store.load_or_create(0.55, 35.5e-6, str(second_folder), lambda: create_coefficients(second_folder))
+    assert calls == [first_folder]
+    assert (second_folder / "qI_RS_la0.55_4layer.dat").read_text() == "qI_RS_la0.55_4layer.dat 1\n"
+    assert store.create_key(0.55, 35.5e-6) != store.create_key(0.55, 50e-6)
+    assert not list((tmp_path / "store").glob("*.lock"))
+
+    # fill factors of the litz database are calculated like in Conductor.set_litz_round_conductor()
+    assert (0.47, 0.05e-3) in femmt.litz_database_fill_factors_and_strand_radii(["1.5x105x0.1"])
+
+def test_write_litz_coefficient_files(tmp_path):
+    """Unittest to assemble the coefficient files from the single cell simulations in the order of the reduced frequencies."""
+    coeff_folder = tmp_path / "coeff"
+    cell_coeff_folder_paths = {1: [], 2: []}
+    for mode, names in femmt.LITZ_COEFFICIENTS_MODES.items():
+        for rf in [0, 0.25]:
+            cell_coeff_folder = tmp_path / "cells" / f"mode_{mode}_{rf}" / "coeff"
+            cell_coeff_folder.mkdir(parents=True)
+            for name in names:
+                (cell_coeff_folder / f"{name}_RS_la0.55_4layer.dat").write_text(f"{rf} {rf + mode} 0\n")
+            cell_coeff_folder_paths[mode].append(str(cell_coeff_folder))
+    femmt.write_litz_coefficient_files(cell_coeff_folder_paths, str(coeff_folder), 0.55)
+    assert (coeff_folder / "pI_RS_la0.55_4layer.dat").read_text() == "0 1\n0.25 1.25\n"
+    assert (coeff_folder / "pB_RS_la0.55_4layer.dat").read_text() == "0 2\n0.25 2.25\n"
+
+def test_adaptive_litz_reduced_frequencies():
+    """Unittest to extend the reduced frequency grid to the requested range and to refine it until the interpolation error is small."""
+    def solve(reduced_frequencies):
+        return {rf: {"pI": rf ** 2, "qB": 1.0} for rf in reduced_frequencies}
+
+    assert sorted(femmt.adaptive_litz_reduced_frequencies(solve)) == femmt.LITZ_COEFFICIENTS_REDUCED_FREQUENCIES.tolist()
+    maximum_reduced_frequency = femmt.litz_coefficients_reduced_frequency_range(3)
+    assert maximum_reduced_frequency == 5
+    values = femmt.adaptive_litz_reduced_frequencies(solve, maximum_reduced_frequency, tolerance=0.01)
+    reduced_frequencies = np.array(sorted(values))
+    assert reduced_frequencies[-1] == 5
+    fine_reduced_frequencies = np.linspace(0, 5, 1001)
+    interpolation_error = np.interp(fine_reduced_frequencies, reduced_frequencies, reduced_frequencies ** 2) - fine_reduced_frequencies ** 2
+    assert np.max(np.abs(interpolation_error)) / 25 <= 0.01
+
+def test_read_getdp_result_table(tmp_path):
+    """Unittest to read a GetDP result file into a table."""
+    result_file = tmp_path / "Voltage_1.dat"
+    result_file.write_text("0 0 1.5 -2.5\n0 0 3e-3 4e-3\n")
+
+    table = femmt.read_getdp_result_table(str(result_file))
+    assert table.shape == (2, 4)
+    assert table[-1:, 2].tolist() == [3e-3]
+    assert table[:, 3].tolist() == [-2.5, 4e-3]
+
+    result_file.write_text("0 0 1.5 -2.5\n")
+    assert femmt.read_getdp_result_table(str(result_file)).shape == (1, 4)
+
+    result_file.write_text("")
+    with pytest.raises(Exception, match="is empty"):
+        femmt.read_getdp_result_table(str(result_file))
+
+def test_binary_log(tmp_path):
+    """Unittest to write the binary companion of a result log and to parse it with the FEMMTLogParser."""
+    winding = {"number_turns": 2, "flux": [1e-5, 2e-6], "flux_over_current": [1e-4, 0.0], "V": [0.1, 3.0],
+               "I": [2.0, 0.0], "P": 0.1, "Q": 3.0, "S": 3.0017, "winding_losses": 0.1, "turn_losses": [0.04, 0.06]}
+    log_dict = {"single_sweeps": [{"f": 100000, "core_eddy_losses": 0.01, "core_hyst_losses": 0.2,
+                                   "all_winding_losses": 0.1, "winding1": winding}],
+                "total_losses": {"all_windings": 0.1, "eddy_core": 0.01, "hyst_core_fundamental_freq": 0.2, "core": 0.21,
+                                 "winding1": {"total": 0.1, "turns": [0.04, 0.06]}},
+                "misc": {"core_2daxi_total_volume": 1e-5, "total_cost_incl_margin": 12.5, "wire_lengths": [1.2]}}
+    log_file_path = str(tmp_path / "log_electro_magnetic.json")
+    with open(log_file_path, "w") as fd:
+        json.dump(log_dict, fd)
+    json_data = femmt.FEMMTLogParser.parse_file(log_file_path, femmt.SweepTypes.SingleSweep)
+
+    femmt.write_binary_log(log_dict, log_file_path)
+    binary_log = femmt.read_binary_log(log_file_path)
+    assert binary_log["turn_losses_winding1"].tolist() == [[0.04, 0.06]]
+    assert binary_log["total_losses"]["winding1/total"][0] == 0.1
+    assert femmt.FEMMTLogParser.parse_file(log_file_path, femmt.SweepTypes.SingleSweep) == json_data
+
+    # the optimizers load the result logs from the binary companion
+    log_dict_from_binary = femmt.load_log_dict(log_file_path)
+    assert log_dict_from_binary["single_sweeps"][0]["winding1"]["flux"] == pytest.approx(winding["flux"])
+    assert log_dict_from_binary["single_sweeps"][0]["winding1"]["turn_losses"] == pytest.approx(winding["turn_losses"])
+    assert log_dict_from_binary["total_losses"]["winding1"]["total"] == 0.1
+    assert log_dict_from_binary["misc"]["total_cost_incl_margin"] == 12.5
+
+def test_bisect_vectorized():
+    """Unittest to find the air gap lengths of several target reluctances at once."""
+    core_inner_diameter = np.array([0.0149, 0.02, 0.0149])
+    core_height = np.array([0.005, 0.01, 0.005])
+    target_reluctance = np.array([femmt.r_air_gap_round_inf(2e-4, 0.0149, 0.005), femmt.r_air_gap_round_inf(5e-4, 0.02, 0.01), 1e12])
+
+    air_gap_length, valid_mask = femmt.bisect_vectorized(femmt.r_air_gap_round_inf_sct, 1e-6, 1e-3,
+                                                         args=(core_inner_diameter, core_height, target_reluctance))
+    assert valid_mask.tolist() == [True, True, False]
+    assert air_gap_length[:2] == pytest.approx([2e-4, 5e-4], rel=1e-6)
+
+def test_create_data_matrix():
+    """Unittest to create the reluctance model data matrix at once and block by block."""
+    parameters = ([0.0149, 0.02], [0.0295, 0.03], [0.011, 0.012], [9, 10], [1, 3], [1e-4, 5e-4], [0, 50], [3000], [1, 2])
+    data_matrix, single_air_gap_len, data_matrix_len = femmt.create_data_matrix(*parameters)
+    assert (single_air_gap_len, data_matrix_len) == (16, 32)
+    assert data_matrix[1, :8].tolist() == [0.0149, 0.0295, 0.011, 3000, 9, 1, 1e-4, 50]
+    assert data_matrix[17, [0, 4, 5, 6, 8]].tolist() == [0.0149, 9, 3, 1e-4, 2]
+    assert np.isnan(data_matrix[:16, 8]).all() and np.isnan(data_matrix[16:, 7]).all()
+
+    blocks = list(femmt.iterate_data_matrix(*parameters, chunk_size=5))
+    assert np.array_equal(np.vstack([block[0] for block in blocks]), data_matrix, equal_nan=True)
+    assert sum(block[1] for block in blocks) == single_air_gap_len
+
+    # a data matrix without design cases has the column layout of the calculated blocks
+    magnetic_circuit = femmt.MagneticCircuit(*parameters, sim_type="sweep", chunk_size=5)
+    empty_block = magnetic_circuit.empty_sweep_block(additional_columns=["total_loss"])
+    block = next(magnetic_circuit.iterate_sweep(additional_columns=["total_loss"]))
+    assert empty_block.shape == (0, block.shape[1])
+    assert magnetic_circuit.get_parameters_position_dict()["total_loss"] == block.shape[1] - 1
+
+def test_material_lookup(tmp_path):
+    """Unittest to evaluate and cache the precomputed material tables."""
+    class MaterialDatabase:
+        """Material database with a linear flux density dependency of mu_r_imag."""
+
+        def permeability_data_to_pro_file(self, temperature, frequency, material_name, datasource, datatype, plot_interpolation):
+            flux_density_vec = np.linspace(0, 0.4, 9)
+            return flux_density_vec, 10 + 100 * flux_density_vec * frequency / 1e5 + temperature, 3000 - 100 * flux_density_vec
+
+        def get_material_attribute(self, material_name, attribute):
+            return 3000
+
+        def get_saturation_flux_density(self, material_name):
+            return 0.4
+
+    material_lookup = femmt.MaterialLookup(str(tmp_path), material_database=MaterialDatabase())
+    material_lookup.precompute(["N95"], [1e5, 2e5], [25, 100])
+    mu_r_imag = material_lookup.mu_r_imag("N95", np.array([0, 0.1, 0.5]), np.array([1e5, 1.5e5, 2e5]), 50)
+    assert mu_r_imag == pytest.approx([60, 75, 140])
+
+    cached_material_lookup = femmt.MaterialLookup(str(tmp_path))
+    cached_material_lookup.precompute(["N95"], [1e5, 2e5], [25, 100])
+    assert cached_material_lookup.number_of_database_calls == 0
+    assert cached_material_lookup.material_curve("N95", 1e5, 25).material_mu_r_imag_vec[-1] == pytest.approx(75)
+    with pytest.raises(ValueError):
+        cached_material_lookup.mu_r_real("N95", 0.1, 3e5, 25)
+
+def test_pareto_front():
+    """Unittest to find the Pareto front at once and incrementally."""
+    costs = np.random.default_rng(0).random((500, 3))
+    reference_mask = femmt.IntegratedTransformerOptimization.is_pareto_efficient_dumb(costs)
+    assert femmt.pareto_front_mask(costs, block_size=64).tolist() == reference_mask.tolist()
+    assert femmt.is_pareto_efficient(costs[:, :2]).tolist() == \
+        femmt.IntegratedTransformerOptimization.is_pareto_efficient_dumb(costs[:, :2]).tolist()
+
+    pareto_front = femmt.ParetoFront(number_of_costs=3)
+    for indices in np.array_split(np.arange(len(costs)), 4):
+        pareto_front.add(costs[indices])
+    assert sorted(pareto_front.ids.tolist()) == np.flatnonzero(reference_mask).tolist()
+
+    # identical points: only the first one is efficient
+    assert femmt.pareto_front_mask(np.array([[1, 2], [2, 1], [1, 2], [2, 2]])).tolist() == [True, True, False, False]
+
+def test_pareto_tolerance_band():
+    """Unittest to select the designs near the Pareto front at once and chunk by chunk."""
+    random_generator = np.random.default_rng(0)
+    volumes = random_generator.random(2000)
+    losses = 1 / (volumes + 0.05) + random_generator.random(2000)
+    tolerance_mask = femmt.pareto_tolerance_mask(volumes, losses, factor_min_losses=0.2)
+
+    front_mask = femmt.pareto_front_mask(np.column_stack((volumes, losses)))
+    front_order = np.argsort(volumes[front_mask])
+    reference_losses = np.interp(volumes, volumes[front_mask][front_order], losses[front_mask][front_order]) + 0.2 * np.min(losses)
+    assert tolerance_mask.tolist() == (losses < reference_losses).tolist()
+
+    tolerance_band = femmt.ParetoToleranceBand(factor_min_losses=0.2)
+    for indices in np.array_split(np.arange(len(volumes)), 10):
+        tolerance_band.add(volumes[indices], losses[indices])
+    assert tolerance_band.select() == np.flatnonzero(tolerance_mask).tolist()
+    assert len(tolerance_band.candidate_items) < len(volumes) / 2
+
+def test_winding_window_free_raster_points():
+    """Unittest for the vectorized collision test of the winding window rasterization."""
+    left_bound, right_bound, bot_bound, top_bound = 0.01, 0.02, -0.015, 0.015
+    round_conductor_centers = np.array([[0.012, -0.01], [0.015, 0.0], [0.018, 0.012]])
+    round_conductor_min_distances = np.array([1.1e-3, 2.2e-3, 1.1e-3])
+    rectangular_conductor_bounds = np.array([[0.011, 0.002, 0.019, 0.006]])
+
+    # reference: loop over all raster points and conductors
+    number_cols = 17
+    number_rows = int(number_cols * (top_bound - bot_bound) / (right_bound - left_bound))
+    cell_width = (right_bound - left_bound) / (number_cols + 1)
+    cell_height = (top_bound - bot_bound) / (number_rows + 1)
+    reference_points = []
+    for i in range(number_cols + 1):
+        for j in range(number_rows + 1):
+            x = left_bound + cell_width / 2 + i * cell_width
+            y = bot_bound + cell_height / 2 + j * cell_height
+            if any(np.sqrt((center[0] - x) ** 2 + (center[1] - y) ** 2) < min_distance
+                   for center, min_distance in zip(round_conductor_centers, round_conductor_min_distances)):
+                continue
+            if any(x_min < x < x_max and y_min < y < y_max for x_min, y_min, x_max, y_max in rectangular_conductor_bounds):
+                continue
+            reference_points.append([x, y])
+
+    for block_size in [7, 4096]:
+        free_points = femmt.winding_window_free_raster_points(left_bound, right_bound, bot_bound, top_bound, round_conductor_centers,
+                                                              round_conductor_min_distances, rectangular_conductor_bounds,
+                                                              number_cols=number_cols, block_size=block_size)
+        np.testing.assert_allclose(free_points, reference_points, rtol=0, atol=1e-15)
+
+    rect = [[0.012, 0.01], [0.018, 0.01], [0.012, -0.01], [0.018, -0.01]]
+    assert femmt.points_are_in_rect(free_points, rect).tolist() == [femmt.point_is_in_rect(x, y, rect) for x, y in free_points]
+
+def test_meshing_engine():
+    """Unittest for the gmsh options of the meshing engine and the meshing pool."""
+    assert femmt.MeshingEngine().gmsh_options() == {}
+
+    meshing_engine = femmt.MeshingEngine(number_of_threads=4, algorithm_2d=femmt.MeshAlgorithm2D.FrontalDelaunay)
+    assert meshing_engine.gmsh_options() == {"General.NumThreads": 4, "Mesh.MaxNumThreads2D": 4, "Mesh.Algorithm": 6}
+    assert meshing_engine.gmsh_options(number_of_threads=1, algorithm_2d=femmt.MeshAlgorithm2D.Delaunay) == \
+        {"General.NumThreads": 1, "Mesh.MaxNumThreads2D": 1, "Mesh.Algorithm": 5}
+
+    assert femmt.mesh_in_pool(abs, [-3, 2, -1], number_of_workers=2, use_processes=False) == [3, 2, 1]
+    assert femmt.mesh_in_pool(abs, [], use_processes=False) == []
+
+def test_adaptive_meshing():
+    """Unittest for the error indicators and the element marking of the adaptive mesh refinement."""
+    # 4 triangles of a unit square split at its center, the flux density of the right triangle differs
+    center = [0.5, 0.5]
+    node_coordinates = np.array([[[0, 0], [1, 0], center], [[1, 0], [1, 1], center],
+                                 [[1, 1], [0, 1], center], [[0, 1], [0, 0], center]], dtype=float)
+    np.testing.assert_allclose(femmt.element_areas(node_coordinates), 0.25)
+    np.testing.assert_allclose(femmt.element_sizes(node_coordinates), (1 + 2 * np.sqrt(0.5)) / 3)
+
+    node_values = np.repeat(np.array([[1.0], [3.0], [1.0], [1.0]]), 3, axis=1)
+    np.testing.assert_allclose(femmt.element_error_indicators(node_values=node_values, node_coordinates=node_coordinates),
+                               [1.0, 1.0, 1.0, 1.0])
+    assert femmt.element_error_indicators(node_coordinates, np.ones((4, 3))).tolist() == [0, 0, 0, 0]
+
+    assert femmt.mark_elements(np.array([1.0, 3.0, 0.5, 2.0]), refinement_fraction=0.6).tolist() == [False, True, False, False]
+    assert femmt.mark_elements(np.array([1.0, 3.0, 0.5, 2.0]), refinement_fraction=0.9).tolist() == [False, True, False, True]
+    assert femmt.mark_elements(np.zeros(3)).tolist() == [False, False, False]
+
+    sizes = femmt.refinement_sizes(node_coordinates, node_values, refinement_fraction=0.5, refinement_factor=0.5)
+    np.testing.assert_allclose(sizes / femmt.element_sizes(node_coordinates), [0.5, 0.5, 1.0, 1.0])
+
+    assert femmt.relative_change([1.0, 2.0], None) == np.inf
+    assert femmt.relative_change([1.1, 2.0, 0.01], [1.0, 2.0, 0.0]) == pytest.approx(0.1)
+
+def test_mesh_accuracy_tuning(tmp_path):
+    """Unittest to tune the mesh accuracies by a synthetic convergence study and to store the profile."""
+    def simulate(mesh_accuracies):
+        # discretization error grows with the mesh accuracies, the conductor mesh has the largest influence
+        return [1 + 0.001 * mesh_accuracies["mesh_accuracy_core"] + 0.02 * mesh_accuracies["mesh_accuracy_conductor"] ** 2,
+                2 - 0.004 * mesh_accuracies["mesh_accuracy_window"] - 0.002 * mesh_accuracies["mesh_accuracy_air_gaps"]]
+
+    profile = femmt.tune_mesh_accuracies(simulate, tolerance=0.01, reference_mesh_accuracy=0.1,
+                                         mesh_accuracy_candidates=[0.05, 0.2, 0.5, 1.0, 2.0])
+    assert [profile[name] for name in femmt.MESH_ACCURACY_NAMES] == [2.0, 2.0, 0.5, 2.0]
+    assert profile["relative_error"] <= 0.01
+    assert femmt.relative_change(simulate({name: profile[name] for name in femmt.MESH_ACCURACY_NAMES}),
+                                 profile["reference_values"]) == profile["relative_error"]
+
+    profile_file_path = str(tmp_path / "profiles.json")
+    assert femmt.load_mesh_accuracy_profile(profile_file_path, femmt.ComponentType.Inductor) is None
+    femmt.write_mesh_accuracy_profile(profile_file_path, femmt.mesh_accuracy_profile_key(femmt.ComponentType.Inductor), profile)
+    assert femmt.load_mesh_accuracy_profile(profile_file_path, femmt.ComponentType.Inductor) == \
+        {name: profile[name] for name in femmt.MESH_ACCURACY_NAMES}
+    assert femmt.load_mesh_accuracy_profile(profile_file_path, femmt.ComponentType.IntegratedTransformer,
+                                            femmt.CoreType.Stacked) is None
+    with pytest.raises(ValueError):
+        femmt.write_mesh_accuracy_profile(profile_file_path, "Transformer_Single", {"mesh_accuracy_core": 1.0})
+
+
+def test_benchmark_comparison(tmp_path):
+    """Unittest to run a benchmark case repeatedly and to flag regressions against a baseline."""
+    from femmt.benchmark import PhaseTimer, run_benchmarks, compare_benchmark_results, phase_statistics, \
+        write_benchmark_results, read_benchmark_results
+
+    statistics = phase_statistics([3.0, 1.0, 2.0])
+    assert statistics == {"repetitions": 3, "median": 2.0, "mean": 2.0, "std": pytest.approx(np.sqrt(2 / 3)), "min": 1.0, "max": 3.0}
+    with pytest.raises(ValueError):
+        phase_statistics([])
+
+    timer = PhaseTimer()
+    for _ in range(2):
+        with timer.phase("phase"):
+            pass
+    assert len(timer.durations["phase"]) == 2
+
+    results = run_benchmarks(["pareto_extraction"], repetitions=2, warmup_repetitions=0, working_directory=str(tmp_path))
+    assert set(results["cases"]["pareto_extraction"]) == {"pareto_front_2d", "pareto_front_3d", "pareto_tolerance"}
+    assert results["cases"]["pareto_extraction"]["pareto_front_2d"]["repetitions"] == 2
+    results_file_path = str(tmp_path / "results.json")
+    write_benchmark_results(results_file_path, results)
+    assert read_benchmark_results(results_file_path) == results
+    with pytest.raises(ValueError):
+        run_benchmarks(["unknown_case"])
+
+    baseline = {"cases": {"case": {"fast": {"median": 1.0}, "slow": {"median": 1.0}, "noise": {"median": 1e-4},
+                                   "removed": {"median": 1.0}}}}
+    current = {"cases": {"case": {"fast": {"median": 0.8}, "slow": {"median": 1.2}, "noise": {"median": 2e-4}}}}
+    comparison = compare_benchmark_results(baseline, current, threshold=0.1, minimum_duration=1e-3)
+    assert {row["phase"]: row["regression"] for row in comparison} == {"fast": False, "slow": True, "noise": False}
+    assert [row["relative_change"] for row in comparison] == pytest.approx([-0.2, 0.2, 1.0])
+
+
+def test_phase_profiler(tmp_path):
+    """Unittest to record nested spans of decorated methods and to export them as JSON and Chrome trace."""
+    class Component:
+        profiler = None
+
+        @femmt.profiled_phase()
+        def simulate(self):
+            return sum(range(1000))
+
+        @femmt.profiled_phase("sweep")
+        def excitation_sweep(self, number_of_steps):
+            return [self.simulate() for _ in range(number_of_steps)]
+
+        @femmt.profiled_phase()
+        def fail(self):
+            raise ValueError("failed")
+
+    component = Component()
+    assert component.excitation_sweep(2) == [499500, 499500]
+
+    profiler = femmt.PhaseProfiler(profiler_type="cprofile", profiled_spans=["sweep"])
+    with profiler.activate():
+        assert femmt.current_profiler() is profiler
+        component.excitation_sweep(2)
+        with pytest.raises(ValueError):
+            component.fail()
+    assert femmt.current_profiler() is None
+    component.simulate()
+
+    assert [(span["name"], span["parent"], span["depth"]) for span in profiler.spans] == \
+        [("sweep", None, 0), ("simulate", 0, 1), ("simulate", 0, 1), ("fail", None, 0)]
+    assert all(span["duration"] >= 0 for span in profiler.spans)
+    assert profiler.spans[0]["duration"] >= profiler.spans[1]["duration"] + profiler.spans[2]["duration"]
+    assert "simulate" in profiler.spans[0]["profile"] and "profile" not in profiler.spans[1]
+    assert profiler.spans[3]["error"] == "ValueError"
+    assert profiler.summary()["simulate"]["count"] == 2
+
+    profiler.write_json(str(tmp_path / "spans.json"))
+    with open(tmp_path / "spans.json") as json_file:
+        assert [span["name"] for span in json.load(json_file)["spans"]] == ["sweep", "simulate", "simulate", "fail"]
+    trace = profiler.to_chrome_trace()
+    assert [event["ph"] for event in trace["traceEvents"]] == ["X"] * 4
+    assert trace["traceEvents"][0]["args"] == {"component": "Component"}
+    assert trace["traceEvents"][3]["args"]["error"] == "ValueError"
+    with pytest.raises(ValueError):
+        femmt.PhaseProfiler(profiler_type="unknown")
+
+
+def test_hpc_example_model_specs(tmp_path, monkeypatch):
+    """Unittest to rebuild the models of the hpc example from their model descriptions, as done by the hpc workers."""
+    from femmt.examples import hpc_examples
+    hpc_examples.working_directory = str(tmp_path)
+
+    # the example inductor has no working directory, keep it in the temporary folder instead of the examples folder
+    magnetic_component_init = femmt.MagneticComponent.__init__
+
+    def magnetic_component_init_in_tmp_path(self, *args, working_directory=None, **kwargs):
+        magnetic_component_init(self, *args, working_directory=working_directory or str(tmp_path), **kwargs)
+    monkeypatch.setattr(femmt.MagneticComponent, "__init__", magnetic_component_init_in_tmp_path)
+    models = [hpc_examples.create_parallel_example_transformer(), hpc_examples.create_parallel_example_inductor(270000)]
+    models[0].binary_log = True
+    models[0].meshing_engine = femmt.MeshingEngine(2, femmt.MeshAlgorithm2D.Delaunay, isolated=True)
+
+    for model in models:
+        model_spec = json.loads(json.dumps(femmt.create_model_spec(model)))
+        rebuilt_model = femmt.model_from_spec(model_spec, str(tmp_path / "rebuilt"))
+
+        settings = femmt.MagneticComponent.encode_settings(model)
+        rebuilt_settings = femmt.MagneticComponent.encode_settings(rebuilt_model)
+        for key in ["date", "working_directory"]:
+            del settings[key], rebuilt_settings[key]
+        assert rebuilt_settings == settings
+        assert femmt.create_component_options(rebuilt_model) == femmt.create_component_options(model)
+        assert femmt.create_model_spec(rebuilt_model)["mesh_accuracies"] == model_spec["mesh_accuracies"]
+        assert femmt.model_spec_round_trips(model, model_spec)
+
+
+def test_model_spec_round_trip_of_split_winding_window(tmp_path):
+    """Unittest to rebuild a model with a split winding window, winding placements and insulation flags from its description."""
+    geo = femmt.MagneticComponent(component_type=femmt.ComponentType.Transformer, working_directory=str(tmp_path),
+                                  verbosity=femmt.Verbosity.Silent)
+    core = femmt.Core(core_dimensions=femmt.SingleCoreDimensions(core_inner_diameter=0.015, window_w=0.012, window_h=0.0295, core_h=0.04),
+                      mu_r_abs=3100, phi_mu_deg=12, sigma=1.2, permeability_datasource=femmt.MaterialDataSource.Custom,
+                      permittivity_datasource=femmt.MaterialDataSource.Custom, detailed_core_model=False)
+    geo.set_core(core)
+    air_gaps = femmt.AirGaps(femmt.AirGapMethod.Percent, core)
+    air_gaps.add_air_gap(femmt.AirGapLegPosition.CenterLeg, 0.0005, 50)
+    geo.set_air_gaps(air_gaps)
+    insulation = femmt.Insulation(max_aspect_ratio=5, flag_insulation=False)
+    insulation.add_core_insulations(0.001, 0.001, 0.002, 0.001)
+    insulation.add_winding_insulations([[0.0002, 0.001], [0.001, 0.0002]])
+    geo.set_insulation(insulation)
+
+    winding_window = femmt.WindingWindow(core, insulation)
+    top, bot = winding_window.split_window(femmt.WindingWindowSplit.HorizontalSplit, split_distance=0.001)
+    primary = femmt.Conductor(0, femmt.Conductivity.Copper)
+    primary.set_solid_round_conductor(0.0011, femmt.ConductorArrangement.Square)
+    top.set_winding(primary, 8, None, femmt.Align.ToEdges, femmt.ConductorDistribution.VerticalUpward_HorizontalRightward, zigzag=True)
+    secondary = femmt.Conductor(1, femmt.Conductivity.Copper)
+    secondary.set_rectangular_conductor(thickness=0.0005)
+    bot.set_winding(secondary, 3, femmt.WindingScheme.FoilVertical, wrap_para_type=femmt.WrapParaType.FixedThickness)
+    geo.set_winding_windows([winding_window])
+
+    model_spec = femmt.create_model_spec(geo)
+    assert femmt.model_spec_round_trips(geo, model_spec)
+    rebuilt_model = femmt.model_from_spec(model_spec, str(tmp_path / "rebuilt"))
+    rebuilt_top, rebuilt_bot = rebuilt_model.winding_windows[0].virtual_winding_windows
+    assert (rebuilt_top.alignment, rebuilt_top.placing_strategy, rebuilt_top.zigzag) == \
+        (femmt.Align.ToEdges, femmt.ConductorDistribution.VerticalUpward_HorizontalRightward, True)
+    assert rebuilt_bot.wrap_para == femmt.WrapParaType.FixedThickness
+    assert (rebuilt_model.insulation.flag_insulation, rebuilt_model.insulation.max_aspect_ratio) == (False, 5)
+
+
+def test_mesh_accuracy_profile_keeps_explicit_mesh_accuracies(tmp_path):
+    """Unittest to apply a mesh accuracy profile in set_core() without replacing explicitly set mesh accuracies."""
+    profile_file_path = str(tmp_path / "profiles.json")
+    femmt.write_mesh_accuracy_profile(profile_file_path, femmt.mesh_accuracy_profile_key(femmt.ComponentType.Inductor),
+                                      {name: 2.0 for name in femmt.MESH_ACCURACY_NAMES})
+    core = femmt.Core(core_dimensions=femmt.SingleCoreDimensions(core_inner_diameter=0.015, window_w=0.012, window_h=0.0295, core_h=0.04),
+                      mu_r_abs=3100, phi_mu_deg=12, sigma=1.2, permeability_datasource=femmt.MaterialDataSource.Custom,
+                      permittivity_datasource=femmt.MaterialDataSource.Custom)
+
+    geo = femmt.MagneticComponent(working_directory=str(tmp_path), verbosity=femmt.Verbosity.Silent,
+                                  mesh_accuracy_profile_file_path=profile_file_path)
+    geo.set_core(core)
+    assert [getattr(geo.mesh_data, name) for name in femmt.MESH_ACCURACY_NAMES] == [2.0, 2.0, 2.0, 2.0]
+
+    geo = femmt.MagneticComponent(working_directory=str(tmp_path), verbosity=femmt.Verbosity.Silent,
+                                  mesh_accuracy_profile_file_path=profile_file_path)
+    geo.update_mesh_accuracies(0.3, 0.4, 0.5, 0.6)
+    geo.set_core(core)
+    assert [getattr(geo.mesh_data, name) for name in femmt.MESH_ACCURACY_NAMES] == [0.3, 0.4, 0.5, 0.6]